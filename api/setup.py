@@ -154,6 +154,7 @@ if __name__ == "__main__":
         entry_points={
             'console_scripts': [
                 'opentrons_simulate = opentrons.simulate:main',
+                'opentrons_simulate_batch = opentrons.simulate_batch:main',
                 'opentrons_execute = opentrons.execute:main',
             ]
         },
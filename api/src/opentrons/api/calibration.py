@@ -299,6 +299,8 @@ class CalibrationManager:
                 orig = _well0(container._container)._top().point
             delta = here - orig
             labware.save_calibration(container._container, delta)
+            # the labware's height changed with its calibration
+            instrument._context.deck.recalculate_high_z()
         else:
             inst.robot.calibrate_container_with_instrument(
                 container=container._container,
@@ -1,13 +1,22 @@
-from opentrons.broker import Notifications, Broker
+from opentrons.broker import Notifications, Broker, CoalescePolicy
 from .session import SessionManager, Session
 from .calibration import CalibrationManager
 
+#: The largest number of notifications waiting to be sent to clients
+NOTIFICATION_QUEUE_SIZE = 1000
+
 
 class MainRouter:
     def __init__(self, hardware=None, loop=None, lock=None):
         topics = [Session.TOPIC, CalibrationManager.TOPIC]
         self._broker = Broker()
-        self._notifications = Notifications(topics, self._broker, loop=loop)
+        # When clients fall behind, only the latest calibration snapshot
+        # matters, and session clients resync if they miss a delta
+        self._notifications = Notifications(
+            topics, self._broker, loop=loop,
+            maxsize=NOTIFICATION_QUEUE_SIZE,
+            policies={CalibrationManager.TOPIC: CoalescePolicy.KEEP_LATEST,
+                      Session.TOPIC: CoalescePolicy.DROP_OLDEST})
 
         checked_hw = None
         if hardware:
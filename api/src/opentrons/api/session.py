@@ -1,10 +1,12 @@
 import asyncio
 import base64
 from copy import copy
-from functools import reduce, wraps
+from functools import wraps
 import logging
+import threading
 from time import time, sleep
-from typing import List, Dict, Any, Optional, Set, TYPE_CHECKING
+from typing import (List, Dict, Any, Iterable, NamedTuple, Optional, Set,
+                    Tuple, TYPE_CHECKING)
 from uuid import uuid4
 from opentrons.drivers.smoothie_drivers.driver_3_0 import SmoothieAlarm
 from opentrons.drivers.rpi_drivers.gpio_simulator import SimulatingGPIOCharDev
@@ -266,6 +268,16 @@ class Session(object):
         self.startTime: Optional[float] = None
         self._motion_lock = motion_lock
 
+        #: The version of the session state, incremented with every
+        #: notification so that clients applying the deltas of notifications
+        #: can tell when they missed one (see :py:meth:`resync`)
+        self.version = 0
+        # Counts the refreshes of the commands, instruments, containers and
+        # modules, so that each new set of them is sent in full
+        self._load_generation = 0
+        self._published = _PublishedState()
+        self._notification_lock = threading.Lock()
+
     def _hw_iface(self):
         if self._use_v2:
             return self._hardware
@@ -279,29 +291,25 @@ class Session(object):
         self.refresh()
 
     def get_instruments(self):
+        containers = _group_by_id(
+            (instrument, container)
+            for instrument, container in self._interactions)
         return [
             Instrument(
                 instrument=instrument,
-                containers=[
-                    container
-                    for _instrument, container in
-                    self._interactions
-                    if _instrument == instrument
-                ],
+                containers=containers.get(id(instrument), []),
                 context=self._use_v2 and self._simulating_ctx)
             for instrument in self._instruments
         ]
 
     def get_containers(self):
+        instruments = _group_by_id(
+            (container, instrument)
+            for instrument, container in self._interactions)
         return [
             Container(
                 container=container,
-                instruments=[
-                    instrument
-                    for instrument, _container in
-                    self._interactions
-                    if _container == container
-                ],
+                instruments=instruments.get(id(container), []),
                 context=self._use_v2 and self._simulating_ctx)
             for container in self._containers
         ]
@@ -323,7 +331,7 @@ class Session(object):
 
         stack: List[Dict[str, Any]] = []
         res: List[Dict[str, Any]] = []
-        commands: List[Dict[str, Any]] = []
+        accumulator = _Accumulator()
 
         self._containers.clear()
         self._instruments.clear()
@@ -340,7 +348,7 @@ class Session(object):
                 level = len(stack)
 
                 stack.append(message)
-                commands.append(payload)
+                accumulator.add(_get_labware(payload))
 
                 res.append(
                     {
@@ -403,18 +411,17 @@ class Session(object):
 
             unsubscribe()
 
-            instruments, containers, modules, interactions = _accumulate(
-                [_get_labware(command) for command in commands])
+            accumulator.add((
+                self._simulating_ctx.loaded_instruments.values(),
+                [],
+                [m._geometry
+                 for m in self._simulating_ctx.loaded_modules.values()],
+                []))
 
-            self._containers.extend(_dedupe(containers))
-            self._instruments.extend(_dedupe(
-                instruments
-                + list(self._simulating_ctx.loaded_instruments.values())))
-            self._modules.extend(_dedupe(
-                modules
-                + [m._geometry
-                   for m in self._simulating_ctx.loaded_modules.values()]))
-            self._interactions.extend(_dedupe(interactions))
+            self._containers.extend(accumulator.containers)
+            self._instruments.extend(accumulator.instruments)
+            self._modules.extend(accumulator.modules)
+            self._interactions.extend(accumulator.interactions)
 
             # Labware calibration happens after simulation and before run, so
             # we have to clear the tips if they are left on after simulation
@@ -441,6 +448,7 @@ class Session(object):
         self.containers = self.get_containers()
         self.instruments = self.get_instruments()
         self.modules = self.get_modules()
+        self._load_generation += 1
         self.startTime = None
         self.set_state('loaded')
         return self
@@ -611,52 +619,149 @@ class Session(object):
         self._hw_iface().reset()
         self.clear_logs()
 
+    def resync(self):
+        """ Get the whole session along with its current version.
+
+        Clients apply the deltas of session notifications on top of the
+        version they know. A client that gets a delta that does not follow
+        from its version has missed a notification, and should call this
+        to start over.
+        """
+        return self
+
     def _snapshot(self):
-        if self.state == 'loaded':
+        """ Build the notification for the current state of the session.
+
+        The session is sent in full (as a copy, carrying its new
+        :py:attr:`version`) when it is loaded with commands, instruments,
+        containers or modules that were never sent. Otherwise only what
+        changed since the previous notification is sent, as a dict with the
+        ``version`` of the session, the ``baseVersion`` the delta applies
+        to, the ``state``, the ``stateInfo`` and ``startTime`` if they
+        changed, the ``lastCommand`` handled, the ``commandLog`` entries and
+        ``newErrors`` appended since the previous notification, and
+        ``logsCleared`` if the command log and errors were cleared first.
+        """
+        base_version = self.version
+        self.version += 1
+        published = self._published
+        if self.state == 'loaded'\
+                and self._load_generation != published.load_generation:
             payload: Any = copy(self)
         else:
-            if self.command_log.keys():
-                idx = sorted(self.command_log.keys())[-1]
-                timestamp = self.command_log[idx]
-                last_command: Optional[Dict[str, Any]]\
-                    = {'id': idx, 'handledAt': timestamp}
-            else:
-                last_command = None
-
             payload = {
+                'version': self.version,
+                'baseVersion': base_version,
                 'state': self.state,
-                'stateInfo': self.stateInfo,
-                'startTime': self.startTime,
-                'errors': self.errors,
-                'lastCommand': last_command
             }
+            if self.stateInfo != published.state_info:
+                payload['stateInfo'] = self.stateInfo
+            if self.startTime != published.start_time:
+                payload['startTime'] = self.startTime
+            payload.update(self._log_delta(published))
+
+        self._published = _PublishedState(
+            load_generation=self._load_generation,
+            state_info=dict(self.stateInfo),
+            start_time=self.startTime,
+            log_size=len(self.command_log),
+            error_count=len(self.errors))
         return {
             'topic': Session.TOPIC,
             'payload': payload
         }
 
+    def _log_delta(self, published: '_PublishedState') -> Dict[str, Any]:
+        delta: Dict[str, Any] = {}
+        log_size, error_count = published.log_size, published.error_count
+        if len(self.command_log) < log_size or len(self.errors) < error_count:
+            delta['logsCleared'] = True
+            log_size, error_count = 0, 0
+
+        if self.command_log:
+            idx = len(self.command_log) - 1
+            delta['lastCommand'] = {
+                'id': idx, 'handledAt': self.command_log[idx]}
+        else:
+            delta['lastCommand'] = None
+        delta['commandLog'] = {
+            idx: self.command_log[idx]
+            for idx in range(log_size, len(self.command_log))}
+        delta['newErrors'] = self.errors[error_count:]
+        return delta
+
     def _on_state_changed(self):
-        snap = self._snapshot()
-        self._broker.publish(Session.TOPIC, snap)
+        # Versions must reach the broker in order
+        with self._notification_lock:
+            snap = self._snapshot()
+            self._broker.publish(Session.TOPIC, snap)
 
     def _pre_run_hooks(self):
         self._hw_iface().home_z()
 
 
-def _accumulate(iterable):
-    return reduce(
-        lambda x, y: tuple([x + y for x, y in zip(x, y)]),  # type: ignore
-        iterable,
-        ([], [], [], []))
+class _PublishedState(NamedTuple):
+    """ What the last notification of a session told its clients """
+    #: The load generation of the commands, instruments, containers and
+    #: modules last sent in full
+    load_generation: int = 0
+    state_info: Optional[Dict[str, Any]] = None
+    start_time: Optional[float] = None
+    #: The number of command log entries sent
+    log_size: int = 0
+    #: The number of errors sent
+    error_count: int = 0
+
+
+class _Accumulator:
+    """ Collects the instruments, containers, modules and interactions used
+    by the commands of a protocol as they are simulated.
+
+    Each object is kept once, in the order it was first seen. Objects are
+    told apart by identity, so adding a command's labware costs the same no
+    matter how many commands came before it.
+    """
+    def __init__(self):
+        self.instruments: List[Any] = []
+        self.containers: List[Any] = []
+        self.modules: List[Any] = []
+        self.interactions: List[Tuple[Any, Any]] = []
+        self._seen_instruments: Set[int] = set()
+        self._seen_containers: Set[int] = set()
+        self._seen_modules: Set[int] = set()
+        self._seen_interactions: Set[Tuple[int, int]] = set()
+
+    def add(self, labware: Tuple[Iterable[Any], ...]):
+        """ Add the (instruments, containers, modules, interactions) of a
+        command, as returned by :py:func:`_get_labware`
+        """
+        instruments, containers, modules, interactions = labware
+        _add_new(instruments, self.instruments, self._seen_instruments, id)
+        _add_new(containers, self.containers, self._seen_containers, id)
+        _add_new(modules, self.modules, self._seen_modules, id)
+        _add_new(interactions, self.interactions, self._seen_interactions,
+                 _interaction_key)
+
+
+def _interaction_key(interaction):
+    instrument, container = interaction
+    return id(instrument), id(container)
+
 
+def _add_new(items, target, seen, key):
+    for item in items:
+        item_key = key(item)
+        if item_key not in seen:
+            seen.add(item_key)
+            target.append(item)
 
-def _dedupe(iterable):
-    acc = set()  # type: ignore
 
-    for item in iterable:
-        if item not in acc:
-            acc.add(item)
-            yield item
+def _group_by_id(pairs):
+    """ Group the values of (key, value) pairs by the identity of the key """
+    groups: Dict[int, List[Any]] = {}
+    for key, value in pairs:
+        groups.setdefault(id(key), []).append(value)
+    return groups
 
 
 def now():
@@ -1,19 +1,188 @@
 import asyncio
+import enum
+import functools
 import logging
+import threading
 
-from asyncio import Queue
+from collections import deque, OrderedDict
 from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Mapping, NamedTuple
 
 MODULE_LOG = logging.getLogger(__name__)
 
 
+class CoalescePolicy(enum.Enum):
+    """ What a bounded :py:class:`NotificationQueue` does with a new message
+    of a topic when it is full.
+
+    If the policy of the topic cannot make room for the message, the oldest
+    message in the queue is dropped.
+    """
+    #: Replace the newest waiting message of the topic with the new one. For
+    #: topics whose messages are snapshots of a state.
+    KEEP_LATEST = enum.auto()
+    #: Drop the oldest waiting message of the topic. For topics whose
+    #: messages are logs.
+    DROP_OLDEST = enum.auto()
+    #: Drop the new message
+    DROP_NEWEST = enum.auto()
+
+
+class TopicMetrics(NamedTuple):
+    """ Statistics of the messages of a topic in a notification queue """
+    #: The number of messages of the topic waiting in the queue
+    depth: int
+    #: The largest number of messages of the topic ever waiting at once
+    max_depth: int
+    #: The number of messages of the topic put in the queue
+    published: int
+    #: The number of messages replaced by a later one because the queue was
+    #: full (see :py:attr:`CoalescePolicy.KEEP_LATEST`)
+    coalesced: int
+    #: The number of messages dropped because the queue was full
+    dropped: int
+
+
+class _Entry:
+    __slots__ = ('seq', 'topic', 'message')
+
+    def __init__(self, seq: int, topic: str, message: Any) -> None:
+        self.seq = seq
+        self.topic = topic
+        self.message = message
+
+
+class NotificationQueue:
+    """ A queue of messages of several topics, bounded in size.
+
+    Messages are consumed in the order they were put, by awaiting
+    :py:meth:`get`. The :py:class:`CoalescePolicy` of each topic decides what
+    happens to its messages when the queue is full. The queue is not thread
+    safe: messages must be put from the thread of its event loop.
+    """
+
+    def __init__(self,
+                 maxsize: int = 0,
+                 policies: Mapping[str, CoalescePolicy] = None,
+                 default_policy: CoalescePolicy = CoalescePolicy.DROP_OLDEST,
+                 loop: asyncio.AbstractEventLoop = None) -> None:
+        """ Build the queue.
+
+        :param maxsize: The largest number of messages waiting in the
+                        queue. If 0, the queue is unbounded.
+        :param policies: The policy of each topic
+        :param default_policy: The policy of topics not in `policies`
+        """
+        self._maxsize = maxsize
+        self._policies = dict(policies or {})
+        self._default_policy = default_policy
+        # Entries by sequence number, in the order they were put, so that
+        # dropped entries are removed wherever they are in the queue
+        self._entries: 'OrderedDict[int, _Entry]' = OrderedDict()
+        self._by_topic: Dict[str, Deque[_Entry]] = {}
+        self._seq = 0
+        self._nonempty = asyncio.Event(loop=loop)
+        self._counts: Dict[str, List[int]] = {}
+
+    def qsize(self) -> int:
+        """ The number of messages waiting in the queue """
+        return len(self._entries)
+
+    def full(self) -> bool:
+        return bool(self._maxsize) and len(self._entries) >= self._maxsize
+
+    @property
+    def metrics(self) -> Dict[str, TopicMetrics]:
+        """ The metrics of each topic that had messages put in the queue """
+        return {topic: TopicMetrics(len(self._by_topic[topic]), *counts)
+                for topic, counts in self._counts.items()}
+
+    def _count(self, topic: str) -> List[int]:
+        # max_depth, published, coalesced, dropped
+        return self._counts.setdefault(topic, [0, 0, 0, 0])
+
+    def put_nowait(self, topic: str, message: Any):
+        """ Put a message, making room or dropping it if the queue is full
+        according to the policy of its topic """
+        policy = self._policies.get(topic, self._default_policy)
+        counts = self._count(topic)
+        counts[1] += 1
+        waiting = self._by_topic.setdefault(topic, deque())
+
+        if self.full():
+            if policy is CoalescePolicy.DROP_NEWEST:
+                counts[3] += 1
+                MODULE_LOG.debug(f'Notification queue full, dropped {topic}')
+                return
+            if policy is CoalescePolicy.KEEP_LATEST and waiting:
+                waiting[-1].message = message
+                counts[2] += 1
+                return
+            if policy is CoalescePolicy.DROP_OLDEST and waiting:
+                self._drop(waiting[0])
+            else:
+                self._drop(next(iter(self._entries.values())))
+
+        entry = _Entry(self._seq, topic, message)
+        self._seq += 1
+        self._entries[entry.seq] = entry
+        waiting.append(entry)
+        counts[0] = max(counts[0], len(waiting))
+        self._nonempty.set()
+
+    def _drop(self, entry: _Entry):
+        self._remove(entry)
+        self._count(entry.topic)[3] += 1
+        MODULE_LOG.debug(f'Notification queue full, dropped {entry.topic}')
+
+    def _remove(self, entry: _Entry):
+        # Entries of a topic leave the queue oldest first
+        self._by_topic[entry.topic].popleft()
+        del self._entries[entry.seq]
+        if not self._entries:
+            self._nonempty.clear()
+
+    def get_nowait(self) -> Any:
+        """ Take the oldest message.
+
+        :raises asyncio.QueueEmpty: If there are no messages waiting
+        """
+        if not self._entries:
+            raise asyncio.QueueEmpty()
+        entry = next(iter(self._entries.values()))
+        self._remove(entry)
+        return entry.message
+
+    async def get(self) -> Any:
+        """ Take the oldest message, waiting for one if there are none """
+        while not self._entries:
+            await self._nonempty.wait()
+        return self.get_nowait()
+
+
 class Notifications(object):
-    def __init__(self, topics, broker, loop=None):
+    def __init__(self,
+                 topics,
+                 broker,
+                 loop=None,
+                 maxsize: int = 0,
+                 policies: Mapping[str, CoalescePolicy] = None,
+                 default_policy: CoalescePolicy = CoalescePolicy.DROP_OLDEST):
+        """ Subscribe to topics of a broker and queue their messages for
+        iteration from an event loop.
+
+        Messages may be published from any thread. See
+        :py:class:`NotificationQueue` for the meaning of `maxsize`,
+        `policies` and `default_policy`.
+        """
         self.loop = loop or asyncio.get_event_loop()
-        self.queue = Queue(loop=self.loop)  # type: ignore
+        self.queue = NotificationQueue(
+            maxsize, policies, default_policy, loop=self.loop)
         self.snoozed = False
         self._unsubscribe = [
-            broker.subscribe(topic, self.on_notify) for topic in topics]
+            broker.subscribe(topic, functools.partial(self.on_notify,
+                                                      topic=topic))
+            for topic in topics]
 
     @contextmanager
     def snooze(self):
@@ -23,10 +192,25 @@ class Notifications(object):
         finally:
             self.snoozed = False
 
-    def on_notify(self, message):
+    @property
+    def metrics(self) -> Dict[str, TopicMetrics]:
+        """ The metrics of each topic of the queue (see
+        :py:class:`TopicMetrics`)
+        """
+        return self.queue.metrics
+
+    def on_notify(self, message, topic: str = ''):
         if self.snoozed:
             return
-        self.queue.put_nowait(message)
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self.queue.put_nowait(topic, message)
+        else:
+            self.loop.call_soon_threadsafe(
+                self.queue.put_nowait, topic, message)
 
     async def __anext__(self):
         return await self.queue.get()
@@ -40,14 +224,21 @@ class Broker:
     def __init__(self):
         self.subscriptions = {}
         self.logger = MODULE_LOG
+        self._lock = threading.Lock()
 
     def subscribe(self, topic, handler):
-        if handler in self.subscriptions.setdefault(topic, []):
-            return
-        self.subscriptions[topic].append(handler)
+        with self._lock:
+            handlers = self.subscriptions.setdefault(topic, [])
+            if handler in handlers:
+                return
+            # Handlers are replaced rather than modified so that publish can
+            # call them without holding the lock
+            self.subscriptions[topic] = handlers + [handler]
 
         def unsubscribe():
-            self.subscriptions[topic].remove(handler)
+            with self._lock:
+                self.subscriptions[topic] = [
+                    h for h in self.subscriptions[topic] if h != handler]
 
         return unsubscribe
 
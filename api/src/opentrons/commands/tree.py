@@ -4,30 +4,20 @@ def from_list(commands):
     that represents a DFS traversal of a command tree,
     returns a dictionary representing command tree.
     """
-    def subtrees(commands, level):
-        if not commands:
-            return
+    root = []
+    # The children lists of the commands on the path from the root to the
+    # last command, by level
+    path = [root]
 
-        acc = []
-        parent, *commands = commands
+    for command in commands:
+        level = min(command['level'], len(path) - 1)
+        del path[level + 1:]
+        children = []
+        path[level].append({
+            'description': command['description'],
+            'children': children,
+            'id': command['id']
+        })
+        path.append(children)
 
-        for command in commands:
-            if command['level'] > level:
-                acc.append(command)
-            else:
-                yield (parent, acc)
-                parent = command
-                acc.clear()
-        yield (parent, acc)
-
-    def walk(commands, level=0):
-        return [
-            {
-                'description': key['description'],
-                'children': walk(subtree, level + 1),
-                'id': key['id']
-            }
-            for key, subtree in subtrees(commands, level)
-        ]
-
-    return walk(commands)
+    return root
@@ -2,6 +2,7 @@ import json
 import logging
 import os
 import sys
+from threading import Lock
 from typing import Any, Dict, Mapping, Tuple, Union, \
     Optional, TYPE_CHECKING, NamedTuple
 
@@ -28,6 +29,88 @@ class SettingsData(NamedTuple):
     version: int
 
 
+class SettingsCacheStats(NamedTuple):
+    #: How many reads of the settings were served from the cache
+    hits: int
+    #: How many reads of the settings had to read the file
+    misses: int
+
+
+#: What identifies a version of the settings file: its path, and its inode,
+#: size and modification times (or None if it does not exist)
+_FileKey = Tuple[str, Optional[Tuple[int, int, int, int]]]
+
+
+class _SettingsCache:
+    """ The settings as last read from the settings file.
+
+    The file is only read again when it changes: each read compares the
+    result of a ``stat`` of the file with the one it had when it was cached,
+    which is much cheaper than reading and parsing it (especially from an SD
+    card). Writing the settings through this module updates the cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._key: Optional[_FileKey] = None
+        self._data: Optional[SettingsData] = None
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(path: Union[str, 'Path']) -> _FileKey:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (str(path), None)
+        return (str(path), (stat.st_ino, stat.st_size,
+                            stat.st_mtime_ns, stat.st_ctime_ns))
+
+    def get(self, path: Union[str, 'Path']) -> Optional[SettingsData]:
+        key = self.key(path)
+        with self._lock:
+            if self._data is None or key != self._key:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return _copy_settings(self._data)
+
+    def put(self, path: Union[str, 'Path'], data: SettingsData):
+        key = self.key(path)
+        with self._lock:
+            self._key = key
+            self._data = _copy_settings(data)
+
+    def clear(self):
+        with self._lock:
+            self._key = None
+            self._data = None
+
+    @property
+    def stats(self) -> SettingsCacheStats:
+        return SettingsCacheStats(hits=self._hits, misses=self._misses)
+
+
+def _copy_settings(data: SettingsData) -> SettingsData:
+    return SettingsData(settings_map=dict(data.settings_map),
+                        version=data.version)
+
+
+_SETTINGS_CACHE = _SettingsCache()
+
+
+def settings_cache_stats() -> SettingsCacheStats:
+    """ How many reads of the advanced settings were served from the cache
+    and how many read the settings file, since the process started """
+    return _SETTINGS_CACHE.stats
+
+
+def clear_settings_cache():
+    """ Forget the cached settings, so that the next read reads the settings
+    file """
+    _SETTINGS_CACHE.clear()
+
+
 class SettingDefinition:
     def __init__(self, _id: str, title: str, description: str,
                  old_id: str = None,
@@ -162,7 +245,6 @@ settings_by_old_id: Dict[str, SettingDefinition] = \
     {s.old_id: s for s in settings if s.old_id}
 
 
-# TODO: LRU cache?
 def get_adv_setting(setting: str) -> Optional[Setting]:
     setting = _clean_id(setting)
     s = get_all_adv_settings()
@@ -227,6 +309,9 @@ def _read_settings_file(settings_file: 'Path') -> SettingsData:
         (the values stored in the settings file, or `False` if the key was not
         found). Along with the version.
     """
+    cached = _SETTINGS_CACHE.get(settings_file)
+    if cached:
+        return cached
     # Read settings from persistent file
     data = _read_json_file(settings_file)
     settings, version = _migrate(data)
@@ -235,7 +320,9 @@ def _read_settings_file(settings_file: 'Path') -> SettingsData:
     if data.get('_version') != version:
         _write_settings_file(settings, version, settings_file)
 
-    return SettingsData(settings_map=settings, version=version)
+    settings_data = SettingsData(settings_map=settings, version=version)
+    _SETTINGS_CACHE.put(settings_file, settings_data)
+    return settings_data
 
 
 def _write_settings_file(data: Mapping[str, Any],
@@ -249,6 +336,11 @@ def _write_settings_file(data: Mapping[str, Any],
     except OSError:
         log.exception(
             f'Failed to write advanced settings file to {settings_file}')
+        _SETTINGS_CACHE.clear()
+    else:
+        _SETTINGS_CACHE.put(
+            settings_file,
+            SettingsData(settings_map=dict(data), version=version))
 
 
 def _migrate0to1(previous: Mapping[str, Any]) -> SettingsMap:
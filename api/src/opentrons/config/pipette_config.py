@@ -1,9 +1,14 @@
 import copy
+import functools
 import logging
 import json
 import numbers
+from bisect import bisect_left
 from collections import namedtuple
-from typing import Any, Dict, List, Union, Tuple, Sequence, Optional
+from typing import (Any, Dict, Iterable, List, Union, Tuple, Sequence,
+                    Optional)
+
+import numpy as np  # type: ignore
 
 from opentrons.config import feature_flags as ff, CONFIG
 from opentrons.system.shared_data import load_shared_data
@@ -209,6 +214,69 @@ def load(pipette_model: str, pipette_id: str = None) -> pipette_config:
     return res
 
 
+class VolumeConversion:
+    """ A piecewise ul/mm function (see :py:func:`piecewise_volume_conversion`)
+    compiled into sorted arrays of the max volumes of its pieces and of their
+    slopes and y-intercepts, so that the piece for a volume is found by
+    bisection. Build one with :py:func:`volume_conversion`.
+    """
+
+    def __init__(self, sequence: Iterable[Sequence[float]]) -> None:
+        max_volumes: List[float] = []
+        slopes: List[float] = []
+        intercepts: List[float] = []
+        for max_volume, slope, intercept in sequence:
+            # A piece is only ever picked if its max volume is above those of
+            # the pieces before it
+            if not max_volumes or max_volume > max_volumes[-1]:
+                max_volumes.append(max_volume)
+                slopes.append(slope)
+                intercepts.append(intercept)
+        self._max_volumes = max_volumes
+        self._slopes = slopes
+        self._intercepts = intercepts
+        self._arrays = (np.array(max_volumes), np.array(slopes),
+                        np.array(intercepts))
+
+    def __call__(self, ul: float) -> float:
+        """ The ul/mm value for a volume
+
+        :raises IndexError: If the volume is above the max volume of the
+                            function
+        """
+        index = bisect_left(self._max_volumes, ul)
+        return self._slopes[index]*ul + self._intercepts[index]
+
+    def batch(self, volumes: Sequence[float]) -> List[float]:
+        """ The ul/mm values for many volumes at once
+
+        :raises IndexError: If a volume is above the max volume of the
+                            function
+        """
+        max_volumes, slopes, intercepts = self._arrays
+        uls = np.asarray(volumes, dtype=float)
+        indices = np.searchsorted(max_volumes, uls, side='left')
+        if indices.size and indices.max() >= len(self._max_volumes):
+            raise IndexError(
+                f'Volume above the max of {self._max_volumes[-1]}')
+        return (slopes[indices]*uls + intercepts[indices]).tolist()
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_volume_conversion(
+        sequence: Tuple[Tuple[float, ...], ...]) -> VolumeConversion:
+    return VolumeConversion(sequence)
+
+
+def volume_conversion(sequence: Sequence[Sequence[float]]) -> VolumeConversion:
+    """ The compiled version of a piecewise ul/mm function (see
+    :py:func:`piecewise_volume_conversion`). Each sequence is compiled once,
+    however many pipettes and actions share it.
+    """
+    return _compile_volume_conversion(
+        tuple(tuple(piece) for piece in sequence))
+
+
 def piecewise_volume_conversion(
         ul: float, sequence: List[List[float]]) -> float:
     """
@@ -221,13 +289,26 @@ def piecewise_volume_conversion(
       - the slope of the segment
       - the y-intercept of the segment
 
+    The first item of the sequence whose max volume is at least the target
+    is used. To convert many volumes, or the same function often, use
+    :py:func:`volume_conversion`.
+
     :return: the ul/mm value for the specified volume
+    :raises IndexError: If the volume is above the max volume of the
+                        function
     """
-    # pick the first item from the seq for which the target is less than
-    # the bracketing element
-    i = list(filter(lambda x: ul <= x[0], sequence))[0]
-    # use that element to calculate the movement distance in mm
-    return i[1]*ul + i[2]
+    for max_volume, slope, intercept in sequence:
+        if ul <= max_volume:
+            return slope*ul + intercept
+    raise IndexError(f'Volume {ul} above the max of the function')
+
+
+def piecewise_volume_conversion_batch(
+        volumes: Sequence[float], sequence: List[List[float]]) -> List[float]:
+    """ The ul/mm values of a piecewise function (see
+    :py:func:`piecewise_volume_conversion`) for many volumes at once, for
+    instance to plan a transfer """
+    return volume_conversion(sequence).batch(volumes)
 
 
 TypeOverrides = Dict[str, Union[float, bool, None]]
@@ -0,0 +1,319 @@
+""" Serial communication with modules from an event loop.
+
+An :py:class:`AsyncSerial` owns the serial connection to one port. Commands
+sent to it are put in a queue and written one at a time by a task on its event
+loop; each response is matched to its command by the acknowledgement the
+device sends at its end. The connection is read with a reader callback on the
+event loop, so that a port needs no thread of its own.
+"""
+import asyncio
+import logging
+from typing import (
+    Any, Callable, Coroutine, List, Optional, Sequence, TypeVar)
+
+import serial  # type: ignore
+from serial.serialutil import SerialException  # type: ignore
+
+from opentrons.drivers.serial_communication import (
+    SerialNoResponse, get_ports_by_name)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_TIMEOUT = 30
+DEFAULT_COMMAND_RETRIES = 3
+DEFAULT_STABILIZE_DELAY = 0.1
+UNSOLICITED_TERMINATOR = '\r\n'
+
+T = TypeVar('T')
+
+#: Called with each line the device sends while no command is waiting for a
+#: response (for instance, the lid-open interrupt of a thermocycler)
+UnsolicitedCallback = Callable[[str], None]
+
+
+class _Request:
+    __slots__ = ('command', 'timeout', 'retries', 'future', 'batch')
+
+    def __init__(self,
+                 command: str,
+                 timeout: float,
+                 retries: int,
+                 future: 'asyncio.Future[str]',
+                 batch: List['asyncio.Future[str]']) -> None:
+        self.command = command
+        self.timeout = timeout
+        self.retries = retries
+        self.future = future
+        # The futures of the commands sent along with this one, which are
+        # cancelled if it fails
+        self.batch = batch
+
+
+class AsyncSerial:
+    """ A serial connection shared by everything that talks to a device
+    through one port.
+
+    Commands are written in the order they were sent, and the next one is
+    only written when the response to the previous one was received or timed
+    out, so that responses cannot be mixed up. Awaiting a response can be
+    cancelled (for instance with :py:func:`asyncio.wait_for`); a command that
+    was already written still has its response consumed so that the next
+    command gets its own.
+    """
+
+    def __init__(self,
+                 connection: serial.Serial,
+                 ack: str,
+                 loop: asyncio.AbstractEventLoop,
+                 unsolicited_callback: UnsolicitedCallback = None,
+                 tag: str = None) -> None:
+        self._connection = connection
+        self._ack = ack.encode()
+        self._loop = loop
+        self._unsolicited_callback = unsolicited_callback
+        self._tag = tag or connection.port
+        self._buffer = bytearray()
+        self._response: Optional['asyncio.Future[str]'] = None
+        self._queue: 'asyncio.Queue[_Request]' = asyncio.Queue(loop=loop)
+        self._reading = False
+        self._closed = False
+        self._worker = loop.create_task(self._process_requests())
+        self._start_reading()
+
+    @classmethod
+    async def open(cls,
+                   port: str = None,
+                   baudrate: int = 115200,
+                   ack: str = 'ok\r\nok\r\n',
+                   device_name: str = None,
+                   loop: asyncio.AbstractEventLoop = None,
+                   unsolicited_callback: UnsolicitedCallback = None,
+                   tag: str = None) -> 'AsyncSerial':
+        """ Open a serial port.
+
+        :param port: The port to open. If not specified, the first port of a
+                     device named `device_name`.
+        :param ack: What the device sends at the end of every response
+        :param loop: The loop to communicate from. If not specified, the
+                     current event loop.
+        :param unsolicited_callback: A function to call with the lines the
+                                     device sends while no command is waiting
+                                     for a response
+        :raises SerialException: If the port cannot be opened
+        """
+        if not port:
+            port = get_ports_by_name(device_name=device_name)[0]
+        connection = serial.Serial(port=port, baudrate=baudrate, timeout=0)
+        log.debug(connection)
+        return cls(connection, ack, loop or asyncio.get_event_loop(),
+                   unsolicited_callback, tag)
+
+    @property
+    def port(self) -> str:
+        return self._connection.port
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def is_open(self) -> bool:
+        return not self._closed and self._connection.is_open
+
+    async def write_and_return(
+            self,
+            command: str,
+            timeout: float = DEFAULT_RESPONSE_TIMEOUT,
+            retries: int = DEFAULT_COMMAND_RETRIES) -> str:
+        """ Write a command and wait for its response.
+
+        If the device does not acknowledge the command within `timeout`
+        seconds, the port is reopened and the command written again, up to
+        `retries` times in total.
+
+        :returns: The response, stripped of the acknowledgement
+        :raises SerialNoResponse: If the device never acknowledged the command
+        :raises SerialException: If the port was closed
+        """
+        return await self._enqueue(command, timeout, retries)
+
+    async def write_and_return_batch(
+            self,
+            commands: Sequence[str],
+            timeout: float = DEFAULT_RESPONSE_TIMEOUT,
+            retries: int = DEFAULT_COMMAND_RETRIES) -> List[str]:
+        """ Write several commands, with no command from anyone else between
+        them, and wait for all their responses.
+
+        :returns: The responses, in the order of `commands`
+        :raises SerialNoResponse: If the device did not acknowledge one of
+                                  the commands. The commands after it are not
+                                  written.
+        """
+        futures: List['asyncio.Future[str]'] = []
+        for command in commands:
+            self._submit(command, timeout, retries, futures)
+        try:
+            return [await future for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def run_threadsafe(self, coro: Coroutine[Any, Any, T]) -> T:
+        """ Run a coroutine that communicates through this connection from
+        another thread than the one of its event loop, and return its result.
+
+        :raises RuntimeError: If called from the thread of the event loop,
+                              which would never run the coroutine
+        """
+        running: Optional[asyncio.AbstractEventLoop]
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            coro.close()
+            raise RuntimeError(
+                f'{self._tag}: cannot block the event loop of the port '
+                'waiting for a response')
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _submit(self,
+                command: str,
+                timeout: float,
+                retries: int,
+                batch: List['asyncio.Future[str]']) -> 'asyncio.Future[str]':
+        if self._closed:
+            raise SerialException(f'{self._tag}: port is closed')
+        future = self._loop.create_future()
+        batch.append(future)
+        self._queue.put_nowait(
+            _Request(command, timeout, retries, future, batch))
+        return future
+
+    async def _enqueue(self, command: str, timeout: float, retries: int):
+        future = self._submit(command, timeout, retries, [])
+        try:
+            return await future
+        finally:
+            # If awaiting was cancelled, a command that was not written yet
+            # is skipped
+            future.cancel()
+
+    async def _process_requests(self):
+        while True:
+            request = await self._queue.get()
+            if request.future.done():
+                continue
+            try:
+                response = await self._write_with_retries(request)
+            except asyncio.CancelledError:
+                request.future.cancel()
+                raise
+            except Exception as e:
+                if not request.future.done():
+                    request.future.set_exception(e)
+                for future in request.batch:
+                    future.cancel()
+            else:
+                if not request.future.done():
+                    request.future.set_result(response)
+
+    async def _write_with_retries(self, request: _Request) -> str:
+        retries = request.retries
+        while True:
+            try:
+                return await self._write_and_wait(
+                    request.command, request.timeout)
+            except SerialNoResponse:
+                retries -= 1
+                if retries <= 0:
+                    raise
+            await asyncio.sleep(DEFAULT_STABILIZE_DELAY)
+            self._reopen()
+
+    async def _write_and_wait(self, command: str, timeout: float) -> str:
+        if not self._reading:
+            # A read failed, or reopening the port did
+            self._reopen()
+        self._clear_buffer()
+        encoded = command.encode()
+        log.debug(f'{self._tag}: Write -> {encoded!r}')
+        self._response = self._loop.create_future()
+        try:
+            self._connection.write(encoded)
+            return await asyncio.wait_for(self._response, timeout)
+        except asyncio.TimeoutError:
+            log.warning(f'{self._tag}: timed out after {timeout}')
+            raise SerialNoResponse(
+                f'No response from serial port after {timeout} second(s)')
+        finally:
+            self._response = None
+
+    def _clear_buffer(self):
+        self._dispatch_unsolicited()
+        self._buffer.clear()
+        self._connection.reset_input_buffer()
+
+    def _start_reading(self):
+        self._loop.add_reader(self._connection.fileno(), self._on_readable)
+        self._reading = True
+
+    def _stop_reading(self):
+        if self._reading:
+            self._loop.remove_reader(self._connection.fileno())
+            self._reading = False
+
+    def _reopen(self):
+        self._stop_reading()
+        self._connection.close()
+        self._connection.open()
+        self._start_reading()
+
+    def _on_readable(self):
+        try:
+            data = self._connection.read(self._connection.in_waiting or 1)
+        except (SerialException, OSError) as e:
+            # The device is probably gone. Stop reading, or the loop would
+            # keep calling back; the next command reopens the port.
+            log.warning(f'{self._tag}: read failed: {e}')
+            self._stop_reading()
+            if self._response and not self._response.done():
+                self._response.set_exception(SerialNoResponse(str(e)))
+            return
+        self._buffer.extend(data)
+        if self._response and not self._response.done():
+            index = self._buffer.find(self._ack)
+            if index < 0:
+                return
+            response = bytes(self._buffer[:index])
+            del self._buffer[:index + len(self._ack)]
+            log.debug(f'{self._tag}: Read <- {response!r}')
+            self._response.set_result(response.decode().strip())
+        else:
+            self._dispatch_unsolicited()
+
+    def _dispatch_unsolicited(self):
+        terminator = UNSOLICITED_TERMINATOR.encode()
+        while self._unsolicited_callback:
+            index = self._buffer.find(terminator)
+            if index < 0:
+                return
+            line = bytes(self._buffer[:index + len(terminator)])
+            del self._buffer[:index + len(terminator)]
+            log.debug(f'{self._tag}: Unsolicited <- {line!r}')
+            self._unsolicited_callback(line.decode())
+
+    def close(self):
+        """ Close the port. Commands waiting to be written fail with a
+        :py:class:`SerialException`. """
+        if self._closed:
+            return
+        self._closed = True
+        self._worker.cancel()
+        while not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(
+                    SerialException(f'{self._tag}: port was closed'))
+        self._stop_reading()
+        self._connection.close()
@@ -1,4 +1,6 @@
 from os import environ
+import asyncio
+import functools
 import logging
 from threading import Event, Lock
 from time import sleep
@@ -6,6 +8,7 @@ from typing import Dict, Optional, Mapping, Tuple
 from serial.serialutil import SerialException  # type: ignore
 
 from opentrons.drivers import serial_communication
+from opentrons.drivers.async_serial import AsyncSerial
 from opentrons.drivers.serial_communication import SerialNoResponse
 
 """
@@ -164,26 +167,47 @@ class SimulatingDriver:
     def probe_plate(self):
         pass
 
+    async def probe_plate_async(self):
+        pass
+
     def home(self):
         pass
 
+    async def home_async(self):
+        pass
+
     def move(self, location: float):
         self._height = location
 
+    async def move_async(self, location: float):
+        self.move(location)
+
     def get_device_info(self) -> Mapping[str, str]:
         return {'serial': 'dummySerialMD',
                 'model': self._model,
                 'version': 'dummyVersionMD'}
 
+    async def get_device_info_async(self) -> Mapping[str, str]:
+        return self.get_device_info()
+
     def connect(self, port: str):
         pass
 
+    async def connect_async(self, port: str):
+        pass
+
     def disconnect(self, port: str = None):
         pass
 
     def enter_programming_mode(self):
         pass
 
+    async def enter_programming_mode_async(self):
+        pass
+
+    async def get_mag_position_async(self) -> float:
+        return self._height
+
     @property
     def plate_height(self) -> float:
         return self._height
@@ -208,6 +232,7 @@ class MagDeck:
         self._mag_position: Optional[float] = None
         self._port: Optional[str] = None
         self._lock: Optional[Lock] = None
+        self._transport: Optional[AsyncSerial] = None
 
     def connect(self, port=None) -> str:
         """
@@ -221,11 +246,7 @@ class MagDeck:
         try:
             self.disconnect(port)
             self._connect_to_port(port)
-            if mag_locks.get(port):
-                self._lock = mag_locks[port][0]
-            else:
-                self._lock = Lock()
-                mag_locks[port] = (self._lock, self)
+            self._register_lock(port)
             self._wait_for_ack()    # verify the device is there
             self._port = port
 
@@ -233,23 +254,62 @@ class MagDeck:
             return str(e)
         return ''
 
+    async def connect_async(self, port=None) -> str:
+        """ Connect to the Mag-Deck from the current event loop.
+
+        The port is read from the event loop, so that the ``_async`` methods
+        do not block it. The other methods may still be used from other
+        threads.
+        """
+        if environ.get('ENABLE_VIRTUAL_SMOOTHIE', '').lower() == 'true':
+            return ''
+        try:
+            self.disconnect(port)
+            await self._open_transport(port)
+            self._register_lock(port)
+            # verify the device is there
+            await self._send_command_async(
+                '\r\n', timeout=DEFAULT_MAG_DECK_TIMEOUT)
+            self._port = port
+        except (SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
+    def _register_lock(self, port):
+        if mag_locks.get(port):
+            self._lock = mag_locks[port][0]
+        else:
+            self._lock = Lock()
+            mag_locks[port] = (self._lock, self)
+
     def disconnect(self, port=None):
         if port and self.is_connected():
-            self._connection.close()  # type: ignore
+            self._close_connection()
             del mag_locks[port]
         elif self.is_connected():
-            self._connection.close()  # type: ignore
+            self._close_connection()
         self._connection = None
+        self._transport = None
+
+    def _close_connection(self):
+        if self._transport:
+            self._transport.close()
+        else:
+            self._connection.close()  # type: ignore
 
     def is_connected(self) -> bool:
         # Does not detect if the module was physically plugged out
         # TODO: have it test actual connection
+        if self._transport:
+            return self._transport.is_open()
         if not self._connection:
             return False
         return self._connection.is_open
 
     @property
     def port(self) -> str:
+        if self._transport:
+            return self._transport.port
         if not self._connection:
             return ''
         return self._connection.port
@@ -265,6 +325,13 @@ class MagDeck:
             return str(e)
         return ''
 
+    async def home_async(self) -> str:
+        try:
+            await self._send_command_async(GCODES['HOME'])
+        except (MagDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
     def probe_plate(self) -> str:
         """
         Probes for the deck plate and calculates the plate distance
@@ -278,6 +345,13 @@ class MagDeck:
             return str(e)
         return ''
 
+    async def probe_plate_async(self) -> str:
+        try:
+            await self._send_command_async(GCODES['PROBE_PLATE'])
+        except (MagDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
     @property
     def plate_height(self) -> float:
         """
@@ -314,6 +388,28 @@ class MagDeck:
             return str(e)
         return ''
 
+    async def move_async(self, position_mm) -> str:
+        try:
+            position_mm = round(
+                float(position_mm), GCODE_ROUNDING_PRECISION)
+            await self._send_command_async(
+                '{0} Z{1}'.format(GCODES['MOVE'], position_mm))
+        except (MagDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
+    async def get_mag_position_async(self) -> float:
+        """ Query the position of the magnets (see :py:attr:`mag_position`)
+        """
+        try:
+            res = await self._send_command_async(
+                GCODES['GET_CURRENT_POSITION'])
+            self._mag_position = _parse_distance_response(res)
+        except (MagDeckError, SerialException, SerialNoResponse):
+            log.exception('Could not get the position of the Mag-Deck')
+        assert self._mag_position is not None, 'not connected'
+        return self._mag_position
+
     def get_device_info(self) -> Dict[str, str]:
         """
         Queries Temp-Deck for it's build version, model, and serial number
@@ -333,6 +429,18 @@ class MagDeck:
         """
         return self._recursive_get_info(DEFAULT_COMMAND_RETRIES)
 
+    async def get_device_info_async(self) -> Dict[str, str]:
+        for retry in range(DEFAULT_COMMAND_RETRIES, 0, -1):
+            device_info = await self._send_command_async(
+                GCODES['DEVICE_INFO'])
+            try:
+                return _parse_device_information(device_info)
+            except ParseError as e:
+                if retry <= 1:
+                    raise MagDeckError(e)
+            await asyncio.sleep(DEFAULT_STABILIZE_DELAY)
+        raise MagDeckError('Unknown error in magnetic module')
+
     def enter_programming_mode(self) -> str:
         """
         Enters and stays in DFU mode for 8 seconds.
@@ -349,6 +457,15 @@ class MagDeck:
             del mag_locks[self._port]
         return ''
 
+    async def enter_programming_mode_async(self) -> str:
+        try:
+            await self._send_command_async(GCODES['PROGRAMMING_MODE'])
+        except (MagDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        if self._port:
+            del mag_locks[self._port]
+        return ''
+
     def _recursive_write_and_return(self, cmd, timeout, retries, tag=None):
         if not tag:
             tag = f'magdeck {id(self)}'
@@ -379,19 +496,35 @@ class MagDeck:
 
     # Potential place for command optimization (buffering, flushing, etc)
     def _send_command(self, command, timeout=DEFAULT_MAG_DECK_TIMEOUT):
+        if self._transport:
+            return self._transport.run_threadsafe(
+                self._send_command_async(command, timeout))
         command_line = command + ' ' + MAG_DECK_COMMAND_TERMINATOR
         assert self._lock, 'need a lock'
         with self._lock:
             ret_code = self._recursive_write_and_return(
                 command_line, timeout, DEFAULT_COMMAND_RETRIES)
-
-            # Smoothieware returns error state if a switch was hit while moving
-            if (ERROR_KEYWORD in ret_code.lower()) or \
-                    (ALARM_KEYWORD in ret_code.lower()):
-                log.error(f'Received error message from Mag-Deck: {ret_code}')
-                raise MagDeckError(ret_code)
-
-            return ret_code.strip()
+            return self._check_response(ret_code)
+
+    async def _send_command_async(
+            self, command, timeout=DEFAULT_MAG_DECK_TIMEOUT):
+        if not self._transport:
+            # Connected with connect(): the port can only be used blocking
+            return await asyncio.get_event_loop().run_in_executor(
+                None, functools.partial(self._send_command, command, timeout))
+        ret_code = await self._transport.write_and_return(
+            command + ' ' + MAG_DECK_COMMAND_TERMINATOR, timeout,
+            DEFAULT_COMMAND_RETRIES)
+        return self._check_response(ret_code)
+
+    @staticmethod
+    def _check_response(ret_code: str) -> str:
+        # Smoothieware returns error state if a switch was hit while moving
+        if (ERROR_KEYWORD in ret_code.lower()) or \
+                (ALARM_KEYWORD in ret_code.lower()):
+            log.error(f'Received error message from Mag-Deck: {ret_code}')
+            raise MagDeckError(ret_code)
+        return ret_code.strip()
 
     def _connect_to_port(self, port=None):
         try:
@@ -413,6 +546,23 @@ class MagDeck:
             # For development use ENABLE_VIRTUAL_SMOOTHIE=true
             raise SerialException('No port specified')
 
+    async def _open_transport(self, port=None):
+        try:
+            self._transport = await AsyncSerial.open(
+                port=port,
+                baudrate=MAG_DECK_BAUDRATE,
+                ack=MAG_DECK_ACK,
+                device_name=environ.get('OT_MAG_DECK_ID'),
+                tag=f'magdeck {id(self)}')
+        except SerialException:
+            raise SerialException(
+                'Unable to access Serial port to Mag-Deck. This is because '
+                'another process is currently using it, or the Serial port is '
+                'disabled on this device (OS)')
+        except IndexError:
+            # There are no ot_module_magdeck* devices in /dev
+            raise SerialException('No port specified')
+
     def _update_plate_height(self) -> str:
         try:
             res = self._send_command(GCODES['GET_PLATE_HEIGHT'])
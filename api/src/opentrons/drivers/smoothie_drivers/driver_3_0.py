@@ -1,10 +1,13 @@
 import asyncio
 import contextlib
+from collections import deque
 from os import environ
 import logging
+import re
 from time import sleep, time
 from threading import Event, RLock
-from typing import Any, Dict, Optional, Union, List, Tuple
+from typing import (Any, Deque, Dict, NamedTuple, Optional, Union, List,
+                    Tuple)
 
 from math import isclose
 from serial.serialutil import SerialException  # type: ignore
@@ -14,6 +17,7 @@ from opentrons.drivers.types import MoveSplits
 from opentrons.drivers.utils import AxisMoveTimestamp
 from opentrons.drivers.rpi_drivers.gpio_simulator import SimulatingGPIOCharDev
 from opentrons.system import smoothie_update
+from . import motion_profile
 '''
 - Driver is responsible for providing an interface for motion control
 - Driver is the only system component that knows about GCODES or how smoothie
@@ -72,6 +76,10 @@ DEFAULT_SMOOTHIE_TIMEOUT = 1
 DEFAULT_MOVEMENT_TIMEOUT = 30
 SMOOTHIE_BOOT_TIMEOUT = 3
 DEFAULT_STABILIZE_DELAY = 0.1
+# A move that takes longer than this multiple of its estimated duration,
+# plus the margin, is treated as stalled
+MOVE_TIMEOUT_FACTOR = 2
+MOVE_TIMEOUT_MARGIN = 5
 
 DEFAULT_COMMAND_RETRIES = 3
 
@@ -111,6 +119,47 @@ MICROSTEPPING_GCODES = {
     }
 }
 
+# Gcodes that only queue work in Smoothieware's planner (or change settings
+# that are applied in queue order), and can therefore be streamed without an
+# M400 after each one. Anything else is a synchronization point.
+STREAMABLE_GCODES = frozenset([
+    GCODES['MOVE'],
+    GCODES['DWELL'],
+    GCODES['ABSOLUTE_COORDS'],
+    GCODES['RELATIVE_COORDS'],
+    GCODES['PUSH_SPEED'],
+    GCODES['POP_SPEED'],
+    GCODES['STEPS_PER_MM'],
+    GCODES['SET_MAX_SPEED'],
+    GCODES['SET_CURRENT'],
+    GCODES['ACCELERATION'].split(' ')[0],
+] + [code for codes in MICROSTEPPING_GCODES.values()
+     for code in codes.values()])
+
+GCODE_WORD_RE = re.compile(r'[GM]\d+(?:\.\d+)?')
+GCODE_PARAM_RE = re.compile(r'([A-Z])(-?\d*\.?\d+)')
+
+# Gcodes that set a value per parameter letter, which Smoothieware keeps
+# until it is set again. The driver shadows the last value sent for each
+# so that unchanged values are not re-sent.
+COALESCIBLE_SETTINGS = frozenset([
+    GCODES['SET_CURRENT'],
+    GCODES['SET_MAX_SPEED'],
+    GCODES['ACCELERATION'].split(' ')[0],
+    GCODES['STEPS_PER_MM'],
+])
+# The microstepping gcodes take no parameters, so map them to the state
+# they leave their axis in
+MICROSTEPPING_STATES = {
+    code: (axis, int(action == 'ENABLE'))
+    for axis, codes in MICROSTEPPING_GCODES.items()
+    for action, code in codes.items()
+}
+
+# Default number of streamed commands that may be in flight (acked by
+# Smoothieware but not yet known to be complete) before we wait for them
+DEFAULT_STREAM_WINDOW = 8
+
 # Number of digits after the decimal point for coordinates being sent
 # to Smoothie
 GCODE_ROUNDING_PRECISION = 3
@@ -163,6 +212,55 @@ class ParseError(Exception):
     pass
 
 
+class InFlightCommand(NamedTuple):
+    sequence: int
+    command: str
+    execute_timeout: Optional[float]
+
+
+def _split_gcodes(command: str) -> List[Tuple[str, str, str]]:
+    '''
+    Split a command string into (gcode, parameters, text) for each gcode it
+    contains. Returns an empty list if the command does not start with a
+    gcode (e.g. 'version')
+    '''
+    matches = list(GCODE_WORD_RE.finditer(command))
+    if not matches or command[:matches[0].start()].strip():
+        return []
+    ends = [m.start() for m in matches[1:]] + [len(command)]
+    return [
+        (match.group(0),
+         command[match.end():end].strip(),
+         command[match.start():end].strip())
+        for match, end in zip(matches, ends)]
+
+
+def _parse_setting(code: str, params: str) -> Tuple[str, Dict[str, str]]:
+    '''
+    Returns the key under which a gcode's settings are shadowed and its
+    parameters, or an empty key if the gcode is not a setting
+    '''
+    if code in MICROSTEPPING_STATES:
+        axis, state = MICROSTEPPING_STATES[code]
+        return 'microstepping', {axis: str(state)}
+    parsed = dict(GCODE_PARAM_RE.findall(params))
+    if code in COALESCIBLE_SETTINGS:
+        return code, parsed
+    if code == GCODES['MOVE'] and parsed.keys() == {'F'}:
+        # a feedrate-only move just sets the speed
+        return code, parsed
+    return '', parsed
+
+
+def _is_streamable(command: str) -> bool:
+    '''
+    True if every gcode in the command string may be queued without waiting
+    for it to complete
+    '''
+    codes = GCODE_WORD_RE.findall(command)
+    return bool(codes) and all(code in STREAMABLE_GCODES for code in codes)
+
+
 def _parse_number_from_substring(smoothie_substring):
     '''
     Returns the number in the expected string "N:12.3", where "N" is the
@@ -359,10 +457,14 @@ class SmoothieDriver_3_0_0:
         # motor speed settings
         self._max_speed_settings = config.default_max_speed.copy()
         self._saved_max_speed_settings = self._max_speed_settings.copy()
+        # the max speeds last set, including temporary ones that don't
+        # update _max_speed_settings
+        self._active_max_speed_settings = self._max_speed_settings.copy()
         self._combined_speed = float(DEFAULT_AXES_SPEED)
         self._saved_axes_speed = float(self._combined_speed)
         self._steps_per_mm = {}
         self._acceleration = config.acceleration.copy()
+        self._last_move_estimate = 0.0
         self._saved_acceleration = config.acceleration.copy()
 
         # position after homing
@@ -393,6 +495,22 @@ class SmoothieDriver_3_0_0:
         #: Cache of currently configured splits from callers
         self._axes_moved_at = AxisMoveTimestamp(AXES)
 
+        # Command streaming: when the stream window is 0, every command is
+        # followed by an M400. Otherwise up to that many acked commands may
+        # be in flight before we synchronize.
+        self._stream_window = 0
+        self._in_flight: Deque[InFlightCommand] = deque()
+        #: Sequence number of the last command sent to Smoothieware
+        self._last_sent_seq = 0
+        #: Sequence number of the last command known to have completed
+        self._last_completed_seq = 0
+
+        # Shadow of the settings Smoothieware was last sent, keyed by gcode
+        # and then by parameter, used to avoid re-sending unchanged values.
+        # Cleared whenever the smoothie's state may no longer match it.
+        self._sent_settings: Dict[str, Dict[str, float]] = {}
+        self._coalesced = {'commands': 0, 'gcodes': 0, 'bytes': 0}
+
     @property
     def gpio_chardev(self):
         return self._gpio_chardev
@@ -454,6 +572,161 @@ class SmoothieDriver_3_0_0:
         log.info(f"Updated move split config with {config}")
         self._axes_moved_at.reset_moved(config.keys())
 
+    def configure_streaming(self, window: Optional[int] = None):
+        """ Enable or disable pipelined command streaming.
+
+        When streaming is enabled, commands that only queue motion or change
+        motion settings (see STREAMABLE_GCODES) are sent and acked without
+        the usual M400, so that Smoothieware's planner can run them back to
+        back. An M400 is only sent once `window` commands are in flight, or
+        before a synchronization point like a read, probe, home or
+        disengage.
+
+        Note that since streamed commands are only known to have executed
+        after the next synchronization, pausing takes effect once the
+        commands already in flight have run.
+
+        :param window: The maximum number of commands that may be in flight.
+                       0 or None disables streaming (the default).
+        """
+        if window is not None and window < 0:
+            raise ValueError(f'Invalid stream window {window}')
+        with self._serial_lock:
+            self.wait_for_completion()
+            self._stream_window = window or 0
+        log.info(f"Command stream window set to {self._stream_window}")
+
+    @property
+    def streaming(self) -> bool:
+        return self._stream_window > 0
+
+    @property
+    def commands_in_flight(self) -> List[str]:
+        """ The streamed commands that have not yet been waited on """
+        return [ifc.command for ifc in self._in_flight]
+
+    def wait_for_completion(self):
+        """ Block until every streamed command has finished executing.
+
+        Does nothing if no commands are in flight.
+        """
+        if self.simulating or not self._in_flight:
+            return
+        try:
+            with self._serial_lock:
+                self._synchronize()
+        except SmoothieError as se:
+            self._reset_from_error()
+            self._home_after_error(se.ret_code, se.command or '')
+            raise
+
+    @contextlib.contextmanager
+    def streamed(self, window: int):
+        """ Stream the commands sent in this context with a window of at least
+        `window` commands (see :py:meth:`configure_streaming`), so that a
+        block of moves runs without stopping between them.
+
+        If the window was smaller, it is restored at the end of the context,
+        which waits for the block to complete.
+        """
+        previous = self._stream_window
+        if self.simulating or window <= previous:
+            yield
+            return
+        self.configure_streaming(window)
+        try:
+            yield
+        finally:
+            self.configure_streaming(previous)
+
+    @property
+    def coalesced(self) -> Dict[str, int]:
+        """ Counts of what was not sent because Smoothieware already had
+        the settings in question:
+
+        - 'commands': serial commands that did not need to be sent at all
+        - 'gcodes': individual gcodes removed from commands
+        - 'bytes': bytes not written to the serial port
+        """
+        return self._coalesced.copy()
+
+    def reset_coalesced(self):
+        self._coalesced = {'commands': 0, 'gcodes': 0, 'bytes': 0}
+
+    def _invalidate_sent_settings(self):
+        self._sent_settings = {}
+
+    def _coalesce(self, command: str)\
+            -> Tuple[str, Dict[str, Dict[str, float]]]:
+        '''
+        Remove settings from a command that Smoothieware already has.
+
+        Current, max speed, acceleration and steps/mm values that match the
+        last ones sent are removed (and the whole gcode if none are left),
+        as are feedrate-only moves at the current feedrate and microstepping
+        changes to the current microstepping state. A dwell that only exists
+        to let removed settings take effect is removed too.
+
+        Returns the command to send and the settings it will leave the
+        smoothie with, which should be committed once it has been sent.
+        '''
+        updates: Dict[str, Dict[str, float]] = {}
+        kept: List[str] = []
+        dropped = 0
+        trimmed = False
+        # whether each setting since the last dwell or other gcode changed
+        settings_changed: List[bool] = []
+
+        for code, params, text in _split_gcodes(command):
+            key, raw = _parse_setting(code, params)
+            values = {letter: float(value) for letter, value in raw.items()}
+
+            if not key:
+                if code == GCODES['DWELL']\
+                        and settings_changed and not any(settings_changed):
+                    dropped += 1
+                else:
+                    kept.append(text)
+                settings_changed = []
+                continue
+
+            sent = {**self._sent_settings.get(key, {}),
+                    **updates.get(key, {})}
+            changed = {letter: value for letter, value in values.items()
+                       if sent.get(letter) != value}
+            settings_changed.append(bool(changed))
+            if not changed:
+                dropped += 1
+                continue
+            updates.setdefault(key, {}).update(changed)
+            if changed.keys() == values.keys():
+                kept.append(text)
+            else:
+                trimmed = True
+                kept.append(code + ' ' + ' '.join(
+                    letter + raw[letter] for letter in sorted(changed)))
+
+        if not dropped and not trimmed:
+            return command, updates
+        coalesced = ' '.join(kept)
+        self._count_coalesced(command, coalesced, dropped)
+        return coalesced, updates
+
+    def _count_coalesced(self, command: str, coalesced: str, dropped: int):
+        log.debug(f"coalesced {command} to {coalesced}")
+        self._coalesced['gcodes'] += dropped
+        self._coalesced['bytes'] += len(command) - len(coalesced)
+        if not coalesced:
+            self._coalesced['commands'] += 1
+            self._coalesced['bytes'] += len(SMOOTHIE_COMMAND_TERMINATOR)
+            if not self.streaming:
+                self._coalesced['bytes']\
+                    += len(GCODES['WAIT'] + SMOOTHIE_COMMAND_TERMINATOR)
+
+    def _commit_sent_settings(self, updates: Dict[str, Dict[str, float]]):
+        for key, values in updates.items():
+            self._sent_settings.setdefault(key, {}).update(values)
+
     def read_pipette_id(self, mount) -> Optional[str]:
         '''
         Reads in an attached pipette's ID
@@ -581,6 +854,8 @@ class SmoothieDriver_3_0_0:
         self._setup()
 
     def disconnect(self):
+        self._in_flight.clear()
+        self._invalidate_sent_settings()
         if self.is_connected():
             self._connection.close()  # type: ignore
         self._connection = None
@@ -746,6 +1021,8 @@ class SmoothieDriver_3_0_0:
         '''
         if update:
             self._max_speed_settings.update(settings)
+        self._active_max_speed_settings.update(
+            {axis.upper(): value for axis, value in settings.items()})
         values = ['{}{}'.format(axis.upper(), value)
                   for axis, value in sorted(settings.items())]
         command = '{} {}'.format(
@@ -973,6 +1250,7 @@ class SmoothieDriver_3_0_0:
         if not self.simulating:
             sleep(DEFAULT_STABILIZE_DELAY)
         log.debug("reset_from_error")
+        self._invalidate_sent_settings()
         self._send_command(GCODES['RESET_FROM_ERROR'])
         self.update_homed_flags()
 
@@ -990,6 +1268,10 @@ class SmoothieDriver_3_0_0:
         (the axis for plunger control) do current ramp-up and ramp-down, so
         that plunger motors rest at a low current to prevent burn-out.
 
+        Settings in the command that Smoothieware already has (see
+        `_coalesce`) are not re-sent, and if nothing is left of the command
+        it is not sent at all.
+
         In the case of a limit-switch alarm during any command other than home,
         the robot should home the axis from the alarm and then raise a
         SmoothieError. The robot should *not* recover and continue to run the
@@ -1019,40 +1301,77 @@ class SmoothieDriver_3_0_0:
             complete in the worst case. If this is None, the timeout will
             be infinite. This is almost certainly not what you want.
         """
-        if self.simulating:
-            return
         try:
+            # Coalescing, sending and recording what was sent happen under
+            # the one lock, so that no other thread can send a setting in
+            # between and leave the command compared against stale settings
             with self._serial_lock:
-                return self._send_command_unsynchronized(command,
-                                                         ack_timeout,
-                                                         timeout)
+                command, updates = self._coalesce(command)
+                if self.simulating or not command:
+                    self._commit_sent_settings(updates)
+                    return None if self.simulating else ''
+                ret = self._send_command_unsynchronized(command,
+                                                        ack_timeout,
+                                                        timeout)
+                self._commit_sent_settings(updates)
+                return ret
         except SmoothieError as se:
             # XXX: This is a reentrancy error because another command could
             # swoop in here. We're already resetting though and errors (should
             # be) rare so it's probably fine, but the actual solution to this
             # is locking at a higher level like in APIv2.
             self._reset_from_error()
-            error_axis = se.ret_code.strip()[-1]
+            # when streaming, the error may come from an earlier command that
+            # was still in flight, in which case that is the command to blame
+            failed_command = se.command or command
             if not suppress_error_msg:
                 log.warning(
-                        f"alarm/error: command={command}, resp={se.ret_code}")
-            if (GCODES['MOVE'] in command or GCODES['PROBE'] in command)\
-               and not suppress_home_after_error:
-                if error_axis not in 'XYZABC':
-                    error_axis = AXES
-                log.info("Homing after alarm/error")
-                self.home(error_axis)
-            raise SmoothieError(se.ret_code, command)
+                    f"alarm/error: command={failed_command}, "
+                    f"resp={se.ret_code}")
+            if not suppress_home_after_error:
+                self._home_after_error(se.ret_code, failed_command)
+            raise SmoothieError(se.ret_code, failed_command)
+        except BaseException:
+            # we can't know what the smoothie did with the command
+            self._invalidate_sent_settings()
+            raise
+
+    def _home_after_error(self, ret_code: str, command: str):
+        if GCODES['MOVE'] in command or GCODES['PROBE'] in command:
+            error_axis = ret_code.strip()[-1:]
+            if not error_axis or error_axis not in 'XYZABC':
+                error_axis = AXES
+            log.info("Homing after alarm/error")
+            self.home(error_axis)
 
     def _send_command_unsynchronized(self,
                                      command: str,
                                      ack_timeout: float,
                                      execute_timeout: float):
+        streamable = self.streaming and _is_streamable(command)
+        if not streamable:
+            # anything that is not streamed must see every previous command
+            # complete before it runs, so that errors are attributed to the
+            # command that caused them and reads reflect finished motion
+            self._synchronize()
         cmd_ret = self._write_with_retries(
             command + SMOOTHIE_COMMAND_TERMINATOR,
             ack_timeout, DEFAULT_COMMAND_RETRIES)
+        self._last_sent_seq += 1
         cmd_ret = self._remove_unwanted_characters(command, cmd_ret)
-        self._handle_return(cmd_ret)
+        if streamable:
+            self._handle_stream_return(cmd_ret, command)
+            self._in_flight.append(InFlightCommand(
+                self._last_sent_seq, command, execute_timeout))
+            if len(self._in_flight) >= self._stream_window:
+                self._synchronize()
+        else:
+            self._handle_return(cmd_ret)
+            self._wait_for_execution(execute_timeout)
+            self._last_completed_seq = self._last_sent_seq
+        return cmd_ret.strip()
+
+    def _wait_for_execution(self, execute_timeout: Optional[float]):
         wait_ret = serial_communication.write_and_return(
             GCODES['WAIT'] + SMOOTHIE_COMMAND_TERMINATOR,
             SMOOTHIE_ACK, self._connection, timeout=execute_timeout,
@@ -1060,7 +1379,41 @@ class SmoothieDriver_3_0_0:
         wait_ret = self._remove_unwanted_characters(
             GCODES['WAIT'], wait_ret)
         self._handle_return(wait_ret)
-        return cmd_ret.strip()
+
+    def _synchronize(self):
+        """ Wait for all in-flight streamed commands to complete.
+
+        Errors from the M400 are attributed to the in-flight commands.
+        """
+        if not self._in_flight:
+            return
+        timeouts = [ifc.execute_timeout for ifc in self._in_flight]
+        timeout = None if None in timeouts else sum(timeouts)  # type: ignore
+        in_flight = list(self._in_flight)
+        self._in_flight.clear()
+        try:
+            self._wait_for_execution(timeout)
+        except SmoothieError as se:
+            raise SmoothieError(
+                se.ret_code, ' '.join(ifc.command for ifc in in_flight))
+        self._last_completed_seq = in_flight[-1].sequence
+
+    def _handle_stream_return(self, ret_code: str, command: str):
+        """ Check the ack of a streamed command for an error condition.
+
+        Smoothieware reports errors from queued commands asynchronously, so
+        an error in this ack may come from any command in flight; in that
+        case, the in-flight commands are dropped and blamed along with this
+        one.
+        """
+        try:
+            self._handle_return(ret_code)
+        except (SmoothieError, SmoothieAlarm) as e:
+            in_flight = [ifc.command for ifc in self._in_flight] + [command]
+            self._in_flight.clear()
+            if isinstance(e, SmoothieError):
+                raise SmoothieError(e.ret_code, ' '.join(in_flight))
+            raise
 
     def _handle_return(self, ret_code: str):
         """ Check the return string from smoothie for an error condition.
@@ -1225,6 +1578,7 @@ class SmoothieDriver_3_0_0:
 
     def _setup(self):
         log.debug("_setup")
+        self._invalidate_sent_settings()
         try:
             self._wait_for_ack()
         except serial_communication.SerialNoResponse:
@@ -1418,11 +1772,7 @@ class SmoothieDriver_3_0_0:
                 f"No axes move in {target} from position {self.position}")
             return
 
-        backlash_target = {
-            axis: value + PLUNGER_BACKLASH_MM
-            for axis, value in target.items()
-            if axis in 'BC' and self.position[axis] < value
-        }
+        backlash_target = self._build_backlash_target(target)
 
         # whatever else we do to our motion target, if nothing moves in the
         # input we will not command it to move
@@ -1468,6 +1818,7 @@ class SmoothieDriver_3_0_0:
         command = ''
         split_prefix = ''
         split_postfix = ''
+        split_speed = checked_speed
 
         if split_command_string:
             # set fullstepping if necessary
@@ -1518,19 +1869,24 @@ class SmoothieDriver_3_0_0:
         if home_flagged_axes:
             self.home_flagged_axes(''.join(list(target.keys())))
 
+        self._last_move_estimate = self._estimate_segments_time([
+            (split_target, split_speed),
+            (backlash_target, checked_speed),
+            (moving_target, checked_speed)])
+        timeout = self._move_timeout(self._last_move_estimate)
+
         def _do_split():
             try:
                 for sc in (c for c in (split_prefix, split_command) if c):
-                    self._send_command(sc)
+                    self._send_command(sc, timeout=timeout)
             finally:
                 if split_postfix:
                     self._send_command(split_postfix)
         try:
-            log.debug("move: {}".format(command))
-            # TODO (hmg) a movement's timeout should be calculated by
-            # how long the movement is expected to take.
+            log.debug("move: {} (estimated {:.3f}s)".format(
+                command, self._last_move_estimate))
             _do_split()
-            self._send_command(command, timeout=DEFAULT_EXECUTE_TIMEOUT)
+            self._send_command(command, timeout=timeout)
         finally:
             # dwell pipette motors because they get hot
             plunger_axis_moved = ''.join(set('BC') & set(target.keys()))
@@ -1541,6 +1897,62 @@ class SmoothieDriver_3_0_0:
 
         self._update_position(target)
 
+    def _build_backlash_target(
+            self, target: Dict[str, float]) -> Dict[str, float]:
+        """ Plunger moves in the positive direction overshoot by the
+        backlash distance and then come back, so they always end the same way
+        """
+        return {
+            axis: value + PLUNGER_BACKLASH_MM
+            for axis, value in target.items()
+            if axis in 'BC' and self.position[axis] < value
+        }
+
+    def _estimate_segments_time(
+            self, segments: List[Tuple[Dict[str, float], float]]) -> float:
+        """ Estimate the time taken by a sequence of (target, speed) moves
+        starting from the current position
+        """
+        position = self.position
+        duration = 0.0
+        for target, speed in segments:
+            duration += motion_profile.move_profile(
+                position, target, speed,
+                self._active_max_speed_settings, self._acceleration,
+                self.steps_per_mm).duration
+            position.update(target)
+        return duration
+
+    @staticmethod
+    def _move_timeout(duration: float) -> float:
+        return min(DEFAULT_EXECUTE_TIMEOUT,
+                   duration * MOVE_TIMEOUT_FACTOR + MOVE_TIMEOUT_MARGIN)
+
+    def estimate_move_time(
+            self, target: Dict[str, float], speed: float = None) -> float:
+        '''
+        Estimate how long in seconds `move()` will take to reach `target`
+        from the current position, using the current max speed, acceleration
+        and steps/mm settings.
+
+        This does not account for moves that will be split (see
+        `configure_splits_for`), since whether a move splits depends on when
+        it is made.
+
+        :param target: dict of axes to their coordinates in mm
+        :param speed: Optional speed for the move. If not specified, the
+                      current combined speed is used.
+        '''
+        checked_speed = speed or self._combined_speed
+        return self._estimate_segments_time([
+            (self._build_backlash_target(target), checked_speed),
+            (target, checked_speed)])
+
+    @property
+    def last_move_estimate(self) -> float:
+        """ The estimated duration in seconds of the last move sent """
+        return self._last_move_estimate
+
     def home(self,
              axis: str = AXES,
              disabled: str = DISABLE_AXES) -> Dict[str, float]:
@@ -1910,6 +2322,7 @@ class SmoothieDriver_3_0_0:
         if self.simulating:
             pass
         else:
+            self._invalidate_sent_settings()
             self._gpio_chardev.set_reset_pin(False)
             self._gpio_chardev.set_isp_pin(True)
             sleep(0.25)
@@ -1939,6 +2352,9 @@ class SmoothieDriver_3_0_0:
             pass
         else:
             self._is_hard_halting.set()
+            # anything queued on the smoothie is discarded by the halt
+            self._in_flight.clear()
+            self._invalidate_sent_settings()
             self._gpio_chardev.set_halt_pin(False)
             sleep(0.25)
             self._gpio_chardev.set_halt_pin(True)
@@ -0,0 +1,107 @@
+""" Estimates of how long Smoothieware takes to execute moves.
+
+Smoothieware executes each linear move with a trapezoidal velocity profile:
+it accelerates at a constant rate up to the move's nominal speed, cruises,
+and decelerates at the same rate to a stop (the driver waits for each move
+to complete, so moves always start and end at rest). If the move is too
+short to reach its nominal speed, the profile is a triangle instead.
+
+The nominal speed and acceleration of a move are those of the whole move,
+limited so that no single axis exceeds its own maximum speed, acceleration
+or step rate.
+"""
+from math import sqrt
+from typing import Dict, Mapping, NamedTuple, Optional
+
+# Smoothieware's default base stepping frequency, which bounds how many
+# steps per second any one axis can take
+MAX_STEP_RATE = 100000
+
+CARTESIAN_AXES = 'XYZ'
+
+
+class MoveProfile(NamedTuple):
+    #: The length of the move in mm
+    distance: float
+    #: The nominal (cruise) speed of the move in mm/s
+    speed: float
+    #: The acceleration of the move in mm/s^2
+    acceleration: float
+    #: The estimated time the move takes in s
+    duration: float
+
+
+def trapezoid_time(distance: float, speed: float,
+                   acceleration: float) -> float:
+    """ The time in seconds to travel a distance starting and ending at rest,
+    with a maximum speed and constant acceleration and deceleration
+    """
+    if distance <= 0:
+        return 0.0
+    if speed <= 0 or acceleration <= 0:
+        raise ValueError(
+            f'Cannot move {distance}mm at {speed}mm/s and {acceleration}mm/s2')
+    ramp_distance = speed * speed / acceleration
+    if distance >= ramp_distance:
+        # accelerate to speed, cruise, then decelerate
+        return distance / speed + speed / acceleration
+    # accelerate for half the distance and decelerate for the other half
+    return 2 * sqrt(distance / acceleration)
+
+
+def move_profile(
+        start: Mapping[str, float],
+        target: Mapping[str, float],
+        speed: float,
+        max_speeds: Mapping[str, float],
+        accelerations: Mapping[str, float],
+        steps_per_mm: Optional[Mapping[str, float]] = None) -> MoveProfile:
+    """ Estimate the profile of a single coordinated linear move.
+
+    :param start: The position of each axis before the move
+    :param target: The position of each axis that moves. Axes not in
+                   `start` are assumed not to move.
+    :param speed: The requested (feedrate) speed of the move in mm/s
+    :param max_speeds: Each axis' maximum speed in mm/s
+    :param accelerations: Each axis' acceleration in mm/s^2
+    :param steps_per_mm: Each axis' steps per mm, if known
+    """
+    steps_per_mm = steps_per_mm or {}
+    deltas: Dict[str, float] = {
+        ax: abs(pos - start[ax])
+        for ax, pos in target.items()
+        if ax in start}
+    deltas = {
+        ax: delta for ax, delta in deltas.items()
+        # moves of less than a step don't happen at all
+        if delta > 0 and delta * steps_per_mm.get(ax, 1e6) >= 1}
+    if not deltas:
+        return MoveProfile(0.0, 0.0, 0.0, 0.0)
+
+    # the feedrate applies to the cartesian length of the move; moves of
+    # only the mount and plunger axes move at the feedrate along the longest
+    cartesian = [deltas[ax] for ax in CARTESIAN_AXES if ax in deltas]
+    if cartesian:
+        distance = sqrt(sum(d * d for d in cartesian))
+    else:
+        distance = max(deltas.values())
+
+    move_speed = speed
+    move_acceleration = float('inf')
+    for ax, delta in deltas.items():
+        # each axis only covers delta/distance of the move's length per mm
+        scale = distance / delta
+        axis_speed = max_speeds.get(ax, speed)
+        if ax in steps_per_mm:
+            axis_speed = min(axis_speed, MAX_STEP_RATE / steps_per_mm[ax])
+        move_speed = min(move_speed, axis_speed * scale)
+        if ax in accelerations:
+            move_acceleration = min(
+                move_acceleration, accelerations[ax] * scale)
+    if move_acceleration == float('inf'):
+        # no acceleration limit: the move is at speed the whole way
+        return MoveProfile(distance, move_speed, move_acceleration,
+                           distance / move_speed)
+    return MoveProfile(
+        distance, move_speed, move_acceleration,
+        trapezoid_time(distance, move_speed, move_acceleration))
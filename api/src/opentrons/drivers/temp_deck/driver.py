@@ -1,4 +1,5 @@
 from os import environ
+import functools
 import logging
 import asyncio
 from threading import Event, Thread, Lock
@@ -7,6 +8,7 @@ from typing import Any, Optional, Mapping, Dict, Tuple
 from serial.serialutil import SerialException  # type: ignore
 
 from opentrons.drivers import serial_communication, utils
+from opentrons.drivers.async_serial import AsyncSerial
 from opentrons.drivers.serial_communication import SerialNoResponse
 
 '''
@@ -69,6 +71,9 @@ class SimulatingDriver:
         self._target_temp = celsius
         self._active = True
 
+    async def start_set_temperature_async(self, celsius):
+        self.start_set_temperature(celsius)
+
     def legacy_set_temperature(self, celsius: float):
         self._target_temp = celsius
         self._active = True
@@ -77,12 +82,21 @@ class SimulatingDriver:
         self._target_temp = 0
         self._active = False
 
+    async def deactivate_async(self):
+        self.deactivate()
+
     def update_temperature(self):
         pass
 
+    async def update_temperature_async(self):
+        pass
+
     def connect(self, port: str):
         self._port = port
 
+    async def connect_async(self, port: str):
+        self._port = port
+
     def is_connected(self) -> bool:
         return True
 
@@ -92,6 +106,9 @@ class SimulatingDriver:
     def enter_programming_mode(self):
         pass
 
+    async def enter_programming_mode_async(self):
+        pass
+
     @property
     def temperature(self) -> float:
         return self._target_temp
@@ -109,6 +126,9 @@ class SimulatingDriver:
                 'model': self._model,
                 'version': 'dummyVersionTD'}
 
+    async def get_device_info_async(self) -> Mapping[str, str]:
+        return self.get_device_info()
+
 
 class TempDeck:
     def __init__(self, config={}):
@@ -118,10 +138,12 @@ class TempDeck:
         self._connection = None
         self._config = config
 
-        self._temperature = {'current': 25, 'target': None}
+        self._temperature: Dict[str, Optional[float]] = {
+            'current': 25, 'target': None}
         self._update_thread = None
         self._port = None
         self._lock = None
+        self._transport: Optional[AsyncSerial] = None
 
     def connect(self, port=None) -> Optional[str]:
         if environ.get('ENABLE_VIRTUAL_SMOOTHIE', '').lower() == 'true':
@@ -129,11 +151,7 @@ class TempDeck:
         try:
             self.disconnect(port)
             self._connect_to_port(port)
-            if temp_locks.get(port):
-                self._lock = temp_locks[port][0]
-            else:
-                self._lock = Lock()
-                temp_locks[port] = (self._lock, self)
+            self._register_lock(port)
             self._wait_for_ack()  # verify the device is there
             self._port = port
 
@@ -141,22 +159,61 @@ class TempDeck:
             return str(e)
         return ''
 
+    async def connect_async(self, port=None) -> Optional[str]:
+        """ Connect to the Temp-Deck from the current event loop.
+
+        The port is read from the event loop, so that the ``_async`` methods
+        do not block it. The other methods may still be used from other
+        threads.
+        """
+        if environ.get('ENABLE_VIRTUAL_SMOOTHIE', '').lower() == 'true':
+            return None
+        try:
+            self.disconnect(port)
+            await self._open_transport(port)
+            self._register_lock(port)
+            # verify the device is there
+            await self._send_command_async(
+                '\r\n', timeout=DEFAULT_TEMP_DECK_TIMEOUT)
+            self._port = port
+        except (SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
+    def _register_lock(self, port):
+        if temp_locks.get(port):
+            self._lock = temp_locks[port][0]
+        else:
+            self._lock = Lock()
+            temp_locks[port] = (self._lock, self)
+
     def disconnect(self, port=None):
         if self._port and self.is_connected():
-            self._connection.close()  # type: ignore
+            self._close_connection()
             del temp_locks[self._port]
         elif self.is_connected():
-            self._connection.close()  # type: ignore
+            self._close_connection()
 
         self._connection = None
+        self._transport = None
+
+    def _close_connection(self):
+        if self._transport:
+            self._transport.close()
+        else:
+            self._connection.close()  # type: ignore
 
     def is_connected(self) -> bool:
+        if self._transport:
+            return self._transport.is_open()
         if not self._connection:
             return False
         return self._connection.is_open
 
     @property
     def port(self) -> Optional[str]:
+        if self._transport:
+            return self._transport.port
         if not self._connection:
             return None
         return self._connection.port
@@ -169,12 +226,19 @@ class TempDeck:
             return str(e)
         return ''
 
+    async def deactivate_async(self) -> str:
+        try:
+            await self._send_command_async(GCODES['DISENGAGE'])
+        except (TempDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
     async def set_temperature(self, celsius) -> str:
         self.run_flag.wait()
         celsius = round(float(celsius),
                         utils.TEMPDECK_GCODE_ROUNDING_PRECISION)
         try:
-            self._send_command(
+            await self._send_command_async(
                 '{0} S{1}'.format(GCODES['SET_TEMP'], celsius))
         except (TempDeckError, SerialException, SerialNoResponse) as e:
             return str(e)
@@ -192,6 +256,14 @@ class TempDeck:
         self._temperature.update({'target': celsius})
         return ''
 
+    async def start_set_temperature_async(self, celsius) -> str:
+        celsius = round(float(celsius),
+                        utils.TEMPDECK_GCODE_ROUNDING_PRECISION)
+        await self._send_command_async(
+            '{0} S{1}'.format(GCODES['SET_TEMP'], celsius))
+        self._temperature.update({'target': celsius})
+        return ''
+
     # NOTE: only present to support apiV1 non-blocking by default behavior
     def legacy_set_temperature(self, celsius) -> str:
         self.run_flag.wait()
@@ -221,8 +293,27 @@ class TempDeck:
                 return str(e)
         return ''
 
+    async def update_temperature_async(self) -> str:
+        """ Query the current and target temperatures of the Temp-Deck """
+        try:
+            for retry in range(DEFAULT_COMMAND_RETRIES, 0, -1):
+                response: str = await self._send_command_async(
+                    GCODES['GET_TEMP'])
+                try:
+                    temperature = utils.parse_temperature_response(
+                        response, utils.TEMPDECK_GCODE_ROUNDING_PRECISION)
+                    self._temperature.update(temperature)
+                    break
+                except utils.ParseError as e:
+                    if retry <= 1:
+                        raise TempDeckError(e)
+                await asyncio.sleep(DEFAULT_STABILIZE_DELAY)
+        except (TempDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        return ''
+
     @property
-    def target(self) -> Optional[int]:
+    def target(self) -> Optional[float]:
         return self._temperature.get('target')
 
     @property
@@ -268,6 +359,19 @@ class TempDeck:
         '''
         return self._get_info(DEFAULT_COMMAND_RETRIES)
 
+    async def get_device_info_async(self) -> Mapping[str, str]:
+        last_e: Any = None
+        for _ in range(DEFAULT_COMMAND_RETRIES):
+            try:
+                device_info = await self._send_command_async(
+                    GCODES['DEVICE_INFO'])
+                return utils.parse_device_information(device_info)
+            except utils.ParseError as e:
+                log.exception("tempdeck device information parse failure")
+                last_e = e
+                await asyncio.sleep(DEFAULT_STABILIZE_DELAY)
+        raise last_e
+
     def pause(self):
         self.run_flag.clear()
 
@@ -283,6 +387,15 @@ class TempDeck:
             del temp_locks[self._port]
         return ''
 
+    async def enter_programming_mode_async(self) -> str:
+        try:
+            await self._send_command_async(GCODES['PROGRAMMING_MODE'])
+        except (TempDeckError, SerialException, SerialNoResponse) as e:
+            return str(e)
+        if self._port:
+            del temp_locks[self._port]
+        return ''
+
     def _connect_to_port(self, port=None):
         try:
             temp_deck = environ.get('OT_TEMP_DECK_ID', None)
@@ -299,6 +412,23 @@ class TempDeck:
             error_msg += 'the Serial port is disabled on this device (OS)'
             raise SerialException(error_msg)
 
+    async def _open_transport(self, port=None):
+        try:
+            self._transport = await AsyncSerial.open(
+                port=port,
+                baudrate=TEMP_DECK_BAUDRATE,
+                ack=TEMP_DECK_ACK,
+                device_name=environ.get('OT_TEMP_DECK_ID', None),
+                tag=f'tempdeck {id(self)}')
+        except SerialException:
+            raise SerialException(
+                'Unable to access Serial port to Temp-Deck. This is because '
+                'another process is currently using it, or the Serial port is '
+                'disabled on this device (OS)')
+        except IndexError:
+            # There are no ot_module_tempdeck* devices in /dev
+            raise SerialException('No port specified')
+
     def _wait_for_ack(self):
         '''
         This methods writes a sequence of newline characters, which will
@@ -312,19 +442,35 @@ class TempDeck:
         """
 
         """
+        if self._transport:
+            return self._transport.run_threadsafe(
+                self._send_command_async(command, timeout))
         assert self._lock, 'not connected'
         with self._lock:
             command_line = command + ' ' + TEMP_DECK_COMMAND_TERMINATOR
             ret_code = self._recursive_write_and_return(
                 command_line, timeout, DEFAULT_COMMAND_RETRIES)
-
-            # Smoothieware returns error state if a switch was hit while moving
-            if (ERROR_KEYWORD in ret_code.lower()) or \
-                    (ALARM_KEYWORD in ret_code.lower()):
-                log.error(f'Received error message from Temp-Deck: {ret_code}')
-                raise TempDeckError(ret_code)
-
-            return ret_code.strip()
+            return self._check_response(ret_code)
+
+    async def _send_command_async(
+            self, command, timeout=DEFAULT_TEMP_DECK_TIMEOUT):
+        if not self._transport:
+            # Connected with connect(): the port can only be used blocking
+            return await asyncio.get_event_loop().run_in_executor(
+                None, functools.partial(self._send_command, command, timeout))
+        ret_code = await self._transport.write_and_return(
+            command + ' ' + TEMP_DECK_COMMAND_TERMINATOR, timeout,
+            DEFAULT_COMMAND_RETRIES)
+        return self._check_response(ret_code)
+
+    @staticmethod
+    def _check_response(ret_code: str) -> str:
+        # Smoothieware returns error state if a switch was hit while moving
+        if (ERROR_KEYWORD in ret_code.lower()) or \
+                (ALARM_KEYWORD in ret_code.lower()):
+            log.error(f'Received error message from Temp-Deck: {ret_code}')
+            raise TempDeckError(ret_code)
+        return ret_code.strip()
 
     def _recursive_write_and_return(self, cmd, timeout, retries, tag=None):
         if not tag:
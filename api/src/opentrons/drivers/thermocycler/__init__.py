@@ -1,6 +1,7 @@
-from .driver import Thermocycler, SimulatingDriver
+from .driver import Thermocycler, SimulatingDriver, ProfileStep
 
 __all__ = [
     'Thermocycler',
-    'SimulatingDriver'
+    'SimulatingDriver',
+    'ProfileStep',
 ]
@@ -1,26 +1,14 @@
 import asyncio
 import logging
 import os
-import threading
 import serial  # type: ignore
-from queue import Queue
-try:
-    import select
-except ModuleNotFoundError:
-    select = None  # type: ignore
-from time import sleep
-from typing import Callable, Optional, Mapping, Tuple, TYPE_CHECKING
+from typing import (
+    Awaitable, Callable, List, Mapping, NamedTuple, Optional, Sequence)
 from serial.serialutil import SerialException  # type: ignore
-from opentrons.drivers import serial_communication, utils
+from opentrons.drivers import utils
+from opentrons.drivers.async_serial import AsyncSerial
 from opentrons.drivers.serial_communication import SerialNoResponse
 
-if TYPE_CHECKING:
-    # avoid an issue where Queue doesn't support generics at runtime
-    CommandQueue = Queue[Tuple[str, Callable[[str], None]]]
-else:
-    CommandQueue = Queue
-
-
 log = logging.getLogger(__name__)
 
 GCODES = {
@@ -61,6 +49,37 @@ def _build_temp_code(temp: float,
     return cmd, temp
 
 
+class ProfileStep(NamedTuple):
+    #: The block temperature of the step, in degrees C
+    temperature: float
+    #: How long to hold the temperature, in s. If 0, the step is over as
+    #: soon as the temperature is reached.
+    hold_time: float
+    #: How fast to reach the temperature, in degrees C/s, or None for the
+    #: fastest rate
+    ramp_rate: Optional[float]
+
+
+def _compile_profile(profile: Sequence[ProfileStep],
+                     volume: Optional[float]) -> List[List[str]]:
+    """ Build the commands that start each step of a profile """
+    compiled = []
+    for step in profile:
+        commands = []
+        if step.ramp_rate:
+            commands.append(f"{GCODES['SET_RAMP_RATE']} S{step.ramp_rate}")
+        temp_cmd, _ = _build_temp_code(temp=step.temperature,
+                                       hold_time=step.hold_time,
+                                       volume=volume)
+        commands.append(temp_cmd)
+        compiled.append(commands)
+    return compiled
+
+
+#: Awaited before each step of a profile is started
+BeforeStep = Callable[[], Awaitable[None]]
+
+
 TC_BAUDRATE = 115200
 TC_BOOTLOADER_BAUDRATE = 1200
 # TODO (Laura 20190327) increased the thermocycler command timeout
@@ -81,6 +100,14 @@ class ThermocyclerError(Exception):
     pass
 
 
+def _check_response(ret_code: str) -> str:
+    if ERROR_KEYWORD in ret_code.lower():
+        log.error('Received error message from Thermocycler: {}'.format(
+            ret_code))
+        raise ThermocyclerError(ret_code)
+    return ret_code.strip()
+
+
 class SimulatingDriver:
     def __init__(self, sim_model: str = None):
         self._target_temp: Optional[float] = None
@@ -91,6 +118,7 @@ class SimulatingDriver:
         self._lid_status = 'open'
         self._lid_target: Optional[float] = None
         self._lid_heating_active = False
+        self._profile_step_index: Optional[int] = None
 
     async def open(self):
         self._lid_status = 'open'
@@ -137,9 +165,16 @@ class SimulatingDriver:
     def lid_temp(self):
         return self._lid_target
 
+    @property
+    def profile_step_index(self) -> Optional[int]:
+        return self._profile_step_index
+
     async def connect(self, port):
         self._port = port
 
+    def set_polling_interval(self, interval: float):
+        pass
+
     def disconnect(self):
         self._port = None
 
@@ -153,6 +188,17 @@ class SimulatingDriver:
         self._ramp_rate = ramp_rate
         self._active = True
 
+    async def execute_profile(self,
+                              profile: Sequence[ProfileStep],
+                              volume: float = None,
+                              before_step: BeforeStep = None) -> None:
+        for index, step in enumerate(profile):
+            self._profile_step_index = index
+            if before_step:
+                await before_step()
+            await self.set_temperature(step.temperature, step.hold_time,
+                                       step.ramp_rate, volume)
+
     async def set_lid_temperature(self, temp: Optional[float]):
         """ Set the lid temperature in deg Celsius """
         self._lid_heating_active = True
@@ -185,162 +231,140 @@ class SimulatingDriver:
         pass
 
 
-class TCPoller(threading.Thread):
-    def __init__(self, port, interrupt_callback, temp_status_callback,
-                 lid_status_callback, lid_temp_status_callback):
-        if not select:
-            raise RuntimeError("Cannot connect to a Thermocycler from Windows")
-        self._port = port
-        self._connection = self._connect_to_port()
-        self._interrupt_callback = interrupt_callback
+class TCPoller:
+    """ Polls the status of a thermocycler from an event loop.
+
+    Commands are sent through the :py:class:`.AsyncSerial` connection to the
+    thermocycler, which the poller shares. Every second, the plate
+    temperature, lid status and lid temperature are queried in a batch and
+    passed to their callbacks, after which the status callback is called
+    and the futures returned by :py:meth:`next_status` are resolved. Lines
+    the thermocycler sends on its own (the lid-open interrupt) are passed to
+    the interrupt callback.
+    """
+
+    def __init__(self, transport: AsyncSerial,
+                 temp_status_callback, lid_status_callback,
+                 lid_temp_status_callback,
+                 status_callback: Callable[[], None] = None):
+        self._transport = transport
         self._temp_status_callback = temp_status_callback
         self._lid_status_callback = lid_status_callback
         self._lid_temp_status_callback = lid_temp_status_callback
-        self._lock = threading.Lock()
-        self._command_queue: CommandQueue = Queue()
-
-        # Note: the options and order of operations for opening file
-        # descriptors is very specific. For more info, see:
-        # http://pubs.opengroup.org/onlinepubs/007908799/xsh/open.html
-        self._send_path = '/var/run/tc_send_fifo_{}'.format(hash(self))
-        os.mkfifo(self._send_path)
-        send_read_fd = os.open(
-            self._send_path, flags=os.O_RDONLY | os.O_NONBLOCK)
-        self._send_read_file = os.fdopen(send_read_fd, 'rb')
-        self._send_write_fd = open(self._send_path, 'wb', buffering=0)
-
-        self._halt_path = '/var/run/tc_halt_fifo_{}'.format(hash(self))
-        os.mkfifo(self._halt_path)
-        halt_read_fd = os.open(
-            self._halt_path, flags=os.O_RDONLY | os.O_NONBLOCK)
-        self._halt_read_file = os.fdopen(halt_read_fd, 'rb')
-        self._halt_write_fd = open(self._halt_path, 'wb', buffering=0)
-
-        self._poller = select.poll()
-        self._poller.register(self._send_read_file, select.POLLIN)
-        self._poller.register(self._halt_read_file, select.POLLIN)
-        self._poller.register(self._connection, select.POLLIN)
-
-        serial_thread_name = 'tc_serial_poller_{}'.format(hash(self))
-        super().__init__(target=self._serial_poller, name=serial_thread_name)
-        log.info("Starting TC thread {}".format(serial_thread_name))
-        super().start()
+        self._status_callback = status_callback
+        self._interval = POLLING_FREQUENCY_MS / 1000
+        self._wake = asyncio.Event(loop=transport.loop)
+        self._status_waiters: List['asyncio.Future[None]'] = []
+        self._task = transport.loop.create_task(self._serial_poller())
+
+    @classmethod
+    async def build(cls, port, interrupt_callback, temp_status_callback,
+                    lid_status_callback, lid_temp_status_callback,
+                    status_callback: Callable[[], None] = None,
+                    loop: asyncio.AbstractEventLoop = None) -> 'TCPoller':
+        if os.name == 'nt':
+            raise RuntimeError("Cannot connect to a Thermocycler from Windows")
+        try:
+            transport = await AsyncSerial.open(
+                port=port, baudrate=TC_BAUDRATE, ack=TC_ACK, loop=loop,
+                unsolicited_callback=interrupt_callback,
+                tag=f'thermocycler {port}')
+        except SerialException:
+            raise SerialException(
+                "Thermocycler device not found on {}".format(port))
+        log.info(f"Starting TC poller on {port}")
+        return cls(transport, temp_status_callback, lid_status_callback,
+                   lid_temp_status_callback, status_callback)
 
     @property
     def port(self):
-        return self._port
-
-    def _serial_poller(self):
-        """ Priority-sorted list of checks
-
-        Highest priority is the 'halt' channel, which is used to kill the
-        thread and the serial communication channel and allow everything to be
-        cleaned up.
-
-        Second is the lid-open interrupt, which should trigger a callback
-        (typically to halt the robot).
+        return self._transport.port
 
-        Third is an enqueued command to send to the Thermocycler.
-
-        Fourth (if no other work is available) is to query the Thermocycler for
-        its current temp, target temp, and time remaining in its current cycle.
+    async def _serial_poller(self):
+        """ Query the Thermocycler for its current temp, target temp, time
+        remaining in its current cycle, lid status and lid temperature
         """
         while True:
-            _next = dict(self._poller.poll(POLLING_FREQUENCY_MS))
-            if self._halt_read_file.fileno() in _next:
-                log.debug("Poller [{}]: halt".format(hash(self)))
-                self._halt_read_file.read()
-                # Note: this is discarded because we send a set message to halt
-                # the thread--don't currently need to parse it
-                break
-
-            elif self._connection.fileno() in _next:
-                # Lid-open interrupt
-                log.debug("Poller [{}]: interrupt".format(hash(self)))
-                res = self._connection.read_until(SERIAL_ACK)
-                self._interrupt_callback(res)
-
-            elif self._send_read_file.fileno() in _next:
-                self._send_read_file.read(1)
-                command, callback = self._command_queue.get()
-                log.debug("Poller [{}]: send {}".format(hash(self), command))
-                res = self._send_command(command)
-                callback(res)
+            self._wake.clear()
+            log.debug("Poller [{}]: updating temp".format(hash(self)))
+            # Only the waiters registered before the query was sent get the
+            # status it returns
+            waiters, self._status_waiters = self._status_waiters, []
+            try:
+                plate, lid, lid_temp = await self.send_batch(
+                    [GCODES['GET_PLATE_TEMP'],
+                     GCODES['GET_LID_STATUS'],
+                     GCODES['GET_LID_TEMP']])
+            except (ThermocyclerError, SerialException,
+                    SerialNoResponse) as e:
+                log.warning(f"Poller [{hash(self)}]: status update failed: "
+                            f"{e}")
+                self._status_waiters.extend(waiters)
             else:
-                # Nothing else to do--update device status
-                log.debug("Poller [{}]: updating temp".format(hash(self)))
-                res = self._send_command(GCODES['GET_PLATE_TEMP'])
-                self._temp_status_callback(res)
-                res = self._send_command(GCODES['GET_LID_STATUS'])
-                self._lid_status_callback(res)
-                res = self._send_command(GCODES['GET_LID_TEMP'])
-                self._lid_temp_status_callback(res)
-        log.info("Exiting TC poller loop [{}]".format(hash(self)))
-
-    def _wait_for_ack(self):
-        """
-        This method writes a sequence of newline characters, which will
-        guarantee the device responds with 'ok\r\nok\r\n' within 1 second
-        """
-        self._send_command(SERIAL_ACK, timeout=DEFAULT_TC_TIMEOUT)
-
-    def _send_command(self, command, timeout=DEFAULT_TC_TIMEOUT):
-        command_line = command + ' ' + TC_COMMAND_TERMINATOR
-        ret_code = self._recursive_write_and_return(
-            command_line, timeout, DEFAULT_COMMAND_RETRIES)
-        if ERROR_KEYWORD in ret_code.lower():
-            log.error('Received error message from Thermocycler: {}'.format(
-                ret_code))
-            raise ThermocyclerError(ret_code)
-        return ret_code.strip()
-
-    def _recursive_write_and_return(self, cmd, timeout, retries):
-        try:
-            return serial_communication.write_and_return(
-                cmd, TC_ACK, self._connection, timeout,
-                tag=f'thermocycler {id(self)}')
-        except SerialNoResponse as e:
-            retries -= 1
-            if retries <= 0:
-                raise e
-            sleep(DEFAULT_STABILIZE_DELAY)
-            if self._connection:
-                self._connection.close()
-                self._connection.open()
-            return self._recursive_write_and_return(
-                cmd, timeout, retries)
-
-    def _connect_to_port(self):
-        try:
-            return serial_communication.connect(port=self._port,
-                                                baudrate=TC_BAUDRATE)
-        except SerialException:
-            raise SerialException(
-                "Thermocycler device not found on {}".format(self._port))
-
-    def send(self, command, callback):
-        with self._lock:
-            self._command_queue.put((command, callback))
-            self._send_write_fd.write(b'c')
+                self._temp_status_callback(plate)
+                self._lid_status_callback(lid)
+                self._lid_temp_status_callback(lid_temp)
+                if self._status_callback:
+                    self._status_callback()
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def set_interval(self, interval: float):
+        """ Change how long to wait between status queries. If it is shorter
+        than before, query the status right away. """
+        if interval < self._interval:
+            self._wake.set()
+        self._interval = interval
+
+    def wake(self):
+        """ Query the status right away """
+        self._wake.set()
+
+    def next_status(self) -> 'asyncio.Future[None]':
+        """ A future resolved when the callbacks were called with a status
+        queried after this call, and so after every command whose response
+        was already received. """
+        waiter = self._transport.loop.create_future()
+        self._status_waiters.append(waiter)
+        return waiter
+
+    async def send_command(self, command, timeout=DEFAULT_TC_TIMEOUT):
+        ret_code = await self._transport.write_and_return(
+            command + ' ' + TC_COMMAND_TERMINATOR, timeout,
+            DEFAULT_COMMAND_RETRIES)
+        return _check_response(ret_code)
+
+    async def send_batch(self, commands, timeout=DEFAULT_TC_TIMEOUT):
+        """ Send several commands in a row and return their responses """
+        ret_codes = await self._transport.write_and_return_batch(
+            [command + ' ' + TC_COMMAND_TERMINATOR for command in commands],
+            timeout, DEFAULT_COMMAND_RETRIES)
+        return [_check_response(ret_code) for ret_code in ret_codes]
+
+    def is_alive(self) -> bool:
+        return not self._task.done() and self._transport.is_open()
 
     def close(self):
-        self._halt_write_fd.write(b'q')
-
-    def __del__(self):
-        """ Clean up thread fifos"""
-        try:
-            os.unlink(self._send_path)
-        except NameError:
-            pass
-        try:
-            os.unlink(self._halt_path)
-        except NameError:
-            pass
+        log.info("Stopping TC poller [{}]".format(hash(self)))
+        self._task.cancel()
+        self._transport.close()
+        for waiter in self._status_waiters:
+            if not waiter.done():
+                waiter.set_exception(
+                    SerialException('Thermocycler poller stopped'))
+        self._status_waiters.clear()
 
 
 class Thermocycler:
-    def __init__(self, interrupt_callback):
+    def __init__(self, interrupt_callback, status_callback=None):
         self._poller = None
+        self._status_cb = status_callback
+        self._polling_interval = POLLING_FREQUENCY_MS / 1000
         self._update_thread = None
         self._current_temp = None
         self._target_temp = None
@@ -350,14 +374,17 @@ class Thermocycler:
         self._interrupt_cb = interrupt_callback
         self._lid_target = None
         self._lid_temp = None
+        self._profile_step_index = None
 
     async def connect(self, port: str) -> 'Thermocycler':
         self.disconnect()
-        self._poller = TCPoller(
+        self._poller = await TCPoller.build(
             port, self._interrupt_callback,
             self._temp_status_update_callback,
             self._lid_status_update_callback,
-            self._lid_temp_status_callback)
+            self._lid_temp_status_callback,
+            self._status_cb)
+        self._poller.set_interval(self._polling_interval)
 
         # Check initial device lid state
         _lid_status_res = await self._write_and_wait(GCODES['GET_LID_STATUS'])
@@ -367,9 +394,8 @@ class Thermocycler:
         return self
 
     def disconnect(self) -> 'Thermocycler':
-        if self.is_connected():
-            self._poller.close()  # type: ignore
-            self._poller.join()  # type: ignore
+        if self._poller:
+            self._poller.close()
         self._poller = None
         return self
 
@@ -410,6 +436,8 @@ class Thermocycler:
                                           hold_time=hold_time,
                                           volume=volume)
         await self._write_and_wait(temp_cmd)
+        if self._poller:
+            self._poller.wake()
         retries = 0
         while (self._target_temp != temp) or (self._hold_time != hold_time):
             await asyncio.sleep(0.1)    # Wait for the poller to update
@@ -417,6 +445,41 @@ class Thermocycler:
             if retries > TEMP_UPDATE_RETRIES:
                 break
 
+    async def execute_profile(self,
+                              profile: Sequence[ProfileStep],
+                              volume: float = None,
+                              before_step: BeforeStep = None) -> None:
+        """ Run the steps of a thermal profile one after the other.
+
+        The whole profile is compiled to commands before it starts. The
+        commands of each step are sent in one batch as soon as a status
+        update shows that the previous step is over, so the poller paces the
+        profile rather than the caller awaiting each step.
+        :py:attr:`profile_step_index` is the index of the running step.
+
+        :param before_step: Awaited before each step is started, for instance
+                            to hold the profile while a protocol is paused
+        """
+        assert self._poller, 'not connected'
+        compiled = _compile_profile(profile, volume)
+        for index, commands in enumerate(compiled):
+            self._profile_step_index = index
+            if before_step:
+                await before_step()
+            await self._poller.send_batch(commands)
+            self._poller.wake()
+            while True:
+                await self._poller.next_status()
+                if self._step_over(profile[index].hold_time):
+                    break
+
+    def _step_over(self, hold_time: float) -> bool:
+        # Only called with a status queried after the step was started, so
+        # that the status of the previous step cannot be mistaken for it
+        if hold_time:
+            return self._hold_time == 0
+        return self.status == 'holding at target'
+
     async def set_lid_temperature(self, temp: float) -> None:
         if temp is None:
             self._lid_target = LID_TARGET_DEFAULT
@@ -432,6 +495,13 @@ class Thermocycler:
                                        self._lid_target)
         await self._write_and_wait(lid_temp_cmd)
 
+    def set_polling_interval(self, interval: float):
+        """ Change how long to wait between queries of the status, in
+        seconds """
+        self._polling_interval = interval
+        if self._poller:
+            self._poller.set_interval(interval)
+
     def _lid_status_update_callback(self, lid_response):
         if lid_response:
             self._lid_status = utils.parse_string_value_from_substring(
@@ -489,6 +559,12 @@ class Thermocycler:
     def ramp_rate(self):
         return self._ramp_rate
 
+    @property
+    def profile_step_index(self) -> Optional[int]:
+        """ The index of the running (or last run) step of the profile
+        started with :py:meth:`execute_profile` """
+        return self._profile_step_index
+
     @property
     def lid_temp_status(self):
         if self.lid_temp is None:
@@ -551,19 +627,8 @@ class Thermocycler:
             raise ThermocyclerError("Thermocycler did not return device info")
 
     async def _write_and_wait(self, command):
-        ret = None
-
-        def cb(cmd):
-            nonlocal ret
-            ret = cmd
-
         assert self._poller, 'not connected'
-        self._poller.send(command, cb)
-
-        while None is ret:
-            await asyncio.sleep(0.05)
-            pass
-        return ret
+        return await self._poller.send_command(command)
 
     async def enter_programming_mode(self):
         trigger_connection = serial.Serial(
@@ -2,7 +2,9 @@
 """
 import asyncio
 import functools
-from typing import TYPE_CHECKING
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, NamedTuple,
+    Sequence, Tuple)
 
 from .types import HardwareAPILike
 
@@ -10,6 +12,30 @@ if TYPE_CHECKING:
     from .dev_types import HasLoop # noqa (F501)
 
 
+class HardwareCall(NamedTuple):
+    #: The name of the method to call
+    name: str
+    #: Its positional arguments
+    args: Sequence[Any] = ()
+    #: Its keyword arguments
+    kwargs: Mapping[str, Any] = {}
+
+
+async def call_batch(obj: Any, calls: Iterable[HardwareCall]) -> List[Any]:
+    """ Call methods of `obj` one after the other, awaiting those that are
+    coroutines, and return their results.
+
+    If a call raises, the calls after it are not made.
+    """
+    results = []
+    for call in calls:
+        result = getattr(obj, call.name)(*call.args, **call.kwargs)
+        if asyncio.iscoroutine(result):
+            result = await result
+        results.append(result)
+    return results
+
+
 # TODO: BC 2020-02-25 instead of overwriting __get_attribute__ in this class
 # use inspect.getmembers to iterate over appropriate members of adapted
 # instance and setattr on the outer instance with the proper async resolution
@@ -46,6 +72,11 @@ class SynchronousAdapter(HardwareAPILike):
         :param asynchronous_instance: The asynchronous class instance to wrap
         """
         self._obj_to_adapt = asynchronous_instance
+        # The synchronous versions of coroutine functions, by name, along
+        # with the function each was built for. A bound method compares
+        # equal to the one it was built for until the method is replaced on
+        # the instance or its class.
+        self._sync_methods: Dict[str, Tuple[Any, Callable]] = {}
 
     def __repr__(self):
         return '<SynchronousAdapter>'
@@ -55,6 +86,13 @@ class SynchronousAdapter(HardwareAPILike):
         fut = asyncio.run_coroutine_threadsafe(to_call(*args, **kwargs), loop)
         return fut.result()
 
+    def call_batch(self, calls: Iterable[HardwareCall]) -> List[Any]:
+        """ Make several calls to the adapted object in its event loop,
+        waiting for them only once (see :py:func:`call_batch`) """
+        obj_to_adapt = object.__getattribute__(self, '_obj_to_adapt')
+        return object.__getattribute__(self, 'call_coroutine_sync')(
+            obj_to_adapt._loop, call_batch, obj_to_adapt, list(calls))
+
     def __getattribute__(self, attr_name):
         """ Retrieve attributes from our API and wrap coroutines """
         # Almost every attribute retrieved from us will be for people actually
@@ -66,6 +104,11 @@ class SynchronousAdapter(HardwareAPILike):
             # Maybe this actually was for us? Let’s find it
             return object.__getattribute__(self, attr_name)
 
+        sync_methods = object.__getattribute__(self, '_sync_methods')
+        cached = sync_methods.get(attr_name)
+        if cached and cached[0] == inner_attr:
+            return cached[1]
+
         check = inner_attr
         if isinstance(inner_attr, functools.partial):
             # if partial func check passed in func
@@ -77,9 +120,11 @@ class SynchronousAdapter(HardwareAPILike):
             pass
         if asyncio.iscoroutinefunction(check):
             # Return a synchronized version of the coroutine
-            return functools.partial(
+            sync_method = functools.partial(
                     object.__getattribute__(self, 'call_coroutine_sync'),
                     obj_to_adapt._loop, inner_attr)
+            sync_methods[attr_name] = (inner_attr, sync_method)
+            return sync_method
         elif asyncio.iscoroutine(check):
             # Catch awaitable properties and reify the future before returning
             fut = asyncio.run_coroutine_threadsafe(check, obj_to_adapt._loop)
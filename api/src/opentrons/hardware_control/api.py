@@ -3,16 +3,17 @@ import contextlib
 import logging
 import pathlib
 from collections import OrderedDict
-from typing import Dict, Union, List, Optional, Tuple
+from typing import Dict, Union, List, Optional, Sequence, Tuple
 from opentrons import types as top_types
 from opentrons.util import linal
 from opentrons.config import robot_configs, pipette_config
 from opentrons.drivers.types import MoveSplit
 
-from .util import use_or_initialize_loop
+from .util import use_or_initialize_loop, merge_waypoints
 from .pipette import Pipette
 from .controller import Controller
 from .simulator import Simulator
+from .simulator_clock import SimulatorClock
 from .constants import (SHAKE_OFF_TIPS_SPEED, SHAKE_OFF_TIPS_DROP_DISTANCE,
                         SHAKE_OFF_TIPS_PICKUP_DISTANCE,
                         DROP_TIP_RELEASE_DISTANCE)
@@ -158,11 +159,15 @@ class API(HardwareAPILike):
             attached_modules: List[str] = None,
             config: robot_configs.robot_config = None,
             loop: asyncio.AbstractEventLoop = None,
-            strict_attached_instruments: bool = True) -> 'API':
+            strict_attached_instruments: bool = True,
+            clock: SimulatorClock = None) -> 'API':
         """ Build a simulating hardware controller.
 
         This method may be used both on a real robot and on dev machines.
         Multiple simulating hardware controllers may be active at one time.
+
+        If `clock` is specified, the simulator charges it with the time each
+        action would take on a robot (see :py:mod:`.simulator_clock`).
         """
 
         if None is attached_instruments:
@@ -174,7 +179,8 @@ class API(HardwareAPILike):
         backend = Simulator(attached_instruments,
                             attached_modules,
                             config, checked_loop,
-                            strict_attached_instruments)
+                            strict_attached_instruments,
+                            clock=clock)
         await backend.setup_gpio_chardev()
         api_instance = cls(backend, loop=checked_loop, config=config)
         await backend.watch_modules(
@@ -199,6 +205,15 @@ class API(HardwareAPILike):
         """ `True` if this is a simulator; `False` otherwise. """
         return isinstance(self._backend, Simulator)
 
+    @property
+    def simulator_clock(self) -> Optional[SimulatorClock]:
+        """ The clock a simulator charges with the time its actions would
+        take, if any.
+        """
+        if isinstance(self._backend, Simulator):
+            return self._backend.clock
+        return None
+
     async def register_callback(self, cb):
         """ Allows the caller to register a callback, and returns a closure
         that can be used to unregister the provided callback
@@ -272,7 +287,9 @@ class API(HardwareAPILike):
         """
         await self._wait_for_is_running()
         self.pause()
-        if not self.is_simulator:
+        if isinstance(self._backend, Simulator):
+            self._backend.delay(duration_s)
+        else:
             async def sleep_for_seconds(seconds: int):
                 await asyncio.sleep(seconds)
             delay_task = self._loop.create_task(sleep_for_seconds(duration_s))
@@ -758,6 +775,67 @@ class API(HardwareAPILike):
             await self.home()
 
         await self._cache_and_maybe_retract_mount(mount)
+        target_position = self._mount_target(
+            mount, abs_position, critical_point)
+        await self._move(target_position, speed=speed, max_speeds=max_speeds)
+
+    async def move_through(
+            self, mount: top_types.Mount,
+            waypoints: Sequence[
+                Tuple[top_types.Point, Optional[CriticalPoint]]],
+            speed: float = None,
+            max_speeds: Dict[Axis, float] = None):
+        """ Move the critical point of the specified mount through a series
+        of locations relative to the deck, as a single block of motion.
+
+        This is how to follow a path like the arcs of :py:func:`.plan_arc`.
+        Each waypoint is a location and the critical point to move there, as
+        for :py:meth:`move_to`. Unlike a call to :py:meth:`move_to` for each
+        waypoint, the gantry does not stop at every waypoint: those that the
+        path goes straight through are merged into the move along it (see
+        :py:func:`.merge_waypoints`), and the remaining moves are streamed to
+        the motion controller back to back.
+
+        The block starts once the robot is running, like a single move.
+        Pausing during the block takes effect after the moves that were
+        already sent to the motion controller, and halting stops it at once.
+
+        :param mount: The mount to move
+        :param waypoints: The locations and critical points to move through,
+                          in order
+        :param speed: An overall head speed to use during the moves
+        :param max_speeds: An optional override for per-axis maximum speeds,
+                           as for :py:meth:`move_to`
+        """
+        if not waypoints:
+            return
+        if not self._current_position:
+            await self.home()
+
+        await self._cache_and_maybe_retract_mount(mount)
+        targets = [self._mount_target(mount, point, cp)
+                   for point, cp in waypoints]
+        z_axis = Axis.by_mount(mount)
+        start = top_types.Point(*(self._current_position[ax]
+                                  for ax in (Axis.X, Axis.Y, z_axis)))
+        kept = merge_waypoints(
+            start, [top_types.Point(*target.values()) for target in targets])
+        block = [targets[index] for index in kept]
+
+        await self._wait_for_is_running()
+        moves = [(target, self._smoothie_target(target)) for target in block]
+        async with self._motion_lock:
+            with self._backend.streaming_moves(len(moves)):
+                for target, smoothie_pos in moves:
+                    self._backend_move(target, smoothie_pos, speed=speed,
+                                       max_speeds=max_speeds)
+
+    def _mount_target(
+            self, mount: top_types.Mount, abs_position: top_types.Point,
+            critical_point: Optional[CriticalPoint]
+    ) -> 'OrderedDict[Axis, float]':
+        """ The position of the gantry axes that puts the critical point of
+        a mount at a location relative to the deck """
         z_axis = Axis.by_mount(mount)
         if mount == top_types.Mount.LEFT:
             offset = top_types.Point(*self._config.mount_offset)
@@ -765,14 +843,12 @@ class API(HardwareAPILike):
             offset = top_types.Point(0, 0, 0)
         cp = self._critical_point_for(mount, critical_point)
 
-        target_position = OrderedDict(
+        return OrderedDict(
             ((Axis.X, abs_position.x - offset.x - cp.x),
              (Axis.Y, abs_position.y - offset.y - cp.y),
              (z_axis, abs_position.z - offset.z - cp.z))
         )
 
-        await self._move(target_position, speed=speed, max_speeds=max_speeds)
-
     async def move_rel(self, mount: top_types.Mount, delta: top_types.Point,
                        speed: float = None,
                        max_speeds: Dict[Axis, float] = None):
@@ -842,6 +918,19 @@ class API(HardwareAPILike):
         is identified by the presence of (ZA) or (BC).
         """
         await self._wait_for_is_running()
+        smoothie_pos = self._smoothie_target(target_position)
+        async with contextlib.AsyncExitStack() as stack:
+            if acquire_lock:
+                await stack.enter_async_context(self._motion_lock)
+            self._backend_move(target_position, smoothie_pos, speed=speed,
+                               home_flagged_axes=home_flagged_axes,
+                               max_speeds=max_speeds)
+
+    def _smoothie_target(self, target_position: 'OrderedDict[Axis, float]'
+                         ) -> Dict[str, float]:
+        """ Transform the deck calibrated target of a move (see
+        :py:meth:`_move`) into the position to send to the backend, warning
+        about axes out of bounds """
         # Transform only the x, y, and (z or a) axes specified since this could
         # get the b or c axes as well
         to_transform = tuple((tp
@@ -892,21 +981,24 @@ class API(HardwareAPILike):
                                 smoothie_pos[ax.name],
                                 deck_mins[ax], deck_max[ax],
                                 bounds[ax.name][0], bounds[ax.name][1]))
+        return smoothie_pos
+
+    def _backend_move(self, target_position: 'OrderedDict[Axis, float]',
+                      smoothie_pos: Dict[str, float],
+                      speed: float = None, home_flagged_axes: bool = True,
+                      max_speeds: Dict[Axis, float] = None):
         checked_maxes = max_speeds or {}
         str_maxes = {ax.name: val for ax, val in checked_maxes.items()}
-        async with contextlib.AsyncExitStack() as stack:
-            if acquire_lock:
-                await stack.enter_async_context(self._motion_lock)
-            try:
-                self._backend.move(smoothie_pos, speed=speed,
-                                   home_flagged_axes=home_flagged_axes,
-                                   axis_max_speeds=str_maxes)
-            except Exception:
-                self._log.exception('Move failed')
-                self._current_position.clear()
-                raise
-            else:
-                self._current_position.update(target_position)
+        try:
+            self._backend.move(smoothie_pos, speed=speed,
+                               home_flagged_axes=home_flagged_axes,
+                               axis_max_speeds=str_maxes)
+        except Exception:
+            self._log.exception('Move failed')
+            self._current_position.clear()
+            raise
+        else:
+            self._current_position.update(target_position)
 
     def get_engaged_axes(self) -> Dict[Axis, bool]:
         """ Which axes are engaged and holding. """
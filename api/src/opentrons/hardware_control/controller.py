@@ -145,6 +145,13 @@ class Controller:
         finally:
             self._smoothie_driver.pop_active_current()
 
+    @contextmanager
+    def streaming_moves(self, count: int):
+        """ Stream the next `count` moves to the smoothie back to back,
+        waiting for them to complete at the end of the context """
+        with self._smoothie_driver.streamed(count):
+            yield
+
     async def _handle_watch_event(self, register_modules: 'RegisterModules'):
         event = await self._module_watcher.get_event()
         flags = aionotify.Flags.parse(event.flags)
@@ -94,6 +94,7 @@ class MagDeck(mod_abc.AbstractModule):
                          execution_manager=execution_manager,
                          sim_model=sim_model)
         self._device_info: Mapping[str, str] = {}
+        self._current_height = 0.0
         self._driver: Union['SimulatingDriver', 'MagDeckDriver']
         if mag_locks.get(port):
             self._driver = mag_locks[port][1]
@@ -106,7 +107,7 @@ class MagDeck(mod_abc.AbstractModule):
         Calibration involves probing for top plate to get the plate height
         """
         await self.wait_for_is_running()
-        self._driver.probe_plate()
+        await self._driver.probe_plate_async()
         # return if successful or not?
 
     async def engage(self, height: float):
@@ -118,19 +119,21 @@ class MagDeck(mod_abc.AbstractModule):
             raise ValueError(
                 f'Invalid engage height for {self.model()}: {height} mm. '
                 f'Must be 0 - {MAX_ENGAGE_HEIGHT[self.model()]} mm')
-        self._driver.move(height)
+        await self._driver.move_async(height)
+        self._current_height = await self._driver.get_mag_position_async()
 
     async def deactivate(self):
         """
         Home the magnet
         """
         await self.wait_for_is_running()
-        self._driver.home()
+        await self._driver.home_async()
         await self.engage(0.0)
 
     @property
     def current_height(self) -> float:
-        return self._driver.mag_position
+        """ The height of the magnet, as of its last move """
+        return self._current_height
 
     @property
     def device_info(self) -> Mapping[str, str]:
@@ -190,8 +193,9 @@ class MagDeck(mod_abc.AbstractModule):
         Connect to the serial port
         """
         if not self._driver.is_connected():
-            self._driver.connect(self._port)
-        self._device_info = self._driver.get_device_info()
+            await self._driver.connect_async(self._port)
+        self._device_info = await self._driver.get_device_info_async()
+        self._current_height = await self._driver.get_mag_position_async()
 
     def _disconnect(self):
         """
@@ -204,6 +208,6 @@ class MagDeck(mod_abc.AbstractModule):
         self._disconnect()
 
     async def prep_for_update(self) -> str:
-        self._driver.enter_programming_mode()
+        await self._driver.enter_programming_mode_async()
         new_port = await update.find_bootloader_port()
         return new_port or self.port
@@ -3,12 +3,15 @@ import asyncio
 import logging
 import re
 from pkg_resources import parse_version
-from typing import Mapping, Optional
+from typing import Mapping, Optional, TYPE_CHECKING
 from opentrons.config import IS_ROBOT, ROBOT_FIRMWARE_DIR
 from opentrons.hardware_control.util import use_or_initialize_loop
 from ..execution_manager import ExecutionManager
 from .types import BundledFirmware, UploadFunction, InterruptCallback, LiveData
 
+if TYPE_CHECKING:
+    from ..simulator_clock import SimulatorClock  # noqa(F501)
+
 mod_log = logging.getLogger(__name__)
 
 
@@ -79,6 +82,13 @@ class AbstractModule(abc.ABC):
     async def make_cancellable(self, task: asyncio.Task):
         self._execution_manager.register_cancellable_task(task)
 
+    def attach_clock(self, clock: 'SimulatorClock'):
+        """ Charge `clock` with the time the actions of this simulated
+        module would take on a robot. Modules whose actions take no
+        significant time ignore it.
+        """
+        pass
+
     @abc.abstractmethod
     def deactivate(self):
         """ Deactivate the module. """
@@ -0,0 +1,104 @@
+""" Waiting for conditions on the polled status of a module.
+
+Modules poll their status (temperatures, hold time, lid state) from the
+device. Rather than checking the last polled status in a sleep loop, a
+coroutine waits on a :py:class:`StatusWatch` for a condition on it; the
+condition is checked each time the module publishes a new status. The watch
+also tells the module how often to poll: often while a waiter is close to its
+condition, seldom while nobody waits and the module is idle.
+"""
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+#: Polling interval while a waiter is near its condition
+FAST_POLL_INTERVAL_SECS = 0.25
+#: Polling interval while nobody waits and the module is idle
+IDLE_POLL_INTERVAL_SECS = 5.0
+#: How close to a target temperature a waiter is near it, in degrees C
+NEAR_TARGET_DELTA = 2.0
+
+Condition = Callable[[], bool]
+
+
+def near_temperature(current: Optional[float],
+                     target: Optional[float]) -> bool:
+    """ Whether a temperature is within :py:data:`NEAR_TARGET_DELTA` of a
+    target """
+    if current is None or target is None:
+        return False
+    return abs(target - current) < NEAR_TARGET_DELTA
+
+
+class StatusWatch:
+    """ Resolves coroutines waiting for conditions on the status of a module
+    when the status is updated. """
+
+    def __init__(self,
+                 on_waiters_changed: Callable[[], None] = None) -> None:
+        """ Build the watch.
+
+        :param on_waiters_changed: A function called when a coroutine starts
+                                   or stops waiting, for instance to change
+                                   the polling interval of the module
+        """
+        self._on_waiters_changed = on_waiters_changed
+        self._waiters: List[
+            Tuple[Condition, Optional[Condition], 'asyncio.Future[None]']
+        ] = []
+
+    @property
+    def waiting(self) -> bool:
+        """ Whether any coroutine is waiting """
+        return bool(self._waiters)
+
+    def near(self) -> bool:
+        """ Whether any coroutine is waiting for a condition that is about to
+        hold """
+        return any(near and near() for _, near, _ in self._waiters)
+
+    def poll_interval(self, active: bool, interval: float) -> float:
+        """ How long to wait before polling the status again.
+
+        :param active: Whether the module is doing something (for instance
+                       holding a temperature), so that its status changes
+        :param interval: The polling interval of an active module
+        """
+        if self.near():
+            return min(interval, FAST_POLL_INTERVAL_SECS)
+        if active or self.waiting:
+            return interval
+        return max(interval, IDLE_POLL_INTERVAL_SECS)
+
+    def notify(self):
+        """ Check the conditions of the waiters, and resolve those that hold.
+        Called each time the status is updated. """
+        for condition, _, future in self._waiters:
+            if future.done():
+                continue
+            try:
+                if condition():
+                    future.set_result(None)
+            except Exception as e:
+                future.set_exception(e)
+
+    async def wait_for(self, condition: Condition, near: Condition = None):
+        """ Wait until `condition` holds after an update of the status.
+
+        :param condition: Checks the status of the module
+        :param near: Whether the condition is about to hold, in which case
+                     the status is polled more often
+        """
+        if condition():
+            return
+        waiter = (condition, near, asyncio.get_event_loop().create_future())
+        self._waiters.append(waiter)
+        self._waiters_changed()
+        try:
+            await waiter[2]
+        finally:
+            self._waiters.remove(waiter)
+            self._waiters_changed()
+
+    def _waiters_changed(self):
+        if self._on_waiters_changed:
+            self._on_waiters_changed()
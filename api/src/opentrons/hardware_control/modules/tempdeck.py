@@ -1,12 +1,15 @@
 import asyncio
 import logging
-from threading import Thread, Event
-from typing import Mapping, Union, Optional
+from typing import Callable, Mapping, Union, Optional
 from opentrons.drivers.temp_deck import (
     SimulatingDriver, TempDeck as TempDeckDriver)
 from opentrons.drivers.temp_deck.driver import temp_locks
 from ..execution_manager import ExecutionManager
+from ..simulator_clock import (SimulatorClock, SimulatedTemperature,
+                               AMBIENT_TEMPERATURE, TEMPDECK_HEATING_RATE,
+                               TEMPDECK_COOLING_RATE)
 from . import update, mod_abc, types
+from .status_watch import StatusWatch, near_temperature
 
 log = logging.getLogger(__name__)
 
@@ -37,19 +40,44 @@ class MissingDevicePortError(Exception):
     pass
 
 
-class Poller(Thread):
-    def __init__(self, driver: Union[TempDeckDriver, SimulatingDriver]):
+class Poller:
+    """ Updates the temperature of a TempDeck driver from an event loop,
+    calling `on_update` after each update """
+    def __init__(self,
+                 driver: Union[TempDeckDriver, SimulatingDriver],
+                 loop: asyncio.AbstractEventLoop,
+                 on_update: Callable[[], None] = None):
         self._driver_ref = driver
-        self._stop_event = Event()
-        super().__init__(target=self._poll_temperature,
-                         name='Temperature poller for tempdeck')
-
-    def _poll_temperature(self):
-        while not self._stop_event.wait(TEMP_POLL_INTERVAL_SECS):
-            self._driver_ref.update_temperature()
+        self._on_update = on_update
+        self._interval: float = TEMP_POLL_INTERVAL_SECS
+        self._wake = asyncio.Event(loop=loop)
+        self._task = loop.create_task(self._poll_temperature())
+
+    async def _poll_temperature(self):
+        while True:
+            self._wake.clear()
+            error = await self._driver_ref.update_temperature_async()
+            if error:
+                log.warning(f'Could not update temperature: {error}')
+            elif self._on_update:
+                self._on_update()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def set_interval(self, interval: float):
+        """ Change how long to wait between updates. If it is shorter than
+        before, update right away. """
+        if interval < self._interval:
+            self._wake.set()
+        self._interval = interval
+
+    def is_alive(self) -> bool:
+        return not self._task.done()
 
     def stop(self):
-        self._stop_event.set()
+        self._task.cancel()
 
 
 class TempDeck(mod_abc.AbstractModule):
@@ -117,6 +145,12 @@ class TempDeck(mod_abc.AbstractModule):
                 simulating, sim_model)
 
         self._poller: Optional[Poller] = None
+        self._watch = StatusWatch(self._update_poll_interval)
+        self._sim_temperature: Optional[SimulatedTemperature] = None
+
+    def attach_clock(self, clock: SimulatorClock):
+        self._sim_temperature = clock.temperature(
+            TEMPDECK_HEATING_RATE, TEMPDECK_COOLING_RATE, 'tempdeck')
 
     async def set_temperature(self, celsius: float):
         """
@@ -127,9 +161,20 @@ class TempDeck(mod_abc.AbstractModule):
         to the nearest limit
         """
         await self.wait_for_is_running()
-        task = self._loop.create_task(self._driver.set_temperature(celsius))
+        if self._sim_temperature:
+            self._sim_temperature.start(celsius)
+            self._sim_temperature.settle()
+
+        def holding() -> bool:
+            return self.status == 'holding at target'
+
+        def near() -> bool:
+            return near_temperature(self.temperature, self.target)
+
+        await self._driver.start_set_temperature_async(celsius)
+        task = self._loop.create_task(self._watch.wait_for(holding, near))
         await self.make_cancellable(task)
-        return await task
+        await task
 
     async def start_set_temperature(self, celsius):
         """
@@ -140,7 +185,11 @@ class TempDeck(mod_abc.AbstractModule):
         to the nearest limit
         """
         await self.wait_for_is_running()
-        return self._driver.start_set_temperature(celsius)
+        if self._sim_temperature:
+            self._sim_temperature.start(celsius)
+        result = await self._driver.start_set_temperature_async(celsius)
+        self._update_poll_interval()
+        return result
 
     async def await_temperature(self, awaiting_temperature: float):
         """
@@ -149,26 +198,45 @@ class TempDeck(mod_abc.AbstractModule):
         the specified temperature is reached
         """
         await self.wait_for_is_running()
+        if self._sim_temperature:
+            self._sim_temperature.settle()
 
-        async def _await_temperature(awaiting_temperature: float):
-            status = self.status
+        status = self.status
 
-            if status == 'heating':
-                while self.temperature < awaiting_temperature:
-                    await asyncio.sleep(0.2)
+        def heated() -> bool:
+            return self.temperature >= awaiting_temperature
 
-            elif status == 'cooling':
-                while self.temperature > awaiting_temperature:
-                    await asyncio.sleep(0.2)
+        def cooled() -> bool:
+            return self.temperature <= awaiting_temperature
 
-        t = self._loop.create_task(_await_temperature(awaiting_temperature))
+        def near() -> bool:
+            return near_temperature(self.temperature, awaiting_temperature)
+
+        if status == 'heating':
+            t = self._loop.create_task(self._watch.wait_for(heated, near))
+        elif status == 'cooling':
+            t = self._loop.create_task(self._watch.wait_for(cooled, near))
+        else:
+            return
         await self.make_cancellable(t)
         await t
 
+    def _update_poll_interval(self):
+        if self._poller:
+            self._poller.set_interval(self._watch.poll_interval(
+                self.target is not None, TEMP_POLL_INTERVAL_SECS))
+
+    def _on_temperature_update(self):
+        self._watch.notify()
+        self._update_poll_interval()
+
     async def deactivate(self):
         """ Stop heating/cooling and turn off the fan """
         await self.wait_for_is_running()
-        self._driver.deactivate()
+        if self._sim_temperature:
+            self._sim_temperature.start(AMBIENT_TEMPERATURE)
+        await self._driver.deactivate_async()
+        self._update_poll_interval()
 
     @property
     def device_info(self) -> Mapping[str, str]:
@@ -223,16 +291,19 @@ class TempDeck(mod_abc.AbstractModule):
         """
         if self._poller:
             self._poller.stop()
-            self._poller.join()
         if not self._driver.is_connected():
-            self._driver.connect(self._port)
-        self._device_info = self._driver.get_device_info()
-        self._poller = Poller(self._driver)
-        self._poller.start()
+            await self._driver.connect_async(self._port)
+        self._device_info = await self._driver.get_device_info_async()
+        self._poller = Poller(
+            self._driver, self._loop, self._on_temperature_update)
 
     def __del__(self):
         if hasattr(self, '_poller') and self._poller:
-            self._poller.stop()
+            try:
+                self._poller.stop()
+            except RuntimeError:
+                # The event loop of the poller is already closed
+                pass
 
     async def prep_for_update(self) -> str:
         model = self._device_info and self._device_info.get('model')
@@ -242,10 +313,9 @@ class TempDeck(mod_abc.AbstractModule):
 
         if self._poller:
             self._poller.stop()
-            self._poller.join()
         del self._poller
         self._poller = None
-        self._driver.enter_programming_mode()
+        await self._driver.enter_programming_mode_async()
         new_port = await update.find_bootloader_port()
         return new_port or self.port
 
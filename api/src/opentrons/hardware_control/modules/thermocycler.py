@@ -1,13 +1,24 @@
 import asyncio
-from typing import Union, Optional, List, Callable
+from typing import Union, Optional, List, Callable, Tuple
 from opentrons.drivers.thermocycler.driver import (
-    SimulatingDriver, Thermocycler as ThermocyclerDriver)
+    SimulatingDriver, Thermocycler as ThermocyclerDriver, ProfileStep,
+    POLLING_FREQUENCY_MS)
 import logging
 from ..execution_manager import ExecutionManager
+from ..simulator_clock import (
+    SimulatorClock, SimulatedTemperature, AMBIENT_TEMPERATURE,
+    THERMOCYCLER_BLOCK_HEATING_RATE, THERMOCYCLER_BLOCK_COOLING_RATE,
+    THERMOCYCLER_LID_HEATING_RATE, THERMOCYCLER_LID_COOLING_RATE,
+    THERMOCYCLER_LID_MOTION_TIME)
 from . import types, update, mod_abc
+from .status_watch import (
+    StatusWatch, near_temperature, FAST_POLL_INTERVAL_SECS)
 
 MODULE_LOG = logging.getLogger(__name__)
 
+#: How long before the end of a hold the status is polled more often
+NEAR_HOLD_END_SECS = 2
+
 
 class Thermocycler(mod_abc.AbstractModule):
     """
@@ -48,12 +59,13 @@ class Thermocycler(mod_abc.AbstractModule):
     def _build_driver(
             simulating: bool,
             sim_model: str = None,
-            interrupt_cb: Callable[[str], None] = None)\
+            interrupt_cb: Callable[[str], None] = None,
+            status_cb: Callable[[], None] = None)\
             -> Union['SimulatingDriver', 'ThermocyclerDriver']:
         if simulating:
             return SimulatingDriver(sim_model=sim_model)
         else:
-            return ThermocyclerDriver(interrupt_cb)
+            return ThermocyclerDriver(interrupt_cb, status_cb)
 
     def __init__(self,
                  port: str,
@@ -68,59 +80,94 @@ class Thermocycler(mod_abc.AbstractModule):
                          execution_manager=execution_manager)
         self._driver: Union['SimulatingDriver', 'ThermocyclerDriver']
         self._interrupt_cb = interrupt_callback
+        self._watch = StatusWatch(self._update_poll_interval)
         self._driver = self._build_driver(
             simulating,
             sim_model,
-            interrupt_callback)
+            interrupt_callback,
+            self._on_status_update)
 
         self._total_cycle_count: Optional[int] = None
-        self._current_cycle_index: Optional[int] = None
         self._total_step_count: Optional[int] = None
-        self._current_step_index: Optional[int] = None
+        self._running_profile = False
+        self._sim_block: Optional[SimulatedTemperature] = None
+        self._sim_lid: Optional[SimulatedTemperature] = None
+
+    def attach_clock(self, clock: SimulatorClock):
+        self._sim_block = clock.temperature(
+            THERMOCYCLER_BLOCK_HEATING_RATE, THERMOCYCLER_BLOCK_COOLING_RATE,
+            'thermocycler')
+        self._sim_lid = clock.temperature(
+            THERMOCYCLER_LID_HEATING_RATE, THERMOCYCLER_LID_COOLING_RATE,
+            'thermocycler')
+
+    def _sim_lid_motion(self, to_status: str):
+        if self._sim_lid and self.lid_status != to_status:
+            self._sim_lid.hold(THERMOCYCLER_LID_MOTION_TIME)
 
     def _clear_cycle_counters(self):
         self._total_cycle_count = None
-        self._current_cycle_index = None
         self._total_step_count = None
-        self._current_step_index = None
 
     async def deactivate_lid(self):
         """ Deactivate the lid heating pad"""
         await self.wait_for_is_running()
+        if self._sim_lid:
+            self._sim_lid.start(AMBIENT_TEMPERATURE)
         return await self._driver.deactivate_lid()
 
     async def deactivate_block(self):
         """ Deactivate the block peltiers"""
         await self.wait_for_is_running()
         self._clear_cycle_counters()
+        if self._sim_block:
+            self._sim_block.start(AMBIENT_TEMPERATURE)
         return await self._driver.deactivate_block()
 
     async def deactivate(self):
         """ Deactivate the block peltiers and lid heating pad"""
         await self.wait_for_is_running()
         self._clear_cycle_counters()
+        if self._sim_block and self._sim_lid:
+            self._sim_block.start(AMBIENT_TEMPERATURE)
+            self._sim_lid.start(AMBIENT_TEMPERATURE)
         return await self._driver.deactivate_all()
 
     async def open(self) -> str:
         """ Open the lid if it is closed"""
         await self.wait_for_is_running()
+        self._sim_lid_motion('open')
         return await self._driver.open()
 
     async def close(self) -> str:
         """ Close the lid if it is open"""
         await self.wait_for_is_running()
+        self._sim_lid_motion('closed')
         return await self._driver.close()
 
+    @staticmethod
+    def _hold_time(hold_time_seconds: Optional[float],
+                   hold_time_minutes: Optional[float]) -> float:
+        seconds = hold_time_seconds if hold_time_seconds is not None else 0
+        minutes = hold_time_minutes if hold_time_minutes is not None else 0
+        total_seconds = seconds + (minutes * 60)
+        return total_seconds if total_seconds > 0 else 0
+
+    def _sim_step(self, temperature: float, hold_time: float,
+                  ramp_rate: Optional[float]):
+        if self._sim_block:
+            self._sim_block.start(temperature, ramp_rate)
+            self._sim_block.settle()
+            self._sim_block.hold(hold_time)
+
     async def set_temperature(self, temperature,
                               hold_time_seconds: float = None,
                               hold_time_minutes: float = None,
                               ramp_rate: float = None,
                               volume: float = None):
         await self.wait_for_is_running()
-        seconds = hold_time_seconds if hold_time_seconds is not None else 0
-        minutes = hold_time_minutes if hold_time_minutes is not None else 0
-        total_seconds = seconds + (minutes * 60)
-        hold_time = total_seconds if total_seconds > 0 else 0
+        hold_time = self._hold_time(hold_time_seconds, hold_time_minutes)
+        self._sim_step(temperature, hold_time, ramp_rate)
         await self._driver.set_temperature(temp=temperature,
                                            hold_time=hold_time,
                                            ramp_rate=ramp_rate,
@@ -134,50 +181,53 @@ class Thermocycler(mod_abc.AbstractModule):
         await self.make_cancellable(task)
         await task
 
-    async def _execute_cycle_step(self,
-                                  step: types.ThermocyclerStep,
-                                  index: int,
-                                  volume: Optional[float]):
-        await self.wait_for_is_running()
-        self._current_step_index = index + 1  # science starts at 1
-        temperature = step.get('temperature')
-        hold_time_minutes = step.get('hold_time_minutes', None)
-        hold_time_seconds = step.get('hold_time_seconds', None)
-        ramp_rate = step.get('ramp_rate', None)
-        await self.set_temperature(temperature=temperature,
-                                   hold_time_minutes=hold_time_minutes,
-                                   hold_time_seconds=hold_time_seconds,
-                                   ramp_rate=ramp_rate,
-                                   volume=volume)
-
-    async def _execute_cycles(self,
-                              steps: List[types.ThermocyclerStep],
-                              repetitions: int,
-                              volume: float = None):
-        for rep in range(repetitions):
-            self._current_cycle_index = rep + 1  # science starts at 1
-            for step_idx, step in enumerate(steps):
-                await self._execute_cycle_step(step, step_idx, volume)
-                await self.wait_for_hold()
+    async def _execute_profile(self,
+                               profile: List[ProfileStep],
+                               repetitions: int,
+                               step_count: int,
+                               volume: Optional[float]):
+        self._total_cycle_count = repetitions
+        self._total_step_count = step_count
+        self._running_profile = True
+        try:
+            await self._driver.execute_profile(
+                profile, volume, self.wait_for_is_running)
+        finally:
+            self._running_profile = False
 
     async def cycle_temperatures(self,
                                  steps: List[types.ThermocyclerStep],
                                  repetitions: int,
                                  volume: float = None):
+        """ Run `steps` `repetitions` times.
+
+        The cycles are compiled into a single profile that the driver runs
+        step after step as the polled status shows each step is over;
+        :py:attr:`current_cycle_index` and :py:attr:`current_step_index`
+        follow the step it runs.
+        """
         await self.wait_for_is_running()
-        self._total_cycle_count = repetitions
-        self._total_step_count = len(steps)
+        profile = [
+            ProfileStep(temperature=step['temperature'],
+                        hold_time=self._hold_time(
+                            step.get('hold_time_seconds'),
+                            step.get('hold_time_minutes')),
+                        ramp_rate=step.get('ramp_rate'))
+            for step in steps] * repetitions
+        for step in profile:
+            self._sim_step(*step)
 
         task = self._loop.create_task(
-            self._execute_cycles(steps,
-                                 repetitions,
-                                 volume))
+            self._execute_profile(profile, repetitions, len(steps), volume))
         await self.make_cancellable(task)
         await task
 
     async def set_lid_temperature(self, temperature: float):
         """ Set the lid temperature in deg Celsius """
         await self.wait_for_is_running()
+        if self._sim_lid:
+            self._sim_lid.start(temperature)
+            self._sim_lid.settle()
         await self._driver.set_lid_temperature(temp=temperature)
         task = self._loop.create_task(self.wait_for_lid_temp())
         await self.make_cancellable(task)
@@ -189,8 +239,13 @@ class Thermocycler(mod_abc.AbstractModule):
 
         Subject to change without a version bump.
         """
-        while self._driver.lid_temp_status != 'holding at target':
-            await asyncio.sleep(0.1)
+        def holding() -> bool:
+            return self._driver.lid_temp_status == 'holding at target'
+
+        def near() -> bool:
+            return near_temperature(self.lid_temp, self.lid_target)
+
+        await self._watch.wait_for(holding, near)
 
     async def wait_for_temp(self):
         """
@@ -198,15 +253,44 @@ class Thermocycler(mod_abc.AbstractModule):
 
         Subject to change without a version bump.
         """
-        while self.status != 'holding at target':
-            await asyncio.sleep(0.1)
+        def holding() -> bool:
+            return self.status == 'holding at target'
+
+        def near() -> bool:
+            return near_temperature(self.temperature, self.target)
+
+        await self._watch.wait_for(holding, near)
 
     async def wait_for_hold(self):
         """
         This method returns only when hold time has elapsed
         """
-        while self.hold_time != 0:
-            await asyncio.sleep(0.1)
+        def held() -> bool:
+            return self.hold_time == 0
+
+        def near() -> bool:
+            return self.hold_time is not None \
+                and self.hold_time <= NEAR_HOLD_END_SECS
+
+        await self._watch.wait_for(held, near)
+
+    def _near_step_end(self) -> bool:
+        if self.hold_time:
+            return self.hold_time <= NEAR_HOLD_END_SECS
+        return near_temperature(self.temperature, self.target)
+
+    def _update_poll_interval(self):
+        active = self.target is not None or self.lid_target is not None
+        interval = self._watch.poll_interval(
+            active, POLLING_FREQUENCY_MS / 1000)
+        if self._running_profile and self._near_step_end():
+            # The next step of the profile starts on the next status update
+            interval = min(interval, FAST_POLL_INTERVAL_SECS)
+        self._driver.set_polling_interval(interval)
+
+    def _on_status_update(self):
+        self._watch.notify()
+        self._update_poll_interval()
 
     @property
     def lid_target(self):
@@ -252,9 +336,18 @@ class Thermocycler(mod_abc.AbstractModule):
     def total_cycle_count(self):
         return self._total_cycle_count
 
+    def _profile_progress(self) -> Optional[Tuple[int, int]]:
+        index = self._driver.profile_step_index
+        if index is None or not self._total_step_count:
+            return None
+        # science starts at 1
+        cycle, step = divmod(index, self._total_step_count)
+        return cycle + 1, step + 1
+
     @property
     def current_cycle_index(self):
-        return self._current_cycle_index
+        progress = self._profile_progress()
+        return progress[0] if progress else None
 
     @property
     def total_step_count(self):
@@ -262,7 +355,8 @@ class Thermocycler(mod_abc.AbstractModule):
 
     @property
     def current_step_index(self):
-        return self._current_step_index
+        progress = self._profile_progress()
+        return progress[1] if progress else None
 
     @property
     def live_data(self):
@@ -1,7 +1,7 @@
 """ Classes and functions for pipette state tracking
 """
 import logging
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from opentrons.types import Point
 from opentrons.config import pipette_config
@@ -25,6 +25,8 @@ class Pipette:
                  inst_offset_config: Dict[str, Tuple[float, float, float]],
                  pipette_id: str = None) -> None:
         self._config = pipette_config.load(model, pipette_id)
+        self._volume_conversions: Dict[
+            str, pipette_config.VolumeConversion] = {}
         self._name = pipette_config.name_for_model(model)
         self._model = model
         self._model_offset = self._config.model_offset
@@ -60,6 +62,8 @@ class Pipette:
     def update_config_item(self, elem_name: str, elem_val: Any):
         self._log.info("updated config: {}={}".format(elem_name, elem_val))
         self._config = self._config._replace(**{elem_name: elem_val})
+        if elem_name == 'ul_per_mm':
+            self._volume_conversions.clear()
 
     @property
     def name(self) -> str:
@@ -198,9 +202,24 @@ class Pipette:
     def has_tip(self) -> bool:
         return self._has_tip
 
+    def _volume_conversion(
+            self, action: str) -> pipette_config.VolumeConversion:
+        try:
+            return self._volume_conversions[action]
+        except KeyError:
+            conversion = pipette_config.volume_conversion(
+                self._config.ul_per_mm[action])
+            self._volume_conversions[action] = conversion
+            return conversion
+
     def ul_per_mm(self, ul: float, action: str) -> float:
-        sequence = self._config.ul_per_mm[action]
-        return pipette_config.piecewise_volume_conversion(ul, sequence)
+        return self._volume_conversion(action)(ul)
+
+    def ul_per_mm_batch(self, volumes: Sequence[float],
+                        action: str) -> List[float]:
+        """ The ul/mm values for many volumes at once, for instance to plan a
+        transfer or simulate a protocol """
+        return self._volume_conversion(action).batch(volumes)
 
     def __str__(self) -> str:
         return '{} current volume {}ul critical point: {} at {}'\
@@ -13,6 +13,7 @@ from opentrons.drivers.rpi_drivers.gpio_simulator import SimulatingGPIOCharDev
 
 from . import modules
 from .execution_manager import ExecutionManager
+from .simulator_clock import SimulatorClock
 from .types import BoardRevision
 
 
@@ -57,7 +58,8 @@ class Simulator:
             attached_instruments: Dict[types.Mount, Dict[str, Optional[str]]],
             attached_modules: List[str],
             config, loop,
-            strict_attached_instruments=True) -> None:
+            strict_attached_instruments=True,
+            clock: SimulatorClock = None) -> None:
         """ Build the simulator.
 
         :param attached_instruments: A dictionary describing the instruments
@@ -91,6 +93,9 @@ class Simulator:
                                             version of 1, while calls
                                             requesting instruments that _are_
                                             present get the full number.
+        :param clock: If specified, a clock to charge with the time each
+                      simulated action would take on a robot. Modules built
+                      by this simulator charge it as well.
         """
         self._config = config
         self._loop = loop
@@ -109,6 +114,7 @@ class Simulator:
         self._log = MODULE_LOG.getChild(repr(self))
         self._strict_attached = bool(strict_attached_instruments)
         self._gpio_chardev = SimulatingGPIOCharDev('gpiochip0')
+        self._clock = clock
 
     @property
     def gpio_chardev(self) -> 'GPIODriverLike':
@@ -123,6 +129,9 @@ class Simulator:
     def move(self, target_position: Dict[str, float],
              home_flagged_axes: bool = True, speed: float = None,
              axis_max_speeds: Dict[str, float] = None):
+        if self._clock:
+            self._clock.move(self._position, target_position,
+                             speed, axis_max_speeds)
         self._position.update(target_position)
         self._engaged_axes.update({ax: True
                                    for ax in target_position})
@@ -130,6 +139,9 @@ class Simulator:
     def home(self, axes: List[str] = None) -> Dict[str, float]:
         # driver_3_0-> HOMED_POSITION
         checked_axes = axes or 'XYZABC'
+        if self._clock:
+            self._clock.home(self._position,
+                             {ax: _HOME_POSITION[ax] for ax in checked_axes})
         self._position.update({ax: _HOME_POSITION[ax]
                                for ax in checked_axes})
         self._engaged_axes.update({ax: True
@@ -137,6 +149,9 @@ class Simulator:
         return self._position
 
     def fast_home(self, axis: str, margin: float) -> Dict[str, float]:
+        if self._clock:
+            self._clock.home(self._position,
+                             {axis: _HOME_POSITION[axis]})
         self._position[axis] = _HOME_POSITION[axis]
         self._engaged_axes[axis] = True
         return self._position
@@ -210,6 +225,15 @@ class Simulator:
     def set_active_current(self, axis, amp):
         pass
 
+    @property
+    def clock(self) -> Optional[SimulatorClock]:
+        """ The clock charged with simulated actions, if any """
+        return self._clock
+
+    def delay(self, duration_s: float):
+        if self._clock:
+            self._clock.advance(duration_s, 'delay')
+
     async def watch_modules(self, register_modules: 'RegisterModules'):
         new_mods_at_ports = [
             modules.ModuleAtPort(
@@ -222,6 +246,10 @@ class Simulator:
     def save_current(self):
         yield
 
+    @contextmanager
+    def streaming_moves(self, count: int):
+        yield
+
     async def build_module(
             self,
             port: str,
@@ -231,7 +259,7 @@ class Simulator:
             execution_manager: ExecutionManager,
             sim_model: str = None
             ) -> modules.AbstractModule:
-        return await modules.build(
+        module = await modules.build(
             port=port,
             which=model,
             simulating=True,
@@ -239,6 +267,9 @@ class Simulator:
             loop=loop,
             execution_manager=execution_manager,
             sim_model=sim_model)
+        if self._clock:
+            module.attach_clock(self._clock)
+        return module
 
     @property
     def axis_bounds(self) -> Dict[str, Tuple[float, float]]:
@@ -0,0 +1,210 @@
+""" Estimates of how long simulated hardware actions take on a real robot.
+
+The hardware simulator normally completes every action instantly. When it is
+built with a :py:class:`SimulatorClock`, it instead charges each action it
+simulates with the time that action would take on a robot, so that running a
+protocol against the simulator predicts how long the protocol runs:
+
+- gantry and plunger moves are charged with their motion profile, using the
+  same speeds, accelerations and steps per mm as the robot (plunger moves
+  run at the speed derived from the pipette's flow rate)
+- homes are charged with a move to the home position at homing speed
+- delays are charged with their duration
+- modules are charged with the time their temperature ramps, holds and lid
+  motions take, which lets thermocycler profiles be estimated step by step
+"""
+from collections import defaultdict
+from typing import Dict, Mapping, Optional
+
+from opentrons.config import robot_configs
+from opentrons.drivers.smoothie_drivers import motion_profile
+from opentrons.drivers.smoothie_drivers.driver_3_0 import (
+    DEFAULT_AXES_SPEED, XY_HOMING_SPEED)
+
+PLUNGER_AXES = 'BC'
+
+#: The time a home takes on top of moving to the home position, while the
+#: axes back off their switches and slowly home again
+HOME_SETTLE_TIME = 1.0
+
+#: The temperature every simulated module starts at and drifts back to once
+#: it is deactivated, in °C
+AMBIENT_TEMPERATURE = 25.0
+
+# Approximate ramp rates in °C/s
+TEMPDECK_HEATING_RATE = 0.17
+TEMPDECK_COOLING_RATE = 0.05
+THERMOCYCLER_BLOCK_HEATING_RATE = 4.0
+THERMOCYCLER_BLOCK_COOLING_RATE = 2.0
+THERMOCYCLER_LID_HEATING_RATE = 0.5
+THERMOCYCLER_LID_COOLING_RATE = 0.1
+
+#: The time the thermocycler takes to open or close its lid, in s
+THERMOCYCLER_LID_MOTION_TIME = 20.0
+
+
+class SimulatorClock:
+    """ Keeps the time a simulated run would have taken on a robot.
+
+    The clock starts at 0 and only moves forward when something charges it
+    with the duration of an action. Each charge is also added to a total
+    for its category (e.g. ``'gantry'`` or ``'thermocycler'``), available
+    from :py:attr:`totals`.
+    """
+
+    def __init__(self,
+                 config: robot_configs.robot_config = None) -> None:
+        """ Build the clock.
+
+        :param config: The robot config whose speeds, accelerations and
+                       steps per mm to estimate moves with. If not
+                       specified, load the default.
+        """
+        checked_config = config or robot_configs.load()
+        self._max_speeds = dict(checked_config.default_max_speed)
+        self._accelerations = dict(checked_config.acceleration)
+        plunger_steps = checked_config.default_pipette_configs['stepsPerMM']
+        self._steps_per_mm = {
+            **{ax: plunger_steps for ax in PLUNGER_AXES},
+            **checked_config.gantry_steps_per_mm}
+        self._now = 0.0
+        self._totals: Dict[str, float] = defaultdict(float)
+
+    @property
+    def now(self) -> float:
+        """ The simulated time since the clock was built, in seconds """
+        return self._now
+
+    @property
+    def totals(self) -> Dict[str, float]:
+        """ The time charged to each category, in seconds """
+        return dict(self._totals)
+
+    def advance(self, seconds: float, category: str):
+        """ Charge the clock with an action that takes `seconds` """
+        if seconds <= 0:
+            return
+        self._now += seconds
+        self._totals[category] += seconds
+
+    def wait_until(self, timestamp: float, category: str):
+        """ Charge the clock with waiting until `timestamp`, if it has not
+        already passed.
+        """
+        self.advance(timestamp - self._now, category)
+
+    def move(self,
+             start: Mapping[str, float],
+             target: Mapping[str, float],
+             speed: float = None,
+             axis_max_speeds: Mapping[str, float] = None) -> float:
+        """ Charge the clock with a coordinated move of the smoothie axes.
+
+        :param start: The position of the axes before the move
+        :param target: The position of each axis that moves
+        :param speed: The requested speed of the move in mm/s. If not
+                      specified, the default speed of the smoothie.
+        :param axis_max_speeds: Max speeds overriding the configured ones
+                                for the duration of the move
+        :returns: The duration of the move, in seconds
+        """
+        max_speeds = {**self._max_speeds, **(axis_max_speeds or {})}
+        profile = motion_profile.move_profile(
+            start, target, speed or DEFAULT_AXES_SPEED,
+            max_speeds, self._accelerations, self._steps_per_mm)
+        moved = [ax for ax in target
+                 if ax in start and target[ax] != start[ax]]
+        if moved and all(ax in PLUNGER_AXES for ax in moved):
+            category = 'plunger'
+        else:
+            category = 'gantry'
+        self.advance(profile.duration, category)
+        return profile.duration
+
+    def home(self,
+             start: Mapping[str, float],
+             home_position: Mapping[str, float]) -> float:
+        """ Charge the clock with homing some axes.
+
+        :param start: The position of the axes before the home
+        :param home_position: The home position of each axis that homes
+        :returns: The duration of the home, in seconds
+        """
+        homing_speeds = {ax: min(XY_HOMING_SPEED, self._max_speeds[ax])
+                         for ax in 'XY' if ax in home_position}
+        profile = motion_profile.move_profile(
+            start, home_position, DEFAULT_AXES_SPEED,
+            {**self._max_speeds, **homing_speeds},
+            self._accelerations, self._steps_per_mm)
+        duration = profile.duration + HOME_SETTLE_TIME
+        self.advance(duration, 'home')
+        return duration
+
+    def temperature(self,
+                    heating_rate: float,
+                    cooling_rate: float,
+                    category: str) -> 'SimulatedTemperature':
+        """ Build a simulated heater or cooler charging this clock """
+        return SimulatedTemperature(
+            self, heating_rate, cooling_rate, category)
+
+
+class SimulatedTemperature:
+    """ A simulated heater or cooler, such as a thermocycler's block.
+
+    Its temperature ramps linearly to each new target at the given heating or
+    cooling rate. Ramps run in the background: they only charge the clock when
+    something waits for the target to be reached with :py:meth:`settle`.
+    """
+
+    def __init__(self,
+                 clock: SimulatorClock,
+                 heating_rate: float,
+                 cooling_rate: float,
+                 category: str) -> None:
+        self._clock = clock
+        self._heating_rate = heating_rate
+        self._cooling_rate = cooling_rate
+        self._category = category
+        self._start_temperature = AMBIENT_TEMPERATURE
+        self._target = AMBIENT_TEMPERATURE
+        self._start_time = clock.now
+        self._reached_at = clock.now
+
+    @property
+    def current(self) -> float:
+        """ The temperature at the current simulated time """
+        now = self._clock.now
+        if now >= self._reached_at:
+            return self._target
+        progress = (now - self._start_time)\
+            / (self._reached_at - self._start_time)
+        return self._start_temperature\
+            + (self._target - self._start_temperature) * progress
+
+    @property
+    def reached_at(self) -> float:
+        """ The simulated time at which the target is reached """
+        return self._reached_at
+
+    def start(self, target: float, rate: Optional[float] = None):
+        """ Start ramping to `target`, at most at `rate` °C/s if given """
+        current = self.current
+        if target >= current:
+            max_rate = self._heating_rate
+        else:
+            max_rate = self._cooling_rate
+        checked_rate = min(rate, max_rate) if rate else max_rate
+        self._start_temperature = current
+        self._target = target
+        self._start_time = self._clock.now
+        self._reached_at = self._start_time\
+            + abs(target - current) / checked_rate
+
+    def settle(self):
+        """ Charge the clock with waiting for the target to be reached """
+        self._clock.wait_until(self._reached_at, self._category)
+
+    def hold(self, seconds: float):
+        """ Charge the clock with holding at temperature for `seconds` """
+        self._clock.advance(seconds, self._category)
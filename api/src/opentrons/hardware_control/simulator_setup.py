@@ -6,6 +6,7 @@ from pathlib import Path
 from opentrons.config import robot_configs
 from opentrons.types import Mount
 from opentrons.hardware_control import API
+from opentrons.hardware_control.simulator_clock import SimulatorClock
 
 
 # Name and kwargs for a module function
@@ -25,7 +26,8 @@ class SimulatorSetup:
     strict_attached_instruments: bool = True
 
 
-async def create_simulator(setup: SimulatorSetup, loop=None) -> API:
+async def create_simulator(setup: SimulatorSetup, loop=None,
+                           clock: SimulatorClock = None) -> API:
     """Create a simulator"""
     simulator = await API.build_hardware_simulator(
         attached_instruments=setup.attached_instruments,
@@ -33,6 +35,7 @@ async def create_simulator(setup: SimulatorSetup, loop=None) -> API:
         config=setup.config,
         strict_attached_instruments=setup.strict_attached_instruments,
         loop=loop,
+        clock=clock,
     )
 
     for attached_module in simulator.attached_modules:
@@ -44,10 +47,11 @@ async def create_simulator(setup: SimulatorSetup, loop=None) -> API:
     return simulator
 
 
-async def load_simulator(path: Path, loop=None) -> API:
+async def load_simulator(path: Path, loop=None,
+                         clock: SimulatorClock = None) -> API:
     """Create a simulator from a JSON file."""
     return await create_simulator(setup=load_simulator_setup(path),
-                                  loop=loop)
+                                  loop=loop, clock=clock)
 
 
 def save_simulator_setup(simulator_setup: SimulatorSetup, path: Path):
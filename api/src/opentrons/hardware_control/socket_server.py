@@ -1,16 +1,41 @@
 """ A server that can listen on a local socket and provide serialized access
 to a hardware controller.
+
+Clients send JSON-RPC 2.0 requests, or batches of them (arrays of requests,
+which are run one after the other, in order). A client does not need to wait
+for a response before sending its next request: the responses are written in
+the order of the requests, several at once when several are ready.
+
+Requests and responses are JSON objects written back to back, unless the
+first byte a client sends is 0, in which case every message on the connection
+is a msgpack-encoded request (or response) prefixed with its length as a
+4-byte big-endian unsigned integer (see :py:func:`pack_frame` and
+:py:func:`read_frame`). This framing needs the optional ``msgpack`` package.
 """
 
 import asyncio
-from collections import namedtuple
+from collections import deque, namedtuple
+import codecs
 import functools
 import inspect
 import json
 import logging
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import struct
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, List, Optional, Set)
 
 import jsonrpcserver  # type: ignore
+from jsonrpcserver.async_dispatcher import safe_call  # type: ignore
+from jsonrpcserver.dispatcher import schema  # type: ignore
+from jsonrpcserver.request import NOID, Request  # type: ignore
+from jsonrpcserver.response import (  # type: ignore
+    InvalidJSONResponse, InvalidJSONRPCResponse, Response)
+import jsonschema  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
 
 from opentrons import types as top_types
 from opentrons.config import robot_configs
@@ -19,6 +44,14 @@ from . import API, types, pipette
 
 LOG = logging.getLogger(__name__)
 
+#: The length prefix of a msgpack frame
+FRAME_HEADER = struct.Struct('>I')
+
+# Validates a single request; building the validator once rather than for
+# each request is much cheaper
+_REQUEST_VALIDATOR = jsonschema.Draft4Validator(
+    {'$ref': '#/definitions/request', 'definitions': schema['definitions']})
+
 
 SerDes = namedtuple('SerDes', ('serializer', 'deserializer'))
 
@@ -150,23 +183,41 @@ def build_jrpc_methods(api: API) -> jsonrpcserver.methods.Methods:
 
 
 class JsonStreamDecoder:
+    """ Reads the JSON objects written back to back on a stream """
     def __init__(self, reader: asyncio.StreamReader):
         self._reader = reader
-        self._buf = b''
+        self._buf = ''
+        self._text = codecs.getincrementaldecoder('utf-8')()
         self._decoder = json.JSONDecoder()
 
     async def read_object(self) -> Any:
         while True:
-            self._buf += await self._reader.read(1)
+            self._buf = self._buf.lstrip()
             try:
-                decoded, offset = self._decoder.raw_decode(self._buf.decode())
+                decoded, offset = self._decoder.raw_decode(self._buf)
             except json.JSONDecodeError:
-                pass
+                data = await self._reader.read(4096)
+                if not data:
+                    raise EOFError('stream closed')
+                self._buf += self._text.decode(data)
             else:
                 self._buf = self._buf[offset:]
                 return decoded
 
 
+def pack_frame(obj: Any) -> bytes:
+    """ Encode a request or response as a length-prefixed msgpack frame """
+    payload = msgpack.packb(obj, use_bin_type=True)
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    """ Read and decode a length-prefixed msgpack frame from a stream """
+    header = await reader.readexactly(FRAME_HEADER.size)
+    payload = await reader.readexactly(FRAME_HEADER.unpack(header)[0])
+    return msgpack.unpackb(payload, raw=False)
+
+
 class Server:
     def __init__(self, api: API,
                  loop: asyncio.AbstractEventLoop):
@@ -178,7 +229,8 @@ class Server:
 
     def _build_protocol(self):
         proto = JsonRpcProtocol(
-            self._api, self._loop, self._unregister, self._dispatch)
+            self._api, self._loop, self._unregister, self._dispatch,
+            self._dispatch_object)
         self._protocol_instances.add(proto)
         return proto
 
@@ -189,9 +241,37 @@ class Server:
             LOG.warning('protocol not present on unregister - double call?')
 
     async def _dispatch(self, call_str: str) -> str:
-        result = await jsonrpcserver.async_dispatcher.dispatch(
-            call_str, self._methods, debug=True)
-        return str(result)
+        """ Run a JSON-encoded request or batch, and return its JSON-encoded
+        response (empty if no response is due) """
+        try:
+            request = json.loads(call_str)
+        except json.JSONDecodeError as e:
+            return str(InvalidJSONResponse(data=str(e), debug=True))
+        response = await self._dispatch_object(request)
+        return '' if response is None else json.dumps(response)
+
+    async def _dispatch_object(self, request: Any) -> Any:
+        """ Run a decoded request, or the requests of a batch in order.
+
+        :returns: The response, or the list of the responses of a batch, or
+                  None if no response is due (all the requests were
+                  notifications)
+        """
+        if isinstance(request, list) and request:
+            responses = [await self._call(item) for item in request]
+            return [response.deserialized()
+                    for response in responses if response.wanted] or None
+        response = await self._call(request)
+        return response.deserialized() if response.wanted else None
+
+    async def _call(self, request: Any) -> Response:
+        if not _REQUEST_VALIDATOR.is_valid(request):
+            return InvalidJSONRPCResponse(data=None, debug=True)
+        return await safe_call(
+            Request(request['method'],
+                    params=request.get('params'),
+                    id=request.get('id', NOID)),
+            self._methods, debug=True)
 
     async def start(self, sock_path: str):
         assert not self.server, 'Server already running'
@@ -206,27 +286,46 @@ class Server:
         self._protocol_instances.clear()
 
 
+def _jrpc_error(message, exc) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': None,
+            'error': {'code': -32063,  # jsonrpc internal error
+                      'message': message,
+                      'data': repr(exc)}}
+
+
 def _build_jrpc_error(message, exc) -> str:
-    return json.dumps({'jsonrpc': '2.0', 'id': None,
-                       'error': {'code': -32063,  # jsonrpc internal error
-                                 'message': message,
-                                 'data': repr(exc)}})
+    return json.dumps(_jrpc_error(message, exc))
+
+
+async def _resolved(value: Any) -> Any:
+    return value
 
 
 class JsonRpcProtocol(asyncio.Protocol):
     def __init__(self, api: API,
                  loop: asyncio.AbstractEventLoop,
                  on_close: Callable[['JsonRpcProtocol'], None],
-                 dispatch: Callable[[str], Awaitable[str]]):
+                 dispatch: Callable[[str], Awaitable[str]],
+                 dispatch_object: Callable[[Any], Awaitable[Any]] = None):
         self._api = api
         self._loop = loop
         self._log = LOG.getChild('jsonrpc')
         self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
         self._buffer = ''
+        self._frames = bytearray()
+        # None until the first data tells whether the client uses msgpack
+        # frames
+        self._framed: Optional[bool] = None
         self._transport: Optional[asyncio.Transport] = None
         self._inflight: Set[asyncio.Future] = set()
+        # Dispatch tasks in the order of their requests, until their
+        # responses are written
+        self._pending: Deque[asyncio.Task] = deque()
+        self._flush_scheduled = False
         self._onclose = on_close
         self._dispatch = dispatch
+        self._dispatch_object = dispatch_object
 
     def connection_made(self, transport):
         self._log.info("Conection made")
@@ -237,6 +336,7 @@ class JsonRpcProtocol(asyncio.Protocol):
         self._log.info(f"Connection lost: {exc}")
         for task in self._inflight:
             task.cancel()
+        self._pending.clear()
         self._onclose(self)
 
     def pause_writing(self):
@@ -245,61 +345,104 @@ class JsonRpcProtocol(asyncio.Protocol):
     def resume_writing(self):
         self._log.debug('resume writing')
 
-    def data_received(self, data: bytes):  # noqa(C901)
+    def data_received(self, data: bytes):
         self._log.debug(f'data received: {data!r}')
-        self._buffer += data.decode()  # hope this isn't incomplete
-        try:
-            _, pos = self._decoder.raw_decode(self._buffer)
-        except json.JSONDecodeError:
-            # If someone sends us garbage that isn't valid json, we need to
-            # not get stuck in a bad state. If we're always accumulating data
-            # until we no longer get an error, then consider if the first thing
-            # we saw was "aaaaaaaa" - this would always be invalid because it's
-            # impossible to make it valid json just by adding more data.
-            # Since we are only accepting jsonrpc, every message should be an
-            # object and therefore should start with {.
-            if self._buffer[0] != '{':
-                obj_start = self._buffer.find('{')
-                if obj_start == -1:
-                    # There is no '{' character in the buffer, wait for more
-                    # data
-                    return
-                else:
-                    # Recurse now that we've made the buffer safe
-                    self._buffer = self._buffer[obj_start:]
-                    return self.data_received(b'')
-            else:
-                # This is an incomplete json object, we can't dispatch anything
-                # and should wait for more data
+        if self._framed is None and data:
+            self._framed = data[:1] == b'\x00'
+            if self._framed and not (msgpack and self._dispatch_object):
+                self._log.error(
+                    'Client sent msgpack frames but msgpack is not installed')
+                if self._transport:
+                    self._transport.close()
                 return
-        to_dispatch = self._buffer[:pos]
-        self._buffer = self._buffer[pos:]
-        task = self._loop.create_task(self._dispatch(to_dispatch))
-        self._inflight.add(task)
+        if self._framed:
+            self._frames_received(data)
+        else:
+            self._json_received(data)
 
-        def done_callback(fut):
-            if not self._transport:  # closed under us
+    def _json_received(self, data: bytes):
+        self._buffer += self._text.decode(data)
+        while self._buffer:
+            # If someone sends us garbage that isn't valid json, we need to
+            # not get stuck in a bad state: since we are only accepting
+            # jsonrpc, every message should be an object or a batch (an
+            # array), so skip anything before the next { or [.
+            starts = [pos for pos in (self._buffer.find('{'),
+                                      self._buffer.find('['))
+                      if pos >= 0]
+            if not starts:
+                self._buffer = ''
                 return
+            self._buffer = self._buffer[min(starts):]
             try:
-                res = fut.result()
-            except asyncio.InvalidStateError:
-                self._log.exception("Invalid state in jrpc dispatch")
-                pass
-            except asyncio.CancelledError as e:
-                self._log.error("jsonrpc invocation cancelled")
-                self._transport.write(
-                    _build_jrpc_error('execution cancelled', e).encode())
+                _, pos = self._decoder.raw_decode(self._buffer)
+            except json.JSONDecodeError:
+                # This is an incomplete json object, we can't dispatch
+                # anything and should wait for more data
+                return
+            to_dispatch = self._buffer[:pos]
+            self._buffer = self._buffer[pos:]
+            self._submit(self._dispatch(to_dispatch))
+
+    def _frames_received(self, data: bytes):
+        self._frames.extend(data)
+        while len(self._frames) >= FRAME_HEADER.size:
+            length, = FRAME_HEADER.unpack_from(self._frames)
+            end = FRAME_HEADER.size + length
+            if len(self._frames) < end:
+                return
+            payload = bytes(self._frames[FRAME_HEADER.size:end])
+            del self._frames[:end]
+            try:
+                request = msgpack.unpackb(payload, raw=False)
             except Exception as e:
-                self._log.exception('Uncaught exception in jsonrpc dispatch')
-                self._transport.write(
-                    _build_jrpc_error('uncaught exception in dispatch',
-                                      e).encode())
+                self._submit(_resolved(
+                    InvalidJSONResponse(data=str(e), debug=True)
+                    .deserialized()))
             else:
-                self._transport.write(res.encode())
-            finally:
-                self._inflight.remove(task)
+                assert self._dispatch_object
+                self._submit(self._dispatch_object(request))
 
-        task.add_done_callback(done_callback)
+    def _submit(self, coro: Awaitable[Any]):
+        task = self._loop.create_task(coro)
+        self._inflight.add(task)
+        self._pending.append(task)
+        task.add_done_callback(self._on_dispatched)
+
+    def _on_dispatched(self, task: asyncio.Task):
+        self._inflight.discard(task)
+        # Responses of tasks that finish together are written together
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if not self._transport:  # closed under us
+            return
+        responses = []
+        while self._pending and self._pending[0].done():
+            responses.append(self._encode(self._pending.popleft()))
+        if responses:
+            self._transport.write(b''.join(responses))
+
+    def _encode(self, task: asyncio.Task) -> bytes:
+        try:
+            res = task.result()
+        except asyncio.CancelledError as e:
+            self._log.error("jsonrpc invocation cancelled")
+            res = self._error('execution cancelled', e)
+        except Exception as e:
+            self._log.exception('Uncaught exception in jsonrpc dispatch')
+            res = self._error('uncaught exception in dispatch', e)
+        if not self._framed:
+            return res.encode()
+        return b'' if res is None else pack_frame(res)
+
+    def _error(self, message: str, exc: BaseException) -> Any:
+        if self._framed:
+            return _jrpc_error(message, exc)
+        return _build_jrpc_error(message, exc)
 
     def eof_received(self):
         self._log.info('eof received')
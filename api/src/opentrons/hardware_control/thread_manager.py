@@ -4,8 +4,8 @@ import threading
 import logging
 import asyncio
 import functools
-from typing import Generic, TypeVar, Any
-from .adapters import SynchronousAdapter
+from typing import Any, Callable, Dict, Generic, Iterable, List, Tuple, TypeVar
+from .adapters import SynchronousAdapter, HardwareCall, call_batch
 from .modules.mod_abc import AbstractModule
 
 MODULE_LOG = logging.getLogger(__name__)
@@ -26,6 +26,14 @@ async def call_coroutine_threadsafe(
 WrappedObj = TypeVar('WrappedObj')
 
 
+async def _call_in_loop(loop: asyncio.AbstractEventLoop,
+                        coro, *args, **kwargs) -> Any:
+    if asyncio.get_running_loop() is loop:
+        # Already in the managed thread: no need for a hop
+        return await coro(*args, **kwargs)
+    return await call_coroutine_threadsafe(loop, coro, *args, **kwargs)
+
+
 class CallBridger(Generic[WrappedObj]):
     def __init__(
             self,
@@ -33,27 +41,42 @@ class CallBridger(Generic[WrappedObj]):
             loop: asyncio.AbstractEventLoop) -> None:
         self.wrapped_obj = wrapped_obj
         self._loop = loop
+        # The wrappers of coroutine functions, by name, along with the
+        # function each was built for (see SynchronousAdapter)
+        self._wrappers: Dict[str, Tuple[Any, Callable]] = {}
+
+    async def call_batch(self, calls: Iterable[HardwareCall]) -> List[Any]:
+        """ Make several calls to the wrapped object in the managed thread,
+        with a single hop to it (see :py:func:`.adapters.call_batch`) """
+        return await _call_in_loop(
+            object.__getattribute__(self, '_loop'), call_batch,
+            object.__getattribute__(self, 'wrapped_obj'), list(calls))
 
     def __getattribute__(self, attr_name: str) -> Any:
         # Almost every attribute retrieved from us will be for people actually
         # looking for an attribute of the managed object, so check there first.
         managed_obj = object.__getattribute__(self, 'wrapped_obj')
-        loop = object.__getattribute__(self, '_loop')
         try:
             attr = getattr(managed_obj, attr_name)
         except AttributeError:
             # Maybe this actually was for us? Let’s find it
             return object.__getattribute__(self, attr_name)
 
+        wrappers = object.__getattribute__(self, '_wrappers')
+        cached = wrappers.get(attr_name)
+        if cached and cached[0] == attr:
+            return cached[1]
+
+        loop = object.__getattribute__(self, '_loop')
         if asyncio.iscoroutinefunction(attr):
             # Return coroutine result of async function
             # executed in managed thread to calling thread
 
             @functools.wraps(attr)
             async def wrapper(*args, **kwargs):
-                return await call_coroutine_threadsafe(
-                    loop, attr, *args, **kwargs)
+                return await _call_in_loop(loop, attr, *args, **kwargs)
 
+            wrappers[attr_name] = (attr, wrapper)
             return wrapper
 
         elif asyncio.iscoroutine(attr):
@@ -1,13 +1,17 @@
 """ Utility functions and classes for the hardware controller"""
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 
 from .types import CriticalPoint
 from opentrons.types import Point
 
 mod_log = logging.getLogger(__name__)
 
+#: How far from a straight line (in mm) a waypoint may be and still be merged
+#: into the move along it
+MERGE_TOLERANCE_MM = 0.01
+
 
 def _handle_loop_exception(loop: asyncio.AbstractEventLoop,
                            context: Dict[str, Any]):
@@ -38,3 +42,48 @@ def plan_arc(
            for wp in checked_wp]\
         + [(dest_point._replace(z=z_height), dest_cp),
            (dest_point, dest_cp)]
+
+
+def _on_segment(point: Point, start: Point, end: Point,
+                tolerance: float) -> bool:
+    segment = end - start
+    length_sq = segment.x ** 2 + segment.y ** 2 + segment.z ** 2
+    if length_sq == 0:
+        return point.magnitude_to(start) <= tolerance
+    offset = point - start
+    along = (offset.x * segment.x + offset.y * segment.y
+             + offset.z * segment.z) / length_sq
+    if along < 0 or along > 1:
+        return False
+    closest = Point(start.x + segment.x * along,
+                    start.y + segment.y * along,
+                    start.z + segment.z * along)
+    return point.magnitude_to(closest) <= tolerance
+
+
+def merge_waypoints(start: Point,
+                    waypoints: Sequence[Point],
+                    tolerance: float = MERGE_TOLERANCE_MM) -> List[int]:
+    """ Look ahead along a path of straight moves from `start` through
+    `waypoints` for the waypoints it can go straight through.
+
+    A waypoint is dropped if the path is already there, or if it lies on the
+    straight line between the last waypoint kept and the next one, so that a
+    single move replaces two. The corners of the path are kept, including
+    those of an arc at a single height, which route it around obstacles.
+
+    :returns: The indices of the waypoints to move to; the last waypoint is
+              always kept
+    """
+    kept: List[int] = []
+    previous = start
+    last = len(waypoints) - 1
+    for index, point in enumerate(waypoints):
+        if index < last and (
+                point.magnitude_to(previous) <= tolerance
+                or _on_segment(point, previous, waypoints[index + 1],
+                               tolerance)):
+            continue
+        kept.append(index)
+        previous = point
+    return kept
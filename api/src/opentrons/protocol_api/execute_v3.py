@@ -55,12 +55,15 @@ def load_labware_from_json_defs(
     definitions = protocol['labwareDefinitions']
     loaded_labware = {}
 
-    for labware_id, props in protocol_labware.items():
-        slot = props['slot']
-        definition = definitions[props['definitionId']]
-        label = props.get('displayName', None)
-        loaded_labware[labware_id] = ctx.load_labware_from_definition(
-            definition, slot, label)
+    # all the labware are loaded together, so the calibration offset index
+    # only needs to be written once
+    with labware.calibration_batch():
+        for labware_id, props in protocol_labware.items():
+            slot = props['slot']
+            definition = definitions[props['definitionId']]
+            label = props.get('displayName', None)
+            loaded_labware[labware_id] = ctx.load_labware_from_definition(
+                definition, slot, label)
 
     return loaded_labware
 
@@ -4,6 +4,7 @@ from .contexts import ProtocolContext, \
     MagneticModuleContext, TemperatureModuleContext, ModuleContext, \
     ThermocyclerContext
 from .execute_v3 import _delay, _move_to_slot
+from .labware import calibration_batch
 from .types import LoadedLabware, Instruments, PipetteHandler, \
     MagneticModuleHandler, TemperatureModuleHandler, \
     ThermocyclerModuleHandler
@@ -23,16 +24,20 @@ def load_labware_from_json_defs(
     definitions = protocol['labwareDefinitions']
     loaded_labware = {}
 
-    for labware_id, props in protocol_labware.items():
-        slot = props['slot']
-        definition = definitions[props['definitionId']]
-        label = props.get('displayName', None)
-        if slot in modules:
-            loaded_labware[labware_id] = \
-                modules[slot].load_labware_from_definition(definition, label)
-        else:
-            loaded_labware[labware_id] = \
-                ctx.load_labware_from_definition(definition, slot, label)
+    # all the labware are loaded together, so the calibration offset index
+    # only needs to be written once
+    with calibration_batch():
+        for labware_id, props in protocol_labware.items():
+            slot = props['slot']
+            definition = definitions[props['definitionId']]
+            label = props.get('displayName', None)
+            if slot in modules:
+                loaded_labware[labware_id] = \
+                    modules[slot].load_labware_from_definition(
+                        definition, label)
+            else:
+                loaded_labware[labware_id] = \
+                    ctx.load_labware_from_definition(definition, slot, label)
 
     return loaded_labware
 
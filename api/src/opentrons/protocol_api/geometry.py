@@ -3,7 +3,8 @@ import functools
 import logging
 import json
 from dataclasses import dataclass
-from typing import Any, List, Optional, Tuple, Dict
+from typing import (
+    Any, Callable, Hashable, List, Optional, Tuple, TypeVar, Dict)
 
 from opentrons import types
 from opentrons.hardware_control.types import CriticalPoint
@@ -18,6 +19,8 @@ from .util import first_parent
 
 MODULE_LOG = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 # Amount of slots in a single deck row
 ROW_LENGTH = 3
 
@@ -78,9 +81,27 @@ def should_dodge_thermocycler(
 
     Returns True if we need to dodge, False otherwise
     """
-    if any([isinstance(item, ThermocyclerGeometry) for item in deck.values()]):
-        transit = (first_parent(from_loc.labware),
-                   first_parent(to_loc.labware))
+    # wells are in the same slot as their labware, so the decision is the
+    # same for all the wells of a pair of labware
+    from_key = from_loc.labware
+    if isinstance(from_key, Well):
+        from_key = from_key.parent
+    to_key = to_loc.labware
+    if isinstance(to_key, Well):
+        to_key = to_key.parent
+    return deck.memoize(
+        ('dodge', from_key, to_key),
+        lambda: _should_dodge_thermocycler(deck, from_key, to_key))
+
+
+def _should_dodge_thermocycler(
+        deck: 'Deck',
+        from_labware: types.LocationLabware,
+        to_labware: types.LocationLabware) -> bool:
+    if any([isinstance(item, ThermocyclerGeometry)
+            for item in deck.data.values()]):
+        transit = (first_parent(from_labware),
+                   first_parent(to_labware))
         # mypy doesn't like this because transit could be none, but it's
         # checked by value in BAD_PAIRS which has only strings
         return transit in BAD_PAIRS
@@ -88,7 +109,14 @@ def should_dodge_thermocycler(
     return False
 
 
-@dataclass
+def _centers_multichannel(deck: 'Deck', labware: Optional[Labware]) -> bool:
+    return deck.memoize(
+        ('center', labware),
+        lambda: 'centerMultichannelOnWells'
+        in quirks_from_any_parent(labware))
+
+
+@dataclass(frozen=True)
 class MoveConstraints:
     instr_max_height: float
     well_z_margin: float = 5.0
@@ -165,28 +193,9 @@ def _build_safe_height(from_loc: types.Location,
     else:
         # One of our labwares is invalid so we have to just go above
         # deck.highest_z since we don’t know where we are
-        to_safety = deck.highest_z + constraints.lw_z_margin
-
-        if to_safety > constraints.instr_max_height:
-            if constraints.instr_max_height\
-               >= (deck.highest_z + constraints.minimum_lw_z_margin):
-                to_safety = constraints.instr_max_height
-            else:
-                tallest_lw = list(filter(
-                    lambda lw: lw.highest_z == deck.highest_z,
-                    [lw for lw in deck.data.values() if lw]))[0]
-                if isinstance(tallest_lw, ModuleGeometry) and\
-                        tallest_lw.labware:
-                    tallest_lw = tallest_lw.labware
-                raise LabwareHeightError(
-                    f"The {tallest_lw} has a total height of {deck.highest_z}"
-                    " mm, which is too tall for your current pipette "
-                    "configurations. The longest pipette on your robot can "
-                    f"only be raised to {constraints.instr_max_height} mm "
-                    "above the deck. "
-                    "This may be because the labware is incorrectly defined, "
-                    "incorrectly calibrated, or physically too tall. Please "
-                    "check your labware definitions and calibrations.")
+        to_safety = deck.memoize(
+            ('clearance', constraints),
+            lambda: _deck_clearance(deck, constraints))
         from_safety = 0.0  # (ignore since it’s in a max())
 
     return max_many(
@@ -197,6 +206,33 @@ def _build_safe_height(from_loc: types.Location,
         constraints.minimum_z_height)
 
 
+def _deck_clearance(deck: 'Deck', constraints: MoveConstraints) -> float:
+    """ The height to move at to clear everything on the deck """
+    clearance = deck.highest_z + constraints.lw_z_margin
+
+    if clearance > constraints.instr_max_height:
+        if constraints.instr_max_height\
+           >= (deck.highest_z + constraints.minimum_lw_z_margin):
+            clearance = constraints.instr_max_height
+        else:
+            tallest_lw = list(filter(
+                lambda lw: lw.highest_z == deck.highest_z,
+                [lw for lw in deck.data.values() if lw]))[0]
+            if isinstance(tallest_lw, ModuleGeometry) and\
+                    tallest_lw.labware:
+                tallest_lw = tallest_lw.labware
+            raise LabwareHeightError(
+                f"The {tallest_lw} has a total height of {deck.highest_z}"
+                " mm, which is too tall for your current pipette "
+                "configurations. The longest pipette on your robot can "
+                f"only be raised to {constraints.instr_max_height} mm "
+                "above the deck. "
+                "This may be because the labware is incorrectly defined, "
+                "incorrectly calibrated, or physically too tall. Please "
+                "check your labware definitions and calibrations.")
+    return clearance
+
+
 def plan_moves(
         from_loc: types.Location,
         to_loc: types.Location,
@@ -237,10 +273,8 @@ def plan_moves(
     to_lw, to_well = split_loc_labware(to_loc)
     from_point = from_loc.point
     from_lw, from_well = split_loc_labware(from_loc)
-    dest_quirks = quirks_from_any_parent(to_lw)
-    from_quirks = quirks_from_any_parent(from_lw)
-    from_center = 'centerMultichannelOnWells' in from_quirks
-    to_center = 'centerMultichannelOnWells' in dest_quirks
+    from_center = _centers_multichannel(deck, from_lw)
+    to_center = _centers_multichannel(deck, to_lw)
     dest_cp_override = CriticalPoint.XY_CENTER if to_center else None
     origin_cp_override = CriticalPoint.XY_CENTER if from_center else None
 
@@ -279,6 +313,8 @@ class Deck(UserDict):
                                                 0)
                            for idx in range(12)}
         self._highest_z = 0.0
+        self._generation = 0
+        self._memo: Dict[Hashable, Any] = {}
         # TODO: support deck loadName as a param
         def_path = 'deck/definitions/2/ot2_standard.json'
         self._definition = json.loads(load_shared_data(def_path))
@@ -312,6 +348,7 @@ class Deck(UserDict):
         checked_key = self._check_name(key)
         old = self.data[checked_key]
         self.data[checked_key] = None
+        self._changed()
         if old:
             self.recalculate_high_z()
 
@@ -339,6 +376,7 @@ class Deck(UserDict):
                              f'{", ".join(flattened_overlappers)}')
         self.data[slot_key_int] = val
         self._highest_z = max(val.highest_z, self._highest_z)
+        self._changed()
 
     def __contains__(self, key: object) -> bool:
         try:
@@ -391,6 +429,33 @@ class Deck(UserDict):
         self._highest_z = 0.0
         for item in [lw for lw in self.data.values() if lw]:
             self._highest_z = max(item.highest_z, self._highest_z)
+        self._changed()
+
+    def _changed(self):
+        self._generation += 1
+        self._memo = {}
+
+    @property
+    def generation(self) -> int:
+        """ A number that changes whenever something is added to or removed
+        from the deck, or the height of the deck is recalculated (for
+        instance, because labware was loaded on a module or recalibrated)
+        """
+        return self._generation
+
+    def memoize(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """ Get a value derived from the deck's contents, computing it only
+        once per deck :py:attr:`generation`
+
+        :param key: What the value is, e.g. ``('clearance', constraints)``
+        :param compute: Computes the value if it is not known yet
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = compute()
+            self._memo[key] = value
+            return value
 
     def get_slot_definition(self, slot_name) -> Dict[str, Any]:
         slots: List[Dict] = self._definition['locations']['orderedSlots']
@@ -1109,9 +1109,13 @@ class InstrumentContext(CommandPublisher):
         self._log.debug("move_to: {}->{} via:\n\t{}"
                         .format(from_loc, location, moves))
         try:
-            for move in moves:
+            if len(moves) == 1:
                 self._hw_manager.hardware.move_to(
-                    self._mount, move[0], critical_point=move[1], speed=speed,
+                    self._mount, moves[0][0], critical_point=moves[0][1],
+                    speed=speed, max_speeds=self._ctx.max_speeds.data)
+            else:
+                self._hw_manager.hardware.move_through(
+                    self._mount, moves, speed=speed,
                     max_speeds=self._ctx.max_speeds.data)
         except Exception:
             self._ctx.location_cache = None
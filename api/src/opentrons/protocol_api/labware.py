@@ -7,28 +7,36 @@ and labware calibration offsets. It contains all the code necessary to
 transform from labware symbolic points (such as "well a1 of an opentrons
 tiprack") to points in deck coordinates.
 """
+import contextlib
+import copy
 import logging
 import json
 import re
+import threading
 import time
 import os
+import pickle
 import shutil
+import tempfile
+import weakref
 
 from pathlib import Path
 from collections import defaultdict
 from enum import Enum, auto
 from hashlib import sha256
-from itertools import takewhile, dropwhile
+from itertools import dropwhile
 from typing import (
-    Any, AnyStr, List, Dict, Optional, Union, Sequence, Tuple, TYPE_CHECKING)
+    Any, AnyStr, ContextManager, List, Dict, Iterable, Iterator, Optional,
+    Union, Sequence, Tuple, TYPE_CHECKING)
 
-import jsonschema  # type: ignore
+import numpy as np  # type: ignore
 
 from .util import ModifiedList, requires_version, first_parent
 from opentrons.types import Location, Point
 from opentrons.config import CONFIG
 from opentrons.protocols.types import APIVersion
-from opentrons.system.shared_data import load_shared_data, get_shared_data_root
+from opentrons.system.shared_data import (
+    get_shared_data_root, validate_schema)
 from .definitions import MAX_SUPPORTED_VERSION, DeckItem
 if TYPE_CHECKING:
     from .module_geometry import ModuleGeometry  # noqa(F401)
@@ -71,7 +79,8 @@ class Well:
                  parent: Location,
                  display_name: str,
                  has_tip: bool,
-                 api_level: APIVersion) -> None:
+                 api_level: APIVersion,
+                 position: Point = None) -> None:
         """
         Create a well, and track the Point corresponding to the top-center of
         the well (this Point is in absolute deck coordinates)
@@ -86,18 +95,26 @@ class Well:
         :param parent: a :py:class:`.Location` Point representing the absolute
                        position of the parent of the Well (usually the
                        front-left corner of a labware)
+        :param position: the absolute position of the top-center of the well,
+                         if already known (a labware takes it from its array
+                         of well positions); otherwise it is computed from
+                         `well_props` and `parent`
         """
         self._api_version = api_level
         self._display_name = display_name
-        self._position\
-            = Point(well_props['x'],
-                    well_props['y'],
-                    well_props['z'] + well_props['depth']) + parent.point
+        if position is None:
+            position = Point(well_props['x'],
+                             well_props['y'],
+                             well_props['z'] + well_props['depth'])\
+                + parent.point
+        self._position = position
 
         if not parent.labware:
             raise ValueError("Wells must have a parent")
         self._parent = parent.labware
         self._has_tip = has_tip
+        # set when the parent labware starts tracking this well's tip
+        self._tip_tracker: Optional['_TipTracker'] = None
         self._shape = well_shapes.get(well_props['shape'])
         if self._shape is WellShape.RECTANGULAR:
             self._length = well_props['xDimension']
@@ -131,7 +148,10 @@ class Well:
 
     @has_tip.setter
     def has_tip(self, value: bool):
-        self._has_tip = value
+        if self._tip_tracker:
+            self._tip_tracker.set_tip(self, value)
+        else:
+            self._has_tip = value
 
     @property  # type: ignore
     @requires_version(2, 0)
@@ -170,9 +190,8 @@ class Well:
 
     def _bottom(self, z: float = 0.0) -> Location:
         # inheritance and version check workaround
-        top = self._top()
-        bottom_z = top.point.z - self._depth + z
-        return Location(Point(x=top.point.x, y=top.point.y, z=bottom_z), self)
+        top = self._position
+        return Location(Point(top.x, top.y, top.z - self._depth + z), self)
 
     @requires_version(2, 0)
     def center(self) -> Location:
@@ -185,9 +204,9 @@ class Well:
 
     def _center(self) -> Location:
         # fairly hacky workaround for inheritance issues with LegacyWell
-        top = self._top()
-        center_z = top.point.z - (self._depth / 2.0)
-        return Location(Point(x=top.point.x, y=top.point.y, z=center_z), self)
+        top = self._position
+        return Location(
+            Point(top.x, top.y, top.z - self._depth / 2.0), self)
 
     def _from_center_cartesian(
             self, x: float, y: float, z: float) -> Point:
@@ -240,6 +259,132 @@ class Well:
         return hash(self.top().point)
 
 
+def _first_run(mask: int, length: int, start: int = 0) -> Optional[int]:
+    """ Find where the first run of set bits in `mask`, from bit `start` on,
+    begins, if the run is at least `length` bits long
+    """
+    mask = mask >> start << start
+    if not mask:
+        return None
+    first = (mask & -mask).bit_length() - 1
+    run = mask >> first
+    # the lowest clear bit of run is where the run ends
+    if (~run & (run + 1)).bit_length() - 1 < length:
+        return None
+    return first
+
+
+def _points(positions: np.ndarray) -> List[Point]:
+    """ Convert an array of positions, one per row, to points """
+    return [Point(*position) for position in positions.tolist()]
+
+
+class _TipTracker:
+    """ Tracks which wells of a labware have tips.
+
+    The tips of each column are a bitmask, with bit ``n`` set if the ``n``-th
+    well of the column has a tip, so that finding, using or returning a run
+    of tips in a column is a handful of integer operations rather than a pass
+    over the wells. For each number of tips looked for, a cursor remembers
+    the first column that may have a long enough run, so successive picks
+    from a tiprack do not look through the columns already emptied.
+
+    Once a labware tracks its tips, setting ``has_tip`` on its wells goes
+    through the tracker, which keeps the wells in sync.
+    """
+
+    def __init__(self, columns: List[List[Well]]) -> None:
+        self._columns = columns
+        self._masks = [
+            sum(1 << row for row, well in enumerate(column) if well._has_tip)
+            for column in columns]
+        self._positions: Dict[Well, Tuple[int, int]] = {}
+        for col, column in enumerate(columns):
+            for row, well in enumerate(column):
+                self._positions[well] = (col, row)
+                well._tip_tracker = self
+        # for each number of tips, no column before the cursor has a run of
+        # that many tips
+        self._cursors: Dict[int, int] = {}
+
+    def _update(self, col: int, mask: int):
+        changed = self._masks[col] ^ mask
+        self._masks[col] = mask
+        column = self._columns[col]
+        while changed:
+            row = (changed & -changed).bit_length() - 1
+            column[row]._has_tip = bool(mask & (1 << row))
+            changed &= changed - 1
+        for num_tips, cursor in self._cursors.items():
+            self._cursors[num_tips] = min(cursor, col)
+
+    def next_tip(self, num_tips: int,
+                 starting_tip: Optional[Well]) -> Optional[Well]:
+        first_col = 0
+        if starting_tip:
+            col, row = self._positions[starting_tip]
+            if row:
+                found = _first_run(self._masks[col], num_tips, row)
+                if found is not None:
+                    return self._columns[col][found]
+                col += 1
+            first_col = col
+        cursor = self._cursors.get(num_tips, 0)
+        for col in range(max(first_col, cursor), len(self._masks)):
+            found = _first_run(self._masks[col], num_tips)
+            if found is not None:
+                if first_col <= cursor:
+                    self._cursors[num_tips] = col
+                return self._columns[col][found]
+        if first_col <= cursor:
+            self._cursors[num_tips] = len(self._masks)
+        return None
+
+    def previous_tip(self, num_tips: int) -> Optional[Well]:
+        for col, mask in enumerate(self._masks):
+            empties = ~mask & ((1 << len(self._columns[col])) - 1)
+            found = _first_run(empties, num_tips)
+            if found is not None:
+                return self._columns[col][found]
+        return None
+
+    def _target(self, start_well: Well, num_channels: int) -> Tuple[int, int]:
+        """ The column of `start_well`, and the bits of the wells in it that
+        `num_channels` channels starting at `start_well` reach
+        """
+        col, row = self._positions[start_well]
+        num_tips = min(len(self._columns[col]) - row, num_channels)
+        return col, ((1 << num_tips) - 1) << row
+
+    def use_tips(self, start_well: Well, num_channels: int,
+                 check_present: bool):
+        col, bits = self._target(start_well, num_channels)
+        if check_present:
+            assert self._masks[col] & bits == bits,\
+                '{} is out of tips'.format(str(start_well.parent))
+        self._update(col, self._masks[col] & ~bits)
+
+    def return_tips(self, start_well: Well, num_channels: int):
+        col, bits = self._target(start_well, num_channels)
+        occupied = self._masks[col] & bits
+        if occupied:
+            row = (occupied & -occupied).bit_length() - 1
+            raise AssertionError(
+                f'Well {repr(self._columns[col][row])} has a tip')
+        self._update(col, self._masks[col] | bits)
+
+    def set_tip(self, well: Well, has_tip: bool):
+        col, row = self._positions[well]
+        if has_tip:
+            self._update(col, self._masks[col] | (1 << row))
+        else:
+            self._update(col, self._masks[col] & ~(1 << row))
+
+    def reset(self):
+        for col, column in enumerate(self._columns):
+            self._update(col, (1 << len(column)) - 1)
+
+
 class Labware(DeckItem):
     """
     This class represents a labware, such as a PCR plate, a tube rack,
@@ -308,6 +453,7 @@ class Labware(DeckItem):
         self._display_name = "{} on {}".format(dn, str(parent.labware))
         self._calibrated_offset: Point = Point(0, 0, 0)
         self._wells: Sequence[Well] = []
+        self._tip_tracker: Optional[_TipTracker] = None
         # Directly from definition
         self._well_definition = definition['wells']
         self._parameters = definition['parameters']
@@ -317,6 +463,23 @@ class Labware(DeckItem):
         self._ordering = [well
                           for col in definition['ordering']
                           for well in col]
+        self._well_indices = {
+            well: idx for idx, well in enumerate(self._ordering)}
+        # The geometry of all the wells as arrays, in the order of
+        # _ordering, so that many wells can be located at once
+        ordered_defs = [self._well_definition[well]
+                        for well in self._ordering]
+        self._well_depths = np.array(
+            [well_def['depth'] for well_def in ordered_defs], dtype=float)
+        # NaN for rectangular wells
+        self._well_diameters = np.array(
+            [well_def.get('diameter', np.nan) for well_def in ordered_defs],
+            dtype=float)
+        self._uncalibrated_well_tops = np.array(
+            [(well_def['x'], well_def['y'], well_def['z'] + well_def['depth'])
+             for well_def in ordered_defs], dtype=float).reshape(-1, 3)
+        self._well_tops = self._uncalibrated_well_tops
+        self._wells_by_object: Optional[Dict[int, int]] = None
         self._offset\
             = Point(offset['x'], offset['y'], offset['z']) + parent.point
         self._parent = parent.labware
@@ -337,7 +500,7 @@ class Labware(DeckItem):
         return self._api_version
 
     def __getitem__(self, key: str) -> Well:
-        return self.wells_by_name()[key]
+        return self._wells[self._well_indices[key]]
 
     @property  # type: ignore
     @requires_version(2, 0)
@@ -398,15 +561,21 @@ class Labware(DeckItem):
         This function is used to create one instance of wells to be used by all
         accessor functions. It is only called again if a new offset needs
         to be applied.
+
+        The wells take their positions from the (already calibrated) array
+        of well positions, so that each well's accessors and the batch
+        accessors of the labware agree.
         """
+        parent = Location(self._calibrated_offset, self)
         return [
             Well(
                 self._well_definition[well],
-                Location(self._calibrated_offset, self),
+                parent,
                 "{} of {}".format(well, self._display_name),
                 self._is_tiprack,
-                self._api_version)
-            for well in self._ordering]
+                self._api_version,
+                position=Point(*top))
+            for well, top in zip(self._ordering, self._well_tops.tolist())]
 
     def _create_indexed_dictionary(self, group=0) -> Dict[str, List['Well']]:
         """
@@ -432,7 +601,12 @@ class Labware(DeckItem):
         self._calibrated_offset = Point(x=self._offset.x + delta.x,
                                         y=self._offset.y + delta.y,
                                         z=self._offset.z + delta.z)
+        self._well_tops = self._uncalibrated_well_tops\
+            + np.array(self._calibrated_offset, dtype=float)
         self._wells = self._build_wells()
+        self._wells_by_object = None
+        # the new wells start out with their tips again
+        self._tip_tracker = None
 
     @property  # type: ignore
     @requires_version(2, 0)
@@ -499,6 +673,110 @@ class Labware(DeckItem):
             '3.12.0. please wells_by_name or dict access')
         return self.wells_by_name()
 
+    def _well_index_array(
+            self, wells: Optional[Sequence[Union[Well, str]]]) -> Any:
+        """ The indices of `wells`, given as wells or well names, in the well
+        geometry arrays
+        """
+        if wells is None:
+            return slice(None)
+        if self._wells_by_object is None:
+            self._wells_by_object = {
+                id(well_obj): idx for idx, well_obj in enumerate(self._wells)}
+        indices = []
+        for well in wells:
+            if isinstance(well, str):
+                indices.append(self._well_indices[well])
+            elif id(well) in self._wells_by_object:
+                indices.append(self._wells_by_object[id(well)])
+            else:
+                # an equal well that is not one of ours, like a well of
+                # this labware from before it was last calibrated
+                indices.append(self._wells.index(well))
+        return np.array(indices, dtype=int)
+
+    @requires_version(2, 5)
+    def well_tops(
+            self, wells: Sequence[Union[Well, str]] = None,
+            z: float = 0.0) -> List[Point]:
+        """
+        Get the top-centers of many wells at once.
+
+        This is the batch equivalent of calling :py:meth:`.Well.top` on each
+        well, for when positions of many wells are needed (for instance, to
+        plan a transfer over a whole plate).
+
+        :param wells: The wells to locate, as :py:class:`.Well` objects or
+                      well names. If not specified, all the wells of the
+                      labware, in the order of :py:meth:`wells`.
+        :param z: A distance in mm to offset the positions by in z
+        :return: The absolute positions of the wells' top-centers, in deck
+                 coordinates
+
+        .. versionadded:: 2.5
+        """
+        tops = self._well_tops[self._well_index_array(wells)]
+        return _points(tops + np.array((0.0, 0.0, z)))
+
+    @requires_version(2, 5)
+    def well_bottoms(
+            self, wells: Sequence[Union[Well, str]] = None,
+            z: float = 0.0) -> List[Point]:
+        """
+        Get the bottom-centers of many wells at once.
+
+        This is the batch equivalent of calling :py:meth:`.Well.bottom` on
+        each well; see :py:meth:`well_tops` for the parameters.
+
+        .. versionadded:: 2.5
+        """
+        indices = self._well_index_array(wells)
+        bottoms = self._well_tops[indices]\
+            - np.array((0.0, 0.0, 1.0)) * self._well_depths[indices, None]
+        return _points(bottoms + np.array((0.0, 0.0, z)))
+
+    @requires_version(2, 5)
+    def well_centers(
+            self, wells: Sequence[Union[Well, str]] = None) -> List[Point]:
+        """
+        Get the centers of many wells at once.
+
+        This is the batch equivalent of calling :py:meth:`.Well.center` on
+        each well; see :py:meth:`well_tops` for the parameters.
+
+        .. versionadded:: 2.5
+        """
+        indices = self._well_index_array(wells)
+        return _points(
+            self._well_tops[indices]
+            - np.array((0.0, 0.0, 0.5)) * self._well_depths[indices, None])
+
+    @requires_version(2, 5)
+    def well_depths(
+            self, wells: Sequence[Union[Well, str]] = None) -> List[float]:
+        """
+        Get the depths of many wells at once, in mm; see :py:meth:`well_tops`
+        for the parameters.
+
+        .. versionadded:: 2.5
+        """
+        return self._well_depths[self._well_index_array(wells)].tolist()
+
+    @requires_version(2, 5)
+    def well_diameters(
+            self, wells: Sequence[Union[Well, str]] = None)\
+            -> List[Optional[float]]:
+        """
+        Get the diameters of many wells at once, in mm, with ``None`` for
+        rectangular wells like :py:attr:`.Well.diameter`; see
+        :py:meth:`well_tops` for the parameters.
+
+        .. versionadded:: 2.5
+        """
+        diameters = self._well_diameters[self._well_index_array(wells)]
+        return [None if np.isnan(diameter) else diameter
+                for diameter in diameters.tolist()]
+
     @requires_version(2, 0)
     def rows(self, *args) -> List[List[Well]]:
         """
@@ -642,6 +920,12 @@ class Labware(DeckItem):
     def tip_length(self, length: float):
         self._parameters['tipLength'] = length
 
+    @property
+    def _tips(self) -> '_TipTracker':
+        if not self._tip_tracker:
+            self._tip_tracker = _TipTracker(self.columns())
+        return self._tip_tracker
+
     def next_tip(self,
                  num_tips: int = 1,
                  starting_tip: Well = None) -> Optional[Well]:
@@ -657,35 +941,7 @@ class Labware(DeckItem):
         :return: the :py:class:`.Well` meeting the target criteria, or None
         """
         assert num_tips > 0, 'Bad call to next_tip: num_tips <= 0'
-
-        columns: List[List[Well]] = self.columns()
-
-        if starting_tip:
-            # Remove columns preceding the one with the pipette's starting tip
-            drop_undefined_columns = list(
-                dropwhile(lambda x: starting_tip not in x, columns))
-            # Remove tips preceding the starting tip in the first column
-            drop_undefined_columns[0] = list(
-                dropwhile(lambda w: starting_tip is not w,
-                          drop_undefined_columns[0]))
-            columns = drop_undefined_columns
-
-        drop_leading_empties = [
-            list(dropwhile(lambda x: not x.has_tip, column))
-            for column in columns]
-        drop_at_first_gap = [
-            list(takewhile(lambda x: x.has_tip, column))
-            for column in drop_leading_empties]
-        long_enough = [
-            column for column in drop_at_first_gap if len(column) >= num_tips]
-
-        try:
-            first_long_enough = long_enough[0]
-            result: Optional[Well] = first_long_enough[0]
-        except IndexError:
-            result = None
-
-        return result
+        return self._tips.next_tip(num_tips, starting_tip)
 
     def use_tips(self, start_well: Well, num_channels: int = 1):
         """
@@ -708,18 +964,11 @@ class Labware(DeckItem):
         :type num_channels: int
         """
         assert num_channels > 0, 'Bad call to use_tips: num_channels<=0'
-        # Select the column of the labware that contains the target well
-        target_column: List[Well] = [
-            col for col in self.columns() if start_well in col][0]
-
-        well_idx = target_column.index(start_well)
-        # Number of tips to pick up is the lesser of (1) the number of tips
-        # from the starting well to the end of the column, and (2) the number
-        # of channels of the pipette (so a 4-channel pipette would pick up a
-        # max of 4 tips, and picking up from the 2nd-to-bottom well in a
-        # column would get a maximum of 2 tips)
-        num_tips = min(len(target_column) - well_idx, num_channels)
-        target_wells = target_column[well_idx: well_idx + num_tips]
+        # The number of tips picked up is the lesser of (1) the number of
+        # tips from the starting well to the end of the column, and (2) the
+        # number of channels of the pipette (so a 4-channel pipette would
+        # pick up a max of 4 tips, and picking up from the 2nd-to-bottom well
+        # in a column would get a maximum of 2 tips)
 
         # In API version 2.2, we no longer reset the tip tracker when a tip
         # is dropped back into a tiprack well. This fixes a behavior where
@@ -729,12 +978,9 @@ class Labware(DeckItem):
         # An extension of work here is to have separate tip trackers for
         # dirty tips and non-present tips; but until then, we can avoid the
         # exception.
-        if self._api_version < APIVersion(2, 2):
-            assert all([well.has_tip for well in target_wells]),\
-                '{} is out of tips'.format(str(self))
-
-        for well in target_wells:
-            well.has_tip = False
+        self._tips.use_tips(
+            start_well, num_channels,
+            check_present=self._api_version < APIVersion(2, 2))
 
     def __repr__(self):
         return self._display_name
@@ -754,19 +1000,7 @@ class Labware(DeckItem):
         # This logic is the inverse of :py:meth:`next_tip`
         assert num_tips > 0, 'Bad call to previous_tip: num_tips <= 0'
 
-        columns = self.columns()
-        drop_leading_filled = [
-            list(dropwhile(lambda x: x.has_tip, column))
-            for column in columns]
-        drop_at_first_gap = [
-            list(takewhile(lambda x: not x.has_tip, column))
-            for column in drop_leading_filled]
-        long_enough = [
-            column for column in drop_at_first_gap if len(column) >= num_tips]
-        try:
-            return long_enough[0][0]
-        except IndexError:
-            return None
+        return self._tips.previous_tip(num_tips)
 
     def return_tips(self, start_well: Well, num_channels: int = 1):
         """
@@ -791,24 +1025,14 @@ class Labware(DeckItem):
         """
         # This logic is the inverse of :py:meth:`use_tips`
         assert num_channels > 0, 'Bad call to return_tips: num_channels <= 0'
-        # Select the column that contains the target_well
-        target_column = [col for col in self.columns() if start_well in col][0]
-        well_idx = target_column.index(start_well)
-        end_idx = min(well_idx + num_channels, len(target_column))
-        drop_targets = target_column[well_idx:end_idx]
-        for well in drop_targets:
-            if well.has_tip:
-                raise AssertionError(f'Well {repr(well)} has a tip')
-        for well in drop_targets:
-            well.has_tip = True
+        self._tips.return_tips(start_well, num_channels)
 
     @requires_version(2, 0)
     def reset(self):
         """Reset all tips in a tiprack
         """
         if self._is_tiprack:
-            for well in self.wells():
-                well.has_tip = True
+            self._tips.reset()
 
 
 def _get_parent_identifier(
@@ -830,37 +1054,200 @@ def _hash_labware_def(labware_def: LabwareDefinition) -> str:
     return sha256(sorted_def_str.encode('utf-8')).hexdigest()
 
 
-def _add_to_index_offset_file(labware: Labware, lw_hash: str):
-    index_file = CONFIG['labware_calibration_offsets_dir_v2'] / 'index.json'
-    uri = labware.uri
-    if index_file.exists():
-        blob = _read_file(str(index_file))
-    else:
-        blob = {}
+#: The file of the calibration offsets directory that maps labware URIs to
+#: the calibration files of their definitions
+OFFSET_INDEX_FILE = 'index.json'
+
+_FileKey = Tuple[int, int, int, int]
+
+
+def _file_key(path: Path) -> Optional[_FileKey]:
+    try:
+        stat = os.stat(str(path))
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+
+def _write_file(path: Path, data: Dict[str, Any]) -> Optional[_FileKey]:
+    # replace files rather than rewriting them in place, so that other
+    # processes loading labware at the same time (such as batch simulations)
+    # never read a partially written file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+            'w', dir=str(path.parent), delete=False) as f:
+        json.dump(data, f)
+    os.replace(f.name, str(path))
+    return _file_key(path)
 
+
+def _offset_index_entry(labware: Labware, lw_hash: str) -> Dict[str, Any]:
     mod_parent = _get_parent_identifier(labware.parent)
     slot = first_parent(labware)
     if mod_parent:
         mod_dict = {mod_parent: f'{slot}-{mod_parent}'}
     else:
         mod_dict = {}
-    blob[uri] = {
+    return {
             "id": f'{lw_hash}',
             "slot": f'{lw_hash}{mod_parent}',
             "module": mod_dict
         }
-    with index_file.open('w') as f:
-        json.dump(blob, f)
 
 
-def _get_labware_offset_path(labware: Labware):
-    calibration_path = CONFIG['labware_calibration_offsets_dir_v2']
-    calibration_path.mkdir(parents=True, exist_ok=True)
+class _CalibrationStore:
+    """ An in-memory view of the labware calibration offsets directory.
 
-    parent_id = _get_parent_identifier(labware.parent)
-    labware_hash = _hash_labware_def(labware._definition)
-    _add_to_index_offset_file(labware, labware_hash)
-    return calibration_path/f'{labware_hash}{parent_id}.json'
+    The definition of each labware is hashed (to name its calibration file)
+    once, the first time its calibration is looked up or saved. The offset
+    index and the calibration files are read once and kept; a calibration
+    file is only read again if a ``stat`` shows it changed on disk, and
+    saving a calibration through this module updates the file and the
+    cache together.
+
+    The index is only written when one of its entries changes, which it
+    rarely does once a labware has been used on the robot; within
+    :py:meth:`batch` it is written once, at the end. If the index changed on
+    disk since it was read (because another process loaded labware), the
+    entries of both are kept. Every file is written to a temporary file that
+    then replaces it, so that no reader ever sees a partially written file.
+
+    Everything but the hashes is forgotten after :py:meth:`invalidate` or
+    when the offsets directory in the config changes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._hashes: 'weakref.WeakKeyDictionary[Labware, str]'\
+            = weakref.WeakKeyDictionary()
+        self._root: Optional[Path] = None
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._index_key: Optional[_FileKey] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, Tuple[_FileKey, Dict[str, Any]]] = {}
+        self._batch_depth = 0
+
+    def _offsets_dir(self) -> Path:
+        root = Path(str(CONFIG['labware_calibration_offsets_dir_v2']))
+        if root != self._root:
+            self.invalidate()
+            root.mkdir(parents=True, exist_ok=True)
+            self._root = root
+        return root
+
+    def invalidate(self):
+        """ Forget the index and calibrations read so far, after the offsets
+        directory changed
+        """
+        with self._lock:
+            self._root = None
+            self._index = None
+            self._index_key = None
+            self._pending = {}
+            self._files = {}
+
+    def labware_hash(self, labware: Labware) -> str:
+        with self._lock:
+            lw_hash = self._hashes.get(labware)
+            if lw_hash is None:
+                lw_hash = _hash_labware_def(labware._definition)
+                self._hashes[labware] = lw_hash
+            return lw_hash
+
+    def file_name(self, labware: Labware) -> str:
+        """ The name (without extension) of the calibration file of a labware,
+        adding it to the offset index if it is not there yet
+        """
+        lw_hash = self.labware_hash(labware)
+        self.add_to_index(labware, lw_hash)
+        return f'{lw_hash}{_get_parent_identifier(labware.parent)}'
+
+    @staticmethod
+    def _read_index(root: Path) -> Tuple[Optional[_FileKey],
+                                         Dict[str, Dict[str, Any]]]:
+        index_path = root / OFFSET_INDEX_FILE
+        key = _file_key(index_path)
+        if key is None:
+            return None, {}
+        return key, _read_file(str(index_path))
+
+    def add_to_index(self, labware: Labware, lw_hash: str):
+        entry = _offset_index_entry(labware, lw_hash)
+        uri = labware.uri
+        with self._lock:
+            root = self._offsets_dir()
+            if self._index is None:
+                self._index_key, self._index = self._read_index(root)
+            if self._index.get(uri) == entry:
+                return
+            self._index[uri] = entry
+            self._pending[uri] = entry
+            if not self._batch_depth:
+                self._flush(root)
+
+    def _flush(self, root: Path):
+        if not self._pending:
+            return
+        index_path = root / OFFSET_INDEX_FILE
+        if self._index is None or _file_key(index_path) != self._index_key:
+            _, index = self._read_index(root)
+            index.update(self._pending)
+            self._index = index
+        self._index_key = _write_file(index_path, self._index)
+        self._pending = {}
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """ Write the offset index once, when the outermost batch ends, rather
+        than every time it changes
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._root:
+                    self._flush(self._root)
+
+    def read(self, name: str) -> Optional[Dict[str, Any]]:
+        """ The contents of a calibration file, or ``None`` if there is none
+        """
+        with self._lock:
+            path = self._offsets_dir() / f'{name}.json'
+            key = _file_key(path)
+            if key is None:
+                self._files.pop(name, None)
+                return None
+            cached = self._files.get(name)
+            if cached is None or cached[0] != key:
+                cached = (key, _read_file(str(path)))
+                self._files[name] = cached
+            return copy.deepcopy(cached[1])
+
+    def write(self, name: str, data: Dict[str, Any]):
+        with self._lock:
+            path = self._offsets_dir() / f'{name}.json'
+            key = _write_file(path, data)
+            if key is None:
+                self._files.pop(name, None)
+            else:
+                self._files[name] = (key, copy.deepcopy(data))
+
+
+_calibration_store = _CalibrationStore()
+
+
+def _add_to_index_offset_file(labware: Labware, lw_hash: str):
+    _calibration_store.add_to_index(labware, lw_hash)
+
+
+def calibration_batch() -> ContextManager[None]:
+    """ Group the lookups and saves of labware calibrations made within it,
+    so that the offset index is written at most once (when it ends)
+    """
+    return _calibration_store.batch()
 
 
 def save_calibration(labware: Labware, delta: Point):
@@ -870,11 +1257,12 @@ def save_calibration(labware: Labware, delta: Point):
     using labware id as the filename. If the file does exist, load it and
     modify the delta and the lastModified fields under the "default" key.
     """
-    labware_offset_path = _get_labware_offset_path(labware)
-    calibration_data = _helper_offset_data_format(
-        str(labware_offset_path), delta)
-    with labware_offset_path.open('w') as f:
-        json.dump(calibration_data, f)
+    name = _calibration_store.file_name(labware)
+    calibration_data = _calibration_store.read(name) or {}
+    default = calibration_data.setdefault('default', {})
+    default['offset'] = [delta.x, delta.y, delta.z]
+    default['lastModified'] = time.time()
+    _calibration_store.write(name, calibration_data)
     labware.set_calibration(delta)
 
 
@@ -885,11 +1273,14 @@ def save_tip_length(labware: Labware, length: float):
     using labware id as the filename. If the file does exist, load it and
     modify the length and the lastModified fields under the "tipLength" key.
     """
-    labware_offset_path = _get_labware_offset_path(labware)
-    calibration_data = _helper_tip_length_data_format(
-        str(labware_offset_path), length)
-    with labware_offset_path.open('w') as f:
-        json.dump(calibration_data, f)
+    name = _calibration_store.file_name(labware)
+    # The file should generally exist, as labware calibration has to happen
+    # prior to tip length calibration
+    calibration_data = _calibration_store.read(name) or {}
+    calibration_data['tipLength'] = {
+        'length': length,
+        'lastModified': time.time()}
+    _calibration_store.write(name, calibration_data)
     labware.tip_length = length
 
 
@@ -897,9 +1288,9 @@ def load_calibration(labware: Labware):
     """
     Look up a calibration if it exists and apply it to the given labware.
     """
-    labware_offset_path = _get_labware_offset_path(labware)
-    if labware_offset_path.exists():
-        calibration_data = _read_file(str(labware_offset_path))
+    calibration_data = _calibration_store.read(
+        _calibration_store.file_name(labware))
+    if calibration_data:
         offset_array = calibration_data['default']['offset']
         offset = Point(x=offset_array[0], y=offset_array[1], z=offset_array[2])
         labware.set_calibration(offset)
@@ -908,6 +1299,16 @@ def load_calibration(labware: Labware):
             labware.tip_length = tip_length
 
 
+def load_calibrations(labware: Iterable[Labware]):
+    """
+    Look up the calibrations of many labware at once (such as all the labware
+    on a deck) and apply them, writing the offset index at most once.
+    """
+    with calibration_batch():
+        for lw in labware:
+            load_calibration(lw)
+
+
 def _helper_offset_data_format(filepath: str, delta: Point) -> dict:
     if not Path(filepath).is_file():
         calibration_data = {
@@ -923,21 +1324,6 @@ def _helper_offset_data_format(filepath: str, delta: Point) -> dict:
     return calibration_data
 
 
-def _helper_tip_length_data_format(filepath: str, length: float) -> dict:
-    try:
-        calibration_data = _read_file(filepath)
-    except FileNotFoundError:
-        # This should generally not occur, as labware calibration has to happen
-        # prior to tip length calibration
-        calibration_data = {}
-
-    calibration_data['tipLength'] = {
-        'length': length,
-        'lastModified': time.time()}
-
-    return calibration_data
-
-
 def _read_file(filepath: str) -> dict:
     with open(filepath, 'r') as f:
         calibration_data = json.load(f)
@@ -995,12 +1381,140 @@ def save_definition(
     Path(def_path).parent.mkdir(parents=True, exist_ok=True)
     with open(def_path, 'w') as f:
         json.dump(labware_def, f)
+    _definition_registry.invalidate_custom()
 
 
 def delete_all_custom_labware() -> None:
     custom_def_dir = CONFIG['labware_user_definitions_dir_v2']
     if custom_def_dir.is_dir():
         shutil.rmtree(custom_def_dir)
+    _definition_registry.invalidate_custom()
+
+
+DefinitionKey = Tuple[str, str, int]
+
+
+def _index_definitions(
+        namespace_dir: Path, namespace: str) -> Dict[DefinitionKey, Path]:
+    """ Find the definition files of a namespace directory, which holds a
+    directory of versions per load name
+    """
+    index: Dict[DefinitionKey, Path] = {}
+    try:
+        load_name_dirs = list(os.scandir(namespace_dir))
+    except FileNotFoundError:
+        return index
+    for load_name_dir in load_name_dirs:
+        if not load_name_dir.is_dir():
+            continue
+        for version_file in os.scandir(load_name_dir.path):
+            version, ext = os.path.splitext(version_file.name)
+            if ext == '.json' and version.isdigit():
+                key = (namespace, load_name_dir.name, int(version))
+                index[key] = Path(version_file.path)
+    return index
+
+
+class _DefinitionRegistry:
+    """ An in-memory index of the labware definitions stored on the robot.
+
+    The first lookup indexes the definitions in shared data and in the custom
+    labware directory by namespace, load name and version, so that finding a
+    definition (or finding that there is none) does not touch the disk. Each
+    definition is then read and parsed at most once per process, and kept
+    pickled: callers still get their own copy, which they may modify (as
+    labware does when its tip length changes), and unpickling it is much
+    cheaper than parsing the JSON again.
+
+    Shared data does not change while the robot runs, but custom labware
+    does: the custom part of the index is rebuilt after
+    :py:meth:`invalidate_custom` or when the custom labware directory in the
+    config changes.
+    """
+
+    def __init__(self) -> None:
+        self._standard: Optional[Dict[DefinitionKey, Path]] = None
+        self._custom: Optional[Dict[DefinitionKey, Path]] = None
+        self._custom_root: Optional[Path] = None
+        self._definitions: Dict[DefinitionKey, bytes] = {}
+
+    def _index(self, namespace: str) -> Dict[DefinitionKey, Path]:
+        if namespace == OPENTRONS_NAMESPACE:
+            if self._standard is None:
+                self._standard = _index_definitions(
+                    get_shared_data_root() / STANDARD_DEFS_PATH,
+                    OPENTRONS_NAMESPACE)
+            return self._standard
+        custom_root = Path(str(CONFIG['labware_user_definitions_dir_v2']))
+        if self._custom is None or custom_root != self._custom_root:
+            self.invalidate_custom()
+            custom: Dict[DefinitionKey, Path] = {}
+            if custom_root.is_dir():
+                for namespace_dir in os.scandir(custom_root):
+                    if namespace_dir.is_dir():
+                        custom.update(_index_definitions(
+                            Path(namespace_dir.path), namespace_dir.name))
+            self._custom = custom
+            self._custom_root = custom_root
+        return self._custom
+
+    def get(self, namespace: str, load_name: str,
+            version: int) -> LabwareDefinition:
+        """ Get a definition by namespace, load name and version.
+
+        :raises FileNotFoundError: If there is no such definition
+        """
+        try:
+            key = (namespace, load_name, int(version))
+        except ValueError:
+            raise FileNotFoundError(
+                f'No definition for {namespace}/{load_name} v{version}')
+        index = self._index(namespace)
+        if key in self._definitions:
+            return pickle.loads(self._definitions[key])
+        def_path = index.get(key)
+        if def_path is None:
+            if namespace == OPENTRONS_NAMESPACE:
+                raise FileNotFoundError(
+                    f'No definition for {namespace}/{load_name} v{version}')
+            # custom definitions may also have been added without going
+            # through save_definition, so check before giving up
+            def_path = _get_path_to_labware(load_name, namespace, version)
+        with open(def_path, 'rb') as f:
+            definition = json.loads(f.read().decode('utf-8'))
+        index[key] = def_path
+        self._definitions[key] = pickle.dumps(
+            definition, pickle.HIGHEST_PROTOCOL)
+        return definition
+
+    def preload(self):
+        """ Index all the definitions and parse the standard ones ahead of
+        their first lookup
+        """
+        for key in self._index(OPENTRONS_NAMESPACE):
+            self.get(*key)
+        self._index(CUSTOM_NAMESPACE)
+
+    def invalidate_custom(self):
+        """ Forget the custom labware definitions indexed and parsed so far,
+        after the custom labware directory changed
+        """
+        self._custom = None
+        self._custom_root = None
+        self._definitions = {
+            key: pickled for key, pickled in self._definitions.items()
+            if key[0] == OPENTRONS_NAMESPACE}
+
+
+_definition_registry = _DefinitionRegistry()
+
+
+def preload_definitions():
+    """ Index the labware definitions on the robot and parse the standard
+    ones now rather than on first use, for processes that go on to load many
+    protocols (like the workers of :py:mod:`opentrons.simulate_batch`)
+    """
+    _definition_registry.preload()
 
 
 def _get_labware_definition_from_bundle(
@@ -1080,11 +1594,10 @@ def _get_standard_labware_definition(
                 load_name, checked_version, OPENTRONS_NAMESPACE))
 
     namespace = namespace.lower()
-    def_path = _get_path_to_labware(load_name, namespace, checked_version)
 
     try:
-        with open(def_path, 'rb') as f:
-            labware_def = json.loads(f.read().decode('utf-8'))
+        labware_def = _definition_registry.get(
+            namespace, load_name, checked_version)
     except FileNotFoundError:
         raise FileNotFoundError(
             f'Labware "{load_name}" not found with version {checked_version} '
@@ -1105,16 +1618,11 @@ def verify_definition(contents: Union[AnyStr, LabwareDefinition])\
     :raises jsonschema.ValidationError: If the definition is not valid.
     :returns: The parsed definition
     """
-    schema_body = load_shared_data('labware/schemas/2.json').decode('utf-8')
-    labware_schema_v2 = json.loads(schema_body)
-
     if isinstance(contents, dict):
         to_return = contents
-        jsonschema.validate(to_return, labware_schema_v2)
-
     else:
         to_return = json.loads(contents)
-        jsonschema.validate(to_return, labware_schema_v2)
+    validate_schema(to_return, 'labware/schemas/2')
     return to_return
 
 
@@ -1193,6 +1701,7 @@ def clear_calibrations():
             target.unlink()
     except FileNotFoundError:
         pass
+    _calibration_store.invalidate()
 
 
 def quirks_from_any_parent(
@@ -17,7 +17,7 @@ from typing import Any, Dict, Mapping, Optional, Type, TypeVar, Union
 import numpy as np  # type: ignore
 import jsonschema  # type: ignore
 
-from opentrons.system.shared_data import load_shared_data
+from opentrons.system.shared_data import load_shared_data, validate_schema
 from opentrons.types import Location, Point, LocationLabware
 from opentrons.protocols.types import APIVersion
 from .definitions import MAX_SUPPORTED_VERSION, DeckItem, V2_MODULE_DEF_VERSION
@@ -468,9 +468,8 @@ def load_module_from_definition(
         # v1 definitions don't have schema versions
         return _load_from_v1(definition, parent, api_level)
     if schema == 'module/schemas/2':
-        schema_doc = json.loads(load_shared_data("module/schemas/2.json"))
         try:
-            jsonschema.validate(definition, schema_doc)
+            validate_schema(definition, schema)
         except jsonschema.ValidationError:
             log.exception("Failed to validate module def schema")
             raise RuntimeError('The specified module definition is not valid.')
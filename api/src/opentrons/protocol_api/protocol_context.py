@@ -468,6 +468,9 @@ class ProtocolContext(CommandPublisher):
                         loop=self._hw_manager.hardware.loop),
                     sim_model=resolved_model.value))
             hc_mod_instance._connect()
+            clock = self._hw_manager.hardware.simulator_clock
+            if clock:
+                hc_mod_instance.attach_clock(clock)
         if hc_mod_instance:
             mod_ctx = mod_class(self,
                                 hc_mod_instance,
@@ -14,7 +14,8 @@ from typing import Any, Dict, Union
 import jsonschema  # type: ignore
 
 from opentrons.config import feature_flags as ff
-from opentrons.system.shared_data import load_shared_data
+from opentrons.system.shared_data import (
+    load_schema, matches_schema, validate_schema)
 from .types import (Protocol, PythonProtocol, JsonProtocol,
                     Metadata, APIVersion, MalformedProtocolError)
 from .bundle import extract_bundle
@@ -298,8 +299,8 @@ def _get_protocol_schema_version(protocol_json: Dict[Any, Any]) -> int:
         'Make sure there is a version number under "schemaVersion"')
 
 
-def _get_schema_for_protocol(version_num: int) -> Dict[Any, Any]:
-    """ Retrieve the json schema for a protocol schema version
+def _get_schema_for_protocol(version_num: int) -> str:
+    """ Retrieve the name of the json schema for a protocol schema version
     """
     # TODO(IL, 2020/03/05): use $otSharedSchema, but maybe wait until
     # deprecating v1/v2 JSON protocols?
@@ -307,27 +308,19 @@ def _get_schema_for_protocol(version_num: int) -> Dict[Any, Any]:
         raise RuntimeError(
             f'JSON Protocol version {version_num} is not yet ' +
             'supported in this version of the API')
+    name = f'protocol/schemas/{version_num}'
     try:
-        schema = load_shared_data(
-            f'protocol/schemas/{version_num}.json')
+        load_schema(name)
     except FileNotFoundError:
-        schema = None  # type: ignore
-    if not schema:
         raise RuntimeError('JSON Protocol schema "{}" does not exist'
                            .format(version_num))
-    return json.loads(schema.decode('utf-8'))
+    return name
 
 
 def validate_json(protocol_json: Dict[Any, Any]) -> int:
     """ Validates a json protocol and returns its schema version """
     # Check if this is actually a labware
-    labware_schema_v2 = json.loads(load_shared_data(
-        'labware/schemas/2.json').decode('utf-8'))
-    try:
-        jsonschema.validate(protocol_json, labware_schema_v2)
-    except jsonschema.ValidationError:
-        pass
-    else:
+    if matches_schema(protocol_json, 'labware/schemas/2'):
         MODULE_LOG.error("labware uploaded instead of protocol")
         raise RuntimeError(
             'The file you are trying to open is a JSON labware definition, '
@@ -352,17 +345,9 @@ def validate_json(protocol_json: Dict[Any, Any]) -> int:
         )
     protocol_schema = _get_schema_for_protocol(version_num)
 
-    # instruct schema how to resolve all $ref's used in protocol schemas
-    resolver = jsonschema.RefResolver(
-        protocol_schema.get('$id', ''),
-        protocol_schema,
-        store={
-            "opentronsLabwareSchemaV2": labware_schema_v2
-        })
-
     # do the validation
     try:
-        jsonschema.validate(protocol_json, protocol_schema, resolver=resolver)
+        validate_schema(protocol_json, protocol_schema)
     except jsonschema.ValidationError:
         MODULE_LOG.exception("JSON protocol validation failed")
         raise RuntimeError(
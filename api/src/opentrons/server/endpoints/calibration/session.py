@@ -243,9 +243,7 @@ class CalibrationSession:
         moves = plan_arc(from_pt, to_loc.point, safe,
                          origin_cp=None,
                          dest_cp=cp)
-        for move in moves:
-            await self.hardware.move_to(
-                mount, move[0], critical_point=move[1])
+        await self.hardware.move_through(mount, moves)
 
 
 # TODO: BC: move the check specific stuff to the check sub dir
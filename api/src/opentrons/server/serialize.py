@@ -1,65 +1,168 @@
-import functools
+""" Serialization of object trees for the RPC servers.
 
+Objects are serialized as ``{'i': <id of the object>, 't': <id of its type>,
+'v': <its serialized public attributes>}`` and every object (and type) that
+is serialized is kept in a reference table, so that clients can refer back to
+it by id. An object that appears more than once in a tree, for instance
+because of a circular reference, is serialized in full only once; its other
+appearances only carry its id and type, with a value of ``None``.
 
-def _get_object_tree(max_depth, path, refs, depth, obj):  # noqa C901
+Types that can be serialized more cheaply (or more usefully) than by walking
+all of their public attributes can register an encoder with
+:py:func:`register_encoder`.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
 
-    def object_container(value):
+from opentrons.legacy_api.instruments.pipette import Pipette
+from opentrons.protocol_api.instrument_context import InstrumentContext
+from opentrons.protocol_api.labware import Labware, Well
+
+#: An encoder builds the attributes to serialize an object with
+Encoder = Callable[[Any], Dict[str, Any]]
+
+_PRIMITIVES = (str, int, bool, float, complex)
+
+_encoders: Dict[type, Encoder] = {}
+# The encoder and whether instances may be iterable, by type
+_type_info: Dict[type, Tuple[Optional[Encoder], bool]] = {}
+
+
+def register_encoder(cls: type, encoder: Encoder):
+    """ Serialize instances of `cls` (and of its subclasses) with `encoder`.
+
+    Rather than serializing all the public attributes of an instance, and
+    the items it yields if it is iterable, the value of the instance will be
+    the dict returned by ``encoder(instance)``, whose values are serialized
+    in turn.
+    """
+    _encoders[cls] = encoder
+    _type_info.clear()
+
+
+def _get_type_info(cls: type) -> Tuple[Optional[Encoder], bool]:
+    try:
+        return _type_info[cls]
+    except KeyError:
+        pass
+    encoder = next(
+        (_encoders[base] for base in cls.__mro__ if base in _encoders), None)
+    iterable = hasattr(cls, '__iter__') or hasattr(cls, '__getitem__')
+    _type_info[cls] = (encoder, iterable)
+    return encoder, iterable
+
+
+class _TreeBuilder:
+    def __init__(self, max_depth: int) -> None:
+        self._max_depth = max_depth
+        self.refs: Dict[int, Any] = {}
+        # Objects are kept alive until the whole tree is built so that their
+        # ids cannot be reused by objects created while it is being built
+        self._visited: Dict[int, Any] = {}
+
+    def _container(self, obj, value):
         # Save id of instance of object's type as a reference too
         # We will need it to keep track of types the same we are
         # tracking objects
         t = type(obj)
-        refs[id(t)] = t
+        self.refs[id(t)] = t
         return {'i': id(obj), 't': id(t), 'v': value}
 
-    # TODO: what's the better way to detect primitive types?
-    if isinstance(obj, (str, int, bool, float, complex)) or obj is None:
-        return obj
+    def build(self, obj, depth=0):  # noqa C901
+        if obj is None or isinstance(obj, _PRIMITIVES):
+            return obj
 
-    # If we have ourself in path, it's a circular reference
-    # we are terminating it with a valid id but a value of None
-    if hasattr(obj, '__dict__') and id(obj) in path:
-        return object_container(None)
+        has_dict = hasattr(obj, '__dict__')
+        # If we have seen this object already, it's either a circular or a
+        # shared reference: we are terminating it with a valid id but a
+        # value of None
+        if has_dict and id(obj) in self._visited:
+            return self._container(obj, None)
+        self._visited[id(obj)] = obj
 
-    # Shorthand for calling ourselves recursively
-    object_tree = functools.partial(
-        _get_object_tree, max_depth, path, refs, depth + 1)
+        # Cut-off at max_depth
+        # If max_depth == 0 (evaluates to False) — keep going
+        if self._max_depth and (depth >= self._max_depth):
+            return {}
 
-    path += [id(obj)]
+        if isinstance(obj, (list, tuple)):
+            return [self.build(o, depth + 1) for o in obj]
+        elif isinstance(obj, dict):
+            return self._container(obj, self._build_items(obj, depth))
+        elif not has_dict:
+            return self._container(obj, {})
 
-    # Cut-off at max_depth
-    # If max_depth == 0 (evaluates to False) — keep going
-    if max_depth and (depth >= max_depth):
-        return {}
+        self.refs[id(obj)] = obj
+        encoder, iterable = _get_type_info(type(obj))
+        if encoder:
+            return self._container(
+                obj, self._build_items(encoder(obj), depth))
 
-    if isinstance(obj, (list, tuple)):
-        return [object_tree(o) for o in obj]
-
-    def iterate(kv):
-        return {str(k): object_tree(v) for k, v in kv.items()}
-
-    if isinstance(obj, dict):
-        return object_container(iterate(obj))
-    elif hasattr(obj, '__dict__'):
-        refs[id(obj)] = obj
-        items = []
         # If Type is iterable we will iterate generating numeric keys and
         # and merge with the output
-        try:
-            items = [object_tree(o) for o in obj]
-        except TypeError:
-            pass
+        items = []
+        if iterable:
+            try:
+                items = [self.build(o, depth + 1) for o in obj]
+            except TypeError:
+                pass
         tail = {i: v for i, v in enumerate(items)}
 
         # Filter out private attributes
         attributes = {
             k: v for k, v in obj.__dict__.items()
             if not k.startswith('_')}
-        return object_container({**iterate(attributes), **tail})
-    else:
-        return object_container({})
+        return self._container(
+            obj, {**self._build_items(attributes, depth), **tail})
+
+    def _build_items(self, kv, depth):
+        return {str(k): self.build(v, depth + 1) for k, v in kv.items()}
 
 
 def get_object_tree(obj, max_depth=0):
-    refs = {}
-    tree = _get_object_tree(max_depth, [], refs, 0, obj)
-    return (tree, refs)
+    """ Serialize `obj`.
+
+    :param obj: The object to serialize
+    :param max_depth: How deep in the tree to serialize objects. Deeper
+                      objects are serialized as empty dicts. If 0, the whole
+                      tree is serialized.
+    :returns: The serialized tree, and a dict of the objects and types it
+              refers to by id
+    """
+    builder = _TreeBuilder(max_depth)
+    tree = builder.build(obj)
+    return (tree, builder.refs)
+
+
+def _encode_labware(labware: Labware) -> Dict[str, Any]:
+    return {'name': labware.name,
+            'load_name': labware.load_name,
+            'uri': labware.uri,
+            'parent': labware.parent,
+            'is_tiprack': labware.is_tiprack}
+
+
+def _encode_well(well: Well) -> Dict[str, Any]:
+    return {'display_name': well.display_name,
+            'parent': well.parent}
+
+
+def _encode_instrument(instrument: InstrumentContext) -> Dict[str, Any]:
+    return {'name': instrument.name,
+            'model': instrument.model,
+            'mount': instrument.mount,
+            'channels': instrument.channels}
+
+
+def _encode_legacy_pipette(pipette: Pipette) -> Dict[str, Any]:
+    return {'name': pipette.name,
+            'model': pipette.model,
+            'mount': pipette.mount,
+            'channels': pipette.channels,
+            'max_volume': pipette.max_volume,
+            'min_volume': pipette.min_volume}
+
+
+register_encoder(Labware, _encode_labware)
+register_encoder(Well, _encode_well)
+register_encoder(InstrumentContext, _encode_instrument)
+register_encoder(Pipette, _encode_legacy_pipette)
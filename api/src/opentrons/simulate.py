@@ -12,11 +12,13 @@ import logging
 import os
 import pathlib
 import queue
-from typing import (Any, Dict, List, Mapping, TextIO, Tuple, BinaryIO,
-                    Optional, Union)
+from typing import (Any, Dict, List, Mapping, NamedTuple, TextIO, Tuple,
+                    BinaryIO, Optional, Union)
 
 
 import opentrons
+from opentrons.hardware_control import API, ThreadManager
+from opentrons.hardware_control.simulator_clock import SimulatorClock
 from opentrons.hardware_control.simulator_setup import load_simulator
 from opentrons.protocol_api import execute, MAX_SUPPORTED_VERSION
 import opentrons.commands
@@ -30,6 +32,23 @@ from opentrons.protocols.types import (
 from .util.entrypoint_util import labware_from_paths, datafiles_from_paths
 
 
+class DurationEstimate(NamedTuple):
+    """ How long a protocol would take to run on a robot.
+
+    All times are in seconds.
+    """
+    #: The total run time
+    total: float
+    #: The time spent on each kind of action, e.g. ``'gantry'`` (moves),
+    #: ``'plunger'``, ``'home'``, ``'delay'``, ``'tempdeck'`` or
+    #: ``'thermocycler'``
+    by_action: Dict[str, float]
+    #: The top level commands of the run log, each a step of the protocol
+    steps: List[Mapping[str, Any]]
+    #: The run log, in which every command has a ``duration``
+    runlog: List[Mapping[str, Any]]
+
+
 class AccumulatingHandler(logging.Handler):
     def __init__(self, level, command_queue):
         """ Create the handler
@@ -54,20 +73,32 @@ class CommandScraper:
     The :py:attr:`commands` property contains the list of commands
     and log messages integrated together. Each element of the list is
     a dict following the pattern in the docs of :py:meth:`simulate`.
+
+    If the scraper has a clock, each command also records the simulated time
+    it took in its ``duration`` key. This is the time from the end of the
+    previous command at the same level (or the start of its parent) to the
+    end of the command, so it includes getting to where the command happens.
     """
 
     def __init__(self,
                  logger: logging.Logger,
                  level: str,
-                 broker: opentrons.broker.Broker) -> None:
+                 broker: opentrons.broker.Broker,
+                 clock: SimulatorClock = None) -> None:
         """ Build the scraper.
 
         :param logger: The :py:class:`logging.logger` to scrape
         :param level: The log level to scrape
         :param broker: Which broker to subscribe to
+        :param clock: The clock the simulation charges, if any
         """
         self._logger = logger
         self._broker = broker
+        self._clock = clock
+        # indices and start times of the commands still running
+        self._running: List[Tuple[int, float]] = []
+        # the time since which time is charged to the next command
+        self._mark = clock.now if clock else 0.0
         self._queue = queue.Queue()  # type: ignore
         if level != 'none':
             level = getattr(logging, level.upper(), logging.WARNING)
@@ -102,6 +133,9 @@ class CommandScraper:
         """ The callback subscribed to the broker """
         payload = message['payload']
         if message['$'] == 'before':
+            if self._clock:
+                self._running.append((len(self._commands), self._mark))
+                self._mark = self._clock.now
             self._commands.append({'level': self._depth,
                                    'payload': payload,
                                    'logs': []})
@@ -110,6 +144,11 @@ class CommandScraper:
             while not self._queue.empty():
                 self._commands[-1]['logs'].append(self._queue.get())
             self._depth = max(self._depth - 1, 0)
+            if self._clock and self._running:
+                index, started = self._running.pop()
+                self._mark = self._clock.now
+                command = self._commands[index]
+                command['duration'] = self._mark - started  # type: ignore
 
 
 def get_protocol_api(
@@ -219,14 +258,29 @@ def bundle_from_sim(
                           bundled_python={})
 
 
+def _get_hardware_simulator(
+        hardware_simulator_file_path: Optional[str],
+        clock: Optional[SimulatorClock]) -> Optional[HardwareToManage]:
+    if hardware_simulator_file_path:
+        return asyncio.get_event_loop().run_until_complete(
+            load_simulator(pathlib.Path(hardware_simulator_file_path),
+                           clock=clock)
+        )
+    elif clock:
+        return ThreadManager(API.build_hardware_simulator, clock=clock)
+    else:
+        return None
+
+
 def simulate(protocol_file: TextIO,
              file_name: str = None,
              custom_labware_paths: List[str] = None,
              custom_data_paths: List[str] = None,
              propagate_logs: bool = False,
              hardware_simulator_file_path: str = None,
-             log_level: str = 'warning') -> Tuple[List[Mapping[str, Any]],
-                                                  Optional[BundleContents]]:
+             log_level: str = 'warning',
+             clock: SimulatorClock = None) -> Tuple[List[Mapping[str, Any]],
+                                                    Optional[BundleContents]]:
     """
     Simulate the protocol itself.
 
@@ -257,6 +311,9 @@ def simulate(protocol_file: TextIO,
                        a payload do ``payload['text'].format(**payload)``.
         - ``logs``: Any log messages that occurred during execution of this
                     command, as a logging.LogRecord
+        - ``duration``: Only if ``clock`` is specified, how long the command
+                        would take on a robot, in seconds (see
+                        :py:class:`CommandScraper`)
 
     :param file-like protocol_file: The protocol file to simulate.
     :param str file_name: The name of the file
@@ -285,6 +342,10 @@ def simulate(protocol_file: TextIO,
     :param log_level: The level of logs to capture in the runlog. Default:
                       ``'warning'``
     :type log_level: 'debug', 'info', 'warning', or 'error'
+    :param clock: If specified, the simulation charges this clock with the
+                  time each action of the protocol would take on a robot.
+                  Only Protocol API v2 protocols can be timed. See
+                  :py:meth:`estimate_duration`.
     :returns: A tuple of a run log for user output, and possibly the required
               data to write to a bundle to bundle this protocol. The bundle is
               only emitted if bundling is allowed (see
@@ -305,18 +366,40 @@ def simulate(protocol_file: TextIO,
     else:
         extra_data = {}
 
-    hardware_simulator = None
-    if hardware_simulator_file_path:
-        hardware_simulator = asyncio.get_event_loop().run_until_complete(
-            load_simulator(pathlib.Path(hardware_simulator_file_path))
-        )
-
+    hardware_simulator = _get_hardware_simulator(
+        hardware_simulator_file_path, clock)
+    try:
+        return _simulate_contents(
+            contents, file_name, extra_labware, extra_data,
+            hardware_simulator, log_level, clock)
+    finally:
+        if isinstance(hardware_simulator, ThreadManager):
+            hardware_simulator.clean_up()
+
+
+def _simulate_contents(
+        contents: Union[str, bytes],
+        file_name: Optional[str],
+        extra_labware: Dict[str, Dict[str, Any]],
+        extra_data: Dict[str, bytes],
+        hardware_simulator: Optional[HardwareToManage],
+        log_level: str,
+        clock: Optional[SimulatorClock])\
+        -> Tuple[List[Mapping[str, Any]], Optional[BundleContents]]:
+    """ Simulate the contents of a protocol file with the labware and data
+    files it may use already loaded. See :py:meth:`simulate`.
+    """
+    stack_logger = logging.getLogger('opentrons')
     protocol = parse.parse(contents, file_name,
                            extra_labware=extra_labware,
                            extra_data=extra_data)
     bundle_contents:  Optional[BundleContents] = None
 
     if getattr(protocol, 'api_level', APIVersion(2, 0)) < APIVersion(2, 0):
+        if clock:
+            raise RuntimeError(
+                'Only Protocol API v2 protocols can be timed')
+
         def _simulate_v1():
             opentrons.robot.disconnect()
             opentrons.robot.reset()
@@ -336,7 +419,8 @@ def simulate(protocol_file: TextIO,
             bundled_data=getattr(protocol, 'bundled_data', None),
             hardware_simulator=hardware_simulator,
             extra_labware=gpa_extras)
-        scraper = CommandScraper(stack_logger, log_level, context.broker)
+        scraper = CommandScraper(
+            stack_logger, log_level, context.broker, clock)
         try:
             execute.run_protocol(protocol, context)
             if isinstance(protocol, PythonProtocol)\
@@ -351,6 +435,43 @@ def simulate(protocol_file: TextIO,
     return scraper.commands, bundle_contents
 
 
+def estimate_duration(protocol_file: TextIO,
+                      file_name: str = None,
+                      custom_labware_paths: List[str] = None,
+                      custom_data_paths: List[str] = None,
+                      hardware_simulator_file_path: str = None,
+                      log_level: str = 'warning') -> DurationEstimate:
+    """
+    Estimate how long a protocol would take to run on a robot.
+
+    This simulates the protocol like :py:meth:`simulate` (and takes the same
+    arguments) while charging a :py:class:`.SimulatorClock` with the time
+    each hardware action takes: moves are charged with their motion profile,
+    aspirates and dispenses with plunger moves at the speed of their flow
+    rate, delays with their duration, and modules with their temperature
+    ramps, holds and thermocycler profiles.
+
+    Only Protocol API v2 protocols can be timed.
+
+    :returns: The estimate. See :py:class:`DurationEstimate`.
+    """
+    clock = SimulatorClock()
+    runlog, _ = simulate(
+        protocol_file, file_name, custom_labware_paths, custom_data_paths,
+        hardware_simulator_file_path=hardware_simulator_file_path,
+        log_level=log_level, clock=clock)
+    return _build_estimate(runlog, clock)
+
+
+def _build_estimate(runlog: List[Mapping[str, Any]],
+                    clock: SimulatorClock) -> DurationEstimate:
+    return DurationEstimate(
+        total=clock.now,
+        by_action=clock.totals,
+        steps=[command for command in runlog if command['level'] == 0],
+        runlog=runlog)
+
+
 def format_runlog(runlog: List[Mapping[str, Any]]) -> str:
     """
     Format a run log (return value of :py:meth:`simulate``) into a
@@ -372,6 +493,33 @@ def format_runlog(runlog: List[Mapping[str, Any]]) -> str:
     return '\n'.join(to_ret)
 
 
+def _format_seconds(seconds: float) -> str:
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{int(hours)}:{int(minutes):02d}:{secs:04.1f}'
+
+
+def format_duration_estimate(estimate: DurationEstimate) -> str:
+    """
+    Format a duration estimate (return value of
+    :py:meth:`estimate_duration`) into a human-readable string
+
+    :param estimate: The output of a call to :py:func:`estimate_duration`
+    """
+    to_ret = []
+    for command in estimate.runlog:
+        to_ret.append(
+            f'{_format_seconds(command.get("duration", 0))}  '
+            + '\t' * command['level']
+            + command['payload'].get('text', '').format(**command['payload']))
+    to_ret.append('')
+    to_ret.extend(
+        f'{_format_seconds(seconds)}  {action}'
+        for action, seconds in sorted(estimate.by_action.items()))
+    to_ret.append(f'{_format_seconds(estimate.total)}  total')
+    return '\n'.join(to_ret)
+
+
 def _get_bundle_args(
         parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
     parser.add_argument(
@@ -474,8 +622,10 @@ def get_arguments(
         help='Print the opentrons package version and exit')
     parser.add_argument(
         '-o', '--output', action='store',
-        help='What to output during simulations',
-        choices=['runlog', 'nothing'],
+        help='What to output during simulations. "duration" outputs an '
+        'estimate of how long each command and the whole protocol would '
+        'take to run on a robot',
+        choices=['runlog', 'duration', 'nothing'],
         default='runlog')
     return parser
 
@@ -513,6 +663,7 @@ def main() -> int:
     args = parser.parse_args()
     # Try to migrate api v1 containers if needed
 
+    clock = SimulatorClock() if args.output == 'duration' else None
     runlog, maybe_bundle = simulate(
         args.protocol,
         args.protocol.name,
@@ -521,7 +672,8 @@ def main() -> int:
         + getattr(args, 'custom_data_file', []),
         hardware_simulator_file_path=getattr(args,
                                              'custom_hardware_simulator_file'),
-        log_level=args.log_level)
+        log_level=args.log_level,
+        clock=clock)
 
     if maybe_bundle:
         bundle_name = getattr(args, 'bundle', None)
@@ -535,6 +687,8 @@ def main() -> int:
 
     if args.output == 'runlog':
         print(format_runlog(runlog))
+    elif clock:
+        print(format_duration_estimate(_build_estimate(runlog, clock)))
 
     return 0
 
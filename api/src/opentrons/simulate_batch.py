@@ -0,0 +1,304 @@
+""" opentrons.simulate_batch: simulate many protocols at once
+
+This module has functions that simulate a batch of protocols across a pool of
+worker processes, and a console entrypoint to do so from the command line.
+
+Each worker is prepared once, when the pool starts: it imports the
+Opentrons stack, parses the standard labware definitions and builds the
+shared-data schema validators, and loads the custom labware, data files and
+hardware simulator setup shared by the whole batch. Every protocol then only
+pays for its own simulation, and its outcome is reported as a
+:py:class:`SimulationResult` rather than an exception, so one bad protocol
+does not stop the batch.
+"""
+
+import argparse
+import json
+import logging
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (Any, Dict, Iterator, List, Mapping, NamedTuple,
+                    Optional, Sequence)
+
+import opentrons
+from opentrons import simulate
+from opentrons.hardware_control import API, ThreadManager
+from opentrons.hardware_control.simulator_clock import SimulatorClock
+from opentrons.hardware_control.simulator_setup import (
+    SimulatorSetup, create_simulator, load_simulator_setup)
+from opentrons.protocol_api import labware
+from opentrons.protocol_api.execute import ExceptionInProtocolError
+from opentrons.system.shared_data import get_schema_validator
+from .util.entrypoint_util import labware_from_paths, datafiles_from_paths
+
+MODULE_LOG = logging.getLogger(__name__)
+
+#: The shared-data schemas protocols are validated against while simulating,
+#: whose validators each worker builds up front
+PRELOADED_SCHEMAS = ('labware/schemas/2', 'module/schemas/2',
+                     'protocol/schemas/3', 'protocol/schemas/4')
+
+
+class SimulationResult(NamedTuple):
+    """ The outcome of simulating one protocol of a batch """
+    #: The path of the protocol file
+    path: str
+    #: Whether the protocol simulated without errors
+    ok: bool
+    #: The commands the protocol ran, as dicts with the ``level`` of the
+    #: command (see :py:meth:`.simulate.simulate`), its ``text``, the
+    #: formatted ``logs`` emitted while it ran and, if durations were
+    #: estimated, its ``duration`` in seconds
+    runlog: List[Dict[str, Any]]
+    #: If the simulation failed, a dict with the ``type`` of the error, its
+    #: ``message`` and, for errors in the protocol itself, the ``line`` of the
+    #: protocol that raised it (or ``None``)
+    error: Optional[Dict[str, Any]]
+    #: If durations were estimated, how long the protocol would take to run
+    #: on a robot, in seconds
+    duration: Optional[float]
+    #: How long simulating the protocol took, in seconds
+    elapsed: float
+
+
+class _WorkerConfig(NamedTuple):
+    extra_labware: Dict[str, Dict[str, Any]]
+    extra_data: Dict[str, bytes]
+    simulator_setup: Optional[SimulatorSetup]
+    log_level: str
+    estimate_duration: bool
+
+
+# Set in each worker process by _initialize_worker
+_worker_config: Optional[_WorkerConfig] = None
+
+
+def _initialize_worker(custom_labware_paths: List[str],
+                       custom_data_paths: List[str],
+                       hardware_simulator_file_path: Optional[str],
+                       log_level: str,
+                       estimate_duration: bool):
+    """ Prepare a worker process to simulate protocols """
+    global _worker_config
+    logging.getLogger('opentrons').propagate = False
+    labware.preload_definitions()
+    for schema in PRELOADED_SCHEMAS:
+        get_schema_validator(schema)
+    simulator_setup = None
+    if hardware_simulator_file_path:
+        simulator_setup = load_simulator_setup(
+            pathlib.Path(hardware_simulator_file_path))
+    _worker_config = _WorkerConfig(
+        extra_labware=labware_from_paths(custom_labware_paths),
+        extra_data=datafiles_from_paths(custom_data_paths),
+        simulator_setup=simulator_setup,
+        log_level=log_level,
+        estimate_duration=estimate_duration)
+
+
+def _format_command(command: Mapping[str, Any]) -> Dict[str, Any]:
+    payload = command['payload']
+    formatted = {
+        'level': command['level'],
+        'text': payload.get('text', '').format(**payload),
+        'logs': [f'{record.levelname} ({record.module}): '
+                 f'{record.getMessage()}'
+                 for record in command['logs']]}
+    if 'duration' in command:
+        formatted['duration'] = command['duration']
+    return formatted
+
+
+def _format_error(error: Exception) -> Dict[str, Any]:
+    if isinstance(error, ExceptionInProtocolError):
+        return {'type': type(error.original_exc).__name__,
+                'message': error.message,
+                'line': error.line}
+    return {'type': type(error).__name__,
+            'message': str(error),
+            'line': getattr(error, 'lineno', None)}
+
+
+def _build_hardware(config: _WorkerConfig,
+                    clock: Optional[SimulatorClock]) -> ThreadManager:
+    if config.simulator_setup:
+        return ThreadManager(
+            create_simulator, config.simulator_setup, clock=clock)
+    return ThreadManager(API.build_hardware_simulator, clock=clock)
+
+
+def _simulate_one(path: str) -> SimulationResult:
+    """ Simulate the protocol at `path` in a worker process """
+    config = _worker_config
+    if not config:
+        raise RuntimeError('Worker process was not initialized')
+    start = time.monotonic()
+    clock = SimulatorClock() if config.estimate_duration else None
+    hardware: Optional[ThreadManager] = None
+    try:
+        hardware = _build_hardware(config, clock)
+        with open(path, 'rb') as protocol_file:
+            contents = protocol_file.read()
+        runlog, _ = simulate._simulate_contents(
+            contents, os.path.basename(path),
+            config.extra_labware, config.extra_data,
+            hardware, config.log_level, clock)
+    except Exception as e:
+        MODULE_LOG.debug(f'{path} failed to simulate', exc_info=True)
+        return SimulationResult(
+            path=path, ok=False, runlog=[], error=_format_error(e),
+            duration=None, elapsed=time.monotonic() - start)
+    finally:
+        if hardware:
+            hardware.clean_up()
+    return SimulationResult(
+        path=path, ok=True,
+        runlog=[_format_command(command) for command in runlog],
+        error=None,
+        duration=clock.now if clock else None,
+        elapsed=time.monotonic() - start)
+
+
+def simulate_batch(
+        protocol_paths: Sequence[str],
+        custom_labware_paths: List[str] = None,
+        custom_data_paths: List[str] = None,
+        hardware_simulator_file_path: str = None,
+        log_level: str = 'warning',
+        estimate_duration: bool = False,
+        workers: int = None) -> Iterator[SimulationResult]:
+    """
+    Simulate many protocols in parallel.
+
+    The protocols are simulated by a pool of worker processes, each of which
+    loads the custom labware, custom data and hardware simulator setup once
+    and uses them for all the protocols it simulates. Unlike
+    :py:meth:`.simulate.simulate`, a protocol failing to simulate does not
+    raise; the error is part of its result.
+
+    :param protocol_paths: The paths of the protocol files to simulate
+    :param custom_labware_paths: A list of directories to search for custom
+                                 labware (see :py:meth:`.simulate.simulate`)
+    :param custom_data_paths: A list of directories or files to load custom
+                              data files from (see
+                              :py:meth:`.simulate.simulate`)
+    :param hardware_simulator_file_path: A path to a JSON file defining the
+                                         hardware simulator to use for every
+                                         protocol
+    :param log_level: The level of logs to capture in the run logs
+    :param estimate_duration: Whether to estimate how long each protocol
+                              would take to run on a robot (see
+                              :py:meth:`.simulate.estimate_duration`)
+    :param workers: The number of worker processes. If not specified, the
+                    number of CPUs.
+    :returns: An iterator of the results, in the order of `protocol_paths`.
+              Results become available as the protocols finish simulating;
+              the worker processes stop once the iterator is exhausted.
+    """
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(custom_labware_paths or [],
+                      custom_data_paths or [],
+                      hardware_simulator_file_path,
+                      log_level,
+                      estimate_duration)) as executor:
+        yield from executor.map(_simulate_one, protocol_paths)
+
+
+def get_arguments(
+        parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """ Get the argument parser for this module
+
+    :param parser: A parser to add arguments to.
+    :returns argparse.ArgumentParser: The parser with arguments added.
+    """
+    parser.add_argument(
+        '-l', '--log-level',
+        choices=['debug', 'info', 'warning', 'error', 'none'],
+        default='warning',
+        help='Specify the level filter for logs to include in the run logs.')
+    parser.add_argument(
+        '-L', '--custom-labware-path',
+        action='append', default=[os.getcwd()],
+        help='Specify directories to search for custom labware definitions. '
+             'See opentrons_simulate.')
+    parser.add_argument(
+        '-D', '--custom-data-path',
+        action='append', default=[],
+        help='Specify directories or files to load custom data files from. '
+             'See opentrons_simulate.')
+    parser.add_argument(
+        '-s', '--custom-hardware-simulator-file',
+        type=str, default=None,
+        help='Specify a file that describes the features present in the '
+             'hardware simulator used for every protocol.')
+    parser.add_argument(
+        '-e', '--estimate-duration', action='store_true',
+        help='Estimate how long each protocol would take to run on a robot')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='The number of protocols to simulate at once. By default, the '
+             'number of CPUs.')
+    parser.add_argument(
+        '-o', '--output', action='store',
+        help='What to output for each protocol: a JSON object per line with '
+             'the full result, or only whether it failed and why',
+        choices=['json', 'summary'],
+        default='json')
+    parser.add_argument(
+        '-v', '--version', action='version',
+        version=f'%(prog)s {opentrons.__version__}',
+        help='Print the opentrons package version and exit')
+    parser.add_argument(
+        'protocols', metavar='PROTOCOL', nargs='+',
+        help='The protocol files to simulate.')
+    return parser
+
+
+def _format_summary(result: SimulationResult) -> str:
+    if result.ok:
+        summary = f'{result.path}: ok'
+        if result.duration is not None:
+            summary += f' (runs for {result.duration:.1f}s)'
+        return summary
+    error = result.error or {}
+    line = f' [line {error["line"]}]' if error.get('line') else ''
+    return f'{result.path}: {error.get("type")}{line}: '\
+        f'{error.get("message")}'
+
+
+# Note - this script is also set up as a setuptools entrypoint and thus does
+# an absolute minimum of work since setuptools does something odd generating
+# the scripts
+def main() -> int:
+    """ Run the batch simulation """
+    parser = argparse.ArgumentParser(
+        prog='opentrons_simulate_batch',
+        description='Simulate many OT-2 protocols at once')
+    parser = get_arguments(parser)
+    args = parser.parse_args()
+
+    failed = 0
+    for result in simulate_batch(
+            args.protocols,
+            custom_labware_paths=args.custom_labware_path,
+            custom_data_paths=args.custom_data_path,
+            hardware_simulator_file_path=args.custom_hardware_simulator_file,
+            log_level=args.log_level,
+            estimate_duration=args.estimate_duration,
+            workers=args.jobs):
+        failed += not result.ok
+        if args.output == 'json':
+            print(json.dumps(result._asdict()), flush=True)
+        else:
+            print(_format_summary(result), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,13 @@
 import typing
 import sys
+import json
 import logging
 import os
 from pathlib import Path
 from functools import lru_cache
 
+import jsonschema  # type: ignore
+
 log = logging.getLogger(__name__)
 
 ENV_SHARED_DATA_PATH = "OT_SHARED_DATA_PATH"
@@ -56,3 +59,92 @@ def load_shared_data(path: typing.Union[str, Path]) -> bytes:
     """
     with open(str(get_shared_data_root() / path), 'rb') as f:
         return f.read()
+
+
+#: The schemas that other schemas refer to with ``$ref``
+REFERENCED_SCHEMAS = ('labware/schemas/2',)
+
+
+@lru_cache(maxsize=None)
+def load_schema(name: str) -> typing.Dict[str, typing.Any]:
+    """
+    Load and parse a JSON schema from the shared data directory.
+
+    name is the path of the schema relative to the root of all shared data,
+    without its extension, as used in ``$otSharedSchema`` (e.g.
+    ``'labware/schemas/2'``). Schemas are parsed once per process and the
+    parsed schema is shared, so it must not be modified.
+    """
+    return json.loads(load_shared_data(f'{name}.json').decode('utf-8'))
+
+
+@lru_cache(maxsize=None)
+def get_schema_validator(name: str) -> typing.Any:
+    """
+    Get a validator for a JSON schema in the shared data directory.
+
+    Building a validator checks the schema itself against its metaschema and
+    loads the schemas it refers to, so validators are built once per schema
+    and reused, rather than on every validation as
+    :py:func:`jsonschema.validate` does.
+    """
+    schema = load_schema(name)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    store = {}
+    for referenced in REFERENCED_SCHEMAS:
+        referenced_schema = load_schema(referenced)
+        store[referenced_schema['$id']] = referenced_schema
+    resolver = jsonschema.RefResolver(
+        schema.get('$id', ''), schema, store=store)
+    return validator_cls(schema, resolver=resolver)
+
+
+def _structural_error(
+        instance: typing.Any,
+        schema: typing.Dict[str, typing.Any]) -> typing.Optional[str]:
+    """ Find what keeps `instance` from even having the shape of an object
+    matching `schema`: not being an object, or lacking one of its required
+    top level properties
+    """
+    if schema.get('type') != 'object':
+        return None
+    if not isinstance(instance, dict):
+        return f'{instance!r:.50} is not of type \'object\''
+    for key in schema.get('required', []):
+        if key not in instance:
+            return f'{key!r} is a required property'
+    return None
+
+
+def validate_schema(instance: typing.Any, name: str):
+    """
+    Validate a document against a JSON schema in the shared data directory.
+
+    Documents that are obviously something else, because they are not an
+    object or lack one of the schema's required top level properties, are
+    rejected without walking the whole document. Otherwise, the document is
+    validated by the cached validator of the schema (see
+    :py:func:`get_schema_validator`).
+
+    :param instance: The parsed JSON document to validate
+    :param name: The name of the schema, e.g. ``'labware/schemas/2'``
+    :raises jsonschema.ValidationError: If the document is not valid
+    """
+    message = _structural_error(instance, load_schema(name))
+    if message:
+        raise jsonschema.ValidationError(message)
+    error = jsonschema.exceptions.best_match(
+        get_schema_validator(name).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def matches_schema(instance: typing.Any, name: str) -> bool:
+    """
+    Check whether a document is valid according to a JSON schema in the
+    shared data directory (see :py:func:`validate_schema`).
+    """
+    if _structural_error(instance, load_schema(name)):
+        return False
+    return get_schema_validator(name).is_valid(instance)
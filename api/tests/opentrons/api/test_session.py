@@ -4,8 +4,7 @@ import pytest
 import base64
 
 from opentrons.api import session
-from opentrons.api.session import (
-    _accumulate, _dedupe)
+from opentrons.api.session import _Accumulator
 from tests.opentrons.conftest import state
 from functools import partial
 from opentrons.protocols.types import APIVersion
@@ -118,6 +117,70 @@ async def test_load_and_run_v2(
     assert session.protocol_text == protocol.text
 
 
+@pytest.mark.parametrize('protocol_file', ['testosaur_v2.py'])
+async def test_notification_deltas(
+        main_router,
+        protocol,
+        protocol_file,
+        loop):
+    session = main_router.session_manager.create(
+        name='<blank>',
+        contents=protocol.text)
+    await loop.run_in_executor(executor=None, func=session.run)
+
+    payloads = []
+    async for notification in main_router.notifications:
+        payload = notification['payload']
+        payloads.append(payload)
+        if isinstance(payload, dict) and payload['state'] == 'finished':
+            break
+
+    snapshot, *deltas = payloads
+    assert snapshot.state == 'loaded'
+    assert snapshot.version == 1
+    assert [delta['version'] for delta in deltas]\
+        == list(range(2, len(deltas) + 2))
+    assert all(delta['baseVersion'] == delta['version'] - 1
+               for delta in deltas)
+    assert all('commands' not in delta for delta in deltas)
+
+    command_log = {}
+    for delta in deltas:
+        command_log.update(delta['commandLog'])
+    assert command_log == session.command_log
+    assert deltas[-1]['lastCommand']['id'] == len(session.command_log) - 1
+    assert 'startTime' in deltas[0]
+    assert 'startTime' not in deltas[-1]
+    assert session.resync().version == deltas[-1]['version']
+
+    session.refresh()
+    async for notification in main_router.notifications:
+        assert notification['payload'].state == 'loaded'
+        assert notification['payload'].commands == session.commands
+        break
+
+
+def test_refresh_sends_full_session(run_session, monkeypatch):
+    # a refresh may leave the commands, instruments, containers and modules
+    # in lists that are, or have the identities of, the ones already sent
+    same: list = []
+    for name in ('get_containers', 'get_instruments', 'get_modules'):
+        monkeypatch.setattr(run_session, name, lambda: same)
+    monkeypatch.setattr(session.tree, 'from_list', lambda commands: same)
+    payloads = []
+    monkeypatch.setattr(
+        run_session._broker, 'publish',
+        lambda topic, message: payloads.append(message['payload']))
+
+    run_session.refresh()
+    run_session.refresh()
+    assert len(payloads) == 2
+    assert all(payload is not run_session and not isinstance(payload, dict)
+               for payload in payloads)
+    run_session.set_state('loaded')
+    assert isinstance(payloads[-1], dict)
+
+
 def test_init(run_session):
     assert run_session.state == 'loaded'
     assert run_session.name == 'dino'
@@ -167,18 +230,15 @@ def test_error_append(run_session):
 
 
 def test_accumulate():
-    res = \
-        _accumulate([
-            (['a'], ['d'], ['g', 'h']),
-            (['b', 'c'], ['e', 'f'], ['i'])
-        ])
-
-    assert res == (['a', 'b', 'c'], ['d', 'e', 'f'], ['g', 'h', 'i'])
-    assert _accumulate([]) == ([], [], [], [])
-
-
-def test_dedupe():
-    assert ''.join(_dedupe('aaaaabbbbcbbbbcccaa')) == 'abc'
+    a, b = object(), object()
+    acc = _Accumulator()
+    acc.add((['i1'], [a], ['m1'], [('i1', a)]))
+    acc.add((['i1', 'i2'], [b, a], [], [('i1', a), ('i2', b)]))
+
+    assert acc.instruments == ['i1', 'i2']
+    assert acc.containers == [a, b]
+    assert acc.modules == ['m1']
+    assert acc.interactions == [('i1', a), ('i2', b)]
 
 
 async def test_session_model_functional(session_manager, protocol):
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+
+from opentrons.broker import (Broker, CoalescePolicy, Notifications,
+                              NotificationQueue)
+
+
+def test_queue_policies(loop):
+    queue = NotificationQueue(
+        maxsize=3,
+        policies={'state': CoalescePolicy.KEEP_LATEST,
+                  'log': CoalescePolicy.DROP_OLDEST,
+                  'misc': CoalescePolicy.DROP_NEWEST},
+        loop=loop)
+    queue.put_nowait('state', 's1')
+    queue.put_nowait('log', 'l1')
+    queue.put_nowait('log', 'l2')
+    # Full: the waiting state is replaced
+    queue.put_nowait('state', 's2')
+    # Full: the oldest log is dropped
+    queue.put_nowait('log', 'l3')
+    # Full: the new message is dropped
+    queue.put_nowait('misc', 'm1')
+    assert queue.qsize() == 3
+    assert [queue.get_nowait() for _ in range(3)] == ['s2', 'l2', 'l3']
+
+    metrics = queue.metrics
+    assert metrics['state'] == (0, 1, 2, 1, 0)
+    assert metrics['log'] == (0, 2, 3, 0, 1)
+    assert metrics['misc'] == (0, 0, 1, 0, 1)
+
+    # With nothing of their topic waiting, policies drop the oldest message
+    for message in ('l4', 'l5', 'l6'):
+        queue.put_nowait('log', message)
+    queue.put_nowait('state', 's3')
+    assert [queue.get_nowait() for _ in range(3)] == ['l5', 'l6', 's3']
+    assert queue.qsize() == 0
+
+
+def test_unbounded_queue_keeps_everything(loop):
+    queue = NotificationQueue(
+        policies={'state': CoalescePolicy.KEEP_LATEST}, loop=loop)
+    for index in range(100):
+        queue.put_nowait('state', index)
+    assert queue.qsize() == 100
+    assert queue.metrics['state'].max_depth == 100
+
+
+def test_dropped_messages_are_released(loop):
+    queue = NotificationQueue(
+        maxsize=10,
+        policies={'state': CoalescePolicy.KEEP_LATEST},
+        default_policy=CoalescePolicy.DROP_OLDEST,
+        loop=loop)
+    # Nothing ever reads the queue
+    for index in range(1000):
+        queue.put_nowait('log', index)
+        queue.put_nowait('state', index)
+    assert queue.qsize() == 10
+    assert len(queue._entries) == 10
+    assert sum(len(waiting) for waiting in queue._by_topic.values()) == 10
+    held = [entry.message for entry in queue._entries.values()]
+    assert held == [queue.get_nowait() for _ in range(10)]
+    assert not queue._entries
+
+
+async def test_publish_from_other_threads(loop):
+    broker = Broker()
+    notifications = Notifications(['a'], broker, loop=loop, maxsize=10)
+
+    def publish():
+        for index in range(100):
+            broker.publish('a', index)
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    await loop.run_in_executor(None, thread.join)
+
+    received = []
+    while notifications.queue.qsize():
+        received.append(await asyncio.wait_for(
+            notifications.__anext__(), 1))
+    assert received == list(range(90, 100))
+    assert notifications.metrics['a'].published == 100
+    assert notifications.metrics['a'].dropped == 90
+
+    # Publishing from the loop puts the message right away
+    broker.publish('a', 'now')
+    assert notifications.queue.qsize() == 1
+    assert await notifications.__anext__() == 'now'
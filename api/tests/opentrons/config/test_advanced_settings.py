@@ -169,3 +169,39 @@ async def test_disable_log_integration_side_effect_error(loop):
             s = advanced_settings.DisableLogIntegrationSettingDefinition()
             with pytest.raises(advanced_settings.SettingException):
                 await s.on_change(True)
+
+
+def test_settings_cache(tmp_path):
+    settings_file = tmp_path / 'settings.json'
+    advanced_settings.clear_settings_cache()
+    before = advanced_settings.settings_cache_stats()
+    first = advanced_settings._read_settings_file(settings_file)
+    # Reading a missing file writes the defaults, which are cached
+    assert settings_file.exists()
+    second = advanced_settings._read_settings_file(settings_file)
+    assert second == first
+    stats = advanced_settings.settings_cache_stats()
+    assert stats.misses == before.misses + 1
+    assert stats.hits == before.hits + 1
+
+    # What is read can be changed without changing the cache
+    second.settings_map['shortFixedTrash'] = True
+    assert advanced_settings._read_settings_file(settings_file)\
+        .settings_map['shortFixedTrash'] is None
+
+    # Writing through this module updates the cache
+    advanced_settings._write_settings_file(
+        {**first.settings_map, 'shortFixedTrash': True},
+        first.version, settings_file)
+    assert advanced_settings._read_settings_file(settings_file)\
+        .settings_map['shortFixedTrash'] is True
+    stats = advanced_settings.settings_cache_stats()
+    assert stats.misses == before.misses + 1
+
+    # Changing the file from elsewhere invalidates the cache
+    settings_file.write_text(
+        '{"shortFixedTrash": null, "_version": %d}' % first.version)
+    assert advanced_settings._read_settings_file(settings_file)\
+        .settings_map['shortFixedTrash'] is None
+    assert advanced_settings.settings_cache_stats().misses\
+        == before.misses + 2
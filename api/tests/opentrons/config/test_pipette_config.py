@@ -53,6 +53,46 @@ def test_versioned_aspiration(pipette_model, monkeypatch):
     assert now.ul_per_mm['aspirate'] != was.ul_per_mm['aspirate']
 
 
+def _reference_conversion(ul, sequence):
+    # How pieces were picked before conversions were compiled
+    return list(filter(lambda x: ul <= x[0], sequence))[0]
+
+
+@pytest.mark.parametrize('pipette_model', pipette_config.config_models)
+def test_volume_conversion_matches_sequence(pipette_model):
+    config = pipette_config.load(pipette_model)
+    for action in ('aspirate', 'dispense'):
+        sequence = config.ul_per_mm[action]
+        max_vol = sequence[-1][0]
+        volumes = [0, max_vol] + [piece[0] for piece in sequence] \
+            + [max_vol * i / 97 for i in range(98)]
+        expected = []
+        for ul in volumes:
+            piece = _reference_conversion(ul, sequence)
+            expected.append(piece[1]*ul + piece[2])
+        assert [pipette_config.piecewise_volume_conversion(ul, sequence)
+                for ul in volumes] == expected
+        assert pipette_config.piecewise_volume_conversion_batch(
+            volumes, sequence) == expected
+        with pytest.raises(IndexError):
+            pipette_config.piecewise_volume_conversion(max_vol + 1, sequence)
+        with pytest.raises(IndexError):
+            pipette_config.piecewise_volume_conversion_batch(
+                [1, max_vol + 1], sequence)
+
+
+def test_volume_conversion_compiled_once():
+    sequence = [[10, 1, 2], [5, 10, 10], [20, 2, 0]]
+    conversion = pipette_config.volume_conversion(sequence)
+    assert pipette_config.volume_conversion(
+        [list(piece) for piece in sequence]) is conversion
+    # Pieces are picked in order, so one below the max volume of an earlier
+    # piece is never used
+    assert conversion(7) == 1*7 + 2
+    assert conversion(15) == 2*15
+    assert conversion.batch([]) == []
+
+
 # TODO:
 # TODO: dispense agree
 @pytest.mark.parametrize('pipette_model', pipette_config.config_models)
@@ -13,7 +13,9 @@ import asyncio
 from threading import Lock
 from opentrons.drivers import serial_communication
 from opentrons.drivers.temp_deck import TempDeck
+from opentrons.drivers.temp_deck.driver import temp_locks
 from opentrons.drivers import utils
+from tests.opentrons.drivers.test_async_serial import FakeDevice
 
 
 @pytest.fixture
@@ -247,3 +249,28 @@ def test_dfu_command(monkeypatch, temp_deck):
 
     temp_deck.enter_programming_mode()
     assert command_log == ['dfu']
+
+
+async def test_connect_async(loop):
+    responses = {'M105': 'T:40 C:31',
+                 'M115': 'serial:TD1 model:temp_deck_v20 version:edge-1'}
+    device = FakeDevice(
+        loop, lambda command: responses.get(command[:4], ''))
+    temp_deck = TempDeck()
+    try:
+        assert await temp_deck.connect_async(device.port) == ''
+        assert temp_locks[device.port][1] is temp_deck
+        assert await temp_deck.update_temperature_async() == ''
+        assert temp_deck.temperature == 31
+        assert temp_deck.target == 40
+        info = await temp_deck.get_device_info_async()
+        assert info['model'] == 'temp_deck_v20'
+        # Other threads (like the legacy API) may still use the driver
+        info = await loop.run_in_executor(None, temp_deck.get_device_info)
+        assert info['serial'] == 'TD1'
+        with pytest.raises(RuntimeError):
+            temp_deck.get_device_info()
+    finally:
+        temp_deck.disconnect()
+        device.close()
+    assert device.port not in temp_locks
@@ -8,8 +8,10 @@
 # If you send a commmand to the serial comm module and it never sees the
 # expected ACK, then it'll eventually time out and return an error
 
+import asyncio
 import types
-from opentrons.drivers.thermocycler import Thermocycler
+from opentrons.drivers.thermocycler import Thermocycler, ProfileStep
+from tests.opentrons.drivers.test_async_serial import FakeDevice
 
 
 async def test_set_block_temperature():
@@ -78,3 +80,95 @@ async def test_deactivates():
     assert command_log.pop(0) == 'M108'
     await tc.deactivate_block()
     assert command_log.pop(0) == 'M14'
+
+
+async def test_poller_on_event_loop(loop):
+    responses = {'M119': 'Lid:closed',
+                 'M105': 'T:95.0 C:77.4 H:600',
+                 'M141': 'T:105.0 C:101.2',
+                 'M115': 'serial:TC1 model:tc_v1 version:v1.0.1'}
+    device = FakeDevice(
+        loop, lambda command: responses.get(command[:4], '') + '\r\n')
+    interrupts = []
+    updates = []
+    tc = Thermocycler(interrupts.append,
+                      lambda: updates.append(tc.temperature))
+    try:
+        await tc.connect(device.port)
+        assert tc.is_connected()
+        assert tc.lid_status == 'closed'
+        assert (await tc.get_device_info())['serial'] == 'TC1'
+        # The poller queries the status as soon as it starts
+        await asyncio.sleep(0.1)
+        assert tc.temperature == 77.4
+        assert tc.target == 95.0
+        assert tc.hold_time == 600
+        assert tc.lid_temp == 101.2
+        assert updates == [77.4]
+        # A shorter polling interval takes effect right away
+        tc.set_polling_interval(0.05)
+        await asyncio.sleep(0.15)
+        assert len(updates) >= 3
+        device.send('Lid:open\r\n')
+        await asyncio.sleep(0.1)
+        assert interrupts == ['Lid:open\r\n']
+    finally:
+        tc.disconnect()
+        device.close()
+    assert not tc.is_connected()
+
+
+class FakeFirmware:
+    """ Holds the block at the target of the last M104 as soon as it is
+    sent, and counts the hold time down by a second each time it is
+    queried """
+    def __init__(self):
+        self.target = 25.0
+        self.hold = 0
+
+    def respond(self, command):
+        if command.startswith('M104'):
+            params = {p[0]: float(p[1:]) for p in command.split()[1:]}
+            self.target = params['S']
+            self.hold = params.get('H', 0)
+        elif command.startswith('M105'):
+            status = f'T:{self.target} C:{self.target} H:{self.hold}'
+            self.hold = max(0, self.hold - 1)
+            return status + '\r\n'
+        elif command.startswith('M119'):
+            return 'Lid:closed\r\n'
+        elif command.startswith('M141'):
+            return 'T:105.0 C:105.0\r\n'
+        return '\r\n'
+
+
+async def test_execute_profile(loop):
+    firmware = FakeFirmware()
+    device = FakeDevice(loop, firmware.respond)
+    progress = []
+    tc = Thermocycler(lambda x: None,
+                      lambda: progress.append(tc.profile_step_index))
+    try:
+        await tc.connect(device.port)
+        tc.set_polling_interval(0.01)
+        profile = [ProfileStep(95, 2, None),
+                   ProfileStep(95, 2, None),
+                   ProfileStep(55, 0, 2.0)]
+        await asyncio.wait_for(tc.execute_profile(profile, volume=50), 5)
+        assert tc.profile_step_index == 2
+        assert tc.target == 55
+        assert progress[-1] == 2
+
+        steps = [command for command in device.received
+                 if command[:4] in ('M104', 'M566')]
+        assert steps == ['M104 S95 H2 V50', 'M104 S95 H2 V50',
+                         'M566 S2.0', 'M104 S55 V50']
+        # The second step has the same status as the end of the first one,
+        # but is only over when a status queried after it started says so
+        starts = [i for i, command in enumerate(device.received)
+                  if command.startswith('M104')]
+        queries = device.received[starts[1]:starts[2]]
+        assert queries.count('M105') >= 3
+    finally:
+        tc.disconnect()
+        device.close()
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import pty
+import re
+import tty
+
+import pytest
+
+from opentrons.drivers.async_serial import AsyncSerial
+from opentrons.drivers.serial_communication import SerialNoResponse
+
+ACK = 'ok\r\nok\r\n'
+
+
+class FakeDevice:
+    """ A device on the other end of a pseudo-terminal, which answers each
+    line written to it with what `responder` returns for it, after `delay`
+    seconds. Lines for which `responder` returns None are not answered.
+    Consecutive line terminators end a single line, so that a write of only
+    terminators (used to check that a device is there) is answered once. """
+
+    def __init__(self, loop, responder, delay=0):
+        self.loop = loop
+        self.responder = responder
+        self.delay = delay
+        self.received = []
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._buffer = b''
+        loop.add_reader(self._master, self._on_readable)
+
+    def _on_readable(self):
+        self._buffer += os.read(self._master, 1024)
+        *lines, self._buffer = re.split(rb'(?:\s*\r\n)+', self._buffer)
+        for line in lines:
+            command = line.decode().strip()
+            self.received.append(command)
+            response = self.responder(command)
+            if response is not None:
+                self.loop.call_later(self.delay, self.send, response + ACK)
+
+    def send(self, data):
+        os.write(self._master, data.encode())
+
+    def close(self):
+        self.loop.remove_reader(self._master)
+        os.close(self._master)
+        os.close(self._slave)
+
+
+@pytest.fixture
+def device(loop):
+    dev = FakeDevice(loop, lambda command: f'echo:{command}\r\n')
+    yield dev
+    dev.close()
+
+
+async def test_responses_match_commands(loop, device):
+    port = await AsyncSerial.open(port=device.port, ack=ACK, loop=loop)
+    try:
+        assert await port.write_and_return('M105\r\n') == 'echo:M105'
+        results = await asyncio.gather(
+            *[port.write_and_return(f'G{i}\r\n') for i in range(5)])
+        assert results == [f'echo:G{i}' for i in range(5)]
+        assert device.received == ['M105'] + [f'G{i}' for i in range(5)]
+    finally:
+        port.close()
+
+
+async def test_batch(loop, device):
+    port = await AsyncSerial.open(port=device.port, ack=ACK, loop=loop)
+    try:
+        other = loop.create_task(port.write_and_return('M18\r\n'))
+        batch = await port.write_and_return_batch(
+            ['M105\r\n', 'M119\r\n', 'M141\r\n'])
+        assert batch == ['echo:M105', 'echo:M119', 'echo:M141']
+        assert await other == 'echo:M18'
+    finally:
+        port.close()
+
+
+async def test_timeout_retries_and_recovers(loop, device):
+    device.responder = lambda command: None
+    port = await AsyncSerial.open(port=device.port, ack=ACK, loop=loop)
+    try:
+        with pytest.raises(SerialNoResponse):
+            await port.write_and_return('M105\r\n', timeout=0.1, retries=2)
+        assert device.received == ['M105', 'M105']
+        device.responder = lambda command: 'fine\r\n'
+        assert await port.write_and_return('M105\r\n') == 'fine'
+    finally:
+        port.close()
+
+
+async def test_cancelled_command_keeps_its_response(loop, device):
+    device.delay = 0.2
+    port = await AsyncSerial.open(port=device.port, ack=ACK, loop=loop)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                port.write_and_return('M105\r\n'), timeout=0.05)
+        # The response to the cancelled command is not mistaken for the
+        # response to the next one
+        assert await port.write_and_return('M119\r\n') == 'echo:M119'
+
+        # A command cancelled before it is written is never written
+        blocking = loop.create_task(port.write_and_return('G1\r\n'))
+        skipped = loop.create_task(port.write_and_return('G2\r\n'))
+        await asyncio.sleep(0.01)
+        skipped.cancel()
+        assert await blocking == 'echo:G1'
+        assert await port.write_and_return('G3\r\n') == 'echo:G3'
+        assert 'G2' not in device.received
+    finally:
+        port.close()
+
+
+async def test_unsolicited_lines(loop, device):
+    interrupts = []
+    port = await AsyncSerial.open(port=device.port, ack=ACK, loop=loop,
+                                  unsolicited_callback=interrupts.append)
+    try:
+        device.send('Lid:open\r\n')
+        await asyncio.sleep(0.1)
+        assert interrupts == ['Lid:open\r\n']
+        assert await port.write_and_return('M119\r\n') == 'echo:M119'
+    finally:
+        port.close()
+
+
+async def test_threadsafe(loop, device):
+    port = await AsyncSerial.open(port=device.port, ack=ACK, loop=loop)
+    try:
+        with pytest.raises(RuntimeError):
+            port.run_threadsafe(port.write_and_return('M105\r\n'))
+        result = await loop.run_in_executor(
+            None, port.run_threadsafe, port.write_and_return('M105\r\n'))
+        assert result == 'echo:M105'
+    finally:
+        port.close()
@@ -1,6 +1,6 @@
 from copy import deepcopy
 from threading import Thread
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 import pytest
 from time import sleep
 
@@ -145,16 +145,18 @@ def test_dwell_and_activate_axes(smoothie, monkeypatch):
     smoothie._set_saved_current()
     smoothie.dwell_axes('BCY')
     smoothie._set_saved_current()
+    # only the currents that change are sent (B and C have the same active
+    # and dwelling currents by default)
     expected = [
         ['M907 A0.1 B0.05 C0.05 X1.25 Y0.3 Z0.1 G4P0.005'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M907 X0.3 G4P0.005'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X1.25 Y1.25 Z0.1 G4P0.005'],
+        ['M907 X1.25 Y1.25 G4P0.005'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y1.25 Z0.1 G4P0.005'],
+        ['M907 X0.3 G4P0.005'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M907 Y0.3 G4P0.005'],
         ['M400'],
     ]
 
@@ -211,25 +213,25 @@ def test_plunger_commands(smoothie, monkeypatch):
 
     smoothie.home()
     expected = [
-        ['M907 A0.8 B0.05 C0.05 X0.3 Y0.3 Z0.8 G4P0.005 G28.2.+[ABCZ].+'],
+        ['M907 A0.8 Z0.8 G4P0.005 G28.2.+[ABCZ].+'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M907 A0.1 Z0.1 G4P0.005'],
         ['M400'],
         ['M203.1 Y50'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.8 Z0.1 G4P0.005 G91 G0Y-28 G0Y10 G90'],
+        ['M907 Y0.8 G4P0.005 G91 G0Y-28 G0Y10 G90'],
         ['M400'],
         ['M203.1 X80'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X1.25 Y0.3 Z0.1 G4P0.005 G28.2X'],
+        ['M907 X1.25 Y0.3 G4P0.005 G28.2X'],
         ['M400'],
-        ['M203.1 A125 B40 C40 X600 Y400 Z125'],
+        ['M203.1 X600 Y400'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M907 X0.3 G4P0.005'],
         ['M400'],
         ['M203.1 Y80'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y1.25 Z0.1 G4P0.005 G28.2Y'],
+        ['M907 Y1.25 G4P0.005 G28.2Y'],
         ['M400'],
         ['M203.1 Y8'],
         ['M400'],
@@ -239,9 +241,9 @@ def test_plunger_commands(smoothie, monkeypatch):
         ['M400'],
         ['G91 G0Y-3 G90'],
         ['M400'],
-        ['M203.1 A125 B40 C40 X600 Y400 Z125'],
+        ['M203.1 Y400'],
         ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M907 Y0.3 G4P0.005'],
         ['M400'],
         ['M114.2'],
         ['M400'],
@@ -251,7 +253,7 @@ def test_plunger_commands(smoothie, monkeypatch):
 
     smoothie.move({'X': 0, 'Y': 1.123456, 'Z': 2, 'A': 3})
     expected = [
-        ['M907 A0.8 B0.05 C0.05 X1.25 Y1.25 Z0.8 G4P0.005 G0.+'],
+        ['M907 A0.8 X1.25 Y1.25 Z0.8 G4P0.005 G0.+'],
         ['M400'],
     ]
     fuzzy_assert(result=command_log, expected=expected)
@@ -259,9 +261,7 @@ def test_plunger_commands(smoothie, monkeypatch):
 
     smoothie.move({'B': 2})
     expected = [
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005 G0B2'],
-        ['M400'],
-        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M907 A0.1 X0.3 Y0.3 Z0.1 G4P0.005 G0B2'],
         ['M400'],
     ]
     fuzzy_assert(result=command_log, expected=expected)
@@ -276,11 +276,9 @@ def test_plunger_commands(smoothie, monkeypatch):
         'C': 5.55})
     expected = [
         # Set active axes high
-        ['M907 A0.8 B0.05 C0.05 X1.25 Y1.25 Z0.8 G4P0.005 G0.+[BC].+'], # noqa(E501)
-        ['M400'],
-        # Set plunger current low
-        ['M907 A0.8 B0.05 C0.05 X1.25 Y1.25 Z0.8 G4P0.005'],
+        ['M907 A0.8 X1.25 Y1.25 Z0.8 G4P0.005 G0.+[BC].+'],
         ['M400'],
+        # The plunger current would be set low, but it is already low
     ]
     fuzzy_assert(result=command_log, expected=expected)
 
@@ -316,16 +314,16 @@ def test_set_active_current(smoothie, monkeypatch):
         # move all
         ['M907 A2 B2 C2 X2 Y2 Z2 G4P0.005 G0A0B0C0X0Y0Z0'],
         ['M400'],
-        ['M907 A2 B0 C0 X2 Y2 Z2 G4P0.005'],  # disable BC axes
+        ['M907 B0 C0 G4P0.005'],  # disable BC axes
         ['M400'],
         # move BC
         ['M907 A0 B2 C2 X0 Y0 Z0 G4P0.005 G0B1.3C1.3 G0B1C1'],
         ['M400'],
-        ['M907 A0 B0 C0 X0 Y0 Z0 G4P0.005'],  # disable BC axes
+        ['M907 B0 C0 G4P0.005'],  # disable BC axes
         ['M400'],
-        ['M907 A0 B0.42 C0.42 X0 Y0 Z0 G4P0.005 G28.2BC'],  # home BC
+        ['M907 B0.42 C0.42 G4P0.005 G28.2BC'],  # home BC
         ['M400'],
-        ['M907 A0 B0 C0 X0 Y0 Z0 G4P0.005'],  # dwell all axes after home
+        ['M907 B0 C0 G4P0.005'],  # dwell all axes after home
         ['M400'],
         ['M114.2'],  # update the position
         ['M400'],
@@ -384,13 +382,12 @@ def test_set_acceleration(smoothie, monkeypatch):
     smoothie.pop_acceleration()
 
     expected = [
-        ['M204 S10000 A4 B5 C6 X1 Y2 Z3'],
-        ['M400'],
-        ['M204 S10000 A4 B5 C6 X1 Y2 Z3'],
+        ['M204 A4 B5 C6 X1 Y2 Z3'],
         ['M400'],
-        ['M204 S10000 A40 B50 C60 X10 Y20 Z30'],
+        # popping the same acceleration that was pushed sends nothing
+        ['M204 A40 B50 C60 X10 Y20 Z30'],
         ['M400'],
-        ['M204 S10000 A4 B5 C6 X1 Y2 Z3'],
+        ['M204 A4 B5 C6 X1 Y2 Z3'],
         ['M400'],
     ]
     fuzzy_assert(result=command_log, expected=expected)
@@ -691,22 +688,20 @@ def test_clear_limit_switch(smoothie, monkeypatch):
         driver.move({'C': 100})
 
     assert [c.strip() for c in cmd_list] == [
-        # attempt to move and fail
-        'M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005 G0C100.3 G0C100',  # noqa(E501)
+        # attempt to move and fail (currents were already set by the home)
+        'G0C100.3 G0C100',
         # recover from failure
         'M999',
         'M400',
-        # set current for homing the failed axis (C)
+        # set current for homing the failed axis (C); the reset means the
+        # driver can no longer assume any currents were kept
         'M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005 G28.2C',
         'M400',
-        # set current back to idling after home
-        'M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005',
-        'M400',
+        # the idle current for C is the same as its active current, so
+        # there is no need to set currents back after the home
         # update position
         'M114.2',
         'M400',
-        'M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005',
-        'M400',
     ]
 
 
@@ -1143,3 +1138,240 @@ def test_per_move_speed(smoothie, robot, monkeypatch):
     smoothie.move({'Y': 100}, speed=100)
     assert command_log[0]\
         == 'G0F6000 M907 A0.1 B0.05 C0.05 X0.3 Y1.25 Z0.1 G4P0.005 G0Y100 G0F24000'  # noqa(E501)
+
+
+def test_streaming_defers_waits(smoothie, monkeypatch):
+    smoothie.simulating = False
+    command_log = []
+
+    def write_with_log(command, ack, connection, timeout, tag=None):
+        command_log.append(command.strip())
+        if command.startswith(driver_3_0.GCODES['LIMIT_SWITCH_STATUS']):
+            return 'X_max:0 Y_max:0 Z_max:0 A_max:0 B_max:0 C_max:0 Probe: 0'
+        return driver_3_0.SMOOTHIE_ACK
+
+    monkeypatch.setattr(serial_communication, 'write_and_return',
+                        write_with_log)
+
+    smoothie.configure_streaming(3)
+    assert smoothie.streaming
+    smoothie.move({'X': 100})
+    smoothie.move({'Y': 100})
+    # streamed moves are acked but not waited on
+    assert 'M400' not in command_log
+    assert len(smoothie.commands_in_flight) == 2
+
+    # filling the window synchronizes
+    smoothie.move({'X': 50})
+    assert command_log[-1] == 'M400'
+    assert command_log.count('M400') == 1
+    assert smoothie.commands_in_flight == []
+
+    # reads are synchronization points: in-flight moves are waited on first
+    command_log.clear()
+    smoothie.move({'Y': 50})
+    smoothie.switch_state
+    assert command_log == [
+        'M907 X0.3 Y1.25 G4P0.005 G0Y50',
+        'M400',
+        'M119',
+        'M400']
+
+    # disabling streaming restores a wait after every command
+    smoothie.configure_streaming(None)
+    assert not smoothie.streaming
+    command_log.clear()
+    smoothie.move({'X': 10})
+    assert command_log[-1] == 'M400'
+
+
+def test_streaming_error_blames_in_flight(smoothie, monkeypatch):
+    smoothie.simulating = False
+    command_log = []
+    fail_next_wait = False
+
+    def write_with_log(command, ack, connection, timeout, tag=None):
+        nonlocal fail_next_wait
+        command_log.append(command.strip())
+        if command.startswith('M400') and fail_next_wait:
+            fail_next_wait = False
+            return 'ALARM: Hard limit +X'
+        return driver_3_0.SMOOTHIE_ACK
+
+    monkeypatch.setattr(serial_communication, 'write_and_return',
+                        write_with_log)
+    homed = []
+    monkeypatch.setattr(smoothie, 'home', lambda axes: homed.append(axes))
+
+    smoothie.configure_streaming(4)
+    smoothie.move({'X': 100})
+    fail_next_wait = True
+    with pytest.raises(driver_3_0.SmoothieError) as e:
+        smoothie.switch_state
+    # the error came from the streamed move, not the read
+    assert 'G0X100' in e.value.command
+    assert 'M119' not in command_log
+    assert homed == ['X']
+    assert smoothie.commands_in_flight == []
+
+
+def test_streaming_hard_halt_clears_in_flight(smoothie, monkeypatch):
+    smoothie.simulating = False
+
+    def fake_write_and_return(command, ack, connection, timeout, tag=None):
+        return driver_3_0.SMOOTHIE_ACK
+
+    monkeypatch.setattr(serial_communication, 'write_and_return',
+                        fake_write_and_return)
+    monkeypatch.setattr(driver_3_0, 'sleep', lambda s: None)
+    smoothie.configure_streaming(4)
+    smoothie.move({'X': 100})
+    assert smoothie.commands_in_flight
+    smoothie.hard_halt()
+    assert smoothie.commands_in_flight == []
+    smoothie._is_hard_halting.clear()
+
+
+def test_streamed_block(smoothie, monkeypatch):
+    smoothie.simulating = False
+    command_log = []
+
+    def write_with_log(command, ack, connection, timeout, tag=None):
+        command_log.append(command.strip())
+        return driver_3_0.SMOOTHIE_ACK
+
+    monkeypatch.setattr(serial_communication, 'write_and_return',
+                        write_with_log)
+    with smoothie.streamed(5):
+        assert smoothie.streaming
+        smoothie.move({'X': 100})
+        smoothie.move({'Y': 100})
+        smoothie.move({'X': 50})
+        assert 'M400' not in command_log
+    # the block is waited on at its end, and streaming is off again
+    assert command_log[-1] == 'M400'
+    assert command_log.count('M400') == 1
+    assert not smoothie.streaming
+
+    # a wider window already configured is kept
+    smoothie.configure_streaming(8)
+    with smoothie.streamed(2):
+        pass
+    assert smoothie._stream_window == 8
+    smoothie.configure_streaming(None)
+
+
+def test_is_streamable():
+    assert driver_3_0._is_streamable(
+        'G0F6000 M907 A0.1 B0.05 C0.05 X0.3 Y1.25 Z0.1 G4P0.005 G0Y100')
+    assert driver_3_0._is_streamable('M55 M92 C100.0 G4P0.01')
+    assert not driver_3_0._is_streamable('M907 X0.3 G4P0.005 G28.2X')
+    assert not driver_3_0._is_streamable('G38.2 F420Z-10')
+    assert not driver_3_0._is_streamable('M114.2')
+    assert not driver_3_0._is_streamable('version')
+
+
+def test_coalesce_unchanged_settings(smoothie):
+    # nothing has been sent yet, so nothing can be removed
+    cmd = 'M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005 G0X10'
+    assert smoothie._coalesce(cmd)[0] == cmd
+    smoothie._send_command(cmd)
+    # unchanged currents (and the dwell that waits for them) are removed
+    assert smoothie._coalesce(cmd)[0] == 'G0X10'
+    # changed currents are sent alone
+    assert smoothie._coalesce(
+        'M907 A0.1 B0.05 C0.05 X1.25 Y0.3 Z0.1 G4P0.005 G0X10')[0]\
+        == 'M907 X1.25 G4P0.005 G0X10'
+    # feedrates and microstepping are shadowed too
+    smoothie._send_command('G0F24000 M53 M92 B100 G4P0.01')
+    assert smoothie._coalesce('G0F24000 M53 M92 B100 G4P0.01')[0] == ''
+    assert smoothie._coalesce('G0F600 M52 M92 B3200 G4P0.01')[0]\
+        == 'G0F600 M52 M92 B3200 G4P0.01'
+    # a dwell that isn't waiting on settings is left alone
+    assert smoothie._coalesce('G4P1.5')[0] == 'G4P1.5'
+    # as is anything the smoothie needs to do every time
+    assert smoothie._coalesce('G28.2X')[0] == 'G28.2X'
+
+    # once we can't trust that the smoothie kept its settings, they are
+    # sent again
+    smoothie._reset_from_error()
+    assert smoothie._coalesce(cmd)[0] == cmd
+
+
+def test_coalesce_and_send_under_one_lock(smoothie, monkeypatch):
+    # no other thread may send a setting between coalescing a command
+    # against the settings already sent and recording what it sent
+    smoothie.simulating = False
+    smoothie._invalidate_sent_settings()
+    events = []
+
+    def write_with_log(command, ack, connection, timeout, tag=None):
+        events.append(('send', deepcopy(smoothie._sent_settings)))
+        return driver_3_0.SMOOTHIE_ACK
+
+    lock = MagicMock()
+    lock.__enter__.side_effect = lambda *args: events.append(('acquire',))
+    lock.__exit__.side_effect = lambda *args: events.append(
+        ('release', deepcopy(smoothie._sent_settings)))
+    monkeypatch.setattr(serial_communication, 'write_and_return',
+                        write_with_log)
+    monkeypatch.setattr(smoothie, '_serial_lock', lock)
+
+    smoothie._send_command('M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005')
+    assert events[0] == ('acquire',)
+    assert events.count(('acquire',)) == 1
+    # sent under the lock, and recorded as sent before it is released
+    assert [name for name, *_ in events[1:-1]] == ['send'] * (len(events) - 2)
+    assert all(not settings for _, settings in events[1:-1])
+    assert events[-1][0] == 'release'
+    assert events[-1][1]
+
+
+def test_coalesced_counts(smoothie):
+    smoothie.home()
+    smoothie.reset_coalesced()
+    assert smoothie.coalesced == {'commands': 0, 'gcodes': 0, 'bytes': 0}
+
+    # an aspirate/dispense cycle: the plunger's currents go up for each
+    # move and back down afterwards, but the gantry's are unchanged
+    for _ in range(3):
+        smoothie.move({'B': 10})
+        smoothie.move({'B': 5})
+    coalesced = smoothie.coalesced
+    # the plunger's active and dwelling currents are the same by default, so
+    # the dwell after each move is not sent at all
+    assert coalesced['commands'] == 6
+    # and no move needs its currents (or the dwell after them) set either
+    assert coalesced['gcodes'] == 6 * 2 + 6 * 2
+    assert coalesced['bytes'] > 6 * len(
+        'M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005')
+
+
+def test_move_timeout_from_estimate(smoothie, monkeypatch):
+    smoothie.simulating = False
+    timeouts = []
+
+    def send_command_logger(command, timeout=12000.0, ack_timeout=5.0):
+        timeouts.append((command, timeout))
+
+    monkeypatch.setattr(smoothie, '_send_command', send_command_logger)
+
+    estimate = smoothie.estimate_move_time({'X': 100})
+    assert estimate > 0
+    smoothie.move({'X': 100})
+    assert smoothie.last_move_estimate == pytest.approx(estimate)
+    assert timeouts[0][1] == pytest.approx(
+        estimate * driver_3_0.MOVE_TIMEOUT_FACTOR
+        + driver_3_0.MOVE_TIMEOUT_MARGIN)
+
+    # slower moves get longer timeouts
+    timeouts.clear()
+    smoothie.move({'X': 200}, speed=10)
+    assert smoothie.last_move_estimate > estimate
+    assert timeouts[0][1] > estimate * driver_3_0.MOVE_TIMEOUT_FACTOR\
+        + driver_3_0.MOVE_TIMEOUT_MARGIN
+
+    # temporary max speeds are taken into account
+    with smoothie.restore_axis_max_speed({'X': 1}):
+        assert smoothie.estimate_move_time({'X': 150}) >= 50
+    assert smoothie.estimate_move_time({'X': 150}) < 50
@@ -0,0 +1,59 @@
+import pytest
+
+from opentrons.drivers.smoothie_drivers import motion_profile
+
+
+def test_trapezoid_time():
+    # reaches 100mm/s after 1mm at 10000mm/s2, so cruises for 98mm
+    assert motion_profile.trapezoid_time(100, 100, 5000) == pytest.approx(
+        98 / 100 + 2 * (100 / 5000))
+    # too short to reach full speed: accelerate halfway, decelerate halfway
+    assert motion_profile.trapezoid_time(1, 100, 5000) == pytest.approx(
+        2 * (1 / 5000) ** 0.5)
+    assert motion_profile.trapezoid_time(0, 100, 5000) == 0
+    with pytest.raises(ValueError):
+        motion_profile.trapezoid_time(10, 0, 5000)
+
+
+def test_move_profile_axis_limits():
+    start = {ax: 0 for ax in 'XYZABC'}
+    max_speeds = {'X': 600, 'Y': 400, 'Z': 125, 'A': 125, 'B': 40, 'C': 40}
+    accels = {'X': 3000, 'Y': 2000, 'Z': 1500, 'A': 1500, 'B': 200, 'C': 200}
+
+    # a single-axis move is limited by that axis
+    profile = motion_profile.move_profile(
+        start, {'Y': 100}, 1000, max_speeds, accels)
+    assert profile.distance == 100
+    assert profile.speed == 400
+    assert profile.acceleration == 2000
+    assert profile.duration == pytest.approx(
+        motion_profile.trapezoid_time(100, 400, 2000))
+
+    # the feedrate limits the move if it's slower than the axes
+    profile = motion_profile.move_profile(
+        start, {'X': 100}, 50, max_speeds, accels)
+    assert profile.speed == 50
+
+    # in a diagonal move, each axis only covers part of the distance
+    profile = motion_profile.move_profile(
+        start, {'X': 30, 'Y': 40}, 1000, max_speeds, accels)
+    assert profile.distance == pytest.approx(50)
+    assert profile.speed == pytest.approx(400 * 50 / 40)
+
+    # plunger-only moves are measured along the plunger
+    profile = motion_profile.move_profile(
+        start, {'B': 10}, 400, max_speeds, accels)
+    assert profile.distance == 10
+    assert profile.speed == 40
+
+    # the step rate limits speed, and sub-step moves don't happen
+    profile = motion_profile.move_profile(
+        start, {'B': 10}, 400, max_speeds, accels,
+        {'B': motion_profile.MAX_STEP_RATE / 20})
+    assert profile.speed == pytest.approx(20)
+    assert motion_profile.move_profile(
+        start, {'X': 0.001}, 400, max_speeds, accels, {'X': 80}).duration == 0
+
+    # axes that aren't moving don't count
+    assert motion_profile.move_profile(
+        start, {'X': 0, 'Y': 0}, 400, max_speeds, accels).duration == 0
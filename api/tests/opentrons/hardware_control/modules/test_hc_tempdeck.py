@@ -1,6 +1,7 @@
 import asyncio
 from opentrons.hardware_control import modules, ExecutionManager
-from opentrons.hardware_control.modules import tempdeck
+from opentrons.hardware_control.modules import status_watch, tempdeck
+from opentrons.drivers.temp_deck import SimulatingDriver
 
 
 async def test_sim_initialization(loop):
@@ -58,11 +59,12 @@ async def test_poller(monkeypatch, loop):
             loop=loop)
     hit = False
 
-    def update_called():
+    async def update_called():
         nonlocal hit
         hit = True
 
-    monkeypatch.setattr(temp._driver, 'update_temperature', update_called)
+    monkeypatch.setattr(
+        temp._driver, 'update_temperature_async', update_called)
     await temp._connect()
     assert temp._poller.is_alive()
     await asyncio.sleep(tempdeck.TEMP_POLL_INTERVAL_SECS * 1.1)
@@ -80,3 +82,63 @@ async def test_revision_model_parsing(loop):
     assert mag.model() == 'temperatureModuleV1'
     mag._device_info['model'] = 'temp_deck_v1.1'
     assert mag.model() == 'temperatureModuleV1'
+
+
+class RampingDriver(SimulatingDriver):
+    """ Heats by one degree each time its temperature is updated """
+    def __init__(self):
+        super().__init__()
+        self.current = 20.0
+        self.updates = 0
+
+    async def update_temperature_async(self):
+        self.updates += 1
+        if self._active:
+            self.current = min(self.current + 1, self._target_temp)
+
+    @property
+    def temperature(self) -> float:
+        return self.current
+
+    @property
+    def status(self) -> str:
+        if not self._active:
+            return 'idle'
+        if self.current < self._target_temp:
+            return 'heating'
+        return 'holding at target'
+
+
+async def test_await_temperature_on_update(monkeypatch, loop):
+    monkeypatch.setattr(tempdeck, 'TEMP_POLL_INTERVAL_SECS', 0.05)
+    temp = modules.tempdeck.TempDeck(
+            port='/dev/ot_module_sim_tempdeck0',
+            execution_manager=ExecutionManager(loop=loop),
+            simulating=True,
+            loop=loop)
+    driver = RampingDriver()
+    temp._driver = driver
+    await temp._connect()
+    await temp.start_set_temperature(25)
+    await asyncio.wait_for(temp.await_temperature(24), 1)
+    assert driver.current == 24
+    await asyncio.wait_for(temp.set_temperature(26), 1)
+    assert driver.current == 26
+    assert temp.status == 'holding at target'
+    # The temperature is only updated when needed
+    assert driver.updates < 10
+
+
+async def test_adaptive_poll_interval(loop):
+    temp = modules.tempdeck.TempDeck(
+            port='/dev/ot_module_sim_tempdeck0',
+            execution_manager=ExecutionManager(loop=loop),
+            simulating=True,
+            loop=loop)
+    await temp._connect()
+    await asyncio.sleep(0.01)
+    assert temp._poller._interval == status_watch.IDLE_POLL_INTERVAL_SECS
+    await temp.start_set_temperature(40)
+    assert temp._poller._interval == tempdeck.TEMP_POLL_INTERVAL_SECS
+    await temp.deactivate()
+    assert temp._poller._interval == status_watch.IDLE_POLL_INTERVAL_SECS
@@ -144,3 +144,29 @@ async def test_set_temperature(monkeypatch, loop):
                                                  volume=None,
                                                  ramp_rate=None)
     set_temp_driver_mock.reset_mock()
+
+
+async def test_cycle_progress(loop):
+    hw_tc = await modules.build(port='/dev/ot_module_sim_thermocycler0',
+                                which='thermocycler',
+                                simulating=True,
+                                interrupt_callback=lambda x: None,
+                                loop=loop,
+                                execution_manager=ExecutionManager(loop=loop))
+    assert hw_tc.current_cycle_index is None
+    assert hw_tc.current_step_index is None
+
+    await hw_tc.cycle_temperatures(
+        steps=[{'temperature': 95, 'hold_time_seconds': 10},
+               {'temperature': 60, 'hold_time_minutes': 1, 'ramp_rate': 2},
+               {'temperature': 72}],
+        repetitions=3, volume=25)
+    assert hw_tc.total_cycle_count == 3
+    assert hw_tc.total_step_count == 3
+    assert hw_tc.current_cycle_index == 3
+    assert hw_tc.current_step_index == 3
+    assert hw_tc.target == 72
+
+    await hw_tc.deactivate_block()
+    assert hw_tc.current_cycle_index is None
+    assert hw_tc.current_step_index is None
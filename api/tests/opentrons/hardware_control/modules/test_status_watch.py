@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from opentrons.hardware_control.modules.status_watch import (
+    StatusWatch, FAST_POLL_INTERVAL_SECS, IDLE_POLL_INTERVAL_SECS)
+
+
+async def test_waiters_resolve_on_notify(loop):
+    status = {'temperature': 20}
+    changes = []
+    watch = StatusWatch(lambda: changes.append(watch.waiting))
+
+    def reached():
+        return status['temperature'] >= 25
+
+    waiter = loop.create_task(watch.wait_for(reached))
+    await asyncio.sleep(0)
+    assert watch.waiting
+    assert changes == [True]
+
+    status['temperature'] = 22
+    watch.notify()
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    status['temperature'] = 25
+    watch.notify()
+    await asyncio.wait_for(waiter, 1)
+    assert not watch.waiting
+    assert changes == [True, False]
+
+    # A condition that already holds does not wait for an update
+    await asyncio.wait_for(watch.wait_for(reached), 1)
+
+
+async def test_cancelled_waiter(loop):
+    watch = StatusWatch()
+    waiter = loop.create_task(watch.wait_for(lambda: False))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert not watch.waiting
+    watch.notify()
+
+
+async def test_condition_errors_reach_waiter(loop):
+    watch = StatusWatch()
+    status = {'temperature': 20}
+    waiter = loop.create_task(
+        watch.wait_for(lambda: status['temperature'] > 25))
+    await asyncio.sleep(0)
+    status['temperature'] = None
+    watch.notify()
+    with pytest.raises(TypeError):
+        await waiter
+
+
+async def test_poll_interval(loop):
+    watch = StatusWatch()
+    assert watch.poll_interval(False, 1) == IDLE_POLL_INTERVAL_SECS
+    assert watch.poll_interval(True, 1) == 1
+
+    near = False
+    waiter = loop.create_task(
+        watch.wait_for(lambda: False, lambda: near))
+    await asyncio.sleep(0)
+    assert watch.poll_interval(False, 1) == 1
+    near = True
+    assert watch.poll_interval(False, 1) == FAST_POLL_INTERVAL_SECS
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from unittest import mock
 import pytest
 from opentrons import types
@@ -135,6 +136,62 @@ async def test_move_extras_passed_through(hardware_api, monkeypatch):
     assert mock_be_move.call_args_list[0][1]['axis_max_speeds'] == {'Y': 20}
 
 
+async def test_move_through(hardware_api, monkeypatch):
+    await hardware_api.home()
+    mount = types.Mount.RIGHT
+    await hardware_api.move_to(mount, types.Point(10, 20, 30))
+    mock_be_move = mock.Mock()
+    monkeypatch.setattr(hardware_api._backend, 'move', mock_be_move)
+    streamed = []
+
+    @contextmanager
+    def fake_streaming_moves(count):
+        streamed.append(count)
+        yield
+    monkeypatch.setattr(hardware_api._backend, 'streaming_moves',
+                        fake_streaming_moves)
+    waypoints = [(types.Point(10, 20, 80), None),
+                 (types.Point(10, 20, 100), None),
+                 (types.Point(60, 20, 100), None),
+                 (types.Point(60, 70, 100), None),
+                 (types.Point(60, 70, 30), None)]
+    await hardware_api.move_through(mount, waypoints, speed=30,
+                                    max_speeds={Axis.X: 10})
+    # The straight move up is merged into one, and the block is streamed
+    assert streamed == [4]
+    assert [call[0][0] for call in mock_be_move.call_args_list] == [
+        {'X': 10, 'Y': 20, 'A': 100},
+        {'X': 60, 'Y': 20, 'A': 100},
+        {'X': 60, 'Y': 70, 'A': 100},
+        {'X': 60, 'Y': 70, 'A': 30}]
+    assert all(call[1]['speed'] == 30
+               and call[1]['axis_max_speeds'] == {'X': 10}
+               for call in mock_be_move.call_args_list)
+    assert await hardware_api.gantry_position(mount) \
+        == types.Point(60, 70, 30)
+
+
+async def test_move_through_failure(hardware_api, monkeypatch):
+    await hardware_api.home()
+    mount = types.Mount.RIGHT
+    await hardware_api.move_to(mount, types.Point(10, 20, 30))
+    moves = []
+
+    def fail_second_move(target, **kwargs):
+        moves.append(target)
+        if len(moves) == 2:
+            raise RuntimeError('halted')
+    monkeypatch.setattr(hardware_api._backend, 'move', fail_second_move)
+    with pytest.raises(RuntimeError):
+        await hardware_api.move_through(
+            mount, [(types.Point(10, 20, 100), None),
+                    (types.Point(60, 20, 100), None),
+                    (types.Point(60, 20, 30), None)])
+    # The rest of the block is not sent, and the position is unknown
+    assert len(moves) == 2
+    assert not hardware_api._current_position
+
+
 async def test_mount_offset_applied(hardware_api):
     await hardware_api.home()
     abs_position = types.Point(30, 20, 10)
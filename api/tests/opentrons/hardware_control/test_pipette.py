@@ -82,6 +82,24 @@ def test_config_update():
         assert pip.config.top == sample_plunger_pos.get('top')
 
 
+def test_ul_per_mm():
+    pip = pipette.Pipette('p300_single_v2.0',
+                          {'single': [0, 0, 0], 'multi': [0, 0, 0]},
+                          'testID')
+    sequence = pip.config.ul_per_mm['aspirate']
+    volumes = [1, 50, 150, 300]
+    expected = [pipette_config.piecewise_volume_conversion(ul, sequence)
+                for ul in volumes]
+    assert [pip.ul_per_mm(ul, 'aspirate') for ul in volumes] == expected
+    assert pip.ul_per_mm_batch(volumes, 'aspirate') == expected
+
+    # Changing the function replaces the cached conversion
+    pip.update_config_item(
+        'ul_per_mm', {'aspirate': [[300, 0, 10]], 'dispense': [[300, 0, 5]]})
+    assert pip.ul_per_mm(150, 'aspirate') == 10
+    assert pip.ul_per_mm_batch([1, 300], 'dispense') == [5, 5]
+
+
 def test_smoothie_config_update(monkeypatch):
     for config in pipette_config.config_models:
         assert config == config
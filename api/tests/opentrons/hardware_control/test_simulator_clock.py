@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from opentrons import types
+from opentrons.config import robot_configs
+from opentrons.hardware_control import API
+from opentrons.hardware_control.simulator_clock import (
+    SimulatorClock, HOME_SETTLE_TIME, THERMOCYCLER_BLOCK_HEATING_RATE,
+    THERMOCYCLER_BLOCK_COOLING_RATE)
+
+
+@pytest.fixture
+def clock():
+    return SimulatorClock(robot_configs.build_config([], {}))
+
+
+def test_move_charges_motion_profile(clock):
+    start = {'X': 0, 'Y': 0, 'Z': 0, 'A': 0, 'B': 0, 'C': 0}
+    # a slow move: 1mm/s over 10mm, accelerating in well under a second
+    assert clock.move(start, {'X': 10}, speed=1) == pytest.approx(
+        10 + 1 / 3000)
+    assert clock.totals == {'gantry': pytest.approx(10 + 1 / 3000)}
+
+    # plunger moves are limited by the plunger's max speed
+    duration = clock.move(start, {'B': 10}, speed=1000)
+    assert duration == pytest.approx(10 / 40 + 40 / 200)
+    assert clock.totals['plunger'] == pytest.approx(duration)
+    assert clock.now == pytest.approx(sum(clock.totals.values()))
+
+    # nothing moves, no time passes
+    now = clock.now
+    assert clock.move(start, {'X': 0}) == 0
+    assert clock.now == now
+
+
+def test_temperature_ramps(clock):
+    block = clock.temperature(2.0, 1.0, 'block')
+    block.start(45)
+    assert clock.now == 0
+    clock.advance(5, 'other')
+    assert block.current == pytest.approx(35)
+    block.settle()
+    assert clock.now == pytest.approx(10)
+    assert clock.totals['block'] == pytest.approx(5)
+
+    # ramps may be slower than the max rate, but not faster
+    block.start(35, rate=0.5)
+    block.settle()
+    assert clock.now == pytest.approx(30)
+    block.start(45, rate=10)
+    block.settle()
+    assert clock.now == pytest.approx(35)
+    block.hold(60)
+    assert clock.now == pytest.approx(95)
+    # settling on a reached target takes no time
+    block.settle()
+    assert clock.now == pytest.approx(95)
+
+
+async def test_simulator_charges_clock(loop, clock):
+    hw = await API.build_hardware_simulator(
+        attached_instruments={
+            types.Mount.RIGHT: {'model': 'p300_single_v1', 'id': 'testy'}},
+        attached_modules=['thermocycler'],
+        loop=loop, clock=clock)
+    await asyncio.sleep(0.05)
+    await hw.home()
+    assert clock.totals['home'] == HOME_SETTLE_TIME
+    await hw.move_rel(types.Mount.RIGHT, types.Point(-100, 0, 0))
+    assert clock.totals['gantry'] > 0
+    await hw.home()
+    assert clock.totals['home'] > 2 * HOME_SETTLE_TIME
+    await hw.delay(30)
+    assert clock.totals['delay'] == 30
+
+    tc = hw.attached_modules[0]
+    await tc.cycle_temperatures(
+        steps=[{'temperature': 95, 'hold_time_seconds': 10},
+               {'temperature': 55, 'hold_time_seconds': 20}],
+        repetitions=2)
+    cycle = (95 - 55) / THERMOCYCLER_BLOCK_HEATING_RATE + 10\
+        + (95 - 55) / THERMOCYCLER_BLOCK_COOLING_RATE + 20
+    first_ramp = (95 - 55) / THERMOCYCLER_BLOCK_HEATING_RATE\
+        - (95 - 25) / THERMOCYCLER_BLOCK_HEATING_RATE
+    assert clock.totals['thermocycler'] == pytest.approx(
+        2 * cycle - first_ramp)
+
+
+async def test_simulator_without_clock(loop):
+    hw = await API.build_hardware_simulator(loop=loop)
+    assert hw.simulator_clock is None
+    await hw.home()
+    await hw.delay(30)
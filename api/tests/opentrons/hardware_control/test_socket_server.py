@@ -243,3 +243,98 @@ def test_serializers(paramtype, native, serializable):
     serdes = sockserv._SERDES[paramtype]
     assert serdes.serializer(native) == serializable
     assert serdes.deserializer(serializable) == native
+
+
+async def test_batch(hc_stream_server, loop, monkeypatch):
+    """ Test that the requests of a batch run in order """
+    sock, server = hc_stream_server
+    durations = []
+
+    def fake_delay(obj, duration_s):
+        durations.append(duration_s)
+
+    monkeypatch.setattr(server._api, 'delay',
+                        MethodType(fake_delay, server._api))
+    server._methods = sockserv.build_jrpc_methods(server._api)
+    reader, writer = await asyncio.open_unix_connection(sock)
+    decoder = sockserv.JsonStreamDecoder(reader)
+    batch = [{'jsonrpc': '2.0', 'method': 'delay',
+              'params': {'duration_s': duration}, 'id': duration}
+             for duration in range(10)]
+    # A notification gets no response, an invalid request gets an error
+    batch.insert(3, {'jsonrpc': '2.0', 'method': 'delay',
+                     'params': {'duration_s': 100}})
+    batch.insert(5, {'not': 'jsonrpc'})
+    writer.write(json.dumps(batch).encode())
+    resp = await decoder.read_object()
+    assert durations == [0, 1, 2, 100] + list(range(3, 10))
+    assert len(resp) == 11
+    assert resp[4]['error']['code'] == -32600
+    del resp[4]
+    assert resp == [{'jsonrpc': '2.0', 'result': None, 'id': duration}
+                    for duration in range(10)]
+
+    # A batch of notifications gets no response at all
+    writer.write(json.dumps(
+        [{'jsonrpc': '2.0', 'method': 'delay',
+          'params': {'duration_s': 5}}]).encode())
+    writer.write(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'delay',
+         'params': {'duration_s': 6}, 'id': 'last'}).encode())
+    resp = await decoder.read_object()
+    assert resp['id'] == 'last'
+
+
+async def test_pipelined(hc_stream_server, loop, monkeypatch):
+    """ Test that requests written together are all run, and that their
+    responses come back in order """
+    sock, server = hc_stream_server
+
+    async def fake_delay(obj, duration_s):
+        await asyncio.sleep(duration_s)
+        return duration_s
+
+    monkeypatch.setattr(server._api, 'delay',
+                        MethodType(fake_delay, server._api))
+    server._methods = sockserv.build_jrpc_methods(server._api)
+    reader, writer = await asyncio.open_unix_connection(sock)
+    decoder = sockserv.JsonStreamDecoder(reader)
+    durations = [0.1, 0, 0.05, 0]
+    writer.write(b' '.join(
+        json.dumps({'jsonrpc': '2.0', 'method': 'delay',
+                    'params': {'duration_s': duration},
+                    'id': index}).encode()
+        for index, duration in enumerate(durations)))
+    responses = [await decoder.read_object() for _ in durations]
+    assert [resp['id'] for resp in responses] == [0, 1, 2, 3]
+    assert [resp['result'] for resp in responses] == durations
+
+
+async def test_msgpack_frames(hc_stream_server, loop, monkeypatch):
+    pytest.importorskip('msgpack')
+    sock, server = hc_stream_server
+    passed_duration = None
+
+    def fake_delay(obj, duration_s):
+        nonlocal passed_duration
+        passed_duration = duration_s
+        return 'waited'
+
+    monkeypatch.setattr(server._api, 'delay',
+                        MethodType(fake_delay, server._api))
+    server._methods = sockserv.build_jrpc_methods(server._api)
+    reader, writer = await asyncio.open_unix_connection(sock)
+    request = {'jsonrpc': '2.0', 'method': 'delay',
+               'params': {'duration_s': 15.2}, 'id': 1}
+    writer.write(sockserv.pack_frame(request))
+    assert await sockserv.read_frame(reader)\
+        == {'jsonrpc': '2.0', 'result': 'waited', 'id': 1}
+    assert passed_duration == 15.2
+
+    frame = sockserv.pack_frame([request, {**request, 'id': 2}])
+    # Frames can arrive in pieces
+    writer.write(frame[:3])
+    await writer.drain()
+    writer.write(frame[3:])
+    assert [resp['id'] for resp in await sockserv.read_frame(reader)]\
+        == [1, 2]
@@ -1,4 +1,7 @@
 import pytest
+from opentrons.types import Mount, Point
+from opentrons.hardware_control import API
+from opentrons.hardware_control.adapters import HardwareCall
 from opentrons.hardware_control.thread_manager import ThreadManagerException,\
     ThreadManager
 
@@ -12,3 +15,48 @@ def test_build_fail_raises_exception():
         raise Exception()
     with pytest.raises(ThreadManagerException):
         ThreadManager(f)
+
+
+async def test_cached_wrappers(monkeypatch):
+    thread_manager = ThreadManager(API.build_hardware_simulator)
+    try:
+        assert thread_manager.home is thread_manager.home
+        assert thread_manager.sync.home is thread_manager.sync.home
+
+        # A method replaced on the instance gets a new wrapper
+        called = []
+
+        async def fake_home(*args, **kwargs):
+            called.append(args)
+
+        monkeypatch.setattr(thread_manager.managed_obj, 'home', fake_home)
+        await thread_manager.home()
+        thread_manager.sync.home()
+        assert called == [(), ()]
+    finally:
+        thread_manager.clean_up()
+
+
+async def test_call_batch():
+    thread_manager = ThreadManager(API.build_hardware_simulator)
+    try:
+        home, position = await thread_manager.call_batch([
+            HardwareCall('home'),
+            HardwareCall('gantry_position', (Mount.RIGHT,))])
+        assert home is None
+        assert isinstance(position, Point)
+
+        moved, moved_to = thread_manager.sync.call_batch([
+            HardwareCall('move_rel', (Mount.RIGHT, Point(-10, 0, 0))),
+            HardwareCall('gantry_position', kwargs={'mount': Mount.RIGHT})])
+        assert moved is None
+        assert moved_to == position - Point(10, 0, 0)
+
+        # The calls after one that raises are not made
+        with pytest.raises(AttributeError):
+            await thread_manager.call_batch([
+                HardwareCall('not_a_method'),
+                HardwareCall('move_rel', (Mount.RIGHT, Point(-10, 0, 0)))])
+        assert thread_manager.sync.gantry_position(Mount.RIGHT) == moved_to
+    finally:
+        thread_manager.clean_up()
@@ -1,6 +1,6 @@
 from typing import List
 
-from opentrons.hardware_control.util import plan_arc
+from opentrons.hardware_control.util import plan_arc, merge_waypoints
 from opentrons.hardware_control.types import CriticalPoint
 from opentrons.types import Point
 
@@ -68,3 +68,32 @@ def test_cp_blending():
     assert arc2[0][1] == CriticalPoint.TIP
     assert arc2[1][1] is None
     assert arc2[2][1] is None
+
+
+def test_merge_waypoints():
+    start = Point(0, 0, 50)
+    # Waypoints the path goes straight through are merged, and so are those
+    # it is already at
+    assert merge_waypoints(
+        start, [Point(0, 0, 50), Point(10, 0, 50), Point(20, 0, 50),
+                Point(20, 0, 10)]) == [2, 3]
+    assert merge_waypoints(
+        start, [Point(0, 0, 80), Point(0, 0, 100)]) == [1]
+    # Corners are kept, even at a single height
+    assert merge_waypoints(
+        start, [Point(10, 0, 50), Point(10, 10, 50), Point(10, 10, 0)]) \
+        == [0, 1, 2]
+    # So are the points the path turns back at
+    assert merge_waypoints(
+        start, [Point(0, 0, 100), Point(0, 0, 10)]) == [0, 1]
+    # The last waypoint always is
+    assert merge_waypoints(start, [Point(0, 0, 50)]) == [0]
+    assert merge_waypoints(start, []) == []
+
+
+def test_merge_arc():
+    from_pt = Point(10, 20, 100)
+    to_pt = Point(50, 20, 30)
+    arc = [a[0] for a in plan_arc(from_pt, to_pt, 100)]
+    # Already at the height of the arc, so its first waypoint is dropped
+    assert merge_waypoints(from_pt, arc) == [1, 2]
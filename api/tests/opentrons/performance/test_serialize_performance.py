@@ -0,0 +1,30 @@
+""" Benchmark of serializing a fully loaded deck for the RPC server """
+import time
+
+import pytest
+
+from opentrons.server import serialize
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_serialize_full_deck(singletons, record_property):
+    robot = singletons['robot']
+    labware = singletons['labware']
+    instruments = singletons['instruments']
+
+    tipracks = [labware.load('tiprack-200ul', slot)
+                for slot in ('1', '4', '7', '10')]
+    for slot in ('2', '3', '5', '6', '8', '9', '11'):
+        labware.load('384-plate', slot)
+    instruments.P300_Single(mount='left', tip_racks=tipracks)
+    instruments.P300_Multi(mount='right', tip_racks=tipracks)
+
+    start = time.monotonic()
+    tree, refs = serialize.get_object_tree(robot)
+    elapsed = time.monotonic() - start
+
+    wells = 4 * 96 + 7 * 384
+    assert len(refs) > wells
+    record_property('objects', len(refs))
+    record_property('elapsed', elapsed)
@@ -0,0 +1,43 @@
+""" Benchmark of post-processing the simulation of a very long protocol """
+import time
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+COMMAND_COUNT = 50000
+
+# Publishes aspirate commands directly rather than moving the simulated
+# hardware, so that the time taken is the session's own
+SYNTHETIC_PROTOCOL = f'''
+from opentrons.commands import commands, types
+
+metadata = {{'apiLevel': '2.0'}}
+
+def run(ctx):
+    tiprack = ctx.load_labware('opentrons_96_tiprack_300ul', 1)
+    plates = [ctx.load_labware('corning_96_wellplate_360ul_flat', slot)
+              for slot in (2, 3)]
+    pipette = ctx.load_instrument('p300_single', 'right',
+                                  tip_racks=[tiprack])
+    for index in range({COMMAND_COUNT}):
+        well = plates[index % 2].wells()[index % 96]
+        command = commands.aspirate(pipette, 10, well, 1.0)
+        ctx.broker.publish(types.COMMAND, {{**command, '$': 'before'}})
+        ctx.broker.publish(types.COMMAND, {{**command, '$': 'after'}})
+'''
+
+
+def test_simulate_long_protocol(session_manager, record_property):
+    start = time.monotonic()
+    session = session_manager.create(
+        name='synthetic', contents=SYNTHETIC_PROTOCOL)
+    elapsed = time.monotonic() - start
+
+    assert len(session.commands) == COMMAND_COUNT
+    assert session.commands[-1]['id'] == COMMAND_COUNT - 1
+    assert len(session.containers) == 2
+    assert len(session.instruments) == 1
+    instrument, = session.instruments
+    assert len(instrument.containers) == 2
+    record_property('elapsed', elapsed)
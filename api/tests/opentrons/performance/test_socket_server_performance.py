@@ -0,0 +1,79 @@
+""" Benchmark of driving simulated motion through the hardware server """
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+import opentrons.hardware_control as hc
+import opentrons.hardware_control.socket_server as sockserv
+
+MOVE_COUNT = 500
+
+pytestmark = [pytest.mark.benchmark,
+              pytest.mark.skipif(sys.platform.startswith('win'),
+                                 reason='No unix domain sockets on windows')]
+
+
+def _move(index):
+    return {'jsonrpc': '2.0', 'method': 'move_rel', 'id': index,
+            'params': {'mount': 'right',
+                       'delta': [1 if index % 2 else -1, 0, 0]}}
+
+
+async def _read_ids(decoder, count):
+    ids = []
+    for _ in range(count):
+        resp = await decoder.read_object()
+        assert 'error' not in resp, resp
+        ids.append(resp['id'])
+    return ids
+
+
+async def test_small_moves_throughput(loop, record_property):
+    with tempfile.TemporaryDirectory() as td:
+        sock = os.path.join(td, 'tst')
+        api = await hc.API.build_hardware_simulator(loop=loop)
+        await api.home()
+        server = await sockserv.run(sock, api)
+        try:
+            reader, writer = await asyncio.open_unix_connection(sock)
+            decoder = sockserv.JsonStreamDecoder(reader)
+
+            # One request at a time, waiting for each response
+            start = time.monotonic()
+            for index in range(MOVE_COUNT):
+                writer.write(json.dumps(_move(index)).encode())
+                resp = await decoder.read_object()
+                assert 'error' not in resp, resp
+            lockstep = time.monotonic() - start
+
+            # All the requests at once, in a batch
+            start = time.monotonic()
+            writer.write(json.dumps(
+                [_move(index) for index in range(MOVE_COUNT)]).encode())
+            resp = await decoder.read_object()
+            batched = time.monotonic() - start
+            assert [r['id'] for r in resp] == list(range(MOVE_COUNT))
+            assert not [r for r in resp if 'error' in r]
+
+            # All the requests at once, each on its own: they must all be
+            # dispatched and answered in order from this one write, without
+            # waiting for more data (the timeout only guards against a hang)
+            start = time.monotonic()
+            writer.write(b''.join(json.dumps(_move(index)).encode()
+                                  for index in range(MOVE_COUNT)))
+            pipelined_ids = await asyncio.wait_for(
+                _read_ids(decoder, MOVE_COUNT), timeout=30)
+            pipelined = time.monotonic() - start
+            assert pipelined_ids == list(range(MOVE_COUNT))
+            writer.close()
+        finally:
+            await server.stop()
+
+    record_property('lockstep', lockstep)
+    record_property('batched', batched)
+    record_property('pipelined', pipelined)
@@ -0,0 +1,35 @@
+""" Benchmark of calling the hardware controller from another thread """
+import time
+
+import pytest
+
+from opentrons.types import Mount
+from opentrons.hardware_control import API, ThreadManager
+from opentrons.hardware_control.adapters import HardwareCall
+
+pytestmark = pytest.mark.benchmark
+
+CALL_COUNT = 3000
+
+
+def test_batched_calls(record_property):
+    thread_manager = ThreadManager(API.build_hardware_simulator)
+    try:
+        hardware = thread_manager.sync
+        hardware.home()
+
+        start = time.monotonic()
+        positions = [hardware.gantry_position(Mount.RIGHT)
+                     for _ in range(CALL_COUNT)]
+        one_by_one = time.monotonic() - start
+
+        start = time.monotonic()
+        batched_positions = hardware.call_batch(
+            [HardwareCall('gantry_position', (Mount.RIGHT,))] * CALL_COUNT)
+        batched = time.monotonic() - start
+    finally:
+        thread_manager.clean_up()
+
+    assert batched_positions == positions
+    record_property('one_by_one', one_by_one)
+    record_property('batched', batched)
@@ -81,6 +81,7 @@ async def test_max_speeds(loop, monkeypatch, hardware):
     ctx.home()
     mock_move = mock.Mock()
     monkeypatch.setattr(ctx._hw_manager.hardware, 'move_to', mock_move)
+    monkeypatch.setattr(ctx._hw_manager.hardware, 'move_through', mock_move)
     instr = ctx.load_instrument('p10_single', Mount.RIGHT)
     instr.move_to(Location(Point(0, 0, 0), None))
     assert all(
@@ -145,17 +146,19 @@ async def test_move_uses_arc(loop, monkeypatch, get_labware_def, hardware):
     lw = ctx.load_labware('corning_96_wellplate_360ul_flat', 1)
     ctx.home()
 
-    targets = []
+    blocks = []
 
-    async def fake_move(self, mount, target_pos, **kwargs):
-        nonlocal targets
-        targets.append((mount, target_pos, kwargs))
-    monkeypatch.setattr(API, 'move_to', fake_move)
+    async def fake_move_through(self, mount, waypoints, **kwargs):
+        nonlocal blocks
+        blocks.append((mount, waypoints, kwargs))
+    monkeypatch.setattr(API, 'move_through', fake_move_through)
 
     right.move_to(lw.wells()[0].top())
-    assert len(targets) == 3
-    assert targets[-1][0] == Mount.RIGHT
-    assert targets[-1][1] == lw.wells()[0].top().point
+    assert len(blocks) == 1
+    mount, waypoints, _ = blocks[0]
+    assert mount == Mount.RIGHT
+    assert len(waypoints) == 3
+    assert waypoints[-1][0] == lw.wells()[0].top().point
 
 
 def test_pipette_info(loop):
@@ -413,8 +416,13 @@ def test_dispense(loop, get_labware_def, monkeypatch):
         nonlocal move_called_with
         move_called_with = (mount, loc, kwargs)
 
+    def fake_move_through(self, mount, waypoints, **kwargs):
+        loc, cp = waypoints[-1]
+        fake_move(self, mount, loc, critical_point=cp, **kwargs)
+
     monkeypatch.setattr(API, 'dispense', fake_hw_dispense)
     monkeypatch.setattr(API, 'move_to', fake_move)
+    monkeypatch.setattr(API, 'move_through', fake_move_through)
 
     instr.dispense(2.0, lw.wells()[0].bottom())
     assert 'dispensing' in ','.join([cmd.lower() for cmd in ctx.commands()])
@@ -401,6 +401,38 @@ def test_should_dodge():
     )
 
 
+def test_deck_changes_invalidate_plans():
+    deck = Deck()
+    lw1 = labware.load(labware_name, deck.position_for(1))
+    deck[1] = lw1
+    generation = deck.generation
+    assert not should_dodge_thermocycler(
+        deck, lw1.wells()[0].top(), deck.position_for(12))
+
+    # adding a thermocycler changes which moves dodge it
+    deck[7] = module_geometry.load_module(
+        module_geometry.ThermocyclerModuleModel.THERMOCYCLER_V1,
+        deck.position_for(7))
+    assert deck.generation != generation
+    assert should_dodge_thermocycler(
+        deck, lw1.wells()[0].top(), deck.position_for(12))
+    del deck[7]
+    assert not should_dodge_thermocycler(
+        deck, lw1.wells()[0].top(), deck.position_for(12))
+
+    # and recalculating the height of the deck changes the height of moves
+    # between labware
+    lw2 = labware.load(labware_name, deck.position_for(2))
+    deck[2] = lw2
+    low = plan_moves(lw1.wells()[0].top(), lw2.wells()[0].top(), deck,
+                     P300M_GEN2_MAX_HEIGHT, 7.0, 15.0)
+    lw2.set_calibration(Point(0, 0, 10))
+    deck.recalculate_high_z()
+    high = plan_moves(lw1.wells()[0].top(), lw2.wells()[0].top(), deck,
+                      P300M_GEN2_MAX_HEIGHT, 7.0, 15.0)
+    assert high[0][0].z == low[0][0].z + 10
+
+
 def test_labware_in_next_slow():
     deck = Deck()
     trough = labware.load(trough_name, deck.position_for(4))
@@ -4,6 +4,7 @@ import pytest
 
 from opentrons.protocol_api import (
     labware, MAX_SUPPORTED_VERSION, module_geometry)
+from opentrons.protocol_api.util import APIVersionError
 from opentrons.system.shared_data import load_shared_data
 from opentrons import config
 from opentrons.types import Point, Location
@@ -198,6 +199,47 @@ def test_well_parent():
     assert well.center().labware.parent is lw
 
 
+def test_well_position_arrays():
+    labware_name = 'corning_384_wellplate_112ul_flat'
+    labware_def = labware.get_labware_definition(labware_name)
+    lw = labware.Labware(labware_def, Location(Point(10, 20, 30), 'Slot'))
+
+    def check(wells, tops, bottoms, centers):
+        assert len(tops) == len(wells)
+        for well, top, bottom, center in zip(wells, tops, bottoms, centers):
+            assert isinstance(top, Point)
+            assert tuple(top) == pytest.approx(tuple(well.top(1).point))
+            assert tuple(bottom)\
+                == pytest.approx(tuple(well.bottom(1).point))
+            assert tuple(center)\
+                == pytest.approx(tuple(well.center().point))
+
+    check(lw.wells(), lw.well_tops(z=1), lw.well_bottoms(z=1),
+          lw.well_centers())
+
+    lw.set_calibration(Point(1, -2, 3))
+    some = ['P24', 'A1', 'C5']
+    check([lw[name] for name in some], lw.well_tops(some, z=1),
+          lw.well_bottoms(some, z=1), lw.well_centers(some))
+    wells = lw.columns()[3]
+    check(wells, lw.well_tops(wells, z=1), lw.well_bottoms(wells, z=1),
+          lw.well_centers(wells))
+    assert lw.well_depths(some)\
+        == [labware_def['wells'][name]['depth'] for name in some]
+    assert lw.well_diameters(some) == [None, None, None]
+
+    tiprack = labware.Labware(
+        labware.get_labware_definition('opentrons_96_tiprack_300ul'),
+        Location(Point(0, 0, 0), 'Slot'))
+    assert tiprack.well_diameters(['A1', 'H12'])\
+        == [tiprack['A1'].diameter, tiprack['H12'].diameter]
+
+    old = labware.Labware(labware_def, Location(Point(10, 20, 30), 'Slot'),
+                          api_level=APIVersion(2, 4))
+    with pytest.raises(APIVersionError):
+        old.well_tops()
+
+
 def test_tip_tracking_init():
     labware_name = 'opentrons_96_tiprack_300ul'
     labware_def = labware.get_labware_definition(labware_name)
@@ -315,6 +357,39 @@ def test_select_next_tip():
         early_tr.use_tips(well_list[0])
 
 
+def test_next_tip_tracks_changes():
+    labware_name = 'opentrons_96_tiprack_300ul'
+    labware_def = labware.get_labware_definition(labware_name)
+    tiprack = labware.Labware(labware_def,
+                              Location(Point(0, 0, 0), 'Test Slot'))
+    well_list = tiprack.wells()
+
+    # only the first run of tips in a column counts
+    tiprack.use_tips(well_list[1])
+    assert tiprack.next_tip(4) == well_list[8]
+    # until the tips before the gap are gone
+    tiprack.use_tips(well_list[0])
+    assert tiprack.next_tip(4) == well_list[2]
+
+    # starting tips skip the tips before them
+    assert tiprack.next_tip(1, well_list[5]) == well_list[5]
+    assert tiprack.next_tip(8, well_list[5]) == well_list[8]
+    assert tiprack.next_tip(8, well_list[8]) == well_list[8]
+
+    # tips come back when they are returned, set or reset
+    for column in tiprack.columns():
+        tiprack.use_tips(column[0], 8)
+    assert tiprack.next_tip() is None
+    tiprack.return_tips(well_list[40], 8)
+    assert tiprack.next_tip(8) == well_list[40]
+    well_list[3].has_tip = True
+    assert tiprack.next_tip() == well_list[3]
+    assert well_list[3].has_tip
+    tiprack.reset()
+    assert tiprack.next_tip(8) == well_list[0]
+    assert all(well.has_tip for well in well_list)
+
+
 def test_previous_tip():
     labware_name = 'opentrons_96_tiprack_300ul'
     labware_def = labware.get_labware_definition(labware_name)
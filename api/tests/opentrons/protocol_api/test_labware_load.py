@@ -1,3 +1,6 @@
+import copy
+import pathlib
+
 import pytest
 from opentrons import protocol_api as papi, types
 
@@ -40,3 +43,46 @@ def test_deprecated_load(loop):
     ctx = papi.ProtocolContext(loop=loop)
     labware = ctx.load_labware_by_name(labware_name, '1', 'my cool labware')
     assert 'my cool labware' in str(labware)
+
+
+def test_standard_definitions_parsed_once(monkeypatch):
+    first = papi.labware.get_labware_definition(labware_name)
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError('definition was read again')
+
+    monkeypatch.setattr(papi.labware.json, 'loads', no_reads)
+    second = papi.labware.get_labware_definition(labware_name)
+    assert second == first
+    # each caller gets a copy it can modify
+    second['parameters']['loadName'] = 'something_else'
+    third = papi.labware.get_labware_definition(labware_name)
+    assert third['parameters']['loadName'] == labware_name
+
+
+def test_custom_definition_invalidation(monkeypatch, tmpdir):
+    monkeypatch.setitem(
+        papi.labware.CONFIG, 'labware_user_definitions_dir_v2',
+        pathlib.Path(str(tmpdir)))
+    custom_def = copy.deepcopy(
+        papi.labware.get_labware_definition(labware_name))
+    custom_def['namespace'] = 'custom_beta'
+    custom_def['parameters']['loadName'] = 'my_plate'
+
+    with pytest.raises(FileNotFoundError):
+        papi.labware.get_labware_definition('my_plate')
+
+    papi.labware.save_definition(custom_def)
+    loaded = papi.labware.get_labware_definition('my_plate')
+    assert loaded == custom_def
+    assert papi.labware.get_labware_definition('my_plate') == loaded
+
+    custom_def['metadata']['displayName'] = 'My Plate'
+    papi.labware.save_definition(custom_def, force=True)
+    assert papi.labware.get_labware_definition(
+        'my_plate', 'custom_beta', 1)['metadata']['displayName']\
+        == 'My Plate'
+
+    papi.labware.delete_all_custom_labware()
+    with pytest.raises(FileNotFoundError):
+        papi.labware.get_labware_definition('my_plate')
@@ -1,5 +1,6 @@
 import json
 from unittest import mock
+from opentrons.drivers.thermocycler import ProfileStep
 from opentrons.hardware_control.modules.magdeck import OFFSET_TO_LABWARE_BOTTOM
 import opentrons.protocol_api as papi
 from opentrons.system.shared_data import load_shared_data
@@ -253,36 +254,21 @@ def test_thermocycler_profile(loop, monkeypatch):
     assert mod.lid_target_temperature == 80
     assert mod.lid_temperature == 80
 
-    set_temp_hw_mock = mock.Mock(
-        side_effect=mod._module._obj_to_adapt.set_temperature)
-    monkeypatch.setattr(
-        mod._module._obj_to_adapt, 'set_temperature', set_temp_hw_mock)
+    driver = mod._module._obj_to_adapt._driver
+    execute_profile_mock = mock.Mock(side_effect=driver.execute_profile)
+    monkeypatch.setattr(driver, 'execute_profile', execute_profile_mock)
 
     # Test volume param
     mod.execute_profile(steps=[{'temperature': 30, 'hold_time_seconds': 20},
                                {'temperature': 70, 'hold_time_seconds': 72}],
                         repetitions=2,
                         block_max_volume=35)
-    set_temp_hw_mock.assert_has_calls([mock.call(temperature=30,
-                                                 hold_time_seconds=20,
-                                                 hold_time_minutes=None,
-                                                 ramp_rate=None,
-                                                 volume=35),
-                                       mock.call(temperature=70,
-                                                 hold_time_seconds=72,
-                                                 hold_time_minutes=None,
-                                                 ramp_rate=None,
-                                                 volume=35),
-                                       mock.call(temperature=30,
-                                                 hold_time_seconds=20,
-                                                 hold_time_minutes=None,
-                                                 ramp_rate=None,
-                                                 volume=35),
-                                       mock.call(temperature=70,
-                                                 hold_time_seconds=72,
-                                                 hold_time_minutes=None,
-                                                 ramp_rate=None,
-                                                 volume=35)])
+    execute_profile_mock.assert_called_once_with(
+        [ProfileStep(temperature=30, hold_time=20, ramp_rate=None),
+         ProfileStep(temperature=70, hold_time=72, ramp_rate=None),
+         ProfileStep(temperature=30, hold_time=20, ramp_rate=None),
+         ProfileStep(temperature=70, hold_time=72, ramp_rate=None)],
+        35, mock.ANY)
 
 
 def test_module_load_labware(loop):
@@ -225,3 +225,79 @@ def test_hash_labware_def():
     assert labware._hash_labware_def(def1a) == labware._hash_labware_def(def1b)
     # different data should not match
     assert labware._hash_labware_def(def1a) != labware._hash_labware_def(def2)
+
+
+def test_calibration_store(monkeypatch, tmpdir):
+    monkeypatch.setitem(
+        config.CONFIG, 'labware_calibration_offsets_dir_v2', tmpdir)
+    hashes = []
+
+    def counting_hash(labware_def):
+        hashes.append(labware_def)
+        return MOCK_HASH
+
+    monkeypatch.setattr(labware, '_hash_labware_def', counting_hash)
+    written = []
+    real_write = labware._write_file
+
+    def recording_write(path, data):
+        written.append(os.path.basename(str(path)))
+        return real_write(path, data)
+
+    monkeypatch.setattr(labware, '_write_file', recording_write)
+
+    lws = [labware.Labware(minimalLabwareDef,
+                           Location(Point(0, 0, 0), str(slot)))
+           for slot in (1, 2)]
+    labware.save_calibration(lws[0], Point(1, 2, 3))
+    labware.save_tip_length(lws[0], 30.1)
+    # one hash per labware, and the index is only written for a new entry
+    assert len(hashes) == 1
+    assert written == ['index.json', 'mock_hash.json', 'mock_hash.json']
+
+    # calibration files changed elsewhere are read again
+    with open(path(MOCK_HASH)) as f:
+        data = json.load(f)
+    data['default']['offset'] = [4, 5, 6]
+    with open(path(MOCK_HASH), 'w') as f:
+        json.dump(data, f)
+
+    # as if loading labware in a new process
+    index = tmpdir / 'index.json'
+    index.remove()
+    labware._calibration_store.invalidate()
+    written.clear()
+    with labware.calibration_batch():
+        labware.load_calibrations(lws)
+        labware.load_calibrations(lws)
+        # the index is written when the outermost batch ends
+        assert not index.exists()
+    assert written == ['index.json']
+    assert len(hashes) == 2
+    for lw in lws:
+        assert lw.calibrated_offset == Point(14, 15, 11)
+        assert lw.tip_length == 30.1
+    assert labware._read_file(str(index))[lws[0].uri]['id'] == MOCK_HASH
+
+
+def test_index_keeps_other_entries(monkeypatch, tmpdir):
+    monkeypatch.setitem(
+        config.CONFIG, 'labware_calibration_offsets_dir_v2', tmpdir)
+    test_labware = labware.Labware(minimalLabwareDef,
+                                   Location(Point(0, 0, 0), '1'))
+    labware.load_calibration(test_labware)
+    index = tmpdir / 'index.json'
+    # another process loads other labware
+    blob = labware._read_file(str(index))
+    blob['other/labware/1'] = {'id': 'other', 'slot': 'other', 'module': {}}
+    with open(str(index), 'w') as f:
+        json.dump(blob, f)
+
+    on_module = labware.Labware(minimalLabwareDef,
+                                Location(Point(0, 0, 0), '1'))
+    monkeypatch.setattr(labware, '_get_parent_identifier',
+                        lambda parent: 'magdeck')
+    labware.load_calibration(on_module)
+    blob = labware._read_file(str(index))
+    assert blob['other/labware/1']['id'] == 'other'
+    assert blob[on_module.uri]['slot'].endswith('magdeck')
@@ -116,3 +116,32 @@ def test_ordered_dict():
                 'i': id(b),
                 't': type_id(b),
                 'v': {'b': 1}}}}
+
+
+def test_shared_objects_serialized_once(instance):
+    root, a1, *_ = instance
+    shared = {'first': a1, 'second': a1}
+    tree, refs = serialize.get_object_tree(shared)
+    assert tree['v']['first']['v'] == {0: 0, 'b': 1, 'c': 'c', 'd': True,
+                                       'e': None}
+    assert tree['v']['second'] == {'i': id(a1), 't': type_id(a1), 'v': None}
+
+
+def test_register_encoder():
+    class Point3:
+        def __init__(self, x):
+            self.x = x
+            self.cache = list(range(1000))
+
+    class SubPoint3(Point3):
+        pass
+
+    serialize.register_encoder(Point3, lambda p: {'x': p.x})
+    try:
+        point = SubPoint3(1)
+        tree, refs = serialize.get_object_tree([point])
+        assert tree == [{'i': id(point), 't': type_id(point), 'v': {'x': 1}}]
+        assert refs[id(point)] is point
+    finally:
+        serialize._encoders.pop(Point3)
+        serialize._type_info.clear()
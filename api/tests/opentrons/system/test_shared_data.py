@@ -0,0 +1,35 @@
+import jsonschema
+import pytest
+
+from opentrons.protocol_api import labware
+from opentrons.system import shared_data
+
+
+def test_schema_validator_built_once():
+    validator = shared_data.get_schema_validator('labware/schemas/2')
+    assert shared_data.get_schema_validator('labware/schemas/2') is validator
+    assert shared_data.get_schema_validator('protocol/schemas/4')\
+        is not validator
+
+
+def test_validate_schema():
+    definition = labware.get_labware_definition(
+        'corning_96_wellplate_360ul_flat')
+    shared_data.validate_schema(definition, 'labware/schemas/2')
+    assert shared_data.matches_schema(definition, 'labware/schemas/2')
+
+    # structurally wrong documents are rejected before validating the rest
+    del definition['wells']
+    with pytest.raises(jsonschema.ValidationError,
+                       match="'wells' is a required property"):
+        shared_data.validate_schema(definition, 'labware/schemas/2')
+    assert not shared_data.matches_schema(definition, 'labware/schemas/2')
+    with pytest.raises(jsonschema.ValidationError, match='not of type'):
+        shared_data.validate_schema([], 'labware/schemas/2')
+
+    definition = labware.get_labware_definition(
+        'corning_96_wellplate_360ul_flat')
+    definition['version'] = 'one'
+    with pytest.raises(jsonschema.ValidationError):
+        shared_data.validate_schema(definition, 'labware/schemas/2')
+    assert not shared_data.matches_schema(definition, 'labware/schemas/2')
@@ -118,3 +118,29 @@ def test_simulate_extra_labware(protocol, protocol_file, monkeypatch):
     ctx = simulate.get_protocol_api('2.0')
     with pytest.raises(FileNotFoundError):
         ctx.load_labware("fixture_12_trough", 1, namespace='fixture')
+
+
+def test_estimate_duration_json_apiv2(get_json_protocol_fixture):
+    jp = get_json_protocol_fixture('3', 'simple', False)
+    estimate = simulate.estimate_duration(io.StringIO(jp), 'simple.json')
+    assert estimate.by_action['delay'] == 42
+    for action in ['gantry', 'plunger', 'home']:
+        assert estimate.by_action[action] > 0
+    assert estimate.total == pytest.approx(
+        sum(estimate.by_action.values()))
+    assert all(command['duration'] >= 0 for command in estimate.runlog)
+    assert estimate.steps == estimate.runlog
+    delay = estimate.runlog[2]
+    assert delay['payload']['text'].startswith('Delaying')
+    assert delay['duration'] == 42
+    # everything but the initial home is charged to some step
+    charged = sum(step['duration'] for step in estimate.steps)
+    assert estimate.total - estimate.by_action['home'] < charged
+    assert charged < estimate.total
+    assert '0:00:42.0' in simulate.format_duration_estimate(estimate)
+
+
+@pytest.mark.parametrize('protocol_file', ['testosaur.py'])
+def test_estimate_duration_v1(protocol, protocol_file):
+    with pytest.raises(RuntimeError):
+        simulate.estimate_duration(protocol.filelike, 'testosaur.py')
@@ -0,0 +1,65 @@
+import logging
+from pathlib import Path
+from unittest import mock
+
+from opentrons import simulate_batch
+from opentrons.protocol_api import labware
+
+DATA = Path(__file__).parent / 'data'
+
+BAD_PROTOCOL = '''
+metadata = {'apiLevel': '2.0'}
+
+def run(ctx):
+    ctx.load_instrument('p300_single', 'middle')
+'''
+
+
+def test_simulate_batch(tmpdir):
+    bad = Path(tmpdir) / 'bad.py'
+    bad.write_text(BAD_PROTOCOL)
+    paths = [str(DATA / 'testosaur_v2.py'), str(bad),
+             str(DATA / 'testosaur_v2.py')]
+    results = list(simulate_batch.simulate_batch(
+        paths, workers=2, estimate_duration=True))
+    assert [result.path for result in results] == paths
+    good, failed, again = results
+
+    assert good.ok
+    assert good.error is None
+    assert [command['text'] for command in good.runlog] == [
+        'Picking up tip from A1 of Opentrons 96 Tip Rack 300 µL on 1',
+        'Aspirating 10.0 uL from A1 of Corning 96 Well Plate 360 µL Flat on 2 at 1.0 speed',  # noqa(E501)
+        'Dispensing 10.0 uL into B1 of Corning 96 Well Plate 360 µL Flat on 2 at 1.0 speed',  # noqa(E501)
+        'Dropping tip into H12 of Opentrons 96 Tip Rack 300 µL on 1'
+        ]
+    assert good.duration > sum(
+        command['duration'] for command in good.runlog) > 0
+    assert again.runlog == good.runlog
+
+    assert not failed.ok
+    assert failed.runlog == []
+    assert failed.error['type'] == 'ValueError'
+    assert failed.error['line'] == 5
+    assert 'middle' in failed.error['message']
+
+
+def test_worker_setup(monkeypatch):
+    monkeypatch.setattr(
+        logging.getLogger('opentrons'), 'propagate',
+        logging.getLogger('opentrons').propagate)
+    monkeypatch.setattr(simulate_batch, '_worker_config', None)
+    simulate_batch._initialize_worker([], [], None, 'warning', False)
+    # the standard labware definitions are parsed up front
+    monkeypatch.setattr(
+        labware, 'json',
+        mock.Mock(loads=mock.Mock(side_effect=AssertionError('parsed'))))
+    assert labware.get_labware_definition('corning_96_wellplate_360ul_flat')
+
+    # a protocol whose hardware cannot be built fails alone
+    monkeypatch.setattr(
+        simulate_batch, '_build_hardware',
+        mock.Mock(side_effect=RuntimeError('no hardware')))
+    result = simulate_batch._simulate_one(str(DATA / 'testosaur_v2.py'))
+    assert not result.ok
+    assert result.error['type'] == 'RuntimeError'
@@ -43,6 +43,13 @@ export function client(dispatch) {
   // TODO(mc, 2017-09-22): build some sort of timer middleware instead?
   let runTimerInterval = NO_INTERVAL
 
+  // robots that send deltas of the session in notifications version them;
+  // keep the version and status fields the next delta applies to
+  let sessionVersion = null
+  let sessionStatus = {}
+  let sessionErrors = []
+  let resyncingSession = false
+
   // return an action handler
   return function receive(state = {}, action = {}) {
     const { type } = action
@@ -155,6 +162,9 @@ export function client(dispatch) {
 
     clearRunTimerInterval()
     remote = null
+    sessionVersion = null
+    sessionErrors = []
+    resyncingSession = false
     dispatch(actions.disconnectResponse())
   }
 
@@ -444,6 +454,9 @@ export function client(dispatch) {
   }
 
   function handleApiSession(apiSession) {
+    if (apiSession.version != null) sessionVersion = apiSession.version
+    sessionStatus = pick(apiSession, ['state', 'stateInfo', 'startTime'])
+
     const update = { state: apiSession.state, startTime: apiSession.startTime }
 
     // ensure run timer is running or stopped
@@ -460,9 +473,20 @@ export function client(dispatch) {
       estimatedDuration: apiSession.stateInfo?.estimatedDuration ?? null,
     }
 
-    // both light and full updates may have the errors list
+    // full updates have the whole errors list; deltas only have the errors
+    // added since their base version and whether the old ones were cleared
+    let errors = null
     if (apiSession.errors) {
-      update.errors = apiSession.errors.map(e => ({
+      errors = apiSession.errors
+    } else if (apiSession.logsCleared || apiSession.newErrors?.length) {
+      errors = (apiSession.logsCleared ? [] : sessionErrors).concat(
+        apiSession.newErrors ?? []
+      )
+    }
+
+    if (errors) {
+      sessionErrors = errors
+      update.errors = errors.map(e => ({
         timestamp: e.timestamp,
         message: e.error.message,
         line: e.error.line,
@@ -649,12 +673,46 @@ export function client(dispatch) {
 
     switch (topic) {
       case 'session':
-        return handleApiSession(payload)
+        return handleSessionNotification(payload)
     }
 
     console.warn(`"${topic}" message was unhandled`)
   }
 
+  function handleSessionNotification(apiSession) {
+    // full sessions have no base version; deltas only carry the fields that
+    // changed since their base version, so skip them if they are stale and
+    // fetch the whole session if we missed one
+    if (apiSession.baseVersion != null) {
+      if (resyncingSession) return
+      if (sessionVersion !== null && apiSession.baseVersion < sessionVersion) {
+        return
+      }
+      if (apiSession.baseVersion !== sessionVersion) return resyncSession()
+
+      return handleApiSession({ ...sessionStatus, ...apiSession })
+    }
+
+    return handleApiSession(apiSession)
+  }
+
+  function resyncSession() {
+    const session = remote && remote.session_manager.session
+    if (!session || !('resync' in session)) return
+
+    resyncingSession = true
+    session
+      .resync()
+      .then(apiSession => {
+        resyncingSession = false
+        handleApiSession(apiSession)
+      })
+      .catch(error => {
+        resyncingSession = false
+        dispatch(actions.sessionResponse(error))
+      })
+  }
+
   function handleClientError(error) {
     console.error(error)
   }
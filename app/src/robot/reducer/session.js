@@ -172,7 +172,9 @@ function handleSessionUpdate(
     payload: { state: sessionStateUpdate, startTime, lastCommand },
     meta: { now },
   } = action
-  let { protocolCommandsById, remoteTimeCompensation } = state
+  let { protocolCommandsById, remoteTimeCompensation, errors } = state
+
+  if (action.payload.errors) errors = action.payload.errors
 
   if (lastCommand) {
     const command = {
@@ -208,6 +210,7 @@ function handleSessionUpdate(
     remoteTimeCompensation,
     startTime,
     protocolCommandsById,
+    errors,
   }
 }
 
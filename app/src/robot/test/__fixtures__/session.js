@@ -19,6 +19,7 @@ export function MockSession() {
     resume: jest.fn(),
     stop: jest.fn(),
     refresh: jest.fn(),
+    resync: jest.fn(),
   }
 }
 
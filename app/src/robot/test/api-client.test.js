@@ -812,6 +812,126 @@ describe('api client', () => {
         .then(() => sendNotification('session', update))
         .then(() => expect(dispatch).toHaveBeenCalledWith(expected))
     })
+
+    it('applies session deltas on top of the known session', () => {
+      session.version = 3
+      session.state = 'running'
+      session.startTime = 4
+      const delta = {
+        version: 4,
+        baseVersion: 3,
+        state: 'running',
+        lastCommand: { id: 0, handledAt: 5 },
+        commandLog: { 0: 5 },
+        newErrors: [],
+      }
+
+      const actionInput = {
+        state: 'running',
+        startTime: 4,
+        lastCommand: { id: 0, handledAt: 5 },
+        statusInfo: {
+          message: null,
+          userMessage: null,
+          changedAt: null,
+          estimatedDuration: null,
+        },
+      }
+      const expected = actions.sessionUpdate(actionInput, expect.any(Number))
+
+      return sendConnect()
+        .then(() => sendNotification('session', delta))
+        .then(() => {
+          expect(dispatch).toHaveBeenCalledWith(expected)
+          expect(session.resync).not.toHaveBeenCalled()
+        })
+    })
+
+    it('appends the new errors of a session delta to the known errors', () => {
+      session.version = 3
+      session.state = 'running'
+      session.errors = [{ timestamp: 1, error: { message: 'AH', line: 2 } }]
+      const delta = {
+        version: 4,
+        baseVersion: 3,
+        state: 'error',
+        lastCommand: null,
+        commandLog: {},
+        newErrors: [{ timestamp: 3, error: { message: 'OH', line: 4 } }],
+      }
+
+      return sendConnect()
+        .then(() => sendNotification('session', delta))
+        .then(() =>
+          expect(dispatch).toHaveBeenCalledWith(
+            expect.objectContaining({
+              type: 'robot:SESSION_UPDATE',
+              payload: expect.objectContaining({
+                errors: [
+                  { timestamp: 1, message: 'AH', line: 2 },
+                  { timestamp: 3, message: 'OH', line: 4 },
+                ],
+              }),
+            })
+          )
+        )
+    })
+
+    it('resets the known errors if a session delta cleared the logs', () => {
+      session.version = 3
+      session.errors = [{ timestamp: 1, error: { message: 'AH', line: 2 } }]
+      const delta = {
+        version: 4,
+        baseVersion: 3,
+        state: 'loaded',
+        lastCommand: null,
+        commandLog: {},
+        newErrors: [],
+        logsCleared: true,
+      }
+
+      return sendConnect()
+        .then(() => sendNotification('session', delta))
+        .then(() =>
+          expect(dispatch).toHaveBeenCalledWith(
+            expect.objectContaining({
+              type: 'robot:SESSION_UPDATE',
+              payload: expect.objectContaining({ errors: [] }),
+            })
+          )
+        )
+    })
+
+    it('resyncs the session if a session delta was missed', () => {
+      session.version = 3
+      const delta = {
+        version: 6,
+        baseVersion: 5,
+        state: 'running',
+        lastCommand: null,
+        commandLog: {},
+        newErrors: [],
+      }
+
+      session.resync.mockResolvedValue({
+        ...session,
+        version: 6,
+        state: 'running',
+      })
+
+      return sendConnect()
+        .then(() => {
+          dispatch.mockClear()
+          sendNotification('session', delta)
+        })
+        .then(() => delay(1))
+        .then(() => {
+          expect(session.resync).toHaveBeenCalled()
+          expect(dispatch).toHaveBeenCalledWith(
+            expect.objectContaining({ type: 'robot:SESSION_RESPONSE' })
+          )
+        })
+    })
   })
 
   describe('calibration', () => {
@@ -193,6 +193,34 @@ describe('robot reducer - session', () => {
     })
   })
 
+  it('handles SESSION_UPDATE action with errors', () => {
+    const state = {
+      session: {
+        state: 'running',
+        startTime: 1,
+        remoteTimeCompensation: 3,
+        protocolCommandsById: {},
+        errors: [],
+      },
+    }
+    const action = {
+      type: 'robot:SESSION_UPDATE',
+      payload: {
+        state: 'error',
+        startTime: 1,
+        lastCommand: null,
+        errors: [{ timestamp: 2, message: 'AH', line: 3 }],
+      },
+      meta: {
+        now: 6,
+      },
+    }
+
+    expect(reducer(state, action).session.errors).toEqual([
+      { timestamp: 2, message: 'AH', line: 3 },
+    ])
+  })
+
   it('handles RUN action', () => {
     const state = {
       session: {
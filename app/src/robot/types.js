@@ -172,6 +172,11 @@ export type SessionUpdate = {|
     id: number,
     handledAt: number,
   |},
+  errors?: Array<{|
+    timestamp: number,
+    line: number,
+    message: string,
+  |}>,
 |}
 
 export type TiprackByMountMap = {|
@@ -0,0 +1,34 @@
+""" make_rootfs_delta.py: make a delta update of a buildroot system
+
+Writes a rootfs.delta that rebuilds a new rootfs.ext4 from the one a robot is
+running. Put it in the ot2-system.zip in place of rootfs.ext4, along with the
+hash (and signature) of the new rootfs.ext4, so that only the blocks that
+changed are uploaded and written. See otupdate.buildroot.delta.
+"""
+
+import argparse
+
+from otupdate.buildroot import delta
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='make a delta update of a buildroot system')
+    parser.add_argument('base', metavar='BASE_ROOTFS',
+                        help='The rootfs.ext4 the robot is running')
+    parser.add_argument('new', metavar='NEW_ROOTFS',
+                        help='The rootfs.ext4 to update to')
+    parser.add_argument('delta', metavar='DELTA',
+                        help='Where to write the rootfs.delta')
+    parser.add_argument('-b', '--block-size', type=int,
+                        default=delta.DEFAULT_BLOCK_SIZE,
+                        help='The size of the blocks to compare')
+    args = parser.parse_args()
+    with open(args.delta, 'wb') as out:
+        header = delta.make_delta(args.base, args.new, out, args.block_size)
+        size = out.tell()
+    print(f'Wrote {args.delta} ({size}B for a {header.new_size}B image)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""
+otupdate.buildroot.delta: block-level deltas between rootfs images
+
+An update can carry a delta (``rootfs.delta``) against the rootfs the robot
+is running instead of the full ``rootfs.ext4``. The new image is rebuilt by
+copying the blocks it shares with the running root partition and writing the
+others from the delta, so only the changed blocks are uploaded.
+
+A delta is a header followed by operations:
+
+- The header holds the block size, the size of the base image the delta was
+  made against, and the size of the new image
+- A copy operation copies a run of blocks of the base image, wherever they
+  are in it. It is followed by the sha256 of the blocks, so that they are
+  checked as they are copied: the running root partition is not the exact
+  base image (the machine id is written to it when it is installed), but
+  only the blocks that are copied from it matter
+- A data operation writes a run of blocks that follow it in the delta
+- An end operation ends the delta
+
+The new image is every block the operations produce, cut to its size.
+
+To make a delta, run::
+
+    python make_rootfs_delta.py base.ext4 new.ext4 rootfs.delta
+
+from the update server project, and put ``rootfs.delta`` in the update zip in
+place of ``rootfs.ext4``, along with the usual hash (and signature) of the
+new image.
+"""
+import binascii
+import hashlib
+import logging
+import struct
+from typing import (BinaryIO, Callable, Dict, IO, Iterator, List,
+                    NamedTuple, Optional)
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'OTDELTA1'
+HEADER = struct.Struct('>8sIQQ')
+OPERATION = struct.Struct('>BQI')
+OP_END = 0
+OP_COPY = 1
+OP_DATA = 2
+#: The size of the hash that follows a copy operation
+COPY_HASH_SIZE = hashlib.sha256().digest_size
+
+#: The default block size of deltas; the block size of ext4
+DEFAULT_BLOCK_SIZE = 4096
+#: The most blocks a data operation of a delta being made holds
+MAX_DATA_BLOCKS = 1024
+#: The size of the chunks a delta is applied in
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class DeltaFormatError(ValueError):
+    def __init__(self, message):
+        self.message = message
+        self.short = 'Bad Delta'
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.message}>'
+
+    def __str__(self):
+        return self.message
+
+
+class BaseMismatch(ValueError):
+    def __init__(self, message):
+        self.message = message
+        self.short = 'Base Mismatch'
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.message}>'
+
+    def __str__(self):
+        return self.message
+
+
+class DeltaHeader(NamedTuple):
+    block_size: int
+    base_size: int
+    new_size: int
+
+
+def read_header(delta: IO[bytes]) -> DeltaHeader:
+    """ Read the header at the start of a delta
+
+    :raises DeltaFormatError: If this is not a delta
+    """
+    raw = delta.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise DeltaFormatError('Delta too short')
+    magic, block_size, base_size, new_size = HEADER.unpack(raw)
+    if magic != MAGIC or not block_size:
+        raise DeltaFormatError('Not a rootfs delta')
+    return DeltaHeader(block_size, base_size, new_size)
+
+
+def _read_exactly(source: IO[bytes], size: int) -> bytes:
+    data = source.read(size)
+    if len(data) != size:
+        raise DeltaFormatError('Delta truncated')
+    return data
+
+
+def _read_blocks(source: IO[bytes], count: int, block_size: int,
+                 blocks_per_chunk: int, error: Exception) -> Iterator[bytes]:
+    """ Read a run of blocks in chunks, raising `error` if it is cut short """
+    while count:
+        blocks = min(count, blocks_per_chunk)
+        data = source.read(blocks * block_size)
+        if len(data) != blocks * block_size:
+            raise error
+        yield data
+        count -= blocks
+
+
+def _copy_blocks(delta: IO[bytes], base: IO[bytes], start: int, count: int,
+                 block_size: int, blocks_per_chunk: int) -> Iterator[bytes]:
+    """ Read a run of blocks of the base to copy, checking them against the
+    hash that follows their operation once they are all read """
+    expected = _read_exactly(delta, COPY_HASH_SIZE)
+    hasher = hashlib.sha256()
+    base.seek(start * block_size)
+    mismatch = BaseMismatch(
+        f'Blocks {start} to {start + count - 1} of the running system '
+        'differ from the base image of the delta')
+    for data in _read_blocks(
+            base, count, block_size, blocks_per_chunk, mismatch):
+        hasher.update(data)
+        yield data
+    if hasher.digest() != expected:
+        raise mismatch
+
+
+def _operation_blocks(delta: IO[bytes], base: IO[bytes], op: int,
+                      start: int, count: int, block_size: int,
+                      blocks_per_chunk: int) -> Iterator[bytes]:
+    """ The chunks of blocks a copy or data operation writes """
+    if op == OP_COPY:
+        return _copy_blocks(
+            delta, base, start, count, block_size, blocks_per_chunk)
+    if op == OP_DATA:
+        return _read_blocks(delta, count, block_size, blocks_per_chunk,
+                            DeltaFormatError('Delta truncated'))
+    raise DeltaFormatError(f'Unknown delta operation {op}')
+
+
+def apply_delta(delta: IO[bytes],
+                header: DeltaHeader,
+                base: IO[bytes],
+                out: BinaryIO,
+                progress_callback: Callable[[float], None],
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> bytes:
+    """ Write the image a delta rebuilds from its base
+
+    The blocks copied from the base are checked as they are copied, so the
+    image may already be partly written when a mismatch is found.
+
+    :param delta: The delta, positioned after its header (see
+                  :py:func:`read_header`)
+    :param base: The base image, or a partition holding it
+    :param out: Where to write the new image
+    :param progress_callback: Called with the progress between 0 and 1.0
+    :param chunk_size: The most to read and write at once
+    :returns: The sha256 of the new image, as ascii hex
+    :raises DeltaFormatError: If the delta is malformed
+    :raises BaseMismatch: If blocks copied from the base are not those of
+                          the base image the delta was made against
+    """
+    hasher = hashlib.sha256()
+    block_size = header.block_size
+    blocks_per_chunk = max(1, chunk_size // block_size)
+    remaining = header.new_size
+
+    def write(data: bytes):
+        nonlocal remaining
+        data = data[:remaining]
+        hasher.update(data)
+        view = memoryview(data)
+        while view:
+            view = view[out.write(view):]
+        remaining -= len(data)
+        if header.new_size:
+            progress_callback(1 - remaining / header.new_size)
+
+    while True:
+        op, start, count = OPERATION.unpack(
+            _read_exactly(delta, OPERATION.size))
+        if op == OP_END:
+            break
+        for data in _operation_blocks(delta, base, op, start, count,
+                                      block_size, blocks_per_chunk):
+            write(data)
+    if remaining:
+        raise DeltaFormatError(
+            f'Delta ended {remaining}B before the end of the image')
+    return binascii.hexlify(hasher.digest())
+
+
+class _DeltaWriter:
+    """ Writes the operations of a delta, merging consecutive copies and
+    consecutive data blocks """
+
+    def __init__(self, out: BinaryIO, block_size: int) -> None:
+        self._out = out
+        self._block_size = block_size
+        self._copy_start: Optional[int] = None
+        self._copy_count = 0
+        self._copy_hash = hashlib.sha256()
+        self._data: List[bytes] = []
+        self.copied = 0
+        self.written = 0
+
+    def copy(self, block: int, data: bytes):
+        """ Copy a block of the base, whose content is `data` """
+        self._flush_data()
+        if self._copy_start is None \
+                or self._copy_start + self._copy_count != block:
+            self._flush_copy()
+            self._copy_start = block
+        self._copy_count += 1
+        self._copy_hash.update(data)
+
+    def data(self, block: bytes):
+        self._flush_copy()
+        # Data is written in whole blocks; the image is cut to its size
+        self._data.append(block.ljust(self._block_size, b'\0'))
+        if len(self._data) == MAX_DATA_BLOCKS:
+            self._flush_data()
+
+    def end(self):
+        self._flush_copy()
+        self._flush_data()
+        self._out.write(OPERATION.pack(OP_END, 0, 0))
+
+    def _flush_copy(self):
+        if self._copy_start is None:
+            return
+        self._out.write(
+            OPERATION.pack(OP_COPY, self._copy_start, self._copy_count))
+        self._out.write(self._copy_hash.digest())
+        self.copied += self._copy_count
+        self._copy_start = None
+        self._copy_count = 0
+        self._copy_hash = hashlib.sha256()
+
+    def _flush_data(self):
+        if not self._data:
+            return
+        self._out.write(OPERATION.pack(OP_DATA, 0, len(self._data)))
+        self._out.write(b''.join(self._data))
+        self.written += len(self._data)
+        self._data = []
+
+
+def _index_blocks(base: IO[bytes], block_size: int) -> Dict[bytes, int]:
+    index: Dict[bytes, int] = {}
+    block_number = 0
+    while True:
+        block = base.read(block_size)
+        # Only whole blocks are copied, so that a partition larger than the
+        # base image still holds the same bytes
+        if len(block) != block_size:
+            break
+        index.setdefault(hashlib.sha256(block).digest(), block_number)
+        block_number += 1
+    return index
+
+
+def make_delta(base_path: str, new_path: str, out: BinaryIO,
+               block_size: int = DEFAULT_BLOCK_SIZE) -> DeltaHeader:
+    """ Write a delta that rebuilds the image at `new_path` from the one at
+    `base_path`.
+
+    Each whole block of the new image is copied from the same block of the
+    base image if they match, or else from any block of the base image that
+    matches it; it is written to the delta otherwise.
+
+    :returns: The header of the delta
+    """
+    with open(base_path, 'rb') as base, open(new_path, 'rb') as new:
+        base_size = base.seek(0, 2)
+        header = DeltaHeader(block_size, base_size, new.seek(0, 2))
+        out.write(HEADER.pack(MAGIC, *header))
+        base.seek(0)
+        index = _index_blocks(base, block_size)
+        base.seek(0)
+        new.seek(0)
+        writer = _DeltaWriter(out, block_size)
+        block_number = 0
+        while True:
+            block = new.read(block_size)
+            if not block:
+                break
+            if len(block) == block_size and base.read(block_size) == block:
+                writer.copy(block_number, block)
+            else:
+                match = index.get(hashlib.sha256(block).digest())
+                if match is None:
+                    writer.data(block)
+                else:
+                    writer.copy(match, block)
+            block_number += 1
+        writer.end()
+    LOG.info(f'Delta of {new_path} against {base_path}: {writer.copied} '
+             f'blocks copied, {writer.written} written')
+    return header
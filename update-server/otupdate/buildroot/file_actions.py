@@ -3,28 +3,44 @@
 
 This module has functions that actually accomplish the various tasks required
 for an update: unzipping update files, hashing rootfs, checking signatures,
-writing to root partitions
+writing to root partitions. :py:func:`validate_and_write_update` does all of
+these in a single pass over the rootfs.
 """
 import binascii
 import contextlib
 import enum
+import functools
 import hashlib
 import logging
 import os
 import re
 import subprocess
 import tempfile
-from typing import (Callable, Dict, List, Mapping, NamedTuple,
+from typing import (BinaryIO, Callable, Dict, IO, Mapping, NamedTuple,
                     Optional, Sequence, Tuple)
 import zipfile
 
+from . import delta
+
 
 ROOTFS_SIG_NAME = 'rootfs.ext4.hash.sig'
 ROOTFS_HASH_NAME = 'rootfs.ext4.hash'
 ROOTFS_NAME = 'rootfs.ext4'
+ROOTFS_DELTA_NAME = 'rootfs.delta'
 UPDATE_FILES = [ROOTFS_NAME, ROOTFS_SIG_NAME, ROOTFS_HASH_NAME]
 LOG = logging.getLogger(__name__)
 
+#: The size of the chunks :py:func:`validate_and_write_update` decompresses,
+#: hashes and writes at once; a multiple of the erase block size of SD cards,
+#: so that the writes to the partition stay aligned
+STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+
+#: The steps of :py:func:`validate_and_write_update`, in order
+STEP_UNZIP = 'unzip'
+STEP_SIGNATURE = 'signature'
+STEP_STREAM = 'stream'
+STEP_SYNC = 'sync'
+
 
 class Partition(NamedTuple):
     number: int
@@ -115,28 +131,15 @@ def unzip_update(filepath: str,
     :raises FileMissing: If a mandatory file is missing
     """
     assert chunk_size
-    total_size = 0
     written_size = 0
-    to_unzip: List[zipfile.ZipInfo] = []
     file_paths: Dict[str, Optional[str]] = {fn: None
                                             for fn in acceptable_files}
     file_sizes: Dict[str, int] = {fn: 0 for fn in acceptable_files}
     LOG.info(f"Unzipping {filepath}")
     with zipfile.ZipFile(filepath, 'r') as zf:
-        files = zf.infolist()
-        remaining_filenames = [fn for fn in acceptable_files]
-        for fi in files:
-            if fi.filename in acceptable_files:
-                to_unzip.append(fi)
-                total_size += fi.file_size
-                remaining_filenames.remove(fi.filename)
-                LOG.debug(f"Found {fi.filename} ({fi.file_size}B)")
-            else:
-                LOG.debug(f"Ignoring {fi.filename}")
-
-        for name in remaining_filenames:
-            if name in mandatory_files:
-                raise FileMissing(f'File {name} missing from zip')
+        to_unzip = list(_find_update_files(
+            zf, acceptable_files, mandatory_files).values())
+        total_size = sum(fi.file_size for fi in to_unzip)
 
         for fi in to_unzip:
             uncomp_path = os.path.join(os.path.dirname(filepath), fi.filename)
@@ -159,6 +162,29 @@ def unzip_update(filepath: str,
     return file_paths, file_sizes
 
 
+def _find_update_files(
+        zf: zipfile.ZipFile,
+        acceptable_files: Sequence[str],
+        mandatory_files: Sequence[str]) -> Dict[str, zipfile.ZipInfo]:
+    """ Find the files of an update in its zipfile
+
+    :returns: The entries of the acceptable files found, by name
+    :raises FileMissing: If a mandatory file is missing
+    """
+    found: Dict[str, zipfile.ZipInfo] = {}
+    for fi in zf.infolist():
+        if fi.filename in acceptable_files:
+            found[fi.filename] = fi
+            LOG.debug(f"Found {fi.filename} ({fi.file_size}B)")
+        else:
+            LOG.debug(f"Ignoring {fi.filename}")
+
+    for name in mandatory_files:
+        if name not in found:
+            raise FileMissing(f'File {name} missing from zip')
+    return found
+
+
 def hash_file(path: str,
               progress_callback: Callable[[float], None],
               chunk_size: int = 1024,
@@ -233,57 +259,159 @@ def verify_signature(message_path: str,
         raise SignatureMismatch('Signature check failed')
 
 
-def validate_update(filepath: str,
-                    progress_callback: Callable[[float], None],
-                    cert_path: Optional[str]):
-    """ Worker for validation. Call in an executor (so it can return things)
+def _write_all(out: BinaryIO, data: memoryview):
+    while data:
+        data = data[out.write(data):]
+
+
+def _stream_file(zipped: BinaryIO,
+                 file_size: int,
+                 out: BinaryIO,
+                 progress_callback: Callable[[float], None],
+                 chunk_size: int,
+                 algo: str = 'sha256') -> bytes:
+    """ Copy a file from a zip to another, hashing it on the way
+
+    The chunks are read into the same buffer, so that copying a large image
+    does not allocate a new chunk for every read.
+
+    :returns: The hash of what was copied, as ascii hex
+    """
+    hasher = hashlib.new(algo)
+    buffer = memoryview(bytearray(chunk_size))
+    written = 0
+    while True:
+        read = zipped.readinto(buffer)  # type: ignore
+        if not read:
+            break
+        chunk = buffer[:read]
+        hasher.update(chunk)
+        _write_all(out, chunk)
+        written += read
+        progress_callback(written / file_size)
+    return binascii.hexlify(hasher.digest())
 
-    - Unzips filepath to its directory
-    - Hashes the rootfs inside
+
+def validate_and_write_update(
+        filepath: str,
+        progress_callback: Callable[[float], None],
+        cert_path: Optional[str],
+        step_callback: Callable[[str], None] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE) -> RootPartitions:
+    """ Worker for validating and writing an update in a single pass. Call in
+    an executor.
+
+    Rather than unzipping the rootfs to disk, reading it again to hash it
+    and a third time to write it, this decompresses, hashes and writes each
+    chunk of it in the same pass:
+
+    - Unzips the hash of the rootfs (and its signature) to the directory of
+      ``filepath``
     - If requested, checks the signature of the hash
+    - Streams the rootfs from the zip to the unused root partition, hashing
+      it on the way, and syncs the partition. If the zip holds a delta
+      (``rootfs.delta``, see :py:mod:`otupdate.buildroot.delta`) rather than
+      the rootfs, the rootfs is rebuilt from the delta and the running root
+      partition, checking the blocks copied from it
+    - Checks the hash of what was written
+
+    The unused partition is written before its hash is checked, but it is
+    only booted once :py:func:`commit_update` is called, which must only be
+    done if this function returns.
+
     :param filepath: The path to the update zip file
-    :param progress_callback: The function to call with progress between 0
-                              and 1.0. May never reach precisely 1.0, best
-                              only for user information
+    :param progress_callback: The function to call with the progress of the
+                              write between 0 and 1.0. May never reach
+                              precisely 1.0, best only for user information
     :param cert_path: Path to an x.509 certificate to check the signature
                       against. If ``None``, signature checking is disabled
-    :returns str: Path to the rootfs file to update
-
-    Will also raise an exception if validation fails
+    :param step_callback: If specified, called with the name of each step
+                          (:py:data:`STEP_UNZIP`, :py:data:`STEP_SIGNATURE`,
+                          :py:data:`STEP_STREAM`, :py:data:`STEP_SYNC`) as it
+                          begins
+    :param chunk_size: The size of the chunks to decompress, hash and write
+    :returns: The root partition that the rootfs image was written to
+    :raises FileMissing: If a file is missing from the zip
+    :raises SignatureMismatch: If the signature does not verify. Nothing is
+                               written to the partition then.
+    :raises HashMismatch: If the rootfs does not match its hash, or the
+                          blocks of the running system a delta copies are
+                          not those of its base image
     """
+    def step(name: str):
+        if step_callback:
+            step_callback(name)
 
-    def zip_callback(progress):
-        progress_callback(progress/2.0)
-
-    required = [ROOTFS_NAME, ROOTFS_HASH_NAME]
+    required = [ROOTFS_HASH_NAME]
     if cert_path:
         required.append(ROOTFS_SIG_NAME)
-    files, sizes = unzip_update(filepath, zip_callback,
-                                UPDATE_FILES,
-                                required)
-
-    def hash_callback(progress):
-        progress_callback(progress/2.0 + 0.5)
-    rootfs = files.get(ROOTFS_NAME)
-    assert rootfs
-    rootfs_hash = hash_file(rootfs,
-                            hash_callback,
-                            file_size=sizes[ROOTFS_NAME])
-    hashfile = files.get(ROOTFS_HASH_NAME)
-    assert hashfile
-    packaged_hash = open(hashfile, 'rb').read().strip()
+    directory = os.path.dirname(filepath)
+    with zipfile.ZipFile(filepath, 'r') as zf, \
+            contextlib.ExitStack() as stack:
+        step(STEP_UNZIP)
+        files = _find_update_files(
+            zf, UPDATE_FILES + [ROOTFS_DELTA_NAME], required)
+        if ROOTFS_NAME not in files and ROOTFS_DELTA_NAME not in files:
+            raise FileMissing(f'File {ROOTFS_NAME} missing from zip')
+        hashfile = zf.extract(files[ROOTFS_HASH_NAME], directory)
+        packaged_hash = open(hashfile, 'rb').read().strip()
+
+        if cert_path:
+            step(STEP_SIGNATURE)
+            sigfile = zf.extract(files[ROOTFS_SIG_NAME], directory)
+            verify_signature(hashfile, sigfile, cert_path)
+
+        if ROOTFS_DELTA_NAME in files:
+            delta_file = stack.enter_context(
+                zf.open(files[ROOTFS_DELTA_NAME]))
+            header = delta.read_header(delta_file)
+            base = stack.enter_context(
+                open(_find_active_partition().value.path, 'rb'))
+            write = functools.partial(
+                _apply_delta, delta_file, header, base)
+            source = f'{ROOTFS_DELTA_NAME} ({header.new_size}B rebuilt)'
+        else:
+            rootfs = files[ROOTFS_NAME]
+            write = functools.partial(
+                _stream_file, stack.enter_context(zf.open(rootfs)),
+                rootfs.file_size)
+            source = f'{rootfs.filename} ({rootfs.file_size}B)'
+
+        step(STEP_STREAM)
+        unused = _find_unused_partition()
+        part_path = unused.value.path
+        LOG.info(f'Streaming {source} to {part_path} in {chunk_size}B chunks')
+        with open(part_path, 'wb', buffering=0) as part:
+            rootfs_hash = write(part, progress_callback, chunk_size)
+            step(STEP_SYNC)
+            os.fsync(part.fileno())
+
     if packaged_hash != rootfs_hash:
         msg = f"Hash mismatch: calculated {rootfs_hash!r} != "\
             f"packaged {packaged_hash!r}"
         LOG.error(msg)
         raise HashMismatch(msg)
+    return unused
 
-    if cert_path:
-        sigfile = files.get(ROOTFS_SIG_NAME)
-        assert sigfile
-        verify_signature(hashfile, sigfile, cert_path)
 
-    return rootfs
+def _apply_delta(delta_file: IO[bytes], header: delta.DeltaHeader,
+                 base: IO[bytes], out: BinaryIO,
+                 progress_callback: Callable[[float], None],
+                 chunk_size: int) -> bytes:
+    """ Rebuild the rootfs from a delta and the running root partition """
+    try:
+        return delta.apply_delta(
+            delta_file, header, base, out, progress_callback, chunk_size)
+    except delta.BaseMismatch as e:
+        LOG.error(f"Base image mismatch: {e}")
+        raise HashMismatch(str(e)) from e
+
+
+def _find_active_partition() -> RootPartitions:
+    """ Find the root partition the system is running from """
+    return {RootPartitions.TWO: RootPartitions.THREE,
+            RootPartitions.THREE: RootPartitions.TWO}[
+                _find_unused_partition()]
 
 
 def _find_unused_partition() -> RootPartitions:
@@ -293,68 +421,6 @@ def _find_unused_partition() -> RootPartitions:
             b'3': RootPartitions.THREE}[which]
 
 
-def write_file(infile: str,
-               outfile: str,
-               progress_callback: Callable[[float], None],
-               chunk_size: int = 1024,
-               file_size: int = None):
-    """ Write a file to another file with progress callbacks.
-
-    :param infile: The input filepath
-    :param outfile: The output filepath
-    :param progress_callback: The callback to call for progress
-    :param chunk_size: The size of file chunks to copy in between progress
-                       notifications
-    :param file_size: The total size of the update file (for generating
-                      progress percentage). If ``None``, generated with
-                      ``seek``/``tell``.
-    """
-    total_written = 0
-    with open(infile, 'rb') as img, open(outfile, 'wb') as part:
-        if None is file_size:
-            file_size = img.seek(0, 2)
-            img.seek(0)
-            LOG.info(f'write_file: file size calculated as {file_size}B')
-        LOG.info(f'write_file: writing {infile} ({file_size}B)'
-                 f' to {outfile} in {chunk_size}B chunks')
-        while True:
-            chunk = img.read(chunk_size)
-            part.write(chunk)
-            total_written += len(chunk)
-            progress_callback(total_written / file_size)
-            if len(chunk) != chunk_size:
-                break
-
-
-def write_update(rootfs_filepath: str,
-                 progress_callback: Callable[[float], None],
-                 chunk_size: int = 1024,
-                 file_size: int = None) -> RootPartitions:
-    """
-    Write the new rootfs to the next root partition
-
-    - Figure out, from the system, the correct root partition to write to
-    - Write the rootfs at ``rootfs_filepath`` there, with progress
-
-    :param rootfs_filepath: The path to a checked rootfs.ext4
-    :param progress_callback: A callback to call periodically with progress
-                              between 0 and 1.0. May never reach precisely
-                              1.0, best only for user information.
-    :param chunk_size: The size of file chunks to copy in between progress
-                       notifications
-    :param file_size: The total size of the update file (for generating
-                      progress percentage). If ``None``, generated with
-                      ``seek``/``tell``.
-    :returns: The root partition that the rootfs image was written to, e.g.
-              ``RootPartitions.TWO`` or ``RootPartitions.THREE``.
-    """
-    unused = _find_unused_partition()
-    part_path = unused.value.path
-    write_file(rootfs_filepath, part_path, progress_callback,
-               chunk_size, file_size)
-    return unused
-
-
 def _mountpoint_root():
     """ provides mountpoint location for :py:meth:`mount_update`.
 
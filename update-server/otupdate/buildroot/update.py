@@ -84,42 +84,39 @@ async def _save_file(part: BodyPartReader, path: str):
             write.write(decoded)
 
 
-def _begin_write(session: UpdateSession,
-                 loop: asyncio.AbstractEventLoop,
-                 rootfs_file_path: str):
-    """ Start the write process. """
-    session.set_progress(0)
-    session.set_stage(Stages.WRITING)
-    write_future = asyncio.ensure_future(loop.run_in_executor(
-        None, file_actions.write_update, rootfs_file_path,
-        session.set_progress))
-
-    def write_done(fut):
-        exc = fut.exception()
-        if exc:
-            session.set_error(getattr(exc, 'short', str(type(exc))),
-                              str(exc))
-        else:
-            session.set_stage(Stages.DONE)
-
-    write_future.add_done_callback(write_done)
-
-
 def _begin_validation(
         session: UpdateSession,
         config: config.Config,
         loop: asyncio.AbstractEventLoop,
         downloaded_update_path: str)\
         -> asyncio.futures.Future:
-    """ Start the validation process. """
+    """ Start the validation process, which writes the update in the same
+    pass (see :py:func:`.file_actions.validate_and_write_update`).
+
+    The session moves to the writing stage once the signature is checked,
+    and to done once the written update matches its hash.
+    """
     session.set_stage(Stages.VALIDATING)
     cert_path = config.update_cert_path\
         if config.signature_required else None
 
+    def begin_step(step: str):
+        if step == file_actions.STEP_STREAM:
+            session.set_stage(Stages.WRITING)
+        session.begin_step(step)
+
+    def step_callback(step: str):
+        # Called from the executor thread; progress is set right away like
+        # the progress callback does, and the stage changes on the loop
+        if step == file_actions.STEP_STREAM:
+            session.set_progress(0)
+        loop.call_soon_threadsafe(begin_step, step)
+
     validation_future \
         = asyncio.ensure_future(loop.run_in_executor(
-            None, file_actions.validate_update,
-            downloaded_update_path, session.set_progress, cert_path))
+            None, file_actions.validate_and_write_update,
+            downloaded_update_path, session.set_progress, cert_path,
+            step_callback))
 
     def validation_done(fut):
         exc = fut.exception()
@@ -127,11 +124,7 @@ def _begin_validation(
             session.set_error(getattr(exc, 'short', str(type(exc))),
                               str(exc))
         else:
-            rootfs_file = fut.result()
-            loop.call_soon_threadsafe(_begin_write,
-                                      session,
-                                      loop,
-                                      rootfs_file)
+            session.set_stage(Stages.DONE)
     validation_future.add_done_callback(validation_done)
     return validation_future
 
@@ -4,7 +4,8 @@ import enum
 import logging
 import os
 import shutil
-from typing import Mapping, Optional, Union
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
 import uuid
 
 
@@ -35,6 +36,8 @@ class UpdateSession:
         self._storage_path = storage_path
         self._setup_dl_area()
         self._rootfs_file: Optional[str] = None
+        self._step: Optional[Tuple[str, float]] = None
+        self._timings: Dict[str, float] = {}
         LOG.info(f"Update session: created {self._token}")
 
     def _setup_dl_area(self):
@@ -53,8 +56,26 @@ class UpdateSession:
         """ Convenience method to set the stage and lookup message """
         assert stage in Stages
         LOG.info(f'Update session: stage {self._stage.name}->{stage.name}')
+        self.end_step()
         self._stage = stage
 
+    def begin_step(self, step: str):
+        """ Note that a step of the current stage begins (and that the one
+        before ended), so that how long each step takes is in :py:attr:`state`
+        """
+        self.end_step()
+        self._step = (step, time.monotonic())
+
+    def end_step(self):
+        """ Note that the current step ended, if there is one. Changing the
+        stage ends the step too. """
+        if not self._step:
+            return
+        step, started = self._step
+        self._step = None
+        self._timings[step] = time.monotonic() - started
+        LOG.info(f'Update session: {step} took {self._timings[step]:.2f}s')
+
     def set_error(self, error_shortmsg: str, error_longmsg: str):
         """ Set the stage to error and add a message """
         LOG.error(f"Update session: error in stage {self._stage.name}: "
@@ -107,12 +128,19 @@ class UpdateSession:
             return self._stage.value.human
 
     @property
-    def state(self) -> Mapping[str, Union[str, float]]:
+    def timings(self) -> Mapping[str, float]:
+        """ How long each step that ended took, in seconds """
+        return dict(self._timings)
+
+    @property
+    def state(self) -> Mapping[str, Any]:
         if self.is_error:
             return {'stage': self.stage.value.short,
                     'error': self.error.short,
-                    'message': self.message}
+                    'message': self.message,
+                    'timings': self.timings}
         else:
             return {'stage': self.stage.value.short,
                     'progress': self.progress,
-                    'message': self.message}
+                    'message': self.message,
+                    'timings': self.timings}
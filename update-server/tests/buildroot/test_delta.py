@@ -0,0 +1,146 @@
+""" tests for otupdate.buildroot.delta
+
+Makes deltas between small synthetic images laid out like ext4 ones, and
+checks they rebuild the new image, alone and through a delta update
+"""
+import binascii
+import hashlib
+import io
+import os
+import random
+from unittest import mock
+import zipfile
+
+import pytest
+
+from otupdate.buildroot import delta, file_actions
+
+BLOCK = delta.DEFAULT_BLOCK_SIZE
+
+
+def _ext4_like(files, total_blocks):
+    """ An image with a superblock, then the blocks of each file, then free
+    (zeroed) blocks """
+    superblock = b'\0' * 1024 + b'\x53\xef' + bytes(BLOCK - 1026)
+    data = b''.join(files)
+    return superblock + data + bytes(total_blocks * BLOCK - len(data) - BLOCK)
+
+
+def _random_blocks(rng, count):
+    return bytes(rng.getrandbits(8) for _ in range(count * BLOCK))
+
+
+@pytest.fixture
+def images(tmpdir):
+    rng = random.Random(1234)
+    python_pkg = _random_blocks(rng, 8)
+    firmware = _random_blocks(rng, 4)
+    config = _random_blocks(rng, 2)
+    base = _ext4_like([python_pkg, firmware, config], 32)
+    # A changed python package, the firmware moved after the config, and a
+    # larger image that does not end on a block boundary
+    new_pkg = python_pkg[:3 * BLOCK] + _random_blocks(rng, 2) \
+        + python_pkg[5 * BLOCK:]
+    new = _ext4_like([new_pkg, config, firmware], 40) + b'tail'
+    base_path = os.path.join(tmpdir, 'base.ext4')
+    new_path = os.path.join(tmpdir, 'new.ext4')
+    open(base_path, 'wb').write(base)
+    open(new_path, 'wb').write(new)
+    return base_path, new_path
+
+
+def _sha256(data):
+    return binascii.hexlify(hashlib.sha256(data).digest())
+
+
+def test_delta_rebuilds_image(images):
+    base_path, new_path = images
+    base = open(base_path, 'rb').read()
+    new = open(new_path, 'rb').read()
+    out = io.BytesIO()
+    header = delta.make_delta(base_path, new_path, out)
+    assert header == delta.DeltaHeader(BLOCK, len(base), len(new))
+    # Only the two changed blocks and the tail are in the delta
+    assert len(out.getvalue()) < 4 * BLOCK
+
+    out.seek(0)
+    assert delta.read_header(out) == header
+    rebuilt = io.BytesIO()
+    progress = []
+    # The base may be a partition larger than the image
+    rebuilt_hash = delta.apply_delta(
+        out, header, io.BytesIO(base + bytes(10 * BLOCK)), rebuilt,
+        progress.append, chunk_size=3 * BLOCK)
+    assert rebuilt.getvalue() == new
+    assert rebuilt_hash == _sha256(new)
+    assert progress[-1] == 1.0
+    assert progress == sorted(progress)
+
+
+def test_bad_deltas(images):
+    with pytest.raises(delta.DeltaFormatError):
+        delta.read_header(io.BytesIO(b'PK\x03\x04' + bytes(100)))
+    base_path, new_path = images
+    out = io.BytesIO()
+    header = delta.make_delta(base_path, new_path, out)
+    truncated = io.BytesIO(out.getvalue()[:-100])
+    delta.read_header(truncated)
+    with pytest.raises(delta.DeltaFormatError):
+        delta.apply_delta(truncated, header, open(base_path, 'rb'),
+                          io.BytesIO(), lambda p: None)
+
+
+@pytest.fixture
+def delta_update(images, tmpdir, testing_partition, monkeypatch):
+    """ An update zip with a delta against an active partition holding the
+    base image """
+    base_path, new_path = images
+    zip_path = os.path.join(tmpdir, 'downloads', 'ot2-system.zip')
+    os.makedirs(os.path.dirname(zip_path))
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        out = io.BytesIO()
+        delta.make_delta(base_path, new_path, out)
+        zf.writestr(file_actions.ROOTFS_DELTA_NAME, out.getvalue())
+        zf.writestr(file_actions.ROOTFS_HASH_NAME,
+                    _sha256(open(new_path, 'rb').read()))
+    monkeypatch.setattr(
+        file_actions, '_find_active_partition',
+        lambda: mock.Mock(value=file_actions.Partition(3, base_path)))
+    return zip_path
+
+
+def test_delta_update(delta_update, images, testing_partition):
+    steps = []
+    file_actions.validate_and_write_update(
+        delta_update, lambda p: None, None, steps.append)
+    assert steps == [file_actions.STEP_UNZIP, file_actions.STEP_STREAM,
+                     file_actions.STEP_SYNC]
+    assert open(testing_partition, 'rb').read() \
+        == open(images[1], 'rb').read()
+
+
+def test_delta_update_checks_base(delta_update, images, testing_partition):
+    base_path, _ = images
+    with open(base_path, 'r+b') as base:
+        base.seek(BLOCK)
+        base.write(b'changed')
+    with pytest.raises(file_actions.HashMismatch):
+        file_actions.validate_and_write_update(
+            delta_update, lambda p: None, None)
+
+
+def test_delta_update_ignores_blocks_not_copied(
+        delta_update, images, testing_partition):
+    base_path, new_path = images
+    # The running partition is not the exact base image: the blocks of the
+    # python package the new image changes are not copied, and the
+    # partition is larger than the image
+    with open(base_path, 'r+b') as base:
+        base.seek(4 * BLOCK)
+        base.write(b'machine-id')
+        base.seek(0, 2)
+        base.write(b'\xff' * 3 * BLOCK)
+    file_actions.validate_and_write_update(
+        delta_update, lambda p: None, None)
+    assert open(testing_partition, 'rb').read() \
+        == open(new_path, 'rb').read()
@@ -102,102 +102,92 @@ def test_verify_signature_catches_bad_sig(
                                       testing_cert)
 
 
-@pytest.mark.exclude_rootfs_ext4_hash_sig
-def test_validate_hash_only(downloaded_update_file):
-    cb = mock.Mock()
-    assert file_actions.validate_update(downloaded_update_file,
-                                        cb,
-                                        cert_path=None)
-    # We should have a callback call for
-    # - the unzips (see test_unzip for calculation)
-    with zipfile.ZipFile(downloaded_update_file) as zf:
-        rootfs_size = zf.getinfo(file_actions.ROOTFS_NAME).file_size
-        rootfs_calls = rootfs_size // 1024
-        if rootfs_calls * 1024 != rootfs_size:
-            rootfs_calls += 1
-    # only adding 1 extra call because we don’t have a signature file
-    calls = rootfs_calls + 1
-
-    # - the hashes, one for each chunk, the same chunks as unzip
-    calls += rootfs_calls
-    assert cb.call_count == calls
+def _partition_hash(partition):
+    hasher = hashlib.sha256()
+    hasher.update(open(partition, 'rb').read())
+    return binascii.hexlify(hasher.digest())
 
 
-def test_validate(downloaded_update_file, testing_cert):
+def test_validate_and_write(downloaded_update_file, testing_cert,
+                            testing_partition):
     cb = mock.Mock()
-    assert file_actions.validate_update(downloaded_update_file,
-                                        cb,
-                                        cert_path=testing_cert)
-    # We should have a callback call for
-    # - the unzips (see test_unzip for calculation)
+    steps = []
+    written = file_actions.validate_and_write_update(
+        downloaded_update_file, cb, testing_cert, steps.append,
+        chunk_size=4096)
+    assert written.value.path == testing_partition
+    assert steps == [file_actions.STEP_UNZIP, file_actions.STEP_SIGNATURE,
+                     file_actions.STEP_STREAM, file_actions.STEP_SYNC]
     with zipfile.ZipFile(downloaded_update_file) as zf:
         rootfs_size = zf.getinfo(file_actions.ROOTFS_NAME).file_size
-        rootfs_calls = rootfs_size // 1024
-        if rootfs_calls * 1024 != rootfs_size:
-            rootfs_calls += 1
-    calls = rootfs_calls + 2
+        assert _partition_hash(testing_partition)\
+            == zf.read(file_actions.ROOTFS_HASH_NAME).strip()
+    # One progress call per chunk written, in a single pass
+    assert cb.call_count == -(-rootfs_size // 4096)
+    assert cb.call_args[0][0] == 1.0
+    # The rootfs is never unzipped to disk
+    assert not os.path.exists(os.path.join(
+        os.path.dirname(downloaded_update_file), file_actions.ROOTFS_NAME))
 
-    # - the hashes, one for each chunk, the same chunks as unzip
-    calls += rootfs_calls
-    assert cb.call_count == calls
+
+@pytest.mark.exclude_rootfs_ext4_hash_sig
+def test_validate_and_write_hash_only(downloaded_update_file,
+                                      testing_partition):
+    steps = []
+    file_actions.validate_and_write_update(
+        downloaded_update_file, mock.Mock(), None, steps.append)
+    assert file_actions.STEP_SIGNATURE not in steps
+    with zipfile.ZipFile(downloaded_update_file) as zf:
+        assert _partition_hash(testing_partition)\
+            == zf.read(file_actions.ROOTFS_HASH_NAME).strip()
 
 
 @pytest.mark.bad_hash
-def test_validate_catches_bad_hash(downloaded_update_file):
-    cb = mock.Mock()
+def test_validate_and_write_catches_bad_hash(downloaded_update_file,
+                                             testing_partition):
     with pytest.raises(file_actions.HashMismatch):
-        file_actions.validate_update(downloaded_update_file, cb, None)
+        file_actions.validate_and_write_update(
+            downloaded_update_file, mock.Mock(), None)
 
 
 @pytest.mark.bad_sig
-def test_validate_catches_bad_sig(downloaded_update_file, testing_cert):
-    cb = mock.Mock()
+def test_validate_and_write_catches_bad_sig(downloaded_update_file,
+                                            testing_cert, testing_partition):
     with pytest.raises(file_actions.SignatureMismatch):
-        file_actions.validate_update(downloaded_update_file, cb,
-                                     testing_cert)
+        file_actions.validate_and_write_update(
+            downloaded_update_file, mock.Mock(), testing_cert)
+    # Nothing is written without a good signature
+    assert not os.path.exists(testing_partition)
 
 
 @pytest.mark.exclude_rootfs_ext4_hash_sig
-def test_validate_catches_missing_sig(downloaded_update_file, testing_cert):
-    cb = mock.Mock()
+def test_validate_and_write_catches_missing_sig(downloaded_update_file,
+                                                testing_cert,
+                                                testing_partition):
     with pytest.raises(file_actions.FileMissing):
-        file_actions.validate_update(downloaded_update_file, cb, testing_cert)
+        file_actions.validate_and_write_update(
+            downloaded_update_file, mock.Mock(), testing_cert)
+    assert not os.path.exists(testing_partition)
 
 
 @pytest.mark.exclude_rootfs_ext4_hash
-def test_validate_catches_missing_hash(downloaded_update_file, testing_cert):
-    cb = mock.Mock()
+def test_validate_and_write_catches_missing_hash(downloaded_update_file,
+                                                 testing_cert,
+                                                 testing_partition):
     with pytest.raises(file_actions.FileMissing):
-        file_actions.validate_update(downloaded_update_file, cb, testing_cert)
+        file_actions.validate_and_write_update(
+            downloaded_update_file, mock.Mock(), testing_cert)
+    assert not os.path.exists(testing_partition)
 
 
 @pytest.mark.exclude_rootfs_ext4
-def test_validate_catches_missing_image(downloaded_update_file, testing_cert):
-    cb = mock.Mock()
+def test_validate_and_write_catches_missing_image(downloaded_update_file,
+                                                  testing_cert,
+                                                  testing_partition):
     with pytest.raises(file_actions.FileMissing):
-        file_actions.validate_update(downloaded_update_file, cb, testing_cert)
-
-
-def test_write_update(extracted_update_file, testing_partition):
-    img = os.path.join(extracted_update_file, 'rootfs.ext4')
-    cb = mock.Mock()
-    file_actions.write_update(img, cb)
-
-    filesize = open(testing_partition).seek(0, 2)
-
-    call_count = filesize // 1024
-    if call_count * 1024 != filesize:
-        call_count += 1
-
-    assert cb.call_count == call_count
-
-    hasher = hashlib.sha256()
-    hasher.update(open(testing_partition, 'rb').read())
-    hash_val = binascii.hexlify(hasher.digest())
-    assert hash_val\
-        == open(
-            os.path.join(extracted_update_file, 'rootfs.ext4.hash'),
-            'rb').read().strip()
+        file_actions.validate_and_write_update(
+            downloaded_update_file, mock.Mock(), testing_cert)
+    assert not os.path.exists(testing_partition)
 
 
 def test_commit_update(monkeypatch):
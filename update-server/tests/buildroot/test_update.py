@@ -76,13 +76,16 @@ async def test_future_chain(otupdate_config, downloaded_update_file,
         assert session.stage == Stages.VALIDATING
         last_progress = session.state['progress']
         await asyncio.sleep(0.01)
-    assert fut.done()
     last_progress = 0.0
     while session.stage == Stages.WRITING:
         assert session.state['progress'] >= last_progress
         last_progress = session.state['progress']
         await asyncio.sleep(0.1)
+    assert fut.done()
     assert session.stage == Stages.DONE, session.error
+    assert list(session.state['timings'].keys()) == [
+        file_actions.STEP_UNZIP, file_actions.STEP_SIGNATURE,
+        file_actions.STEP_STREAM, file_actions.STEP_SYNC]
 
 
 @pytest.mark.exclude_rootfs_ext4
@@ -0,0 +1,19 @@
+""" Tests for otupdate.buildroot.update_session
+"""
+from otupdate.buildroot.update_session import UpdateSession, Stages
+
+
+def test_step_timings(tmpdir):
+    session = UpdateSession(str(tmpdir.join('downloads')))
+    assert session.state['timings'] == {}
+    session.set_stage(Stages.VALIDATING)
+    session.begin_step('unzip')
+    session.begin_step('signature')
+    assert list(session.timings.keys()) == ['unzip']
+    # Changing the stage ends the current step
+    session.set_stage(Stages.WRITING)
+    session.begin_step('stream')
+    session.set_error('Hash Mismatch', 'bad hash')
+    assert list(session.state['timings'].keys())\
+        == ['unzip', 'signature', 'stream']
+    assert all(timing >= 0 for timing in session.timings.values())